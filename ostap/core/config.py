@@ -53,6 +53,7 @@ config [ 'Canvas'   ] = { 'Width'       :  '1000' , 'Height'       :  '800' ,
                           'MarginRight' : '0.05'  , 'MarginLeft'   : '0.12' }
 
 config [ 'Fit Draw' ] = {}
+config [ 'Fitting'  ] = {}
 config [ 'Parallel' ] = {}
 
 ## the list of processes config files 
@@ -75,6 +76,10 @@ canvas  = config [ 'Canvas'    ]
 ## section for fit drawing options 
 fit_draw = config [ 'Fit Draw' ]
 
+# =============================================================================
+## section for fitting options 
+fitting  = config [ 'Fitting'  ]
+
 # =============================================================================
 # logging 
 # =============================================================================
@@ -113,6 +113,7 @@ with ROOTIgnore( 2001 ) :
     
     import ostap.trees.trees
     import ostap.trees.cuts
+    import ostap.trees.booking
     
     import ostap.histos.param
     import ostap.histos.compare
@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/fitting/autobin.py
+#
+#  Automatic binned-likelihood mode for very large unbinned datasets.
+#
+#  The unbinned dataset is converted once into <code>RooDataHist</code>
+#  with the adaptive binning, the binned fit is performed and (optionally)
+#  it is followed by the short unbinned refinement, that starts from
+#  the values of the parameters found by the binned fit.
+#
+#  The bin edges are chosen from the combination of
+#  - the data density (equal-population bins)
+#  - the curvature of the PDF (only for 1D-models): narrower bins
+#    where <code>|f''|/f</code> is large
+#  - the uniform component to limit the width of the largest bin
+#
+#  @code
+#  model   = ...
+#  dataset = ...
+#  r , f = model.fitTo ( dataset , auto_bin = 200 )
+#  r , f = model.fitTo ( dataset , auto_bin = 200 , auto_bin_refine = True )
+#  @endcode
+#
+#  The global policy can be specified in the <code>[Fitting]</code>
+#  section of the configuration file:
+#  @code
+#  [Fitting]
+#  AutoBin           = 200     ## number of bins (0: no automatic binning)
+#  AutoBinMinEntries = 1000000 ## minimal size of dataset for automatic binning
+#  AutoBinRefine     = False   ## make the unbinned refinement?
+#  @endcode
+#
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-20
+# =============================================================================
+"""Automatic binned-likelihood mode for very large unbinned datasets.
+
+The unbinned dataset is converted once into `RooDataHist`
+with the adaptive binning, the binned fit is performed and (optionally)
+it is followed by the short unbinned refinement, that starts from
+the values of the parameters found by the binned fit.
+
+The bin edges are chosen from the combination of
+- the data density (equal-population bins)
+- the curvature of the PDF (only for 1D-models): narrower bins
+  where |f''|/f is large
+- the uniform component to limit the width of the largest bin
+
+>>> model   = ...
+>>> dataset = ...
+>>> r , f = model.fitTo ( dataset , auto_bin = 200 )
+>>> r , f = model.fitTo ( dataset , auto_bin = 200 , auto_bin_refine = True )
+
+The global policy can be specified in the `[Fitting]`
+section of the configuration file:
+
+    [Fitting]
+    AutoBin           = 200     ## number of bins (0: no automatic binning)
+    AutoBinMinEntries = 1000000 ## minimal size of dataset for automatic binning
+    AutoBinRefine     = False   ## make the unbinned refinement?
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-03-20'
+__all__     = (
+    'adaptive_edges'  , ## get the adaptive bin edges for the variable
+    'auto_binned'     , ## convert the dataset into RooDataHist with adaptive binning
+    'binning_bias'    , ## estimate the relative bias of the bin expectations
+    'auto_bin_policy' , ## the global policy for automatic binning
+    'auto_bin_fit'    , ## make the automatic binned fit
+    )
+# =============================================================================
+from   ostap.logger.logger import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.fitting.autobin' )
+else                      : logger = getLogger ( __name__                )
+# =============================================================================
+import ROOT, math, array
+from   ostap.core.core         import hID, dsID, valid_pointer
+from   ostap.fitting.variables import SETVAR
+from   ostap.utils.timing      import timing
+# =============================================================================
+## get the adaptive bin edges for the variable
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  edges   = adaptive_edges ( pdf , dataset , pdf.xvar , 100 )
+#  @endcode
+#  The density of the bin edges is the combination of
+#  - the data density  (equal-population bins)
+#  - the curvature of the PDF, <code>sqrt(|f''|/f)</code>, that equalizes the
+#    relative bias of the bin expectations <code>h^2f''/(24f)</code>
+#  - the uniform component to limit the width of the largest bin
+#  @param pdf       the PDF
+#  @param dataset   the dataset
+#  @param var       the variable
+#  @param nbins     number of bins
+#  @param curvature use the curvature of the PDF?
+#  @param nfine     number of bins for the fine grid
+#  @return the sorted list of bin edges
+def adaptive_edges ( pdf , dataset , var , nbins , curvature = True , nfine = None ) :
+    """Get the adaptive bin edges for the variable
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> edges   = adaptive_edges ( pdf , dataset , pdf.xvar , 100 )
+    The density of the bin edges is the combination of
+    - the data density  (equal-population bins)
+    - the curvature of the PDF, sqrt(|f''|/f), that equalizes the
+      relative bias of the bin expectations h^2f''/(24f)
+    - the uniform component to limit the width of the largest bin
+    """
+    vmin , vmax = var.getMin () , var.getMax ()
+    nfine = nfine if nfine else max ( 20 * nbins , 1000 )
+    dx    = ( vmax - vmin ) / nfine
+
+    ## data density on the fine grid
+    histo = ROOT.TH1D ( hID () , '' , nfine , vmin , vmax )
+    dataset.project ( histo , var.GetName () )
+    dens  = [ max ( 0.0 , histo.GetBinContent ( k + 1 ) ) for k in range ( nfine ) ]
+    del histo
+
+    components = []
+    sd = sum ( dens )
+    if 0 < sd : components.append ( [ d / sd for d in dens ] )
+
+    ## curvature of the PDF on the fine grid
+    if curvature :
+        obs = ROOT.RooArgSet ( var )
+        fv  = []
+        with SETVAR ( var ) :
+            for k in range ( nfine ) :
+                var.setVal ( vmin + ( k + 0.5 ) * dx )
+                fv.append ( pdf.pdf.getVal ( obs ) )
+        curv = [ 0.0 ] * nfine
+        for k in range ( 1 , nfine - 1 ) :
+            if 0 < fv [ k ] :
+                curv [ k ] = math.sqrt ( abs ( fv [ k - 1 ] - 2 * fv [ k ] + fv [ k + 1 ] ) / fv [ k ] )
+        curv [  0 ] = curv [  1 ]
+        curv [ -1 ] = curv [ -2 ]
+        sc = sum ( curv )
+        if 0 < sc : components.append ( [ c / sc for c in curv ] )
+
+    ## combine all components with the uniform floor
+    nc   = len ( components )
+    dens = [ 0.1 / nfine + 0.9 * sum ( c [ k ] for c in components ) / nc if nc else 1.0 / nfine
+             for k in range ( nfine ) ]
+
+    cumulative = [ 0.0 ]
+    for d in dens : cumulative.append ( cumulative [ -1 ] + d )
+    total = cumulative [ -1 ]
+
+    ## invert the cumulative distribution
+    edges = [ vmin ]
+    k     = 0
+    for i in range ( 1 , nbins ) :
+        target = total * i / nbins
+        while cumulative [ k + 1 ] < target : k += 1
+        frac = ( target - cumulative [ k ] ) / ( cumulative [ k + 1 ] - cumulative [ k ] )
+        x    = vmin + ( k + frac ) * dx
+        if edges [ -1 ] < x < vmax : edges.append ( x )
+    edges.append ( vmax )
+
+    return edges
+
+# =============================================================================
+## convert the dataset into <code>RooDataHist</code> with the adaptive binning
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  hdata   = auto_binned ( pdf , dataset , 100 )
+#  @endcode
+#  - the curvature of the PDF is used only for 1D-models
+#  - all observables must be <code>RooRealVar</code>
+#  @param pdf     the PDF
+#  @param dataset the dataset
+#  @param nbins   number of bins for each observable
+#  @return <code>RooDataHist</code> or <code>None</code> if the dataset can't be binned
+#  @see adaptive_edges
+def auto_binned ( pdf , dataset , nbins ) :
+    """Convert the dataset into `RooDataHist` with the adaptive binning
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> hdata   = auto_binned ( pdf , dataset , 100 )
+    - the curvature of the PDF is used only for 1D-models
+    - all observables must be `RooRealVar`
+    - returns `RooDataHist` or `None` if the dataset can't be binned
+    - see adaptive_edges
+    """
+    observables = [ o for o in pdf.pdf.getObservables ( dataset ) ]
+    if not observables : return None
+    for o in observables :
+        if not isinstance ( o , ROOT.RooRealVar ) :
+            logger.warning ( "auto_binned: observable `%s' is not RooRealVar, skip binning" % o.GetName () )
+            return None
+
+    curvature = 1 == len ( observables )
+
+    ## keep the default binnings
+    saved = [ ( v , v.getBinning ().clone ( v.getBinning ().GetName () ) ) for v in observables ]
+
+    try :
+        vset = ROOT.RooArgSet ()
+        for v in observables :
+            edges   = adaptive_edges ( pdf , dataset , v , nbins , curvature = curvature )
+            binning = ROOT.RooBinning ( len ( edges ) - 1 , array.array ( 'd' , edges ) )
+            v.setBinning ( binning )
+            vset.add     ( v       )
+        hdata = ROOT.RooDataHist ( dsID () , 'auto-binned %s' % dataset.GetTitle () , vset , dataset )
+    finally :
+        for v , b in saved : v.setBinning ( b )
+
+    return hdata
+
+# =============================================================================
+## estimate the relative bias of the bin expectations for the binned fit:
+#  the expectation for the bin is <code>f(x_c)*V</code> instead of
+#  the integral of PDF over the bin, and the relative difference is
+#  \f$ \delta = \sum_i \frac{h_i^2 f^{\prime\prime}_{ii}}{24 f} \f$
+#  @code
+#  pdf   = ...
+#  hdata = ...
+#  bias  = binning_bias ( pdf , hdata )
+#  if bias : max_bias , mean_bias = bias
+#  @endcode
+#  @param pdf     the PDF
+#  @param hdata   the binned dataset
+#  @param maxbins the maximal number of bins for estimate
+#  @return the maximal and the mean (weighted by bin content) absolute relative bias
+def binning_bias ( pdf , hdata , maxbins = 10000 ) :
+    """Estimate the relative bias of the bin expectations for the binned fit:
+    the expectation for the bin is f(x_c)*V instead of
+    the integral of PDF over the bin, and the relative difference is
+    delta = sum_i h_i^2 f''_ii/(24f)
+    >>> pdf   = ...
+    >>> hdata = ...
+    >>> bias  = binning_bias ( pdf , hdata )
+    >>> if bias : max_bias , mean_bias = bias
+    - returns the maximal and the mean (weighted by bin content) absolute relative bias
+    """
+    if maxbins < hdata.numEntries () : return None
+
+    observables = [ o for o in pdf.pdf.getObservables ( hdata ) ]
+    obs         = ROOT.RooArgSet ()
+    for o in observables : obs.add ( o )
+
+    saved = [ ( v , float ( v.getVal () ) ) for v in observables ]
+
+    sumw , sumb , maxb = 0.0 , 0.0 , 0.0
+    try :
+        for i in range ( hdata.numEntries () ) :
+            point = hdata.get ( i )
+            w     = hdata.weight ()
+            if w <= 0 : continue
+
+            centers = []
+            for v in observables :
+                p = point.find ( v.GetName () )
+                b = p.getBinning ()
+                x = p.getVal ()
+                centers.append ( ( v , x , b.binWidth ( b.binNumber ( x ) ) ) )
+
+            for v , x , h in centers : v.setVal ( x )
+            f0 = pdf.pdf.getVal ( obs )
+            if f0 <= 0 : continue
+
+            delta = 0.0
+            for v , x , h in centers :
+                v.setVal ( x - 0.5 * h ) ; fm = pdf.pdf.getVal ( obs )
+                v.setVal ( x + 0.5 * h ) ; fp = pdf.pdf.getVal ( obs )
+                v.setVal ( x )
+                delta += ( fm - 2 * f0 + fp ) / ( 6 * f0 )
+
+            delta = abs ( delta )
+            sumw += w
+            sumb += w * delta
+            maxb  = max ( maxb , delta )
+    finally :
+        for v , x in saved : v.setVal ( x )
+
+    return ( maxb , sumb / sumw ) if 0 < sumw else None
+
+# =============================================================================
+## get the global policy for automatic binning from the
+#  <code>[Fitting]</code> section of the configuration
+#  @code
+#  dataset = ...
+#  nbins , refine = auto_bin_policy ( dataset )
+#  @endcode
+#  @return number of bins (0: no automatic binning) and the refinement flag
+def auto_bin_policy ( dataset ) :
+    """Get the global policy for automatic binning from the
+    `[Fitting]` section of the configuration
+    >>> dataset = ...
+    >>> nbins , refine = auto_bin_policy ( dataset )
+    - returns number of bins (0: no automatic binning) and the refinement flag
+    """
+    import ostap.core.config as OCC
+    nbins   = OCC.fitting.getint     ( 'AutoBin'           , fallback = 0       )
+    minsize = OCC.fitting.getint     ( 'AutoBinMinEntries' , fallback = 1000000 )
+    refine  = OCC.fitting.getboolean ( 'AutoBinRefine'     , fallback = False   )
+    if 0 < nbins and minsize <= len ( dataset ) : return nbins , refine
+    return 0 , refine
+
+# =============================================================================
+## make the automatic binned fit:
+#  - convert the dataset once into <code>RooDataHist</code> with adaptive binning
+#  - make the binned fit
+#  - (optionally) make the short unbinned refinement, starting from
+#    the values of the parameters found by the binned fit
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  r , f   = auto_bin_fit ( pdf , dataset , 200 , refine = True )
+#  @endcode
+#  @param pdf     the PDF
+#  @param dataset the dataset
+#  @param bins    number of bins for each observable
+#  @param refine  make the unbinned refinement?
+#  @see auto_binned
+#  @see binning_bias
+def auto_bin_fit ( pdf             ,
+                   dataset         ,
+                   bins            ,
+                   refine = False  ,
+                   draw   = False  ,
+                   nbins  = 100    ,
+                   silent = False  ,
+                   refit  = False  ,
+                   args   = ()     , **kwargs ) :
+    """Make the automatic binned fit:
+    - convert the dataset once into `RooDataHist` with adaptive binning
+    - make the binned fit
+    - (optionally) make the short unbinned refinement, starting from
+      the values of the parameters found by the binned fit
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> r , f   = auto_bin_fit ( pdf , dataset , 200 , refine = True )
+    - see auto_binned
+    - see binning_bias
+    """
+
+    fit_args = dict ( silent = silent , refit = refit , args = args , auto_bin = 0 )
+    fit_args.update ( kwargs )
+
+    with timing ( 'auto_bin: binning' , logger = pdf.debug , start = None ) as tb :
+        hdata = auto_binned ( pdf , dataset , bins )
+
+    if hdata is None :
+        pdf.warning ( "auto_bin: dataset can't be binned, use the unbinned fit" )
+        return pdf.fitTo ( dataset , draw = draw , nbins = nbins , **fit_args )
+
+    with timing ( 'auto_bin: binned fit' , logger = pdf.debug , start = None ) as tf :
+        result , _ = pdf.fitTo ( hdata , **fit_args )
+
+    if not silent :
+        speedup = float ( len ( dataset ) ) / max ( 1 , hdata.numEntries () )
+        message = "auto_bin: %d entries -> %d bins, expected speed-up of NLL evaluation x%.1f, binning %.1fs, binned fit %.1fs" % (
+            len ( dataset ) , hdata.numEntries () , speedup , tb.delta , tf.delta )
+        bias    = binning_bias ( pdf , hdata )
+        if bias : message += ", expected bias of bin expectations: max %.2g, mean %.2g" % bias
+        pdf.info ( message )
+
+    del hdata
+
+    if refine and valid_pointer ( result ) :
+        with timing ( 'auto_bin: refinement' , logger = pdf.debug , start = None ) as tr :
+            result , frame = pdf.fitTo ( dataset , draw = draw , nbins = nbins , **fit_args )
+        if not silent : pdf.info ( "auto_bin: unbinned refinement %.1fs" % tr.delta )
+        return result , frame
+
+    return result , pdf._draw_fit_ ( dataset , draw , nbins , silent , **kwargs )
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
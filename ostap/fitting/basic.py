@@ -50,6 +50,11 @@ from   ostap.fitting.roocmdarg import check_arg, nontrivial_arg
 import ostap.histos.histos 
 from   ostap.core.meta_info    import root_version_int 
 # =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
 from   ostap.logger.logger import getLogger
 if '__main__' ==  __name__ : logger = getLogger ( 'ostap.fitting.basic' )
 else                       : logger = getLogger ( __name__              )
@@ -274,7 +279,14 @@ class PDF (FUNC) :
     #  r,f = model.fitTo ( dataset , weighted = True )    
     #  r,f = model.fitTo ( dataset , ncpu     = 10   )    
     #  r,f = model.fitTo ( dataset , draw = True , nbins = 300 )    
+    #  r,f = model.fitTo ( dataset , cache = 'fits.db' )    
+    #  r,f = model.fitTo ( dataset , auto_bin = 200 )    
+    #  r,f = model.fitTo ( dataset , multistart = 20 )    
+    #  r,f = model.fitTo ( dataset , multistart = { 'n' : 20 , 'mode' : 'around' , 'parallel' : { 'ncpus' : 4 } } )    
     #  @endcode 
+    #  @see ostap.fitting.fitcache.FitCache
+    #  @see ostap.fitting.autobin.auto_bin_fit
+    #  @see ostap.parallel.parallel_multistart.multistart_fit
     def fitTo ( self           ,
                 dataset        ,
                 draw   = False ,
@@ -289,6 +301,17 @@ class PDF (FUNC) :
         >>> r,f = model.fitTo ( dataset , weighted = True )    
         >>> r,f = model.fitTo ( dataset , ncpu     = 10   )    
         >>> r,f = model.fitTo ( dataset , draw = True , nbins = 300 )    
+        >>> r,f = model.fitTo ( dataset , cache = 'fits.db' )    
+        >>> r,f = model.fitTo ( dataset , auto_bin = 200 )    
+        >>> r,f = model.fitTo ( dataset , multistart = 20 )    
+        >>> r,f = model.fitTo ( dataset , multistart = { 'n' : 20 , 'mode' : 'around' , 'parallel' : { 'ncpus' : 4 } } )    
+        - with `cache` the fit results are taken from/stored in the persistent cache
+        - with `auto_bin` the large unbinned dataset is fit in the binned mode
+        - with `multistart` the fits from many starting points are performed
+          (in parallel), and the final fit starts from the best minimum 
+        - see ostap.fitting.fitcache.FitCache
+        - see ostap.fitting.autobin.auto_bin_fit
+        - see ostap.parallel.parallel_multistart.multistart_fit
         """
         if timer :
             from ostap.utils.timing import timing 
@@ -313,6 +336,34 @@ class PDF (FUNC) :
                                    density = density ,
                                    nbins   = nbins   , 
                                    chi2    = chi2    , args = args , **kwargs ) 
+
+        ## (optional) multi-start global minimisation 
+        multistart = kwargs.pop ( 'multistart' , None  )
+        if multistart :
+            config     = dict ( multistart ) if isinstance ( multistart , dict ) else { 'n' : int ( multistart ) } 
+            nll_config = dict ( ( k , v ) for k , v in kwargs.items ()
+                                if not k in ( 'cache' , 'warm_start' , 'auto_bin' , 'auto_bin_refine' ) )
+            from ostap.parallel.parallel_multistart import multistart_fit, minima_table
+            minima = multistart_fit ( self , dataset , silent = silent , args = args , nll_config = nll_config , **config )
+            if not silent : self.info ( 'fitTo: multi-start minima\n%s' % minima_table ( minima , prefix = '# ' ) )
+            ## start the final fit from the best minimum 
+            if minima :
+                best = minima [ 0 ] [ 'values' ] 
+                for p in self.params ( dataset ) :
+                    if p.GetName() in best : p.setVal ( best [ p.GetName() ] ) 
+            return self.fitTo ( dataset         ,
+                                draw   = draw   ,
+                                nbins  = nbins  ,
+                                silent = silent ,
+                                refit  = refit  ,
+                                args   = args   , **kwargs )
+        
+        ## (optional) persistent cache of the fit results
+        cache      = kwargs.pop ( 'cache'      , None  )
+        warm_start = kwargs.pop ( 'warm_start' , False )
+        ## (optional) automatic binned-likelihood mode 
+        auto_bin   = kwargs.pop ( 'auto_bin'        , None  )
+        refine     = kwargs.pop ( 'auto_bin_refine' , None  )
         #
         ## treat the arguments properly
         #
@@ -321,6 +372,46 @@ class PDF (FUNC) :
         if not silent and opts and nontrivial_arg ( ( 'Save' , 'NumCPU' ) , *opts ) :
             self.info ('fitTo options: %s ' % list ( opts ) )
 
+        if isinstance ( dataset , ROOT.RooDataSet ) and ( auto_bin is None or refine is None ) :
+            from ostap.fitting.autobin import auto_bin_policy
+            policy_bins , policy_refine = auto_bin_policy ( dataset )
+            if auto_bin is None : auto_bin = policy_bins
+            if refine   is None : refine   = policy_refine
+        if not isinstance ( dataset , ROOT.RooDataSet ) : auto_bin = 0 
+            
+        if cache :
+            from ostap.fitting.fitcache import FitCache
+            key_opts = opts + ( ( 'auto_bin:%s:%s' % ( auto_bin , refine ) , ) if auto_bin else () )
+            with FitCache ( cache ) as fc :
+                result = fc.restore ( self , dataset , key_opts , warm_start = warm_start )
+                if result is not None :
+                    self.fit_result = result
+                    if not silent : self.info ( 'fitTo: the fit result is restored from the cache' ) 
+                    return result , self._draw_fit_ ( dataset , draw , nbins , silent , **kwargs )
+                result , frame = self.fitTo ( dataset         ,
+                                              draw   = draw   ,
+                                              nbins  = nbins  ,
+                                              silent = silent ,
+                                              refit  = refit  ,
+                                              args   = args   ,
+                                              auto_bin        = auto_bin ,
+                                              auto_bin_refine = refine   , **kwargs )
+                if valid_pointer ( result ) : fc.store ( self , dataset , key_opts , result )
+                return result , frame 
+
+        ## automatic binned-likelihood mode for very large unbinned datasets 
+        if auto_bin :
+            from ostap.fitting.autobin import auto_bin_fit
+            return auto_bin_fit ( self                     ,
+                                  dataset                  ,
+                                  auto_bin                 ,
+                                  refine = refine          ,
+                                  draw   = draw            ,
+                                  nbins  = nbins           ,
+                                  silent = silent          ,
+                                  refit  = refit           ,
+                                  args   = args            , **kwargs )
+
         ## play a bit with the binning cache for convolutions 
         if self.xvar.hasBinning ( 'cache' ) :
             nb1 = self.xvar.getBins( 'cache' ) 
@@ -342,7 +433,8 @@ class PDF (FUNC) :
                 
         #
         ## define silent context
-        with roo_silent ( silent ) :
+        from ostap.fitting.pypdf import BatchData 
+        with roo_silent ( silent ) , BatchData ( self.pdf , dataset , silent ) :
             self.fit_result = None
             result          = self.pdf.fitTo ( dataset , *opts ) 
             self.fit_result = result 
@@ -424,15 +516,8 @@ class PDF (FUNC) :
                                  refit  = refit  ,
                                  args   = args   , **kwargs ) 
 
-        frame = None
-        
         ## draw it if requested
-        if draw :  
-            from ostap.plotting.fit_draw import draw_options
-            draw_opts = draw_options ( **kwargs )
-            if draw_opts and not draw     : draw = draw_opts
-            if isinstance ( draw , dict ) : draw_opts.update( draw )            
-            frame = self.draw ( dataset , nbins = nbins , silent = silent , **draw_opts ) 
+        frame = self._draw_fit_ ( dataset , draw , nbins , silent , **kwargs )
                         
         if hasattr ( self.pdf , 'setPars' ) : self.pdf.setPars()
             
@@ -451,6 +536,18 @@ class PDF (FUNC) :
                          
         return result, frame 
 
+    # =========================================================================
+    ## helper method to draw the fit results (if requested)
+    def _draw_fit_ ( self , dataset , draw , nbins , silent , **kwargs ) :
+        """Helper method to draw the fit results (if requested)
+        """
+        if not draw : return None
+        from ostap.plotting.fit_draw import draw_options
+        draw_opts = draw_options ( **kwargs )
+        if draw_opts and not draw     : draw = draw_opts
+        if isinstance ( draw , dict ) : draw_opts.update( draw )            
+        return self.draw ( dataset , nbins = nbins , silent = silent , **draw_opts ) 
+
     ## helper method to draw set of components 
     def _draw ( self , what , frame , options , style = None , args = () ) :
         """ Helper method to draw set of components
@@ -863,6 +960,27 @@ class PDF (FUNC) :
                 self.histo_data = H1D_dset ( dataset , self.xvar , density , silent )
                 hdataset        = self.histo_data.dset 
                 histo           = dataset 
+
+        ## (optional) persistent cache of the fit results
+        cache      = kwargs.pop ( 'cache'      , None  )
+        warm_start = kwargs.pop ( 'warm_start' , False )
+        if cache :
+            from ostap.fitting.fitcache import FitCache
+            opts = ( 'chi2fitTo' , ) + tuple ( self.parse_args ( hdataset , *args , **kwargs ) )
+            with FitCache ( cache ) as fc :
+                result = fc.restore ( self , hdataset , opts , warm_start = warm_start )
+                if result is None :
+                    result , _ = self.chi2fitTo ( dataset            ,
+                                                  draw    = False    ,
+                                                  silent  = silent   ,
+                                                  density = density  ,
+                                                  nbins   = nbins    ,
+                                                  args    = args     , **kwargs )
+                    if valid_pointer ( result ) : fc.store ( self , hdataset , opts , result )
+                else :
+                    self.fit_result = result
+                    if not silent : self.info ( 'chi2fitTo: the fit result is restored from the cache' ) 
+            return result , self._draw_fit_ ( hdataset , draw , nbins , silent , **kwargs )
                 
         with roo_silent ( silent ) : 
 
@@ -1097,19 +1215,40 @@ class PDF (FUNC) :
     #                          vrange ( 0 , 100 , 100 ) ,
     #                          dataset                  )
     #  @endcode
-    def graph_nll ( self            ,
-                    variable        , 
-                    values          ,
-                    dataset         ,
-                    silent  = True  ,
-                    args    = ()    , **kwargs ) :
+    #  The scan points can be processed in parallel:
+    #  @code
+    #  graph = pdf.graph_nll ( 'S' , vrange ( 0 , 100 , 100 ) , dataset , parallel = True )
+    #  graph = pdf.graph_nll ( 'S' , vrange ( 0 , 100 , 100 ) , dataset , parallel = { 'ncpus' : 4 } )
+    #  @endcode
+    #  @see ostap.parallel.parallel_scan
+    def graph_nll ( self             ,
+                    variable         , 
+                    values           ,
+                    dataset          ,
+                    silent   = True  ,
+                    args     = ()    ,
+                    parallel = False , **kwargs ) :
         """Get NLL/profile-graph for the variable, using the specified abscissas
         >>> pdf   = ...
         >>> graph = pdf.graph_nll ( 'S'                     ,
         ...                          vrange ( 0 , 100 , 100 ) ,
         ...                          dataset                )
+        The scan points can be processed in parallel:
+        >>> graph = pdf.graph_nll ( 'S' , vrange ( 0 , 100 , 100 ) , dataset , parallel = True )
+        >>> graph = pdf.graph_nll ( 'S' , vrange ( 0 , 100 , 100 ) , dataset , parallel = { 'ncpus' : 4 } )
+        - see ostap.parallel.parallel_scan
         """
 
+        if parallel :
+            results , sf = self.scan_nll ( dataset              ,
+                                           [ variable ]         ,
+                                           [ ( v , ) for v in values ] ,
+                                           profile  = False     ,
+                                           silent   = silent    ,
+                                           parallel = parallel  ,
+                                           args     = args      , **kwargs )
+            return self._graph_scan_ ( results , sf )
+        
         ## 1) create NLL 
         nLL, sf = self.nll ( dataset , silent = silent ,  args = args , **kwargs )
 
@@ -1156,20 +1295,42 @@ class PDF (FUNC) :
     #                              vrange ( 0 , 12.5 , 10  ) ,
     #                              dataset                   )
     #  @endcode
-    def graph_profile ( self            ,
-                        variable        , 
-                        values          ,
-                        dataset         ,
-                        fix     = []    ,
-                        silent  = True  ,
-                        args    = ()    , **kwargs ) :
+    #  The scan points can be processed in parallel, each profile
+    #  minimisation starts from the minimum for the neighbouring point:
+    #  @code
+    #  graph = pdf.graph_profile ( 'S' , vrange ( 0 , 12.5 , 10  ) , dataset , parallel = True )
+    #  @endcode
+    #  @see ostap.parallel.parallel_scan
+    def graph_profile ( self             ,
+                        variable         , 
+                        values           ,
+                        dataset          ,
+                        fix      = []    ,
+                        silent   = True  ,
+                        args     = ()    ,
+                        parallel = False , **kwargs ) :
         """Get profile-graph for the variable, using the specified abscissas
         >>> pdf   = ...
         >>> graph = pdf.graph_profile ( 'S'                     ,
         ...                             range ( 0 , 12.5 , 20 ) ,
         ...                             dataset                 )
+        The scan points can be processed in parallel, each profile
+        minimisation starts from the minimum for the neighbouring point:
+        >>> graph = pdf.graph_profile ( 'S' , vrange ( 0 , 12.5 , 10  ) , dataset , parallel = True )
+        - see ostap.parallel.parallel_scan
         """
 
+        if parallel :
+            results , sf = self.scan_nll ( dataset              ,
+                                           [ variable ]         ,
+                                           [ ( v , ) for v in values ] ,
+                                           fix      = fix       , 
+                                           profile  = True      ,
+                                           silent   = silent    ,
+                                           parallel = parallel  ,
+                                           args     = args      , **kwargs )
+            return self._graph_scan_ ( results , sf )
+
         ## 1) create NLL 
         nLL , sf = self.nll ( dataset , silent = silent ,  args = args , **kwargs )
 
@@ -1218,6 +1379,140 @@ class PDF (FUNC) :
             
         return graph 
         
+    # =========================================================================
+    ## get 2D NLL-profile-graph for two variables, using the specified grid
+    #  @code
+    #  pdf   = ...
+    #  graph = pdf.graph_profile2 ( 'S' , vrange ( 0 , 100 , 20 ) ,
+    #                               'B' , vrange ( 0 , 100 , 20 ) , dataset )
+    #  graph = pdf.graph_profile2 ( 'S' , vrange ( 0 , 100 , 20 ) ,
+    #                               'B' , vrange ( 0 , 100 , 20 ) , dataset , parallel = True )
+    #  @endcode
+    #  @return TGraph2D with the profile (relative to the minimal value) 
+    #  @see ostap.parallel.parallel_scan
+    def graph_profile2 ( self             ,
+                         var1             , 
+                         values1          ,
+                         var2             , 
+                         values2          ,
+                         dataset          ,
+                         fix      = []    ,
+                         silent   = True  ,
+                         args     = ()    ,
+                         parallel = False , **kwargs ) :
+        """Get 2D profile-graph for two variables, using the specified grid
+        >>> pdf   = ...
+        >>> graph = pdf.graph_profile2 ( 'S' , vrange ( 0 , 100 , 20 ) ,
+        ...                              'B' , vrange ( 0 , 100 , 20 ) , dataset )
+        >>> graph = pdf.graph_profile2 ( 'S' , vrange ( 0 , 100 , 20 ) ,
+        ...                              'B' , vrange ( 0 , 100 , 20 ) , dataset , parallel = True )
+        - returns TGraph2D with the profile (relative to the minimal value) 
+        - see ostap.parallel.parallel_scan
+        """
+        values2 = tuple ( values2 ) 
+        points  = [ ( x , y ) for x in values1 for y in values2 ]
+        results , sf = self.scan_nll ( dataset              ,
+                                       [ var1 , var2 ]      ,
+                                       points               ,
+                                       fix      = fix       , 
+                                       profile  = True      ,
+                                       silent   = silent    ,
+                                       parallel = parallel  ,
+                                       args     = args      , **kwargs )
+        return self._graph_scan_ ( results , sf )
+        
+    # =========================================================================
+    ## scan NLL or LL-profile for the given points
+    #  - NLL is created only once (per job)
+    #  - the points are processed in the "snake"-order and each profile
+    #    minimisation starts from the minimum for the neighbouring point
+    #  @code
+    #  pdf = ...
+    #  results , sf = pdf.scan_nll ( dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] )
+    #  results , sf = pdf.scan_nll ( dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] , parallel = True )
+    #  @endcode
+    #  @param parallel  use parallel processing:
+    #          <code>True</code> or the configuration of <code>WorkManager</code>
+    #  @return dictionary { point : NLL-value } and the scale factor 
+    #  @see ostap.parallel.parallel_scan.scan_nll 
+    #  @see ostap.parallel.parallel_scan.parallel_scan 
+    def scan_nll ( self             ,
+                   dataset          ,
+                   variables        ,
+                   points           ,
+                   fix      = ()    ,
+                   profile  = True  , 
+                   silent   = True  ,
+                   args     = ()    ,
+                   parallel = False , **kwargs ) :
+        """Scan NLL or LL-profile for the given points
+        - NLL is created only once (per job)
+        - the points are processed in the ``snake''-order and each profile
+        minimisation starts from the minimum for the neighbouring point
+        >>> pdf = ...
+        >>> results , sf = pdf.scan_nll ( dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] )
+        >>> results , sf = pdf.scan_nll ( dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] , parallel = True )
+        - parallel : use parallel processing: True or the configuration of WorkManager
+        - returns dictionary { point : NLL-value } and the scale factor 
+        - see ostap.parallel.parallel_scan.scan_nll 
+        - see ostap.parallel.parallel_scan.parallel_scan 
+        """
+        ## convert if needed 
+        if not isinstance ( dataset , ROOT.RooAbsData ) and hasattr ( dataset , 'dset' ) :
+            dataset = dataset.dset 
+
+        sf = dataset.sFactor() 
+        
+        if parallel :
+            config = parallel if isinstance ( parallel , dict ) else {}
+            nll_config = dict ( kwargs )
+            nll_config [ 'args' ] = args 
+            from ostap.parallel.parallel_scan import parallel_scan
+            results = parallel_scan ( self , dataset , variables , points ,
+                                      fix        = fix        ,
+                                      profile    = profile    ,
+                                      silent     = silent     ,
+                                      nll_config = nll_config , **config )
+        else :
+            from ostap.parallel.parallel_scan import scan_nll
+            results = scan_nll      ( self , dataset , variables , points ,
+                                      fix        = fix        ,
+                                      profile    = profile    ,
+                                      silent     = silent     ,
+                                      args       = args       , **kwargs )
+            
+        return results , sf 
+
+    # =========================================================================
+    ## create the graph from the scan results
+    #  @see PDF.scan_nll 
+    def _graph_scan_ ( self , results , sf = 1 ) :
+        """Create the graph from the scan results
+        - see PDF.scan_nll 
+        """
+        points = sorted ( results.items () )
+        vmin   = min ( results.values () ) if results else 0
+        
+        if points and 2 == len ( points [ 0 ] [ 0 ] ) :
+            graph = ROOT.TGraph2D ( len ( points ) )
+            for i , pv in enumerate ( points ) :
+                p , v = pv 
+                graph.SetPoint ( i , p [ 0 ] , p [ 1 ] , ( v - vmin ) * sf )
+            return graph
+
+        import ostap.histos.graphs
+        graph = ROOT.TGraph ( len ( points ) )
+        for i , pv in enumerate ( points ) :
+            p , v = pv
+            graph [ i ] = p [ 0 ] , v - vmin 
+            
+        ## scale it if needed
+        if 1 != sf :
+            logger.info ('graph_scan: apply scale factor of %s due to dataset weights' % sf )
+            graph *= sf 
+            
+        return graph 
+
     # ========================================================================
     ## evaluate "significance" using Wilks' theorem via NLL
     #  @code
@@ -1225,18 +1520,23 @@ class PDF (FUNC) :
     #  pdf  = ...
     #  pdf.fitTo ( data , ... )
     #  sigmas = pdf.wilks ( 'S' , data )
+    #  sigmas = pdf.wilks ( 'S' , data , parallel = True )
     #  @endcode
+    #  @see ostap.parallel.parallel_scan
     def wilks ( self                     ,
                 var                      ,
                 dataset                  ,
                 range    = ( 0 , None )  ,
                 silent   = True          ,
-                args     = () , **kwargs ) :
+                args     = ()            ,
+                parallel = False         , **kwargs ) :
         """Evaluate ``significance'' using Wilks' theorem via NLL
         >>> data = ...
         >>> pdf  = ...
         >>> pdf.fitTo ( data , ... )
         >>> sigmas = pdf.wilks ( 'S' , data )
+        >>> sigmas = pdf.wilks ( 'S' , data , parallel = True )
+        - see ostap.parallel.parallel_scan
         """
         # if histogram, convert it to RooDataHist object:
         if isinstance  ( dataset , ROOT.TH1 ) :
@@ -1248,11 +1548,12 @@ class PDF (FUNC) :
                 self.histo_data = H1D_dset ( dataset , self.xvar , density , silent )
                 hdataset        = self.histo_data.dset
                 kwargs['ncpu']  = 1 
-                return self.wilks ( var     = var      ,
-                                    dataset = hdataset ,
-                                    range   = range    ,
-                                    silent  = silent   , 
-                                    args    = args     , **kwargs )
+                return self.wilks ( var      = var      ,
+                                    dataset  = hdataset ,
+                                    range    = range    ,
+                                    silent   = silent   , 
+                                    parallel = parallel , 
+                                    args     = args     , **kwargs )
         ## convert if needed 
         if not isinstance ( dataset , ROOT.RooAbsData ) and hasattr ( dataset , 'dset' ) :
             dataset = dataset.dset 
@@ -1271,6 +1572,13 @@ class PDF (FUNC) :
         if isinstance ( maxv , VE ) :
             if 0 < maxv.cov2 () : error = maxv.error() 
             maxv = maxv.value ()
+
+        if parallel :
+            return self._wilks_scan_ ( var , dataset , minv , maxv , error ,
+                                       profile  = False    ,
+                                       silent   = silent   ,
+                                       parallel = parallel ,
+                                       args     = args     , **kwargs )
             
         with roo_silent ( silent ) :
             
@@ -1325,19 +1633,24 @@ class PDF (FUNC) :
     #  pdf  = ...
     #  pdf.fitTo ( data , ... )
     #  sigmas = pdf.wilks2 ( 'S' , data , fix = [ 'mean' , 'gamma' ] )
+    #  sigmas = pdf.wilks2 ( 'S' , data , fix = [ 'mean' , 'gamma' ] , parallel = True )
     #  @endcode
+    #  @see ostap.parallel.parallel_scan
     def wilks2 ( self                           ,
                  var                            ,
                  dataset                        ,
                  fix                            , ## variables to fix 
                  range          = ( 0 , None )  ,
                  silent         = True          ,
-                 args           = () , **kwargs ) :
+                 args           = ()            ,
+                 parallel       = False         , **kwargs ) :
         """Evaluate ``significance'' using Wilks' theorem via NLL
         >>> data = ...
         >>> pdf  = ...
         >>> pdf.fitTo ( data , ... )
         >>> sigmas = pdf.wilks2 ( 'S' , data , fix = [ 'mean' , 'gamma'] )
+        >>> sigmas = pdf.wilks2 ( 'S' , data , fix = [ 'mean' , 'gamma'] , parallel = True )
+        - see ostap.parallel.parallel_scan
         """
         # if histogram, convert it to RooDataHist object:
         if isinstance  ( dataset , ROOT.TH1 ) :
@@ -1354,6 +1667,7 @@ class PDF (FUNC) :
                                      fix            = fix             ,
                                      range          = range           , 
                                      silent         = silent          ,
+                                     parallel       = parallel        , 
                                      args           = args , **kwargs )
         ## convert if needed 
         if not isinstance ( dataset , ROOT.RooAbsData ) and hasattr ( dataset , 'dset' ) :
@@ -1386,6 +1700,14 @@ class PDF (FUNC) :
             if 0 < maxv.cov2 () : error = maxv.error() 
             maxv = maxv.value ()
 
+        if parallel :
+            return self._wilks_scan_ ( var , dataset , minv , maxv , error ,
+                                       fix      = fixed    , 
+                                       profile  = True     ,
+                                       silent   = silent   ,
+                                       parallel = parallel ,
+                                       args     = args     , **kwargs )
+
         vname = var.GetName() 
         with roo_silent ( silent ) :
 
@@ -1440,6 +1762,44 @@ class PDF (FUNC) :
             
         return result if 0 <= dnll else -1 * result 
                 
+    # ========================================================================
+    ## evaluate "significance" using Wilks' theorem via the scan of NLL/LL-profile
+    #  @see PDF.wilks
+    #  @see PDF.wilks2
+    #  @see PDF.scan_nll
+    def _wilks_scan_ ( self , var , dataset , minv , maxv , error = 0 ,
+                       fix = () , profile = True , silent = True , parallel = False ,
+                       args = () , **kwargs ) :
+        """Evaluate ``significance'' using Wilks' theorem via the scan of NLL/LL-profile
+        - see PDF.wilks
+        - see PDF.wilks2
+        - see PDF.scan_nll
+        """
+        points = [ ( minv , ) , ( maxv , ) ]
+        if 0 < error : points += [ ( maxv + error , ) , ( maxv - error , ) ]
+        
+        results , sf = self.scan_nll ( dataset , [ var ] , points ,
+                                       fix      = fix      ,
+                                       profile  = profile  ,
+                                       silent   = silent   ,
+                                       parallel = parallel ,
+                                       args     = args     , **kwargs )
+        
+        dnll = results [ ( minv , ) ] - results [ ( maxv , ) ]
+        if 0 < error :
+            dnll = VE ( dnll , 0.25 * ( results [ ( maxv + error , ) ] -
+                                        results [ ( maxv - error , ) ] ) ** 2 )
+
+        ## apply scale factor
+        if 1 != sf :  logger.info ('Scale factor of %s is applied' % sf )
+        dnll *= sf            
+        
+        ## convert the difference in likelihoods into sigmas/significance
+        result = 2.0 * abs ( dnll )
+        result = result ** 0.5
+        
+        return result if 0 <= dnll else -1 * result 
+                
     # ========================================================================
     ## get the actual minimizer for the explicit manipulations
     #  @code
@@ -1606,6 +1966,28 @@ class PDF (FUNC) :
         """
         return FUNC.__call__ ( self , x , error = error , normalized = normalized ) 
 
+    # =========================================================================
+    ## evaluate PDF for the (numpy) array of points
+    #  - the points outside the variable range get zero values
+    #  - the loop is performed in C++ 
+    #  @code
+    #  pdf = ...
+    #  x   = numpy.linspace ( 0 , 10 , 1000 )
+    #  y   = pdf.evaluate_array ( x ) 
+    #  @endcode
+    #  @attention numpy is required 
+    #  @see Ostap::MoreRooFit::Arrays 
+    def evaluate_array ( self , x , normalized = True ) :
+        """Evaluate PDF for the (numpy) array of points
+        - the points outside the variable range get zero values
+        - the loop is performed in C++ 
+        >>> pdf = ...
+        >>> x   = numpy.linspace ( 0 , 10 , 1000 )
+        >>> y   = pdf.evaluate_array ( x )
+        - numpy is required 
+        """
+        return FUNC.evaluate_array ( self , x , normalized = normalized ) 
+
     # ========================================================================
     ## check minmax of the PDF using the random shoots
     #  @code
@@ -1659,8 +2041,15 @@ class PDF (FUNC) :
         ## now try to use brute force and random shoots 
         if not self.xminmax() : return ()
         
-        mn  , mx = -1 , -10
         xmn , xmx = self.xminmax()
+
+        ## vectorized random shoots 
+        if not numpy is None and 0 < nshoots :
+            xx = numpy.array ( [ random.uniform ( xmn , xmx ) for i in range ( nshoots ) ] )
+            vv = self.evaluate_array  ( xx , normalized = False )
+            return float ( vv.min () ) , float ( vv.max () ) 
+        
+        mn  , mx = -1 , -10
         for i in range ( nshoots ) : 
             xx = random.uniform ( xmn , xmx )
             with SETVAR ( self.xvar ) :
@@ -1697,6 +2086,9 @@ class PDF (FUNC) :
             elif hasattr ( ff , 'variance'   ) : return ff.variance   ()**0.5  
             elif hasattr ( ff , 'dispersion' ) : return ff.dispersion ()**0.5 
             
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.rms () 
+        
         from ostap.stats.moments import rms as _rms
         return  self._get_stat_ ( _rms , **kwargs )
 
@@ -1708,6 +2100,8 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'SKEWNESS: %s ' % pdf.skewness()
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.skewness () 
         ## use generic machinery 
         from ostap.stats.moments import skewness as _skewness
         return self._get_stat_ ( _skewness , **kwargs )
@@ -1720,6 +2114,8 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'KURTOSIS: %s ' % pdf.kurtosis()
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.kurtosis () 
         ## use generic machinery 
         from ostap.stats.moments import kurtosis as _kurtosis
         return self._get_stat_ ( _kurtosis , **kwargs )
@@ -1732,8 +2128,10 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'MEDIAN: %s ' % pdf.median()
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.median () 
         from ostap.stats.moments import median as _median
-        return self._gets_stat_ ( _median , **kwargs )
+        return self._get_stat_ ( _median , **kwargs )
 
     # =========================================================================
     ## get the effective mean
@@ -1743,6 +2141,8 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'MEAN: %s ' % pdf.get_mean()
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.mean () 
         from ostap.stats.moments import mean as _mean
         return self._get_stat_ ( _mean , **kwargs )
     
@@ -1754,6 +2154,10 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'MOMENT: %s ' % pdf.moment( 10 )
         """
+        kw = dict ( kwargs )
+        x0 = kw.pop ( 'x0' , 0 ) 
+        t  = self._tabulated_ ( **kw )
+        if t : return t.moment ( N , x0 ) 
         ## use generic machinery 
         from ostap.stats.moments import moment as _moment
         return self._get_stat_ ( _moment , N , **kwargs ) 
@@ -1766,6 +2170,8 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'MOMENT: %s ' % pdf.moment( 10 )
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.central_moment ( N ) 
         from ostap.stats.moments import central_moment as _moment
         return self._get_stat_ ( _moment , N , **kwargs ) 
 
@@ -1777,8 +2183,10 @@ class PDF (FUNC) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'QUANTILE: %s ' % pdf.quantile ( 0.10 )
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.quantile ( prob ) 
         from ostap.stats.moments import quantile as _quantile
-        return self._get_stat_ ( quantile , prob , **kwargs ) 
+        return self._get_stat_ ( _quantile , prob , **kwargs ) 
 
     # =========================================================================
     ## get the symmetric confidence interval 
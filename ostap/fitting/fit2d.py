@@ -36,6 +36,11 @@ from   ostap.fitting.basic    import PDF , Flat1D
 from   ostap.fitting.funbasic import FUNC2 
 from   ostap.fitting.utils    import H2D_dset , component_similar , component_clone 
 # =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
 from   ostap.logger.logger import getLogger
 if '__main__' ==  __name__ : logger = getLogger ( 'ostap.fitting.fit2d' )
 else                       : logger = getLogger ( __name__              )
@@ -472,6 +477,29 @@ class PDF2 (PDF,FUNC2) :
             
         raise AttributeError('something wrong goes here')
 
+    # =========================================================================
+    ## evaluate PDF for the (numpy) arrays of points
+    #  - the points outside the variable ranges get zero values
+    #  - the loop is performed in C++ 
+    #  @code
+    #  pdf = ...
+    #  x   = numpy.linspace ( 0 , 10 , 1000 )
+    #  y   = numpy.full     ( 1000 , 2.5    )
+    #  v   = pdf.evaluate_array ( x , y ) 
+    #  @endcode
+    #  @attention numpy is required 
+    #  @see Ostap::MoreRooFit::Arrays 
+    def evaluate_array ( self , x , y , normalized = True ) :
+        """Evaluate PDF for the (numpy) arrays of points
+        - the points outside the variable ranges get zero values
+        - the loop is performed in C++ 
+        >>> pdf = ...
+        >>> x   = numpy.linspace ( 0 , 10 , 1000 )
+        >>> y   = numpy.full     ( 1000 , 2.5    )
+        >>> v   = pdf.evaluate_array ( x , y )
+        - numpy is required 
+        """
+        return FUNC2.evaluate_array ( self , x , y , normalized = normalized ) 
 
     # ========================================================================
     ## check minmax of the PDF using the random shoots
@@ -518,9 +546,17 @@ class PDF2 (PDF,FUNC2) :
         if not self.xminmax() : return ()
         if not self.yminmax() : return ()
         
-        mn  , mx = -1 , -10
         xmn , xmx = self.xminmax()
         ymn , ymx = self.yminmax()
+
+        ## vectorized random shoots 
+        if not numpy is None and 0 < nshoots :
+            xx = numpy.array ( [ random.uniform ( xmn , xmx ) for i in range ( nshoots ) ] )
+            yy = numpy.array ( [ random.uniform ( ymn , ymx ) for i in range ( nshoots ) ] )
+            vv = self.evaluate_array  ( xx , yy , normalized = False )
+            return float ( vv.min () ) , float ( vv.max () ) 
+
+        mn  , mx = -1 , -10
         for i in range ( nshoots ) : 
             xx = random.uniform ( xmn , xmx )
             yy = random.uniform ( ymn , ymx )
@@ -37,6 +37,11 @@ from   ostap.fitting.fit2d    import PDF2 , Model2D
 from   ostap.fitting.roofit   import SETVAR
 from   builtins               import range
 # =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
 from   ostap.logger.logger  import getLogger
 if '__main__' ==  __name__ : logger = getLogger ( 'ostap.fitting.fit3d' )
 else                       : logger = getLogger ( __name__              )
@@ -506,6 +511,31 @@ class PDF3 (PDF2,FUNC3) :
             
         raise AttributeError ( 'something wrong goes here' )
 
+    # =========================================================================
+    ## evaluate PDF for the (numpy) arrays of points
+    #  - the points outside the variable ranges get zero values
+    #  - the loop is performed in C++ 
+    #  @code
+    #  pdf = ...
+    #  x   = numpy.linspace ( 0 , 10 , 1000 )
+    #  y   = numpy.full     ( 1000 , 2.5    )
+    #  z   = numpy.full     ( 1000 , 1.0    )
+    #  v   = pdf.evaluate_array ( x , y , z ) 
+    #  @endcode
+    #  @attention numpy is required 
+    #  @see Ostap::MoreRooFit::Arrays 
+    def evaluate_array ( self , x , y , z , normalized = True ) :
+        """Evaluate PDF for the (numpy) arrays of points
+        - the points outside the variable ranges get zero values
+        - the loop is performed in C++ 
+        >>> pdf = ...
+        >>> x   = numpy.linspace ( 0 , 10 , 1000 )
+        >>> y   = numpy.full     ( 1000 , 2.5    )
+        >>> z   = numpy.full     ( 1000 , 1.0    )
+        >>> v   = pdf.evaluate_array ( x , y , z )
+        - numpy is required 
+        """
+        return FUNC3.evaluate_array ( self , x , y , z , normalized = normalized ) 
 
     # ========================================================================
     ## check minmax of the PDF using the random shoots
@@ -553,10 +583,19 @@ class PDF3 (PDF2,FUNC3) :
         if not self.yminmax() : return ()
         if not self.zminmax() : return ()
         
-        mn  , mx = -1 , -10
         xmn , xmx = self.xminmax()
         ymn , ymx = self.yminmax()
         zmn , zmx = self.zminmax()
+
+        ## vectorized random shoots 
+        if not numpy is None and 0 < nshoots :
+            xx = numpy.array ( [ random.uniform ( xmn , xmx ) for i in range ( nshoots ) ] )
+            yy = numpy.array ( [ random.uniform ( ymn , ymx ) for i in range ( nshoots ) ] )
+            zz = numpy.array ( [ random.uniform ( zmn , zmx ) for i in range ( nshoots ) ] )
+            vv = self.evaluate_array  ( xx , yy , zz , normalized = False )
+            return float ( vv.min () ) , float ( vv.max () ) 
+
+        mn  , mx = -1 , -10
         for i in range ( nshoots ) : 
             xx = random.uniform ( xmn , xmx )
             yy = random.uniform ( ymn , ymx )
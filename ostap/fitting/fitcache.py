@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/fitting/fitcache.py
+#
+#  Persistent cache of the fit results.
+#
+#  The fit results (<code>RooFitResult</code> and the final values of
+#  the parameters) are stored in <code>ostap.io</code> shelve-like
+#  database (SQLite- or ROOT-based), keyed by
+#  - the fingerprint of the model: type, configuration, ranges and constants
+#  - the fingerprint of the fit options
+#  - the checksum of the dataset content
+#
+#  @code
+#  model   = ...
+#  dataset = ...
+#  r , f = model.fitTo ( dataset , cache = 'fits.db' ) ## make the fit & store the result
+#  r , f = model.fitTo ( dataset , cache = 'fits.db' ) ## restore the result from the cache
+#  @endcode
+#
+#  For "near-miss" (the same model and options, but different data)
+#  the cached values of the parameters can be used as starting point
+#  for minimization:
+#  @code
+#  r , f = model.fitTo ( dataset2 , cache = 'fits.db' , warm_start = True )
+#  @endcode
+#
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-19
+# =============================================================================
+"""Persistent cache of the fit results.
+
+The fit results (`RooFitResult` and the final values of
+the parameters) are stored in `ostap.io` shelve-like
+database (SQLite- or ROOT-based), keyed by
+- the fingerprint of the model: type, configuration, ranges and constants
+- the fingerprint of the fit options
+- the checksum of the dataset content
+
+>>> model   = ...
+>>> dataset = ...
+>>> r , f = model.fitTo ( dataset , cache = 'fits.db' ) ## make the fit & store the result
+>>> r , f = model.fitTo ( dataset , cache = 'fits.db' ) ## restore the result from the cache
+
+For ``near-miss'' (the same model and options, but different data)
+the cached values of the parameters can be used as starting point
+for minimization:
+
+>>> r , f = model.fitTo ( dataset2 , cache = 'fits.db' , warm_start = True )
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-03-19'
+__all__     = (
+    'FitCache'            , ## persistent cache of the fit results
+    'model_fingerprint'   , ## fingerprint of the model
+    'options_fingerprint' , ## fingerprint of the fit options
+    'data_fingerprint'    , ## fingerprint (checksum) of the dataset content
+    )
+# =============================================================================
+from   ostap.logger.logger import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.fitting.fitcache' )
+else                      : logger = getLogger ( __name__                 )
+# =============================================================================
+import hashlib
+import ROOT
+from   ostap.core.core        import Ostap
+from   ostap.core.ostap_types import string_types, num_types, dictlike_types
+# =============================================================================
+## update the hash object with the stable representation of the object
+#  - for <code>FUNC</code>-objects:  type and (recursively) configuration
+#  - for <code>RooAbsRealLValue</code>: type, name, range and constness;
+#    value is used only for constants
+#  - for other <code>RooAbsArg</code>: type and name
+#  - sequences and dictionaries are processed recursively
+def _hash_object_ ( hobj , obj , seen ) :
+    """Update the hash object with the stable representation of the object
+    - for `FUNC`-objects:  type and (recursively) configuration
+    - for `RooAbsRealLValue`: type, name, range and constness;
+      value is used only for constants
+    - for other `RooAbsArg`: type and name
+    - sequences and dictionaries are processed recursively
+    """
+
+    if   obj is None or isinstance ( obj , string_types + num_types ) :
+        hobj.update ( repr ( obj ).encode () )
+        return
+
+    if id ( obj ) in seen :
+        hobj.update ( ( '<ref:%s>' % type ( obj ).__name__ ).encode () )
+        return
+    seen.add ( id ( obj ) )
+
+    if   isinstance ( obj , ROOT.RooAbsRealLValue ) :
+        hobj.update ( ( '%s:%s' % ( obj.ClassName () , obj.GetName () ) ).encode () )
+        hobj.update ( ( '[%r,%r]' % ( obj.getMin () , obj.getMax () ) ).encode () )
+        if obj.isConstant () :
+            hobj.update ( ( '=%r' % obj.getVal () ).encode () )
+    elif isinstance ( obj , ROOT.RooAbsCategory ) :
+        hobj.update ( ( '%s:%s' % ( obj.ClassName () , obj.GetName () ) ).encode () )
+    elif isinstance ( obj , ROOT.RooAbsArg ) :
+        hobj.update ( ( '%s:%s' % ( obj.ClassName () , obj.GetName () ) ).encode () )
+        if obj.isConstant () and isinstance ( obj , ROOT.RooAbsReal ) :
+            hobj.update ( ( '=%r' % obj.getVal () ).encode () )
+    elif isinstance ( obj , ROOT.TObject ) :
+        hobj.update ( ( '%s:%s' % ( obj.ClassName () , obj.GetName () ) ).encode () )
+    elif isinstance ( obj , dictlike_types ) :
+        hobj.update ( b'{' )
+        for key in sorted ( obj , key = str ) :
+            hobj.update ( str ( key ).encode () )
+            _hash_object_ ( hobj , obj [ key ] , seen )
+        hobj.update ( b'}' )
+    elif isinstance ( obj , ( list , tuple , set , frozenset ) ) :
+        items = sorted ( obj , key = str ) if isinstance ( obj , ( set , frozenset ) ) else obj
+        hobj.update ( b'(' )
+        for item in items : _hash_object_ ( hobj , item , seen )
+        hobj.update ( b')' )
+    elif hasattr ( obj , 'config' ) and isinstance ( obj.config , dictlike_types ) :
+        hobj.update ( ( '%s.%s' % ( type ( obj ).__module__ , type ( obj ).__name__ ) ).encode () )
+        _hash_object_ ( hobj , obj.config , seen )
+    else :
+        name = getattr ( obj , '__name__' , getattr ( obj , 'name' , '' ) )
+        hobj.update ( ( '%s:%s' % ( type ( obj ).__name__ , name ) ).encode () )
+
+# =============================================================================
+## update the hash object with the content of <code>RooCmdArg</code> 
+#  - the name, integer, double and string slots
+#  - the contained objects and sets (see _hash_object_)
+#  - (recursively) the sub-arguments 
+def _hash_cmdarg_ ( hobj , arg , seen ) :
+    """Update the hash object with the content of `RooCmdArg` 
+    - the name, integer, double and string slots
+    - the contained objects and sets (see _hash_object_)
+    - (recursively) the sub-arguments 
+    """
+    hobj.update ( ( 'RooCmdArg:%s' % arg.GetName () ).encode () )
+    hobj.update ( ( '(%d,%d)' % ( arg.getInt    ( 0 ) , arg.getInt    ( 1 ) ) ).encode () )
+    hobj.update ( ( '(%r,%r)' % ( arg.getDouble ( 0 ) , arg.getDouble ( 1 ) ) ).encode () )
+    for i in range ( 3 ) :
+        st = arg.getString ( i )
+        hobj.update ( ( "'%s'" % ( st if st else '' ) ).encode () )
+    for i in range ( 2 ) :
+        obj = arg.getObject ( i )
+        _hash_object_ ( hobj , obj if obj else None , seen )
+    for i in range ( 2 ) :
+        aset  = arg.getSet ( i )
+        items = sorted ( aset , key = lambda v : v.GetName () ) if aset else []
+        _hash_object_ ( hobj , items , seen )
+    for sub in arg.subArgs () :
+        if isinstance ( sub , ROOT.RooCmdArg ) : _hash_cmdarg_ ( hobj , sub , seen )
+
+# =============================================================================
+## get the fingerprint of the model
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  fp = model_fingerprint ( pdf , dataset )
+#  @endcode
+#  - the type and (recursively) the configuration of the model
+#  - names, ranges and constness of all parameters,
+#    the values are used only for the constant parameters
+def model_fingerprint ( pdf , dataset = None ) :
+    """Get the fingerprint of the model
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> fp = model_fingerprint ( pdf , dataset )
+    - the type and (recursively) the configuration of the model
+    - names, ranges and constness of all parameters,
+      the values are used only for the constant parameters
+    """
+    hobj = hashlib.sha1 ()
+    _hash_object_ ( hobj , pdf , set () )
+    pars = sorted ( pdf.params ( dataset ) , key = lambda p : p.GetName () )
+    _hash_object_ ( hobj , pars , set () )
+    return hobj.hexdigest ()
+
+# =============================================================================
+## get the fingerprint of the fit options
+#  @code
+#  fp = options_fingerprint ( ROOT.RooFit.Save () , ROOT.RooFit.NumCPU ( 4 ) )
+#  @endcode
+#  - for <code>RooCmdArg</code> the slots and contained objects are used,
+#    see _hash_cmdarg_ 
+def options_fingerprint ( *options ) :
+    """Get the fingerprint of the fit options
+    >>> fp = options_fingerprint ( ROOT.RooFit.Save () , ROOT.RooFit.NumCPU ( 4 ) )
+    - for `RooCmdArg` the slots and contained objects are used, see _hash_cmdarg_ 
+    """
+    hobj = hashlib.sha1 ()
+    seen = set () 
+    for o in options :
+        if isinstance ( o , ROOT.RooCmdArg ) : _hash_cmdarg_ ( hobj , o , seen )
+        else                                 : _hash_object_ ( hobj , o , seen )
+    return hobj.hexdigest ()
+
+# =============================================================================
+## get the fingerprint (checksum) of the dataset content
+#  @code
+#  dataset = ...
+#  fp = data_fingerprint ( dataset )
+#  @endcode
+#  @see Ostap::Utils::hash_data
+def data_fingerprint ( dataset ) :
+    """Get the fingerprint (checksum) of the dataset content
+    >>> dataset = ...
+    >>> fp = data_fingerprint ( dataset )
+    - see Ostap.Utils.hash_data
+    """
+    hobj  = hashlib.sha1 ()
+    names = sorted ( v.GetName () for v in dataset.get () )
+    hobj.update ( ( '%s:%s' % ( dataset.ClassName () , ','.join ( names ) ) ).encode () )
+    hobj.update ( ( '%d:%d' % ( dataset.numEntries () , Ostap.Utils.hash_data ( dataset ) ) ).encode () )
+    return hobj.hexdigest ()
+
+# =============================================================================
+## @class FitCache
+#  Persistent cache of the fit results
+#  @code
+#  with FitCache ( 'fits.db' ) as cache :
+#     r , f = model.fitTo ( dataset , cache = cache )
+#  @endcode
+#  - files with <code>.root</code> extension are opened with
+#    <code>ostap.io.rootshelve</code>, other files with
+#    <code>ostap.io.sqliteshelve</code>;
+#  - already opened shelve-like database (or other cache) can be used as well
+class FitCache(object) :
+    """Persistent cache of the fit results
+    >>> with FitCache ( 'fits.db' ) as cache :
+    ...     r , f = model.fitTo ( dataset , cache = cache )
+    - files with `.root` extension are opened with `ostap.io.rootshelve`,
+    other files with `ostap.io.sqliteshelve`;
+    - already opened shelve-like database (or other cache) can be used as well
+    """
+    def __init__ ( self , dbase ) :
+
+        self.__close = False
+        if   isinstance ( dbase , FitCache     ) :
+            dbase        = dbase.dbase
+        elif isinstance ( dbase , string_types ) :
+            if dbase.lower().endswith ( '.root' ) :
+                import ostap.io.rootshelve   as DBASE
+            else :
+                import ostap.io.sqliteshelve as DBASE
+            dbase        = DBASE.open ( dbase , 'c' )
+            self.__close = True
+
+        self.__dbase = dbase
+
+    ## context manager: ENTER
+    def __enter__ ( self      ) : return self
+    ## context manager: EXIT
+    def __exit__  ( self , *_ ) : self.close ()
+
+    # =========================================================================
+    ## close the cache
+    def close ( self ) :
+        """Close the cache"""
+        if self.__dbase is not None and self.__close :
+            self.__dbase.close ()
+        self.__dbase = None
+
+    # =========================================================================
+    ## get the keys for the model, options and dataset
+    def keys ( self , pdf , dataset , options = () ) :
+        """Get the keys for the model, options and dataset:
+        - the key for the model and options
+        - the key for the model, options and dataset
+        """
+        mkey = 'model_%s_%s' % ( model_fingerprint ( pdf , dataset ) , options_fingerprint ( *options ) )
+        dkey = 'fit_%s_%s'   % ( mkey [ 6 : ] , data_fingerprint ( dataset ) )
+        return mkey , dkey
+
+    # =========================================================================
+    ## look for the fit result in the cache
+    #  - for hit: restore the parameters and return the cached fit result
+    #  - for near-miss with <code>warm_start=True</code>:
+    #    load the cached values of the parameters and return <code>None</code>
+    #  @code
+    #  cache  = ...
+    #  result = cache.restore ( pdf , dataset , options , warm_start = True )
+    #  @endcode
+    def restore ( self , pdf , dataset , options = () , warm_start = False ) :
+        """Look for the fit result in the cache
+        - for hit: restore the parameters and return the cached fit result
+        - for near-miss with `warm_start=True`:
+        load the cached values of the parameters and return `None`
+        >>> cache  = ...
+        >>> result = cache.restore ( pdf , dataset , options , warm_start = True )
+        """
+        if self.__dbase is None : return None
+
+        mkey , dkey = self.keys ( pdf , dataset , options )
+
+        entry = self.__dbase.get ( dkey , None )
+        if entry :
+            result = entry [ 'result' ]
+            pdf.load_params ( dataset , entry [ 'params' ] , silent = True )
+            pars   = pdf.params ( dataset )
+            for p in result.floatParsFinal () :
+                if p.GetName () in pars : pars [ p.GetName () ].setError ( p.getError () )
+            logger.debug ( 'FitCache: restore fit result for %s' % pdf.name )
+            return result
+
+        if warm_start :
+            params = self.__dbase.get ( mkey , None )
+            if params :
+                logger.debug ( 'FitCache: warm start for %s' % pdf.name )
+                pdf.load_params ( dataset , params , silent = True )
+
+        return None
+
+    # =========================================================================
+    ## store the fit result in the cache
+    #  @code
+    #  cache  = ...
+    #  cache.store ( pdf , dataset , options , result  )
+    #  @endcode
+    def store ( self , pdf , dataset , options , result ) :
+        """Store the fit result in the cache
+        >>> cache  = ...
+        >>> cache.store ( pdf , dataset , options , result )
+        """
+        if self.__dbase is None : return
+
+        mkey , dkey = self.keys ( pdf , dataset , options )
+
+        params = dict ( ( p.GetName () , float ( p.getVal () ) ) for p in result.floatParsFinal () )
+
+        self.__dbase [ dkey ] = { 'result' : result , 'params' : params }
+        self.__dbase [ mkey ] = params
+        if hasattr ( self.__dbase , 'sync'   ) : self.__dbase.sync   ()
+        if hasattr ( self.__dbase , 'commit' ) : self.__dbase.commit ()
+
+    @property
+    def dbase ( self ) :
+        """``dbase'' : the underlying shelve-like database"""
+        return self.__dbase
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -40,6 +40,11 @@ else                       : logger = getLogger ( __name__                 )
 # =============================================================================
 py2 = 2 >= sys.version_info.major  
 # =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
 ## helper factory function
 def func_factory ( klass , config ) :
     """Helper factory function, used for unpickling"""
@@ -619,6 +624,7 @@ class FUNC(XVar) :
         """Helper  function to implement some math stuff 
         """
         fun         = self.fun
+        kwargs.pop ( 'tabulated' , None ) ## not used by the generic machinery 
         
         if self.xminmax() : 
             xmin , xmax = self.xminmax()
@@ -640,6 +646,62 @@ class FUNC(XVar) :
             
         return funcall ( ff , xmin , xmax , *args , **kwargs )
 
+    # ========================================================================
+    ## helper function to get the tabulated function for the statistical 
+    #  quantities (moments, quantiles, mode, width, ...)
+    #  - the tabulation is opt-in: <code>tabulated = True</code>
+    #    or <code>tabulated = npoints</code>, by default the generic
+    #    (adaptive) machinery is used 
+    #  - the fixed grid has no error control: the structures that are narrow
+    #    with respect to the range (e.g. peaks) can be under-sampled, therefore
+    #    the tabulation is not used by default 
+    #  - it returns <code>None</code> if the tabulation is not requested/possible/appropriate,
+    #    and the generic (point-by-point) machinery needs to be used
+    #  @code
+    #  pdf = ...
+    #  print ( 'RMS: %s' % pdf.rms ( tabulated = True ) ) 
+    #  @endcode
+    #  @see ostap.stats.moments.Tabulated 
+    def _tabulated_ ( self , **kwargs ) :
+        """Helper function to get the tabulated function for the statistical
+        quantities (moments, quantiles, mode, width, ...)
+        - the tabulation is opt-in: `tabulated = True` or `tabulated = npoints`,
+        by default the generic (adaptive) machinery is used 
+        - the fixed grid has no error control: the structures that are narrow
+        with respect to the range (e.g. peaks) can be under-sampled, therefore
+        the tabulation is not used by default 
+        - it returns `None` if the tabulation is not requested/possible/appropriate,
+        and the generic (point-by-point) machinery needs to be used
+        >>> pdf = ...
+        >>> print ( 'RMS: %s' % pdf.rms ( tabulated = True ) ) 
+        - see `ostap.stats.moments.Tabulated`
+        """
+        kw        = dict ( kwargs )
+        tabulated = kw.pop ( 'tabulated' , False )
+        if not tabulated                                     : return None
+        
+        npoints   = 4000 if isinstance ( tabulated , bool ) else int ( tabulated )
+        
+        if numpy is None                                     : return None 
+        if     isinstance ( self , FUNC2 )                   : return None 
+        if not isinstance ( self.xvar , ROOT.RooRealVar )    : return None
+        if self.tricks and hasattr ( self.fun , 'function' ) : return None
+        
+        if self.xminmax() : 
+            xmin , xmax = self.xminmax()
+            xmin = kw.pop ( 'xmin' , xmin )
+            xmax = kw.pop ( 'xmax' , xmax )
+        else : 
+            xmin = kw.pop ( 'xmin' , None )
+            xmax = kw.pop ( 'xmax' , None )
+            
+        ## unknown arguments, e.g. ``err'': use generic machinery 
+        if kw or xmin is None or xmax is None or not xmin < xmax : return None 
+
+        from ostap.stats.moments import Tabulated
+        vfun = lambda x : self.evaluate_array ( x , normalized = False )
+        return Tabulated ( vfun , xmin , xmax , npoints = npoints )
+            
     # ========================================================================
     ## get the effective Full Width at Half Maximum
     def fwhm ( self , **kwargs ) :
@@ -647,6 +709,8 @@ class FUNC(XVar) :
         >>>  fun = ...
         >>>  print 'FWHM: %s ' % fun.fwhm()
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.fwhm ()
         ## use generic machinery 
         from ostap.stats.moments import width as _width
         w = self._get_stat_ ( _width , **kwargs )
@@ -665,6 +729,10 @@ class FUNC(XVar) :
         where  f(x_low) = f(x_high) = f_{max}(x)
         - the same points are used for FWHM
         """
+        t = self._tabulated_ ( **kwargs )
+        if t :
+            w = t.width ()
+            return 0.5 * ( w [ 1 ] + w [ 0 ] )
         ## use generic machinery 
         from ostap.stats.moments import width as _width
         w = self._get_stat_ ( _width , **kwargs )
@@ -678,6 +746,8 @@ class FUNC(XVar) :
         >>>  pdf.fitTo ( ... )
         >>>  print 'MODE: %s ' % pdf.mode()
         """
+        t = self._tabulated_ ( **kwargs )
+        if t : return t.mode () 
         from ostap.stats.moments import mode as _mode
         return self._get_stat_ ( _mode , **kwargs )
 
@@ -716,6 +786,59 @@ class FUNC(XVar) :
                 
         raise AttributeError('Something wrong goes here')
 
+    # =========================================================================
+    ## helper method to evaluate the function for numpy arrays
+    #  @see Ostap::MoreRooFit::Arrays 
+    def _evaluate_array_ ( self , normalized , *arrays ) :
+        """Helper method to evaluate the function for numpy arrays
+        - see `Ostap.MoreRooFit.Arrays`
+        """
+        assert not numpy is None , "evaluate_array: numpy is not available!"
+        
+        args   = numpy.broadcast_arrays ( *arrays )
+        shape  = args [ 0 ].shape
+        args   = [ numpy.ascontiguousarray ( a , dtype = numpy.float64 ).ravel () for a in args ]
+        result = numpy.zeros ( args [ 0 ].size , dtype = numpy.float64 )
+        
+        if not result.size : return result.reshape ( shape )      ## RETURN 
+        
+        variables = [ self.xvar ]
+        if 2 <= len ( args ) : variables.append ( self.yvar )
+        if 3 <= len ( args ) : variables.append ( self.zvar )
+        for v in variables :
+            assert isinstance ( v , ROOT.RooAbsRealLValue ) , \
+                   "evaluate_array: invalid variable type %s" % type ( v ) 
+
+        data = []
+        for v , a in zip ( variables , args ) : data += [ v , a ]
+        
+        normset = self.vars if normalized else ROOT.nullptr 
+        Ostap.MoreRooFit.Arrays.evaluate ( self.fun , *( data + [ result , result.size , normset ] ) )
+        
+        return result.reshape ( shape ) 
+
+    # =========================================================================
+    ## evaluate the function for the (numpy) array of points
+    #  - the points outside the variable range get zero values
+    #  - the loop is performed in C++ 
+    #  @code
+    #  fun = ...
+    #  x   = numpy.linspace ( 0 , 10 , 1000 )
+    #  y   = fun.evaluate_array ( x ) 
+    #  @endcode
+    #  @attention numpy is required 
+    #  @see Ostap::MoreRooFit::Arrays 
+    def evaluate_array ( self , x , normalized = False ) :
+        """Evaluate the function for the (numpy) array of points
+        - the points outside the variable range get zero values
+        - the loop is performed in C++ 
+        >>> fun = ...
+        >>> x   = numpy.linspace ( 0 , 10 , 1000 )
+        >>> y   = fun.evaluate_array ( x )
+        - numpy is required 
+        """
+        return self._evaluate_array_ ( normalized , x )
+
     # ========================================================================
     ## convert to float 
     def __float__ ( self ) :
@@ -1044,6 +1167,29 @@ class FUNC2(FUNC,YVar) :
                 
         raise AttributeError('Something wrong goes here')
 
+    # =========================================================================
+    ## evaluate the function for the (numpy) arrays of points
+    #  - the points outside the variable ranges get zero values
+    #  - the loop is performed in C++ 
+    #  @code
+    #  fun = ...
+    #  x   = numpy.linspace ( 0 , 10 , 1000 )
+    #  y   = numpy.full     ( 1000 , 2.5    )
+    #  v   = fun.evaluate_array ( x , y ) 
+    #  @endcode
+    #  @attention numpy is required 
+    #  @see Ostap::MoreRooFit::Arrays 
+    def evaluate_array ( self , x , y , normalized = False ) :
+        """Evaluate the function for the (numpy) arrays of points
+        - the points outside the variable ranges get zero values
+        - the loop is performed in C++ 
+        >>> fun = ...
+        >>> x   = numpy.linspace ( 0 , 10 , 1000 )
+        >>> y   = numpy.full     ( 1000 , 2.5    )
+        >>> v   = fun.evaluate_array ( x , y )
+        - numpy is required 
+        """
+        return self._evaluate_array_ ( normalized , x , y )
 
     # =========================================================================
     ## make 1D-plot
@@ -1331,6 +1477,31 @@ class FUNC3(FUNC2,ZVar) :
                 
         raise AttributeError('Something wrong goes here')
 
+    # =========================================================================
+    ## evaluate the function for the (numpy) arrays of points
+    #  - the points outside the variable ranges get zero values
+    #  - the loop is performed in C++ 
+    #  @code
+    #  fun = ...
+    #  x   = numpy.linspace ( 0 , 10 , 1000 )
+    #  y   = numpy.full     ( 1000 , 2.5    )
+    #  z   = numpy.full     ( 1000 , 1.0    )
+    #  v   = fun.evaluate_array ( x , y , z ) 
+    #  @endcode
+    #  @attention numpy is required 
+    #  @see Ostap::MoreRooFit::Arrays 
+    def evaluate_array ( self , x , y , z , normalized = False ) :
+        """Evaluate the function for the (numpy) arrays of points
+        - the points outside the variable ranges get zero values
+        - the loop is performed in C++ 
+        >>> fun = ...
+        >>> x   = numpy.linspace ( 0 , 10 , 1000 )
+        >>> y   = numpy.full     ( 1000 , 2.5    )
+        >>> z   = numpy.full     ( 1000 , 1.0    )
+        >>> v   = fun.evaluate_array ( x , y , z )
+        - numpy is required 
+        """
+        return self._evaluate_array_ ( normalized , x , y , z )
 
     # =========================================================================
     ## draw the 1st variable
@@ -47,6 +47,11 @@
 #
 #  The latter two items are mandatory for the proper implemtation of RooAbsPdf::clone
 #  - @see Ostap::Models::PyPdf 
+#
+#  The optional vectorized evaluation (<code>evaluate_batch</code> for PyPDF and
+#  <code>batch</code> function for PyPDF2) is invoked once for all entries in dataset
+#  with observables as numpy arrays and the parameters as floats
+#  - @see Ostap::Models::PyBatch 
 #  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
 #  @date 2018-06-07
 # =============================================================================
@@ -96,6 +101,11 @@
     
     The latter two items are mandatory for the proper implemtation of RooAbsPdf::clone
      - see Ostap::Models::PyPdf 
+
+    The optional vectorized evaluation (`evaluate_batch` for PyPDF and
+    `batch` function for PyPDF2) is invoked once for all entries in dataset
+    with observables as numpy arrays and the parameters as floats
+     - see Ostap::Models::PyBatch 
 """
 # =============================================================================
 __version__ = "$Revision:"
@@ -103,7 +113,8 @@ __author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
 __date__    = "2011-07-25"
 __all__     = (
     ##
-    'PyPDF2' , ## ``pythonic'' PDF for RooFit 
+    'PyPDF2'     , ## ``pythonic'' PDF for RooFit 
+    'BatchData'  , ## attach dataset for the vectorized evaluation of ``pythonic'' PDFs
     )
 # =============================================================================
 import ROOT, math
@@ -117,12 +128,84 @@ else                       : logger = getLogger ( __name__              )
 # =============================================================================
 
 
+# =============================================================================
+## Helper function to wrap the vectorized function for <code>Ostap::Models::PyBatch</code>
+#  - the observables are converted from buffers to numpy arrays
+#  - the result is converted to the contiguous numpy array of doubles 
+#  @see Ostap::Models::PyBatch
+def _batch_function_ ( function ) :
+    """Helper function to wrap the vectorized function for `Ostap::Models::PyBatch`
+    - the observables are converted from buffers to numpy arrays
+    - the result is converted to the contiguous numpy array of doubles 
+    - see Ostap::Models::PyBatch
+    """
+    import numpy
+    def _batch_ ( *args ) :
+        args   = tuple ( a if isinstance ( a , float ) else numpy.frombuffer ( a , dtype = numpy.float64 ) for a in args )
+        size   = max ( len ( a ) for a in args if not isinstance ( a , float ) ) 
+        result = function ( *args )
+        return numpy.ascontiguousarray ( numpy.broadcast_to ( result , ( size , ) ) , dtype = numpy.float64 )
+    return _batch_
+
+# =============================================================================
+## @class BatchData
+#  Attach dataset for the vectorized evaluation of all ``pythonic'' PDFs
+#  (components of the given PDF) that have the vectorized function 
+#  @code
+#  pdf = ...
+#  with BatchData ( pdf , dataset ) :
+#      result = pdf.fitTo ( dataset , ... ) 
+#  @endcode
+#  @see Ostap::Models::PyBatch
+#  @see Ostap::Models::PyPdf
+#  @see Ostap::Models::PyPdf2
+class BatchData(object) :
+    """Attach dataset for the vectorized evaluation of all ``pythonic'' PDFs
+    (components of the given PDF) that have the vectorized function 
+    >>> pdf = ...
+    >>> with BatchData ( pdf , dataset ) :
+    ...     result = pdf.fitTo ( dataset , ... ) 
+    - see Ostap::Models::PyBatch
+    - see Ostap::Models::PyPdf
+    - see Ostap::Models::PyPdf2
+    """
+    def __init__ ( self , pdf , dataset , silent = True ) :
+        self.__pdf      = pdf
+        self.__dataset  = dataset
+        self.__silent   = silent 
+        self.__attached = []
+
+    ## context manager: ENTER 
+    def __enter__ ( self ) :
+        self.__attached = []
+        if not isinstance ( self.__dataset , ROOT.RooAbsData ) : return self 
+        for c in self.__pdf.getComponents () :
+            if isinstance ( c , ( Ostap.Models.PyPdf , Ostap.Models.PyPdf2 ) ) and c.attachBatch ( self.__dataset ) :
+                self.__attached.append ( c )
+        return self
+    
+    ## context manager: EXIT 
+    def __exit__  ( self , *_ ) :
+        for c in self.__attached :
+            b = c.batch () 
+            if not self.__silent :
+                logger.info ( "Vectorized evaluation for '%s': %d calls, %d hits, %d misses" % (
+                    c.GetName () , b.calls () , b.hits () , b.misses () ) )
+            c.detachBatch ()
+        self.__attached = []
+
+    @property
+    def attached ( self ) :
+        """``attached'' : ``pythonic'' PDFs with the attached dataset"""
+        return tuple ( self.__attached ) 
+        
 # =============================================================================
 if old_PyROOT :
 
     __all__ = (
-    'PyPDF'  , ## ``pythonic'' PDF for RooFit 
-    'PyPDF2' , ## ``pythonic'' PDF for RooFit 
+    'PyPDF'     , ## ``pythonic'' PDF for RooFit 
+    'PyPDF2'    , ## ``pythonic'' PDF for RooFit 
+    'BatchData' , ## attach dataset for the vectorized evaluation of ``pythonic'' PDFs
         )
     # =========================================================================
     ## @class PyPDF
@@ -205,6 +288,16 @@ if old_PyROOT :
     #        
     #        return CDF ( xmax , m , s  ) - CDF ( xmin , m , s  )
     # @endcode
+    #
+    # The optional vectorized evaluation is specified via <code>evaluate_batch</code>
+    # method: it gets all variables (in the order of <code>varlist</code>)
+    # with the observables as numpy arrays and the parameters as floats 
+    #  @code
+    #    def evaluate_batch ( self , x , m , s ) :
+    #        dx = ( x - m ) / s
+    #        return numpy.exp ( -0.5 * dx * dx ) * self.norm / s
+    #  @endcode
+    #  @see Ostap::Models::PyBatch 
     class PyPDF (object) :
         """Helper base class to implement ``pure-python'' PDF
         
@@ -272,6 +365,14 @@ if old_PyROOT :
         ...     m     = float ( vlist [ 1 ] ) 
         ...     s     = float ( vlist [ 2 ] )        
         ... return CDF ( xmax , m , s  ) - CDF ( xmin , m , s  )
+
+        The optional vectorized evaluation is specified via `evaluate_batch`
+        method: it gets all variables (in the order of `varlist`)
+        with the observables as numpy arrays and the parameters as floats 
+        ... def evaluate_batch ( self , x , m , s ) :
+        ...     dx = ( x - m ) / s
+        ...     return numpy.exp ( -0.5 * dx * dx ) * self.norm / s
+        - see Ostap::Models::PyBatch 
         """
         _storage = []
         
@@ -305,6 +406,10 @@ if old_PyROOT :
             
             ## define the pdf 
             self.__pypdf = pypdf
+
+            ## vectorized evaluation (if defined)
+            if callable ( getattr ( self , 'evaluate_batch' , None ) ) :
+                pypdf.setBatch ( _batch_function_ ( self.evaluate_batch ) ) 
             
             self.config =  {
                 'name'    : self.pypdf.GetName   () ,
@@ -414,16 +519,35 @@ if old_PyROOT :
 ## @class PyPDF2
 #  ``Light'' version of ``pythonic-Pdf''
 #  
+#  The optional vectorized function <code>batch</code> gets all variables
+#  with the observables as numpy arrays and the parameters as floats;
+#  for <code>batch=True</code> the function itself is used  
+#  @code
+#  def gauss ( x , m , s ) :
+#      dx = ( x - m ) / s
+#      return numpy.exp ( -0.5 * dx * dx ) * NORM / s
+#  pdf = PyPDF2 ( 'G' , gauss , ( x , m , s ) , batch = True ) 
+#  @endcode
 #  @see Ostap::Models::PyPdf
 #  @see Ostap::Models::PyPdf2
+#  @see Ostap::Models::PyBatch 
 class PyPDF2(object) :
     """  ``Light'' version of ``pythonic-Pdf''
+
+    The optional vectorized function `batch` gets all variables
+    with the observables as numpy arrays and the parameters as floats;
+    for `batch=True` the function itself is used  
+    >>> def gauss ( x , m , s ) :
+    ...     dx = ( x - m ) / s
+    ...     return numpy.exp ( -0.5 * dx * dx ) * NORM / s
+    >>> pdf = PyPDF2 ( 'G' , gauss , ( x , m , s ) , batch = True ) 
     """
-    def __init__ (  self       ,
-                    name       ,
-                    function   ,
-                    vars       , 
-                    title = '' ) :
+    def __init__ (  self         ,
+                    name         ,
+                    function     ,
+                    vars         , 
+                    title = ''   ,
+                    batch = None ) :
 
         ## function must be valid function! 
         assert function and callable ( function ) , "``function'' is not callable!"
@@ -450,6 +574,12 @@ class PyPDF2(object) :
 
         self.__pypdf = pypdf
 
+        ## vectorized evaluation 
+        if batch is True : batch = function
+        assert ( not batch ) or callable ( batch ) , "``batch'' is not callable!"
+        self.__batch = batch if batch else None 
+        if self.__batch : pypdf.setBatch ( _batch_function_ ( self.__batch ) ) 
+
 
         ## finally define PDF 
         self.pdf     = self.pypdf
@@ -459,7 +589,8 @@ class PyPDF2(object) :
             'name'     : self.pypdf.GetName  () ,
             'title'    : self.pypdf.GetTitle () ,
             'function' : self.function          ,
-            'vars'     : self.variables                                           
+            'vars'     : self.variables         ,
+            'batch'    : self.batch                                           
             }
 
     @property
@@ -472,6 +603,11 @@ class PyPDF2(object) :
         """``function'' : get the actual python function/callable"""
         return self.__pyfunction
     
+    @property
+    def batch ( self ) :
+        """``batch'' : get the vectorized python function/callable (if any)"""
+        return self.__batch
+    
     @property
     def variables  ( self ) :
         """``variables'' : list(ROOT.RooArgList) of all variables"""
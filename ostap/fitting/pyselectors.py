@@ -417,6 +417,10 @@ class Variable(object) :
                 from ostap.trees.funcs import FuncFormula as FuncVar
                 self.__formula  = accessor 
                 accessor = FuncVar ( accessor ) 
+        elif isinstance ( accessor , Ostap.Functions.FuncFormula ) :
+            ## formula-based accessor can be "lowered" to the formula
+            expression = accessor.expression().strip()
+            if expression : self.__formula = expression
 
         assert callable ( accessor ), \
                'Invalid accessor function! %s/%s' % ( accessor , type ( accessor ) )
@@ -1522,6 +1526,117 @@ def fill_dataset ( tree                 ,
 
 ROOT.TTree.fill_dataset = fill_dataset
 
+# =============================================================================
+## Fill the dataset for <code>SelectorWithVars</code> using RDataFrame machinery:
+#  - all variables are lowered to the (double) columns via <code>Define</code>
+#  - selection and ranges are applied via <code>Filter</code>
+#  - only needed columns are dumped (with implicit MT) into the temporary file
+#  - RooDataSet with TTree-storage is created directly from this tree
+#  It is applicable only for variables with formulas and without py-cuts
+#  @code
+#  selector = SelectorWithVars ( ... )
+#  ds , stat = _frame_fill_ ( tree , selector )
+#  @endcode
+#  @param enable enable implicit MT?
+#  @return dataset and statistics or <code>(None,None)</code> if not applicable
+#  @see ROOT.RDataFrame.Define
+#  @see ROOT.RDataFrame.Filter
+#  @see ROOT.RDataFrame.Snapshot
+def _frame_fill_ ( tree , selector , silent = False , enable = True ) :
+    """Fill the dataset for SelectorWithVars using RDataFrame machinery:
+    - all variables are lowered to the (double) columns via Define
+    - selection and ranges are applied via Filter
+    - only needed columns are dumped (with implicit MT) into the temporary file
+    - RooDataSet with TTree-storage is created directly from this tree
+    It is applicable only for variables with formulas and without py-cuts
+    >>> selector = SelectorWithVars ( ... )
+    >>> ds , stat = _frame_fill_ ( tree , selector )
+    - enable : enable implicit MT?
+    - return dataset and statistics or (None,None) if not applicable
+    """
+
+    if not selector.trivial_vars or selector.morecuts : return None , None
+
+    import ostap.frames.frames
+    from   ostap.core.core      import strings as _strings
+    from   ostap.utils.cleanup  import TempFile
+    from   ostap.fitting.roofit import useStorage
+    from   ostap.logger.utils   import rooSilent, rootError
+    import ostap.io.root_file
+
+    frame   = Ostap.DataFrame ( tree , enable = enable ) ## (implicit MT)
+    columns = set ( frame.GetColumnNames() )
+
+    node    = frame
+    names   = []
+    ranges  = []
+    try :
+
+        for v in selector.variables :
+            if v.name != v.formula :
+                ## the column  with this name already exists: can't redefine it
+                if v.name in columns : return None , None
+                logger.debug  ( 'PROCESS: define %s as %s ' % ( v.name , v.formula ) )
+                node = node.Define ( v.name , '(double)(%s)' % v.formula )
+            names.append ( v.name )
+            mn , mx = v.minmax
+            if _minv < mn : ranges.append ( "(%.16g <= %s)" % ( mn     , v.name ) )
+            if _maxv > mx : ranges.append ( "(%s <= %.16g)" % ( v.name , mx     ) )
+
+        if selector.selection : node = node.Filter ( selector.selection , 'SELECTION' )
+        selected = node.Count ()
+        if ranges : node = node.Filter ( ' && '.join ( ranges ) , 'RANGES' )
+        accepted = node.Count ()
+        report   = node.Report()
+
+        with TempFile ( suffix = '.root' , prefix = 'frame-' ) as tf :
+
+            if not silent :
+                pb = frame.ProgressBar ( len ( tree ) )
+                logger.info ( 'Prepare snapshot/loop over the tree %s' % tf.filename )
+
+            ## dump only the needed columns
+            snapshot = node.Snapshot ( 'tree' , tf.filename , _strings ( *names ) )
+
+            if not silent :
+                from ostap.frames.frames import report_print
+                title =  'Tree -> Frame -> Tree filter/transformation '
+                logger.info ( title + '\n%s' % report_print ( report , title , '# ') )
+
+            with useStorage () :
+                with rooSilent ( ROOT.RooFit.ERROR  , True ) :
+                    with rootError ( ROOT.kWarning ) :
+                        if 0 < accepted.GetValue () :
+                            with ROOT.TFile.Open ( tf.filename  , 'read' ) as rf :
+                                ds = ROOT.RooDataSet ( selector.name     ,
+                                                       selector.fullname ,
+                                                       rf.tree           ,
+                                                       selector.varset   )
+                        else :
+                            ds = ROOT.RooDataSet ( selector.name     ,
+                                                   selector.fullname ,
+                                                   selector.varset   )
+
+    except Exception :
+        logger.warning ( "Can't fill dataset using TFrame, fallback to the selector" , exc_info = True )
+        return None , None
+
+    nsel = selected.GetValue ()
+    stat = SelStat ( len ( tree ) , nsel , nsel - accepted.GetValue () )
+
+    if not silent :
+        skipped = 'Skipped:%d' % stat.skipped
+        skipped = '/' + attention ( skipped ) if stat.skipped else ''
+        report  = 'Frame: Events Total:%d/Processed:%s%s CUTS:"%s" dataset\n%s' % (
+            stat.total         ,
+            stat.processed     ,
+            skipped            ,
+            selector.selection ,
+            ds.table ( prefix = '# ' ) )
+        logger.info (  report )
+
+    return ds , stat
+
 # =============================================================================
 ## define the helper function for proper decoration of ROOT.TTree/TChain
 #
@@ -1589,6 +1704,21 @@ def _process_ ( self , selector , nevents = -1 , first = 0 , shortcut = True , s
             selector.stat = stat 
             return 1
         
+    # =========================================================================
+    ## If the length is large and all variables can be expressed as formulas,
+    #  fill the dataset using RDataFrame machinery
+    #  @see _frame_fill_
+    if all and 0 < use_frame and isinstance ( self , ROOT.TTree ) and use_frame <= len ( self ) :
+
+        if isinstance ( selector , SelectorWithVars ) and selector.trivial_vars and not selector.morecuts :
+
+            if not silent : logger.info ( "Make try to fill the dataset using TFrame!" )
+            ds , stat = _frame_fill_ ( self , selector , silent = silent )
+            if ds :
+                selector.data = ds
+                selector.stat = stat
+                return 1
+
     # =========================================================================
     ## If the length is large and selection is not empty,
     #  try to pre-filter using RDataFrame machinery into  temporary file 
@@ -1724,7 +1854,13 @@ def _process_ ( self , selector , nevents = -1 , first = 0 , shortcut = True , s
     nevents = nevents if 0 <= nevents else ROOT.TChain.kMaxEntries
     if   isinstance ( self , ROOT.TTree ) :
         args =  () if all else ( nevents , first)        
-        return Ostap.Utils.process ( self , selector , *args ) 
+        ## activate only the needed branches (if known) 
+        exprs = [] 
+        if isinstance ( selector , SelectorWithVars ) and selector.trivial_vars and not selector.morecuts :
+            exprs = [ v.formula for v in selector.variables ] + [ selector.selection ]
+        from ostap.trees.trees import AutoBranches
+        with AutoBranches ( self , exprs ) : 
+            return Ostap.Utils.process ( self , selector , *args ) 
 
     ## RooDataSet is here:
     
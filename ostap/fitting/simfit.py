@@ -778,32 +778,79 @@ class SimFit ( MakeVar ) :
     #  r,f = model.fitTo ( dataset , ncpu     = 10   )    
     #  r,f = model.fitTo ( dataset , draw = 'signal' , nbins = 300 )    
     #  @endcode 
-    def fitTo ( self           ,
-                dataset        ,
-                draw   = False ,
-                nbins  = 100   ,
-                silent = False ,
-                refit  = False ,
-                timer  = False ,
-                args   = ()    , **kwargs ) :
+    #  With <code>parallel</code> the NLL for each category is kept in its own
+    #  worker process (small categories are grouped together), and workers
+    #  return the partial NLL and gradient for the given parameters: 
+    #  @code
+    #  r,f = model.fitTo ( dataset , parallel = True )  ## all cores 
+    #  r,f = model.fitTo ( dataset , parallel = 8    )  ## 8 worker processes 
+    #  r,f = model.fitTo ( dataset , parallel = { 'ncpus' : 8 , 'gradient' : False } )
+    #  @endcode 
+    #  @see ostap.parallel.parallel_simfit.parallel_simfit
+    def fitTo ( self             ,
+                dataset          ,
+                draw     = False ,
+                nbins    = 100   ,
+                silent   = False ,
+                refit    = False ,
+                timer    = False ,
+                args     = ()    ,
+                parallel = False , **kwargs ) :
         """
         Perform the actual fit (and draw it optionally)
         >>> r,f = model.fitTo ( dataset )
         >>> r,f = model.fitTo ( dataset , weighted = True )    
         >>> r,f = model.fitTo ( dataset , ncpu     = 10   )    
         >>> r,f = model.fitTo ( dataset , draw = 'signal' , nbins = 300 )    
+        With `parallel` the NLL for each category is kept in its own
+        worker process (small categories are grouped together), and workers
+        return the partial NLL and gradient for the given parameters: 
+        >>> r,f = model.fitTo ( dataset , parallel = True )  ## all cores 
+        >>> r,f = model.fitTo ( dataset , parallel = 8    )  ## 8 worker processes 
+        >>> r,f = model.fitTo ( dataset , parallel = { 'ncpus' : 8 , 'gradient' : False } )
+        - see ostap.parallel.parallel_simfit.parallel_simfit
         """
         assert self.sample in dataset      ,\
                'Category %s is not in dataset' % self.sample.GetName()
 
-        res , frame = self.pdf.fitTo ( 
-            dataset = dataset ,
-            draw    = False   , ## ATTENTION! False is here! 
-            nbins   = nbins   ,
-            silent  = silent  ,
-            refit   = refit   ,
-            timer   = timer   , 
-            args    = args    , **kwargs )
+        if parallel and args :
+            self.warning ( 'fitTo: parallel mode is not supported for explicit arguments, disable it' )
+            parallel = False
+        elif parallel and dataset.isWeighted () :
+            self.warning ( 'fitTo: parallel mode is not supported for weighted dataset, disable it'   )
+            parallel = False
+        elif parallel and any ( k.upper ().replace ( '_' , '' ) in ( 'CONSTRAINT' , 'CONSTRAINTS' ,
+                                                                     'PARS'       , 'PARAMS'      ,
+                                                                     'PARAMETER'  , 'PARAMETERS'  ) for k in kwargs ) :
+            self.warning ( 'fitTo: parallel mode is not supported for constraints, disable it'        )
+            parallel = False
+            
+        if parallel :
+            
+            if   isinstance ( parallel , dict ) : config = dict ( parallel )
+            elif isinstance ( parallel , bool ) : config = {}
+            else                                : config = { 'ncpus' : int ( parallel ) }
+            
+            nll_config = dict ( kwargs ) ## NB: drawing options are skipped by parse_args 
+            nll_config.update ( config ) 
+            
+            from ostap.parallel.parallel_simfit import parallel_simfit
+            from ostap.logger.utils             import roo_silent
+            with roo_silent ( silent ) :
+                res = parallel_simfit ( self , dataset , silent = silent , **nll_config )
+            self.pdf.fit_result = res 
+            if not silent : self.info ( 'fitTo: parallel fit result\n%s' % res.table ( prefix = '# ' ) )
+            
+        else :
+
+            res , frame = self.pdf.fitTo ( 
+                dataset = dataset ,
+                draw    = False   , ## ATTENTION! False is here! 
+                nbins   = nbins   ,
+                silent  = silent  ,
+                refit   = refit   ,
+                timer   = timer   , 
+                args    = args    , **kwargs )
         
         if   not draw                  : return res , None
         elif draw in self.samples      : pass
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Copyright (c) Ostap developers.
+# =============================================================================
+# @file test_fitting_arrays.py
+# Test module for vectorized evaluation of FUNC/PDF objects
+# - evaluate_array
+# - tabulated statistical quantities (opt-in)
+# =============================================================================
+""" Test module for vectorized evaluation of FUNC/PDF objects
+- evaluate_array
+- tabulated statistical quantities (opt-in)
+"""
+# =============================================================================
+from   __future__        import print_function
+# =============================================================================
+__author__ = "Ostap developers"
+__all__    = () ## nothing to import
+# =============================================================================
+import ROOT, math
+import ostap.fitting.roofit
+import ostap.fitting.models   as     Models
+from   ostap.fitting.basic    import Generic1D_pdf
+from   ostap.utils.timing     import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' == __name__  or '__builtin__' == __name__ :
+    logger = getLogger ( 'test_fitting_arrays' )
+else :
+    logger = getLogger ( __name__ )
+# =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
+
+mass  = ROOT.RooRealVar ( 'mass' , '', 0 , 1 )
+mean  = ROOT.RooRealVar ( 'mean_A'  , '' , 0.4  )
+sigma = ROOT.RooRealVar ( 'sigma_A' , '' , 0.05 )
+gauss = ROOT.RooGaussian ( 'gauss_A' , '' , mass , mean , sigma )
+
+# ==============================================================================
+## test vectorized evaluation of FUNC/PDF
+def test_evaluate_array ( ) :
+    """Test vectorized evaluation of FUNC/PDF
+    """
+    if numpy is None :
+        logger.warning ( 'numpy is not available, skip the test' )
+        return
+
+    pdf = Generic1D_pdf ( gauss , xvar = mass )
+
+    x   = numpy.linspace ( -0.1 , 1.1 , 10001 )
+
+    with timing ( 'Scalar     ' , logger = logger ) :
+        v1 = numpy.array ( [ pdf ( xx ) for xx in x ] )
+    with timing ( 'Vectorized ' , logger = logger ) :
+        v2 = pdf.evaluate_array ( x )
+
+    assert numpy.allclose ( v1 , v2 ) , 'Mismatch in scalar/vectorized evaluation!'
+    assert 0 == v2 [ 0 ] and 0 == v2 [ -1 ] , 'Out-of-range points must be zero!'
+
+    v3 = pdf.evaluate_array ( x , normalized = False )
+    assert numpy.allclose ( v3 , numpy.array ( [ pdf ( xx , normalized = False ) for xx in x ] ) ) , \
+           'Mismatch in scalar/vectorized unnormalized evaluation!'
+
+    s = sigma.getVal()
+    with timing ( 'Adaptive   ' , logger = logger ) :
+        a_mean   = pdf.get_mean ()
+        a_rms    = pdf.rms      ()
+        a_median = pdf.median   ()
+    with timing ( 'Tabulated  ' , logger = logger ) :
+        logger.info ( 'Gauss: mean     %s ' % pdf.get_mean ( tabulated = True ) )
+        logger.info ( 'Gauss: RMS      %s ' % pdf.rms      ( tabulated = True ) )
+        logger.info ( 'Gauss: median   %s ' % pdf.median   ( tabulated = True ) )
+        logger.info ( 'Gauss: mode     %s ' % pdf.mode     ( tabulated = True ) )
+        logger.info ( 'Gauss: FWHM     %s ' % pdf.fwhm     ( tabulated = True ) )
+        logger.info ( 'Gauss: skewness %s ' % pdf.skewness ( tabulated = True ) )
+        logger.info ( 'Gauss: kurtosis %s ' % pdf.kurtosis ( tabulated = True ) )
+
+    assert abs ( pdf.get_mean ( tabulated = True ) - a_mean   ) < 1.e-6 , 'Invalid mean!'
+    assert abs ( pdf.rms      ( tabulated = True ) - a_rms    ) < 1.e-6 , 'Invalid RMS!'
+    assert abs ( pdf.median   ( tabulated = True ) - a_median ) < 1.e-6 , 'Invalid median!'
+    assert abs ( pdf.get_mean ( tabulated = True ) - mean.getVal () ) < 1.e-6 , 'Invalid mean!'
+    assert abs ( pdf.median   ( tabulated = True ) - mean.getVal () ) < 1.e-6 , 'Invalid median!'
+    assert abs ( pdf.mode     ( tabulated = True ) - mean.getVal () ) < 1.e-5 , 'Invalid mode!'
+    assert abs ( pdf.rms      ( tabulated = True ) - s              ) < 1.e-6 , 'Invalid RMS!'
+    assert abs ( pdf.fwhm     ( tabulated = True ) - 2 * math.sqrt ( 2 * math.log ( 2 ) ) * s ) < 1.e-5 , 'Invalid FWHM!'
+
+    mn , mx = pdf.minmax ()
+    logger.info ( 'Gauss: minmax   %s/%s' % ( mn , mx ) )
+    assert 0 <= mn <= mx <= 1.0 , 'Invalid minmax!'
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_evaluate_array ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
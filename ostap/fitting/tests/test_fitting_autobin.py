@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Copyright (c) Ostap developers.
+# =============================================================================
+# @file test_fitting_autobin.py
+# Test module for ostap/fitting/autobin.py
+# - automatic binned-likelihood mode for large unbinned datasets
+# =============================================================================
+""" Test module for ostap/fitting/autobin.py
+- automatic binned-likelihood mode for large unbinned datasets
+"""
+# =============================================================================
+from   __future__        import print_function
+# =============================================================================
+__author__ = "Ostap developers"
+__all__    = () ## nothing to import
+# =============================================================================
+import ROOT
+import ostap.fitting.roofit
+import ostap.fitting.models   as     Models
+from   ostap.utils.timing     import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' == __name__  or '__builtin__' == __name__ :
+    logger = getLogger ( 'test_fitting_autobin' )
+else :
+    logger = getLogger ( __name__ )
+# =============================================================================
+
+mass  = ROOT.RooRealVar ( 'mass' , '', 0 , 1 )
+model = Models.Fit1D ( signal     = Models.Gauss_pdf ( 'G' , xvar = mass , mean = 0.4 , sigma = 0.05 ) ,
+                       background = None )
+model.S = 100000
+model.B = 100000
+
+data  = model.generate ( 200000 )
+
+# ==============================================================================
+## compare unbinned and automatic binned fits
+def test_autobin ( ) :
+    """Compare unbinned and automatic binned fits
+    """
+
+    with timing ( 'Unbinned fit' , logger = logger ) :
+        r1 , _ = model.fitTo ( data , silent = True )
+    with timing ( 'Binned   fit' , logger = logger ) :
+        r2 , _ = model.fitTo ( data , silent = True , auto_bin = 200 )
+    with timing ( 'Refined  fit' , logger = logger ) :
+        r3 , _ = model.fitTo ( data , silent = True , auto_bin = 200 , auto_bin_refine = True )
+
+    for p in ( 'S' , 'B' , 'mean_G' , 'sigma_G' ) :
+        v1 , v2 , v3 = r1 ( p ) [ 0 ] , r2 ( p ) [ 0 ] , r3 ( p ) [ 0 ]
+        logger.info ( 'Parameter %-8s unbinned %s binned %s refined %s' % ( p , v1 , v2 , v3 ) )
+        assert abs ( v1.value () - v2.value () ) < 0.2 * v1.error () , 'Mismatch for binned   fit!'
+        assert abs ( v1.value () - v3.value () ) < 0.1 * v1.error () , 'Mismatch for refined  fit!'
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_autobin ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Copyright (c) Ostap developers.
+# =============================================================================
+# @file test_fitting_fitcache.py
+# Test module for ostap/fitting/fitcache.py
+# - persistent cache of the fit results
+# =============================================================================
+""" Test module for ostap/fitting/fitcache.py
+- persistent cache of the fit results
+"""
+# =============================================================================
+from   __future__        import print_function
+# =============================================================================
+__author__ = "Ostap developers"
+__all__    = () ## nothing to import
+# =============================================================================
+import ROOT
+import ostap.fitting.roofit
+import ostap.fitting.models   as     Models
+from   ostap.fitting.fitcache import FitCache, options_fingerprint
+from   ostap.utils.cleanup    import CleanUp
+from   ostap.utils.timing     import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' == __name__  or '__builtin__' == __name__ :
+    logger = getLogger ( 'test_fitting_fitcache' )
+else :
+    logger = getLogger ( __name__ )
+# =============================================================================
+
+mass  = ROOT.RooRealVar ( 'mass' , '', 0 , 1 )
+model = Models.Fit1D ( signal     = Models.Gauss_pdf ( 'G' , xvar = mass , mean = 0.4 , sigma = 0.1 ) ,
+                       background = None )
+model.S = 1000
+model.B = 1000
+
+data1 = model.generate ( 2000 )
+data2 = model.generate ( 2000 )
+
+# ==============================================================================
+## test the persistent cache of the fit results
+def test_fitcache ( ) :
+    """Test the persistent cache of the fit results
+    """
+
+    dbname = CleanUp.tempfile ( prefix = 'test_fitcache_' , suffix = '.db' )
+
+    with FitCache ( dbname ) as cache :
+
+        with timing ( 'Fit      ' , logger = logger ) :
+            r1 , _ = model.fitTo ( data1 , silent = True , cache = cache )
+
+        model.S = 500
+        model.B = 500
+
+        with timing ( 'Cache hit' , logger = logger ) :
+            r2 , _ = model.fitTo ( data1 , silent = True , cache = cache )
+
+        assert abs ( model.S.getVal() - r1.S.value() ) < 1.e-8 , 'Parameters are not restored!'
+        assert abs ( r1.minNll () - r2.minNll () ) < 1.e-8     , 'Mismatch in fit results!'
+
+        with timing ( 'Warm start' , logger = logger ) :
+            r3 , _ = model.fitTo ( data2 , silent = True , cache = cache , warm_start = True )
+
+        r4 , _ = model.fitTo ( data2 , silent = True )
+        assert abs ( r3.minNll () - r4.minNll () ) < 1.e-3 , 'Mismatch in fit results!'
+
+# ==============================================================================
+## test the fingerprint of the fit options 
+def test_fitcache_options ( ) :
+    """Test the fingerprint of the fit options
+    """
+    a = ROOT.RooArgSet ( model.S )
+    b = ROOT.RooArgSet ( model.B )
+    
+    fp1 = options_fingerprint ( ROOT.RooFit.Minos ( a ) , ROOT.RooFit.NumCPU ( 2 ) )
+    fp2 = options_fingerprint ( ROOT.RooFit.Minos ( a ) , ROOT.RooFit.NumCPU ( 2 ) )
+    fp3 = options_fingerprint ( ROOT.RooFit.Minos ( b ) , ROOT.RooFit.NumCPU ( 2 ) )
+    fp4 = options_fingerprint ( ROOT.RooFit.Minos ( a ) , ROOT.RooFit.NumCPU ( 4 ) )
+    
+    assert fp1 == fp2 , 'The same options have different fingerprints!'
+    assert fp1 != fp3 , 'The content of the set is ignored in the fingerprint!'
+    assert fp1 != fp4 , 'The integer slot is ignored in the fingerprint!'
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_fitcache         ()
+    test_fitcache_options ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -32,6 +32,11 @@ if '__main__' == __name__  or '__builtin__' == __name__ :
 else : 
     logger = getLogger ( __name__ )
 # =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
 ## make simple test mass 
 mass     = ROOT.RooRealVar ( 'test_mass' , 'Some test mass' , 3.0 , 3.2 )
 
@@ -318,6 +323,50 @@ def test_PyPDF2 () :
         
         time.sleep ( 2 )
     
+# =============================================================================
+## Benchmark the scalar and vectorized evaluation of <code>PyPDF2</code> 
+#  @see Ostap::Models::PyPdf2 
+#  @see Ostap::Models::PyBatch 
+def test_PyPDF2_batch () :
+    """Benchmark the scalar and vectorized evaluation of PyPDF2
+    - see Ostap.Models.PyPdf2 
+    - see Ostap.Models.PyBatch 
+    """
+
+    logger = getLogger("test_PyPDF2_batch")
+
+    if not numpy :
+        logger.warning("test enabled only with numpy!")
+        return
+    
+    logger.info  ("Benchmark the scalar and vectorized evaluation of PyPDF2")
+    
+    from   ostap.fitting.pypdf  import PyPDF2
+    
+    ## the function: it works both for scalars and numpy arrays 
+    def function ( x , m , s ) :
+        dx = ( x - m ) / s        
+        return numpy.exp ( -0.5 * dx * dx ) * NORM / s 
+
+    results = {}
+    for batch in ( False , True ) :
+
+        gauss = PyPDF2 ( 'G%s' % batch , function = function , batch = batch , 
+                         vars = ( mass , pdf.mean , pdf.sigma ) )
+        gauss = Generic1D_pdf  ( gauss.pypdf , xvar = mass )
+        
+        pdf.mean  = 3.090
+        pdf.sigma = 0.012
+        
+        with timing ( "PyPDF2 %s" % ( 'vectorized' if batch else 'scalar    ' ) , logger ) :
+            r , _ = gauss.fitTo ( dataset , draw = False , silent = True , ncpu = 1 )
+
+        logger.info  ("Fit result for PyPDF2 (batch=%s)\n%s" % ( batch , r.table ( prefix = "# " ) ) )
+        results [ batch ] = r
+
+    r1 , r2 = results [ False ] , results [ True ]
+    assert abs ( r1.minNll () - r2.minNll () ) < 1.e-6 * abs ( r1.minNll () ) , 'Mismatch in fit results!'
+    
 # =============================================================================
 ## Test pure python PDF: <code>PyPdf</code>
 #  @attention For *NEW* PyROOT only!
@@ -512,6 +561,7 @@ if '__main__' == __name__ :
     test_PyPDF    ()
     test_PyPDF_AI ()
     test_PyPDF2   ()
+    test_PyPDF2_batch ()
     test_PyPdf    ()
     test_PyPdf_AI ()
     
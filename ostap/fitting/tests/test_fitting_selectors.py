@@ -351,6 +351,36 @@ def test_selector_with_vars ()  :
     sys.stderr.flush()
     
     
+# ============================================================================
+## Fill dataset using frame machinery:
+#  formula-based variables are lowered to the frame columns 
+def test_selector_with_frame ()  :
+    """Fill dataset using frame machinery:
+    formula-based variables are lowered to the frame columns 
+    """
+    
+    logger = getLogger("test_selector_with_frame")
+
+    from ostap.fitting.pyselectors import SelectorWithVars, Variable 
+
+    variables = [ mass , c2dtf , pt ,
+                  Variable ( 'pt2' , 'pt^2' , 0 , 100 , accessor = 'pt*pt' ) ]
+    
+    with timing ("Selector-with-vars/frame"  , logger ) :
+        sel1 = SelectorWithVars ( variables = variables , selection = cuts , logger = logger ) 
+        data.chain.process ( sel1 , shortcut = False , use_frame = 1 )
+        
+    with timing ("Selector-with-vars/python" , logger ) :
+        sel2 = SelectorWithVars ( variables = variables , selection = cuts , logger = logger ) 
+        data.chain.process ( sel2 , shortcut = False , use_frame = -1 )
+        
+    ds1 , ds2 = sel1.data , sel2.data 
+    logger.info ("Data set (frame):\n%s"  % ds1.table ( prefix = "# " ) )
+    
+    assert len ( ds1 ) == len ( ds2 ) , 'Mismatch in dataset length %d/%d' % ( len ( ds1 ) , len ( ds2 ) )
+    assert abs ( ds1.statVar ( 'pt2' ).mean() - ds2.statVar ( 'pt2' ).mean() ) < 1.e-6 , \
+           'Mismatch for pt2 variable'
+    
 # ==============================================================================================
 if '__main__' == __name__ :
 
@@ -359,6 +389,7 @@ if '__main__' == __name__ :
     test_simple_selector     ()        
     test_selector_with_cuts  ()
     test_selector_with_vars  ()
+    test_selector_with_frame ()
     
 # ==============================================================================================
 ##                                                                                       The END
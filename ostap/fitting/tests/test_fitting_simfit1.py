@@ -133,6 +133,17 @@ def test_simfit1 () :
     # =========================================================================
     r , f = model_sim.fitTo ( dataset , silent = True )
     r , f = model_sim.fitTo ( dataset , silent = True )
+
+    ## per-category parallel NLL 
+    with timing ( 'Parallel simfit' , logger = logger ) : 
+        rp , fp = model_sim.fitTo ( dataset , silent = True , parallel = 2 )
+    logger.info ( 'Parallel fit results are: %s ' % rp )
+    
+    fpars = rp.floatParsFinal() 
+    for p in r.floatParsFinal() :
+        q = fpars.find ( p.GetName() ) 
+        assert abs ( p.getVal() - q.getVal() ) < 0.1 * p.getError() , \
+               'Mismatch in serial/parallel simfit for %s' % p.GetName() 
     
     fA = model_sim.draw ( 'A' , dataset , nbins = 50 )
     fB = model_sim.draw ( 'B' , dataset , nbins = 50 )
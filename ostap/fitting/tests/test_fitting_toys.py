@@ -188,12 +188,87 @@ def test_significance_toys ( ) :
         time.sleep  ( 1 )
 
                 
+# =============================================================================
+## Perform toy-study with the results streamed into database
+#  - interrupted campaign is resumed from the stored seed and toy index 
+def test_toys_dbase ( ) :
+    """Perform toy-study with the results streamed into database
+    - interrupted campaign is resumed from the stored seed and toy index 
+    """
+
+    logger = getLogger ( 'test_toys_dbase' )
+
+    from ostap.utils.cleanup  import CleanUp
+    from ostap.fitting.toysdb import ToysDB 
+    dbname = CleanUp.tempfile ( prefix = 'test_toys_' , suffix = '.db' )
+
+    config = dict ( pdf        = gen_gauss , 
+                    data       = [ mass ]  , 
+                    gen_config = { 'nEvents' : 200 , 'sample' : True } ,
+                    fit_config = { 'silent'  : True } ,
+                    init_pars  = { 'mean_GG' : 0.4 , 'sigma_GG' : 0.1 } ,
+                    silent     = True ,
+                    progress   = True ,
+                    seed       = 12345 )
+    
+    ## "interrupted" campaign 
+    Toys.make_toys ( nToys = 50  , dbase = dbname , **config )
+    with ToysDB ( dbname ) as db : assert 50 == len ( db ) , 'Invalid number of stored toys!'
+
+    ## resume it 
+    r1 , s1 = Toys.make_toys ( nToys = 100 , dbase = dbname , **config )
+    with ToysDB ( dbname ) as db : assert 100 == len ( db ) , 'Invalid number of stored toys!'
+
+    ## the same toys in one go 
+    r2 , s2 = Toys.make_toys ( nToys = 100 , **config )
+    for p in ( 'mean_GG' , 'sigma_GG' ) :
+        assert len ( r1 [ p ] ) == len ( r2 [ p ] ) , 'Mismatch in number of toys!'
+        for v1 , v2 in zip ( r1 [ p ] , r2 [ p ] ) :
+            assert abs ( v1.value() - v2.value() ) < 1.e-6 , 'Mismatch in toy results!'
+
+    ## statistics from disk
+    Toys.print_stats ( dbname ) 
+
+# =============================================================================
+## Perform toy-study until the target precision is reached
+def test_toys_precision ( ) :
+    """Perform toy-study until the target precision is reached
+    """
+
+    logger = getLogger ( 'test_toys_precision' )
+
+    precision = { 'pull:mean_GG'     : 0.1  ,
+                  'width:mean_GG'    : 0.1  ,
+                  'coverage:mean_GG' : 0.05 }
+    
+    results , stats = Toys.make_toys (
+        pdf         = gen_gauss ,
+        nToys       = 5000      , ## the budget 
+        data        = [ mass ]  , 
+        gen_config  = { 'nEvents' : 200  , 'sample'  : True } ,
+        fit_config  = { 'silent'  : True } ,
+        init_pars   = { 'mean_GG' : 0.4  , 'sigma_GG' : 0.1 } ,
+        precision   = precision ,
+        batch       = 20        , 
+        silent      = True      , 
+        progress    = True      )
+
+    ntoys = len ( results [ 'mean_GG' ] )
+    logger.info ( 'Target precision is reached after %d toys' % ntoys )
+    assert ntoys < 5000 , 'Target precision is not reached!'
+    
+    tracker = Toys.ToysPrecision ( precision , init = { 'mean_GG' : 0.4 } )
+    tracker.update ( results )
+    assert tracker.reached , 'Target precision is not reached!'
+    
 # =============================================================================
 if '__main__' == __name__ :
 
     test_toys  () 
     test_toys2 () 
     test_significance_toys ( ) 
+    test_toys_dbase        ( ) 
+    test_toys_precision    ( ) 
     
 
 # =============================================================================
@@ -20,6 +20,8 @@ __all__     = (
     "make_toys2"     , ## run fitting toys (separate models to generate and fit)
     "vars_transform" , ## helper fnuction to transform the variables
     "print_stats"    , ## print statistics of toys 
+    "make_stats"     , ## make statistics of toys 
+    "ToysPrecision"  , ## running statistics for the precision-driven stopping of toys 
     )
 # =============================================================================
 import ROOT
@@ -57,10 +59,27 @@ def vars_transform ( vars ) :
     return result
 # =============================================================================
 ## print statistics of pseudoexperiments
+#  - statistics can be also calculated from the database with toys
+#  @code
+#  print_stats ( stats , 1000 ) 
+#  print_stats ( 'toys.db'    ) 
+#  @endcode
+#  @see ostap.fitting.toysdb.ToysDB 
 def print_stats (  stats , ntoys = '???' ) :
     """print statistics of pseudoexperiments
+    - statistics can be also calculated from the database with toys
+    >>> print_stats ( stats , 1000 ) 
+    >>> print_stats ( 'toys.db'    ) 
+    - see ostap.fitting.toysdb.ToysDB 
     """
     
+    from ostap.core.ostap_types import string_types 
+    from ostap.fitting.toysdb   import ToysDB 
+    if isinstance ( stats , string_types + ( ToysDB , ) ) :
+        with ToysDB ( stats ) as db :
+            stats = db.stats ()
+            if '???' == ntoys : ntoys = len ( db ) 
+        
     table = [ ( 'Parameter' , '#', 'mean' , 'rms' , '%11s / %-11s' % ( 'min' , 'max' ) ) ] 
     keys = stats.keys()
     keys = sorted ( keys )
@@ -89,6 +108,172 @@ def print_stats (  stats , ntoys = '???' ) :
                           alignment = 'lcccc' , prefix = "# " )
     logger.info ( 'Results of %s toys:\n%s' % ( ntoys , table ) ) 
 
+# =============================================================================
+## make statistics of pseudoexperiments
+#  @param results   dictionary with the results of toys
+#  @param fits      counters of fit statuses
+#  @param covs      counters of covariance matrix qualities
+#  @param init      initial values of parameters (for pulls)
+#  @param more_vars names of the additional variables (no pulls)
+#  @return the dictionary of statistics 
+def make_stats ( results , fits = {} , covs = {} , init = {} , more_vars = () ) :
+    """Make statistics of pseudoexperiments
+    - results   : dictionary with the results of toys
+    - fits      : counters of fit statuses
+    - covs      : counters of covariance matrix qualities
+    - init      : initial values of parameters (for pulls)
+    - more_vars : names of the additional variables (no pulls)
+    """
+    
+    from collections     import defaultdict 
+    from ostap.core.core import SE, VE
+    
+    stats = defaultdict ( SE )
+
+    for par in results :
+        pars = results [ par ]
+        mvar = par in more_vars 
+        if not mvar : a0 = init.get ( par , None  )
+        for v in pars : 
+            v0 = float ( v )         
+            stats     [ par             ] +=   v0
+            if not mvar and not a0 is None and isinstance ( v , VE ) and 0 < v.error() : 
+                stats [ 'pull:%s' % par ] += ( v0 - a0 ) / v.error()
+
+    for k in fits :
+        stats ['- Status  %s' % k ] = fits [ k ]
+    for k in covs :
+        stats ['- CovQual %s' % k ] = covs [ k ]
+
+    return stats
+
+# =============================================================================
+## @class ToysPrecision
+#  Running statistics for the precision-driven stopping of toys.
+#  The target precision is specified as dictionary <code>{ quantity : error }</code>:
+#  - <code>'P'</code>          : the mean value of parameter <code>P</code>
+#  - <code>'pull:P'</code>     : the mean of the pull for parameter <code>P</code>
+#  - <code>'width:P'</code>    : the width (rms) of the pull for parameter <code>P</code>
+#  - <code>'coverage:P'</code> : the fraction of toys with <code>|pull|<1</code>
+#  @code
+#  tracker = ToysPrecision ( { 'pull:mean' : 0.02 , 'coverage:mean' : 0.01 } , init = { 'mean' : 0.4 } )
+#  tracker.update ( results )
+#  if tracker.reached : ...
+#  @endcode
+#  @see ostap.fitting.toys.make_toys
+#  @see ostap.parallel.parallel_toys.parallel_toys
+class ToysPrecision(object) :
+    """Running statistics for the precision-driven stopping of toys.
+    The target precision is specified as dictionary `{ quantity : error }`:
+    - `'P'`          : the mean value of parameter `P`
+    - `'pull:P'`     : the mean of the pull for parameter `P`
+    - `'width:P'`    : the width (rms) of the pull for parameter `P`
+    - `'coverage:P'` : the fraction of toys with `|pull|<1`
+    >>> tracker = ToysPrecision ( { 'pull:mean' : 0.02 , 'coverage:mean' : 0.01 } , init = { 'mean' : 0.4 } )
+    >>> tracker.update ( results )
+    >>> if tracker.reached : ...
+    """
+    def __init__ ( self , precision , init = {} , min_toys = 10 ) :
+
+        from collections     import defaultdict 
+        from ostap.core.core import SE
+
+        self.__precision = {}
+        self.__keys      = {}
+        for q , e in precision.items () :
+            assert 0 < e , 'Invalid target precision for %s: %s' % ( q , e )
+            kind , _ , par = q.partition ( ':' )
+            if   not par                                       : kind , par , key = 'value' , q , q
+            elif kind in ( 'pull' , 'width' )                  : key = 'pull:%s'     % par
+            elif 'coverage' == kind                            : key = 'coverage:%s' % par
+            else :
+                raise KeyError ( "Invalid quantity '%s' for the target precision" % q )
+            assert 'value' == kind or par in init , \
+                   "Initial value of '%s' is needed for '%s'" % ( par , q )
+            self.__precision [ q ] = kind , par , key , e 
+            self.__keys      [ key ] = par 
+
+        self.__init     = dict ( init )
+        self.__min_toys = min_toys 
+        self.__counters = defaultdict ( SE )
+
+    # =========================================================================
+    ## update the running statistics with the results of toys
+    #  @param results  dictionary with the results of toys <code>{ name : [ values ] }</code>
+    def update ( self , results ) :
+        """Update the running statistics with the results of toys
+        - results : dictionary with the results of toys `{ name : [ values ] }`
+        """
+        from ostap.core.core import VE
+        for key , par in self.__keys.items () :
+            if not par in results : continue
+            counter = self.__counters [ key ]
+            a0      = self.__init.get ( par , None )
+            for v in results [ par ] :
+                if key == par : 
+                    counter += float ( v )
+                    continue
+                if not isinstance ( v , VE ) or v.error () <= 0 : continue 
+                pull = ( float ( v ) - a0 ) / v.error ()
+                if key.startswith ( 'pull:' ) : counter += pull
+                else                          : counter += 1 if abs ( pull ) < 1 else 0 
+
+    # =========================================================================
+    ## get the current estimates of all quantities
+    #  @return dictionary <code>{ quantity : value +/- error }</code>
+    def estimates ( self ) :
+        """Get the current estimates of all quantities
+        - returns dictionary `{ quantity : value +/- error }`
+        """
+        import math
+        from ostap.core.core import VE, binomEff
+        result = {}
+        for q , ( kind , par , key , e ) in self.__precision.items () :
+            counter = self.__counters [ key ]
+            n       = counter.nEntries () 
+            if n < 2 : continue 
+            if   'width'    == kind :
+                rms = counter.rms () 
+                result [ q ] = VE ( rms , rms * rms / ( 2.0 * ( n - 1 ) ) )
+            elif 'coverage' == kind :
+                result [ q ] = binomEff ( int ( round ( counter.sum () ) ) , n )
+            else :
+                result [ q ] = counter.mean () 
+        return result 
+
+    @property
+    def reached ( self ) :
+        """``reached'' : is the target precision reached for all quantities?"""
+        estimates = self.estimates ()
+        for q , ( kind , par , key , e ) in self.__precision.items () :
+            if not q in estimates                                   : return False
+            if self.__counters [ key ].nEntries () < self.__min_toys : return False
+            if e < estimates [ q ].error ()                         : return False
+        return True
+
+    @property
+    def precision ( self ) :
+        """``precision'' : the target precision { quantity : error }"""
+        return dict ( ( q , v [ -1 ] ) for q , v in self.__precision.items () )
+
+    # =========================================================================
+    ## print the current status as the table 
+    def table ( self , title = 'Toys precision' , prefix = '' ) :
+        """Print the current status as the table 
+        """
+        estimates = self.estimates ()
+        rows = [ ( 'Quantity' , '#' , 'value' , 'target' , '' ) ]
+        for q in sorted ( self.__precision ) :
+            kind , par , key , e = self.__precision [ q ]
+            n = self.__counters [ key ].nEntries ()
+            v = estimates.get ( q , None )
+            if v is None : rows.append ( ( q , '%d' % n , '' , '%-.4g' % e , '' ) ) 
+            else         : rows.append ( ( q , '%d' % n ,
+                                           '%+11.4g +- %-11.4g' % ( v.value () , v.error () ) ,
+                                           '%-.4g' % e , '+' if v.error () <= e else '' ) )
+        import ostap.logger.table as Table
+        return Table.table ( rows , title = title , alignment = 'lcccc' , prefix = prefix )
+
 # ==============================================================================
 ## Default function to generate the data
 #  - simple call for <code>PDF.generate</code>
@@ -127,6 +312,58 @@ def accept_fit  ( result , pdf = None , dataset = None ) :
     return result and ( 0 == result.status () ) and ( result.covQual () in ( -1 , 3 ) ) 
 
 
+# ==============================================================================
+## set the seed for all random generators
+#  @see ostap.fitting.toysdb.set_seed
+def set_seed ( seed ) :
+    """Set the seed for all random generators
+    - see ostap.fitting.toysdb.set_seed
+    """
+    from ostap.fitting.toysdb import set_seed as _set_seed
+    _set_seed ( seed )
+    
+# ==============================================================================
+## Helper function to prepare the streaming mode for toys
+#  @return database (or None), the base seed and indices of toys to be processed 
+def _toys_dbase_ ( dbase , seed , nToys , toys , init = {} , more_vars = {} , silent = True ) :
+    """Helper function to prepare the streaming mode for toys
+    - returns database (or None), the base seed and indices of toys to be processed 
+    """
+    indices = range ( nToys ) if toys is None else toys 
+    if not dbase : return None , seed , indices
+    
+    from ostap.fitting.toysdb import ToysDB
+    db   = ToysDB ( dbase )
+    seed = db.init ( seed , init = init , more = tuple ( more_vars ) )
+    done = db.done
+    if done :
+        indices = [ i for i in indices if not i in done ]
+        if not silent :
+            logger.info ( "make_toys: %d toys are already done, resume processing" % len ( done ) ) 
+    return db , seed , indices 
+
+# ==============================================================================
+## Helper function to prepare the precision-driven mode for toys
+#  @return the running statistics (or None)
+#  @see ToysPrecision 
+def _toys_tracker_ ( precision , init = {} , db = None ) :
+    """Helper function to prepare the precision-driven mode for toys
+    - returns the running statistics (or None)
+    - see ToysPrecision 
+    """
+    if not precision : return None
+    tracker = ToysPrecision ( precision , init = init )
+    ## resumed campaign: account the already stored toys 
+    if not db is None : tracker.update ( db.results () )
+    return tracker 
+
+# ==============================================================================
+## Helper function to get the total number of processed toys from counters of fit statuses
+def _toys_number_ ( fits ) :
+    """Helper function to get the total number of processed toys from counters of fit statuses
+    """
+    return sum ( c.nEntries () for c in fits.values () ) 
+
 # ==============================================================================
 ## make <code>nToys</code> pseudoexperiments
 #
@@ -176,8 +413,26 @@ def accept_fit  ( result , pdf = None , dataset = None ) :
 # @param accept_fun accept    function
 # @param silent     silent toys?
 # @param progress   show the progress?
+# @param dbase      database to stream the results of toys, see ostap.fitting.toysdb.ToysDB 
+# @param seed       the base seed: each toy is generated with the seed <code>seed+index</code>
+# @param toys       the explicit indices of toys to be processed (instead of <code>range(nToys)</code>)
+# @param precision  the target precision <code>{ quantity : error }</code>, see ToysPrecision 
+# @param batch      check the target precision every <code>batch</code> toys 
 # @return dictionary with fit results for the toys and the dictionary of statistics
 #
+#  - If <code>dbase</code> is specified, the results are streamed into database,
+#    one row per toy; the interrupted campaign is resumed from the stored
+#    seed and toy index  
+#
+#  - If <code>precision</code> is specified, the toys are processed until the 
+#    target precision is reached for all quantities, and <code>nToys</code>
+#    is the maximal number of toys (the budget)
+#  @code
+#  results , stats = make_toys ( ... , nToys = 10000 ,
+#         precision = { 'pull:mean' : 0.02 , 'width:mean' : 0.02 , 'coverage:mean' : 0.01 } )  
+#  @endcode
+#  @see ToysPrecision 
+#
 #  - If <code>gen_fun</code>    is not specified <code>generate_data</code> is used 
 #  - If <code>fit_fun</code>    is not specified <code>make_fit</code>      is used 
 #  - If <code>accept_fun</code> is not specified <code>accept_fit</code>    is used   
@@ -192,7 +447,12 @@ def make_toys ( pdf                ,
                 fit_fun    = None  , ## fit       function ( pdf , dataset , **config )
                 accept_fun = None  , ## accept    function ( fit-result, pdf, dataset )
                 silent     = True  ,                
-                progress   = True  ) :
+                progress   = True  ,
+                dbase      = None  , ## database to stream the results of toys
+                seed       = None  , ## the base seed 
+                toys       = None  , ## explicit indices of toys
+                precision  = {}    , ## target precision { quantity : error } 
+                batch      = 50    ) : ## check the precision every <code>batch</code> toys 
     """Make `nToys` pseudoexperiments
 
     -   Schematically:
@@ -224,9 +484,24 @@ def make_toys ( pdf                ,
     - accept_fun accept    function
     - silent     silent toys?
     - progress   show progress bar? 
+    - dbase      database to stream the results of toys, see ostap.fitting.toysdb.ToysDB 
+    - seed       the base seed: each toy is generated with the seed `seed+index`
+    - toys       the explicit indices of toys to be processed (instead of `range(nToys)`)
+    - precision  the target precision `{ quantity : error }`, see ToysPrecision 
+    - batch      check the target precision every `batch` toys 
     
     It returns a dictionary with fit results for the toys and a dictionary of statistics
     
+    If `dbase` is specified, the results are streamed into database,
+    one row per toy; the interrupted campaign is resumed from the stored
+    seed and toy index  
+
+    If `precision` is specified, the toys are processed until the target
+    precision is reached for all quantities, and `nToys` is the maximal
+    number of toys (the budget)
+    >>> results , stats = make_toys ( ... , nToys = 10000 ,
+    ...        precision = { 'pull:mean' : 0.02 , 'width:mean' : 0.02 , 'coverage:mean' : 0.01 } )  
+    
     >>> pdf = ...
     ... results, stats = make_toys ( pdf     , ## PDF  to use 
     ...                 1000                 , ## number of toys 
@@ -316,70 +591,90 @@ def make_toys ( pdf                ,
 
     fits = defaultdict ( SE )  ## fit statuses 
     covs = defaultdict ( SE )  ## covarinace matrix quality
+
+    ## streaming mode: the results are stored in database 
+    db , seed , indices = _toys_dbase_ ( dbase , seed , nToys , toys ,
+                                         init = fix_all , more_vars = more_vars , silent = silent )
+
+    ## precision-driven mode: running statistics for the chosen quantities 
+    tracker = _toys_tracker_ ( precision , fix_all , db )
     
     ## run pseudoexperiments
-    from ostap.utils.progress_bar import progress_bar 
-    for i in progress_bar ( range ( nToys ) , silent = not progress ) :
-                
-        ## 1. reset PDF parameters 
-        pdf.load_params ( None , fix_pars  , silent = silent )
-        pdf.load_params ( None , init_pars , silent = silent )
+    try :
 
-        ## 2. generate dataset!  
-        ## dataset = pdf.generate ( varset = varset , **gen_config )  
-        dataset = gen_fun ( pdf , varset = varset , **gen_config )  
-        if not silent :
-            logger.info ( 'Generated dataset #%d\n%s' % ( i , dataset ) )
+        from ostap.utils.progress_bar import progress_bar 
+        for k , i in enumerate ( progress_bar ( indices , silent = not progress ) ) :
+                
+            ## 0. set the seed for this toy
+            if not seed is None : set_seed ( seed + i )
         
-        ## 3. fit it!
-        r = fit_fun ( pdf , dataset , **fitcnf ) 
-        if not silent :
-            logger.info ( 'Fit result #%d\n%s' % ( i , r.table ( title = 'Fit result #%d' % i , prefix = '# ' ) ) )
+            ## 1. reset PDF parameters 
+            pdf.load_params ( None , fix_pars  , silent = silent )
+            pdf.load_params ( None , init_pars , silent = silent )
+
+            ## 2. generate dataset!  
+            ## dataset = pdf.generate ( varset = varset , **gen_config )  
+            dataset = gen_fun ( pdf , varset = varset , **gen_config )  
+            if not silent :
+                logger.info ( 'Generated dataset #%d\n%s' % ( i , dataset ) )
+        
+            ## 3. fit it!
+            r = fit_fun ( pdf , dataset , **fitcnf ) 
+            if not silent :
+                logger.info ( 'Fit result #%d\n%s' % ( i , r.table ( title = 'Fit result #%d' % i , prefix = '# ' ) ) )
 
-        ## fit status 
-        fits [ r.status  () ] += 1
+            ## fit status 
+            fits [ r.status  () ] += 1
 
-        ## covariance matrix quality
-        covs [ r.covQual () ] += 1
+            ## covariance matrix quality
+            covs [ r.covQual () ] += 1
               
-        ## ok ?
-        if accept_fun ( r , pdf , dataset ) : 
+            ## ok ?
+            accepted = accept_fun ( r , pdf , dataset )
+            if accepted :
+                rpf  = r.params ( float_only = True ) 
+                row  = dict ( ( p , [ rpf [ p ] [ 0 ] ] ) for p in rpf )
+                more = dict ( ( v , more_vars [ v ] ( r , pdf ) ) for v in more_vars )
+                for v in more : row [ v ] = [ more [ v ] ] 
             
-            ## 4. save results 
-            rpf = r.params ( float_only = True ) 
-            for p in rpf : 
-                results [ p ].append ( rpf [ p ][0] ) 
-                
-            for v in more_vars :
-                func  = more_vars[v] 
-                results [ v ] .append ( func ( r , pdf ) )
+            if not db is None :
+            
+                ## 4. stream results into database 
+                db.record ( i , seed + i , r , accepted , len ( dataset ) , more if accepted else {} ) 
+            
+            elif accepted : 
+            
+                ## 4. save results 
+                for p in row : results [ p ] += row [ p ] 
+                results [ '#' ] .append ( len ( dataset ) )
 
-            results [ '#' ] .append ( len ( dataset ) )
+            ## 5. update the running statistics 
+            if tracker and accepted : tracker.update ( row )
             
-        dataset.clear()
-        del dataset
-        del r
+            dataset.clear()
+            del dataset
+            del r
 
-    ## make a final statistics 
-    stats = defaultdict ( SE )
+            ## 6. target precision is reached? 
+            if tracker and 0 == ( k + 1 ) % batch and tracker.reached :
+                if progress or not silent :
+                    logger.info ( 'make_toys: target precision is reached after %d toys' % ( k + 1 ) )
+                break 
 
-    for par in results :
-        pars = results [ par ]
-        mvar = par in more_vars 
-        if not mvar : a0 = fix_all.get ( par , None  )
-        for v in pars : 
-            v0 = float ( v )         
-            stats     [ par             ] +=   v0
-            if not mvar and not a0 is None and isinstance ( v , VE ) and 0 < v.error() : 
-                stats [ 'pull:%s' % par ] += ( v0 - a0 ) / v.error()
+        ## (all) results from database 
+        if not db is None : results , fits , covs = db.load () 
 
-    for k in fits :
-        stats ['- Status  %s' % k ] = fits [ k ]
-    for k in covs :
-        stats ['- CovQual %s' % k ] = covs [ k ]
-            
+    finally :
+        
+        ## always close database: the pending toys are committed 
+        if not db is None : db.close ()
         
-    if progress or not silent : print_stats ( stats , nToys )
+    ## make a final statistics 
+    stats = make_stats ( results , fits , covs , init = fix_all , more_vars = more_vars )
+        
+    if progress or not silent :
+        print_stats ( stats , _toys_number_ ( fits ) if tracker else nToys )
+        if tracker : logger.info ( 'Toys precision:\n%s' % tracker.table ( prefix = '# ' ) )
     
     return results, stats 
 
@@ -438,11 +733,23 @@ def make_toys ( pdf                ,
 # @param fit_fun    fitting   function
 # @param accept_fun accept    function
 # @param silent     silent toys?
+# @param dbase      database to stream the results of toys, see ostap.fitting.toysdb.ToysDB 
+# @param seed       the base seed: each toy is generated with the seed <code>seed+index</code>
+# @param toys       the explicit indices of toys to be processed (instead of <code>range(nToys)</code>)
+# @param precision  the target precision <code>{ quantity : error }</code>, see ToysPrecision 
+# @param batch      check the target precision every <code>batch</code> toys 
 # @return dictionary with fit results for the toys and the dictionary of statistics
 #
 #  - If <code>gen_fun</code>    is not specified <code>generate_data</code> is used 
 #  - If <code>fit_fun</code>    is not specified <code>make_fit</code>      is used 
 #  - If <code>accept_fun</code> is not specified <code>accept_fit</code>    is used   
+#  - If <code>dbase</code> is specified, the results are streamed into database,
+#    one row per toy; the interrupted campaign is resumed from the stored
+#    seed and toy index  
+#  - If <code>precision</code> is specified, the toys are processed until the 
+#    target precision is reached for all quantities, and <code>nToys</code>
+#    is the maximal number of toys (the budget); the pulls are calculated with
+#    respect to the parameters of <code>gen_pdf</code>
 def make_toys2 ( gen_pdf            , ## pdf to generate toys 
                  fit_pdf            , ## pdf to fit  
                  nToys              , ## number of pseudoexperiments 
@@ -456,7 +763,12 @@ def make_toys2 ( gen_pdf            , ## pdf to generate toys
                  fit_fun    = None  , ## fit       function ( pdf , dataset , **fit_config ) 
                  accept_fun = None  , ## accept    function ( fit-result, pdf, dataset     )
                  silent     = True  ,
-                 progress   = True  ) :
+                 progress   = True  ,
+                 dbase      = None  , ## database to stream the results of toys
+                 seed       = None  , ## the base seed 
+                 toys       = None  , ## explicit indices of toys
+                 precision  = {}    , ## target precision { quantity : error } 
+                 batch      = 50    ) : ## check the precision every <code>batch</code> toys 
     """Make `ntoys` pseudoexperiments
     
     -   Schematically:
@@ -485,6 +797,11 @@ def make_toys2 ( gen_pdf            , ## pdf to generate toys
     - fit_pars   redefine these parameters for fit of each pseudoexperiment
     - silent     silent toys?
     - progress  show progress bar? 
+    - dbase      database to stream the results of toys, see ostap.fitting.toysdb.ToysDB 
+    - seed       the base seed: each toy is generated with the seed `seed+index`
+    - toys       the explicit indices of toys to be processed (instead of `range(nToys)`)
+    - precision  the target precision `{ quantity : error }`, see ToysPrecision 
+    - batch      check the target precision every `batch` toys 
     
     It returns a dictionary with fit results for the toys and a dictionary of statistics
     >>> pdf = ...
@@ -569,65 +886,92 @@ def make_toys2 ( gen_pdf            , ## pdf to generate toys
     fits = defaultdict ( SE )  ## fit statuses 
     covs = defaultdict ( SE )  ## covarinace matrix quality
 
+    ## streaming mode: the results are stored in database 
+    db , seed , indices = _toys_dbase_ ( dbase , seed , nToys , toys ,
+                                         more_vars = more_vars , silent = silent )
+
+    ## precision-driven mode: running statistics for the chosen quantities 
+    gen_init = dict ( fix_gen_init )
+    gen_init.update ( fix_gen_pars )
+    tracker  = _toys_tracker_ ( precision , gen_init , db )
+    
     ## run pseudoexperiments
-    from ostap.utils.progress_bar import progress_bar 
-    for i in progress_bar ( range ( nToys ) , silent = not progress ) :
+    try :
 
-        ## 1. reset PDF parameters 
-        gen_pdf.load_params ( None , fix_gen_init , silent = silent )
-        gen_pdf.load_params ( None , fix_gen_pars , silent = silent )
+        from ostap.utils.progress_bar import progress_bar 
+        for k , i in enumerate ( progress_bar ( indices , silent = not progress ) ) :
 
-        ## 2. generate dataset!
-        dataset =  gen_fun ( gen_pdf , varset = varset , **gen_config ) 
-        if not silent : logger.info ( 'Generated dataset #%d\n%s' % ( i , dataset ) )
+            ## 0. set the seed for this toy
+            if not seed is None : set_seed ( seed + i )
+        
+            ## 1. reset PDF parameters 
+            gen_pdf.load_params ( None , fix_gen_init , silent = silent )
+            gen_pdf.load_params ( None , fix_gen_pars , silent = silent )
+
+            ## 2. generate dataset!
+            dataset =  gen_fun ( gen_pdf , varset = varset , **gen_config ) 
+            if not silent : logger.info ( 'Generated dataset #%d\n%s' % ( i , dataset ) )
 
-        ## 3. reset parameters of fit_pdf
-        fit_pdf.load_params ( None , fix_fit_init , silent = silent )
-        fit_pdf.load_params ( None , fix_fit_pars , silent = silent )
+            ## 3. reset parameters of fit_pdf
+            fit_pdf.load_params ( None , fix_fit_init , silent = silent )
+            fit_pdf.load_params ( None , fix_fit_pars , silent = silent )
         
-        ## 4. fit it!  
-        r = fit_fun ( fit_pdf , dataset , **fitcnf ) 
-        if not silent :
-            logger.info ( 'Fit result #%d\n%s' % ( i , r.table ( title = 'Fit result #%d' % i , prefix = '# ' ) ) )
+            ## 4. fit it!  
+            r = fit_fun ( fit_pdf , dataset , **fitcnf ) 
+            if not silent :
+                logger.info ( 'Fit result #%d\n%s' % ( i , r.table ( title = 'Fit result #%d' % i , prefix = '# ' ) ) )
+
+            ## fit status 
+            fits [ r.status  () ] += 1
+
+            ## covariance matrix quality
+            covs [ r.covQual () ] += 1
+
+            ## ok ?
+            accepted = accept_fun ( r , fit_pdf , dataset )
+            if accepted :
+                rpf  = r.params ( float_only = True ) 
+                row  = dict ( ( p , [ rpf [ p ] [ 0 ] ] ) for p in rpf )
+                more = dict ( ( v , more_vars [ v ] ( r , fit_pdf ) ) for v in more_vars )
+                for v in more : row [ v ] = [ more [ v ] ] 
+            
+            if not db is None :
+            
+                ## 5. stream results into database 
+                db.record ( i , seed + i , r , accepted , len ( dataset ) , more if accepted else {} ) 
+            
+            elif accepted : 
 
-        ## fit status 
-        fits [ r.status  () ] += 1
+                ## 5. save results 
+                for p in row : results [ p ] += row [ p ] 
+                results [ '#' ] .append ( len ( dataset ) )
 
-        ## covariance matrix quality
-        covs [ r.covQual () ] += 1
+            ## 6. update the running statistics 
+            if tracker and accepted : tracker.update ( row )
 
-        ## ok ?
-        if accept_fun ( r , fit_pdf , dataset ) : 
+            dataset.clear()
+            del dataset
 
-            ## 5. save results 
-            rpf = r.params ( float_only = True ) 
-            for i in rpf : 
-                results [ i ].append ( rpf[i][0] ) 
-                
-            for v in more_vars :
-                func  = more_vars[v] 
-                results [ v ] .append ( func ( r , fit_pdf ) )
-                
-            results [ '#' ] .append ( len ( dataset ) )
+            ## 7. target precision is reached? 
+            if tracker and 0 == ( k + 1 ) % batch and tracker.reached :
+                if progress or not silent :
+                    logger.info ( 'make_toys2: target precision is reached after %d toys' % ( k + 1 ) )
+                break 
+        
+        ## (all) results from database 
+        if not db is None : results , fits , covs = db.load () 
 
-        dataset.clear()
-        del dataset
+    finally :
+        
+        ## always close database: the pending toys are committed 
+        if not db is None : db.close ()
         
     ## make a final statistics 
-    stats = defaultdict ( SE )
-    
-    for par in results :
-        pars = results [ par ]
-        for v in pars : 
-            v0 = float ( v )         
-            stats [ par ] += v0 
-            
-    for k in fits :
-        stats ['- Status  %s' % k ] = fits [ k ]
-    for k in covs :
-        stats ['- CovQual %s' % k ] = covs [ k ]
+    stats = make_stats ( results , fits , covs )
                     
-    if progress or not silent : print_stats ( stats , nToys )
+    if progress or not silent :
+        print_stats ( stats , _toys_number_ ( fits ) if tracker else nToys )
+        if tracker : logger.info ( 'Toys precision:\n%s' % tracker.table ( prefix = '# ' ) )
 
     return results, stats 
 
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/fitting/toysdb.py
+#
+#  On-disk storage for the results of fitting toys.
+#
+#  The results are streamed incrementally into <code>ostap.io</code>
+#  shelve-like database (SQLite- or ROOT-based), one row per toy:
+#  - the toy index and the seed used for this toy
+#  - fit status and the quality of the covariance matrix
+#  - values and errors of all floating parameters
+#  - the additional variables, see <code>more_vars</code>
+#
+#  Since each toy is generated with its own seed,
+#  <code>base_seed + index</code>, the interrupted campaign can be resumed:
+#  the already stored toys are skipped, and the results do not depend on
+#  the splitting of the campaign into (parallel) subjobs.
+#
+#  @code
+#  results , stats = make_toys ( ... , dbase = 'toys.db' )
+#  ## later
+#  print_stats ( 'toys.db' )
+#  with ToysDB ( 'toys.db' ) as db : results , stats = db.results () , db.stats ()
+#  @endcode
+#
+#  @see ostap.fitting.toys.make_toys
+#  @see ostap.fitting.toys.make_toys2
+#  @see ostap.parallel.parallel_toys.parallel_toys
+#  @see ostap.parallel.parallel_toys.parallel_toys2
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-21
+# =============================================================================
+"""On-disk storage for the results of fitting toys.
+
+The results are streamed incrementally into `ostap.io`
+shelve-like database (SQLite- or ROOT-based), one row per toy:
+- the toy index and the seed used for this toy
+- fit status and the quality of the covariance matrix
+- values and errors of all floating parameters
+- the additional variables, see `more_vars`
+
+Since each toy is generated with its own seed,
+`base_seed + index`, the interrupted campaign can be resumed:
+the already stored toys are skipped, and the results do not depend on
+the splitting of the campaign into (parallel) subjobs.
+
+>>> results , stats = make_toys ( ... , dbase = 'toys.db' )
+>>> ## later
+>>> print_stats ( 'toys.db' )
+>>> with ToysDB ( 'toys.db' ) as db : results , stats = db.results () , db.stats ()
+
+- see ostap.fitting.toys.make_toys
+- see ostap.fitting.toys.make_toys2
+- see ostap.parallel.parallel_toys.parallel_toys
+- see ostap.parallel.parallel_toys.parallel_toys2
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-03-21'
+__all__     = (
+    'ToysDB'   , ## on-disk storage for the results of fitting toys
+    'set_seed' , ## set the seed for all random generators
+    )
+# =============================================================================
+from   ostap.logger.logger import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.fitting.toysdb' )
+else                      : logger = getLogger ( __name__               )
+# =============================================================================
+import ROOT, random, time
+from   collections            import defaultdict
+from   ostap.core.ostap_types import string_types
+# =============================================================================
+## set the seed for all random generators:
+#  - python
+#  - <code>ROOT.gRandom</code>
+#  - <code>ROOT.RooRandom</code>
+def set_seed ( seed ) :
+    """Set the seed for all random generators:
+    - python
+    - ROOT.gRandom
+    - ROOT.RooRandom
+    """
+    random.seed ( seed )
+    ROOT.gRandom.SetSeed ( seed )
+    ROOT.RooRandom.randomGenerator ().SetSeed ( seed )
+
+# =============================================================================
+## @class ToysDB
+#  On-disk storage for the results of fitting toys.
+#  @code
+#  with ToysDB ( 'toys.db' ) as db :
+#     seed = db.init ( seed )
+#     for index in range ( nToys ) :
+#        if index in db.done : continue
+#        set_seed ( seed + index )
+#        ...
+#        db.record ( index , seed + index , result , accepted , len ( dataset ) , more )
+#     results = db.results ()
+#     stats   = db.stats   ()
+#  @endcode
+#  - files with <code>.root</code> extension are opened with
+#    <code>ostap.io.rootshelve</code>, other files with
+#    <code>ostap.io.sqliteshelve</code>;
+#  - already opened shelve-like database (or other ToysDB) can be used as well
+#  - several toy campaigns can be kept in the same database using different tags
+#  - the recorded toys are committed in batches: every <code>commit_every</code>
+#    toys or every <code>commit_time</code> seconds, and always at <code>close</code>
+class ToysDB(object) :
+    """On-disk storage for the results of fitting toys.
+    >>> with ToysDB ( 'toys.db' ) as db :
+    ...     seed = db.init ( seed )
+    ...     for index in range ( nToys ) :
+    ...        if index in db.done : continue
+    ...        set_seed ( seed + index )
+    ...        ...
+    ...        db.record ( index , seed + index , result , accepted , len ( dataset ) , more )
+    ...     results = db.results ()
+    ...     stats   = db.stats   ()
+    - files with `.root` extension are opened with `ostap.io.rootshelve`,
+    other files with `ostap.io.sqliteshelve`;
+    - already opened shelve-like database (or other ToysDB) can be used as well
+    - several toy campaigns can be kept in the same database using different tags
+    - the recorded toys are committed in batches: every `commit_every`
+    toys or every `commit_time` seconds, and always at `close`
+    """
+    def __init__ ( self , dbase , tag = 'toys' , commit_every = 100 , commit_time = 60 ) :
+
+        self.__close = False
+        if   isinstance ( dbase , ToysDB       ) :
+            dbase        = dbase.dbase
+        elif isinstance ( dbase , string_types ) :
+            if dbase.lower().endswith ( '.root' ) :
+                import ostap.io.rootshelve   as DBASE
+            else :
+                import ostap.io.sqliteshelve as DBASE
+            dbase        = DBASE.open ( dbase , 'c' )
+            self.__close = True
+
+        self.__dbase        = dbase
+        self.__tag          = tag
+        self.__commit_every = max ( 1 , int ( commit_every ) )
+        self.__commit_time  = commit_time
+        self.__pending      = 0 
+        self.__last         = time.time () 
+
+    ## context manager: ENTER
+    def __enter__ ( self      ) : return self
+    ## context manager: EXIT
+    def __exit__  ( self , *_ ) : self.close ()
+
+    # =========================================================================
+    ## close the database
+    def close ( self ) :
+        """Close the database
+        - the pending records are committed 
+        """
+        if self.__dbase is None : return 
+        if self.__pending : self.commit ()
+        if self.__close   : self.__dbase.close ()
+        self.__dbase = None
+
+    # =========================================================================
+    ## commit the changes
+    def commit ( self ) :
+        """Commit the changes"""
+        if hasattr ( self.__dbase , 'sync'   ) : self.__dbase.sync   ()
+        if hasattr ( self.__dbase , 'commit' ) : self.__dbase.commit ()
+        self.__pending = 0
+        self.__last    = time.time ()
+
+    # =========================================================================
+    ## initialize the campaign: get the base seed and store the meta-information
+    #  - if the campaign is already started, the stored base seed is used
+    #  @param seed   the base seed (if not specified, the random one is used)
+    #  @param init   the initial values of the parameters (for pulls)
+    #  @param more   the names of the additional variables
+    #  @return the base seed
+    def init ( self , seed = None , init = {} , more = () ) :
+        """Initialize the campaign: get the base seed and store the meta-information
+        - if the campaign is already started, the stored base seed is used
+        - returns the base seed
+        """
+        meta = self.meta
+        if meta :
+            if not seed is None and seed != meta [ 'seed' ] :
+                logger.warning ( "ToysDB: use the stored seed %s instead of %s" % ( meta [ 'seed' ] , seed ) )
+            return meta [ 'seed' ]
+
+        if seed is None : seed = random.randint ( 1 , 2**30 )
+        self.__dbase [ self.meta_key ] = { 'seed' : seed               ,
+                                           'init' : dict  ( init )     ,
+                                           'more' : tuple ( more )     }
+        self.commit ()
+        return seed
+
+    # =========================================================================
+    ## record the results of the toy
+    #  @param index    the toy index
+    #  @param seed     the seed used for this toy
+    #  @param result   the fit result
+    #  @param accepted is the fit accepted?
+    #  @param nevents  number of events in the toy dataset
+    #  @param more     the values of the additional variables
+    #  @param commit   commit policy: <code>True</code> - commit now,
+    #                  <code>False</code> - do not commit,
+    #                  <code>None</code> - commit in batches (default) 
+    def record ( self , index , seed , result , accepted , nevents , more = {} , commit = None ) :
+        """Record the results of the toy
+        - commit policy: `True` - commit now, `False` - do not commit,
+        `None` - commit in batches (default), see `commit_every` and `commit_time`
+        """
+        row = { 'index'    : index               ,
+                'seed'     : seed                ,
+                'status'   : result.status  ()   ,
+                'covqual'  : result.covQual ()   ,
+                'accepted' : bool ( accepted )   ,
+                'nevents'  : nevents             ,
+                'params'   : {}                  ,
+                'more'     : dict ( more )       }
+        if accepted :
+            rpf = result.params ( float_only = True )
+            for p in rpf : row [ 'params' ] [ p ] = rpf [ p ] [ 0 ]
+        self.__dbase [ self.row_key ( index ) ] = row
+        self.__pending += 1 
+        if   commit                                 : self.commit ()
+        elif commit is False                        : pass 
+        elif self.__commit_every <= self.__pending  : self.commit ()
+        elif self.__commit_time and self.__commit_time <= time.time () - self.__last : self.commit ()
+
+    # =========================================================================
+    ## merge the rows from other database (e.g. from the parallel subjob)
+    def merge ( self , other ) :
+        """Merge the rows from other database (e.g. from the parallel subjob)
+        """
+        with ToysDB ( other , self.__tag ) as db :
+            for row in db.rows () :
+                self.__dbase [ self.row_key ( row [ 'index' ] ) ] = row
+        self.commit ()
+
+    # =========================================================================
+    ## iterator over the stored rows (ordered by the toy index)
+    def rows ( self ) :
+        """Iterator over the stored rows (ordered by the toy index)"""
+        for key in sorted ( self.__dbase.ikeys ( '%s:[0-9]*' % self.__tag ) ) :
+            yield self.__dbase [ key ]
+
+    # =========================================================================
+    ## load the results: the fit results, fit statuses and covariance qualities
+    #  @code
+    #  db = ...
+    #  results , fits , covs = db.load ()
+    #  @endcode
+    def load ( self ) :
+        """Load the results: the fit results, fit statuses and covariance qualities
+        >>> db = ...
+        >>> results , fits , covs = db.load ()
+        """
+        from ostap.core.core import SE
+        results = defaultdict ( list )
+        fits    = defaultdict ( SE   )
+        covs    = defaultdict ( SE   )
+        for row in self.rows () :
+            fits [ row [ 'status'  ] ] += 1
+            covs [ row [ 'covqual' ] ] += 1
+            if not row [ 'accepted' ] : continue
+            for p , v in row [ 'params' ].items () : results [ p ].append ( v )
+            for p , v in row [ 'more'   ].items () : results [ p ].append ( v )
+            results [ '#' ].append ( row [ 'nevents' ] )
+        return results , fits , covs
+
+    # =========================================================================
+    ## get the results of the toys (only for accepted fits)
+    def results ( self ) :
+        """Get the results of the toys (only for accepted fits)"""
+        return self.load () [ 0 ]
+
+    # =========================================================================
+    ## get the statistics of the toys
+    #  @see ostap.fitting.toys.make_stats
+    def stats ( self ) :
+        """Get the statistics of the toys
+        - see ostap.fitting.toys.make_stats
+        """
+        from ostap.fitting.toys import make_stats
+        meta = self.meta
+        results , fits , covs = self.load ()
+        return make_stats ( results , fits , covs ,
+                            init      = meta.get ( 'init' , {} ) ,
+                            more_vars = meta.get ( 'more' , () ) )
+
+    # =========================================================================
+    ## the key for the row
+    def row_key ( self , index ) :
+        """The key for the row"""
+        return '%s:%010d' % ( self.__tag , index )
+
+    @property
+    def meta_key ( self ) :
+        """``meta_key'' : the key for the meta-information"""
+        return '%s:meta' % self.__tag
+
+    @property
+    def meta ( self ) :
+        """``meta'' : meta-information for the campaign"""
+        return self.__dbase.get ( self.meta_key , {} )
+
+    @property
+    def done ( self ) :
+        """``done'' : indices of the already stored toys"""
+        return frozenset ( int ( k.split ( ':' ) [ -1 ] ) for k in self.__dbase.ikeys ( '%s:[0-9]*' % self.__tag ) )
+
+    @property
+    def dbase ( self ) :
+        """``dbase'' : the underlying shelve-like database"""
+        return self.__dbase
+
+    @property
+    def pending ( self ) :
+        """``pending'' : number of recorded, but not yet committed toys"""
+        return self.__pending
+    
+    @property
+    def tag ( self ) :
+        """``tag'' : the tag of the campaign"""
+        return self.__tag
+
+    def __len__ ( self ) :
+        return len ( self.done )
+
+    ## valid (opened) database? Note: the empty database is valid! 
+    def __bool__    ( self ) : return self.__dbase is not None
+    ## valid (opened) database? Note: the empty database is valid! 
+    def __nonzero__ ( self ) : return self.__bool__ ()
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -16,9 +16,14 @@ __all__     = (
     'report_print'       , ## print the report 
     'report_print_table' , ## print the report 
     'report_as_table'    , ## print the report 
+    'FrameResult'        , ## (lazy) result of the actions booked on the frame 
+    'frame_statVar'      , ## get (lazy) statistics for the expression 
+    'frame_statCov'      , ## get (lazy) covariance for two expressions 
+    'frame_nEff'         , ## get (lazy) number of effective entries
+    'frame_moments'      , ## get (lazy) weighted moments-counter 
     ) 
 # =============================================================================
-import ROOT
+import ROOT, weakref 
 # =============================================================================
 # logging 
 # =============================================================================
@@ -74,19 +79,41 @@ if not hasattr ( DataFrame , '_fr_old_init_' ) :
     DataFrame._fr_old_init_ = DataFrame.__init__
     DataFrame.__init__      = _fr_new_init_
     
+# =============================================================================
+## cache of the (lazy) counters for the frame nodes: id -> ( weakref , count )
+_fr_len_cache_ = {}
 # =============================================================================
 ## Get the length/size of the data frame
+#  The (lazy) counter is booked once per frame node and cached,
+#  therefore the event loop is not repeated for the subsequent calls.
+#  The counter is evaluated in the same event loop with all other actions
+#  booked before the first call.
 #  @code
 #  frame = ...
 #  print len(frame)
 #  @endcode 
 def _fr_len_ ( f ) :
     """Get the length/size of the data frame
+    - the (lazy) counter is booked once per frame node and cached,
+    therefore the event loop is not repeated for the subsequent calls
+    - the counter is evaluated in the same event loop with all other actions
+    booked before the first call
     >>> frame = ...
     >>> print len(frame)
     """
-    cpf = Ostap.DataFrame ( f )   ## make independet loop?
-    return cpf.Count().GetValue() 
+    key   = id ( f )
+    entry = _fr_len_cache_.get ( key , None )
+    if entry and entry [ 0 ] () is f : return entry [ 1 ].GetValue()
+
+    cnt = f.Count ()  ## lazy action 
+    try :
+        ## remove the cached counter together with the frame 
+        ref = weakref.ref ( f , lambda r , k = key : _fr_len_cache_.pop ( k , None ) )
+        _fr_len_cache_ [ key ] = ref , cnt 
+    except TypeError :
+        pass
+    
+    return cnt.GetValue() 
 
 # =============================================================================
 ## Draw (lazy) progress bar for the    DataFrame:
@@ -130,11 +157,16 @@ def _fr_progress_bar_ ( self          ,
 #  data = ...
 #  neff = data.nEff('b1*b1')
 #  @endcode
-def _fr_nEff_  ( self , cuts = '' ) :
+#  For <code>lazy=True</code> the (lazy) FrameResult is returned 
+#  @see frame_nEff
+def _fr_nEff_  ( self , cuts = '' , lazy = False ) :
     """Get the effective entries in data frame 
     >>> data = ...
     >>> neff = data.nEff('b1*b1')
+    For lazy=True the (lazy) FrameResult is returned 
+    >>> neff = data.nEff('b1*b1', lazy = True ) 
     """
+    if lazy : return frame_nEff ( self , cuts ) 
     return Ostap.StatVar.nEff ( self , cuts )
 
 # =============================================================================
@@ -144,12 +176,17 @@ def _fr_nEff_  ( self , cuts = '' ) :
 #  c1 = data.statVar( 'S_sw' , 'pt>10' ) 
 #  c2 = data.statVar( 'S_sw' , 'pt>0'  )
 #  @endcode
-def _fr_statVar_ ( self  , expression ,  cuts = '' ) :
+#  For <code>lazy=True</code> the (lazy) FrameResult is returned 
+#  @see frame_statVar
+def _fr_statVar_ ( self  , expression ,  cuts = '' , lazy = False ) :
     """Get statistics for the  given expression in data frame
     >>> data = ...
     >>> c1 = data.statVar( 'S_sw' , 'pt>10' ) 
     >>> c2 = data.statVar( 'S_sw' )
+    For lazy=True the (lazy) FrameResult is returned 
+    >>> c3 = data.statVar( 'S_sw' , 'pt>10' , lazy = True ) 
     """
+    if lazy : return frame_statVar ( self , expression , cuts ) 
     return Ostap.StatVar.statVar( self , expression , cuts , )
 
 # =============================================================================
@@ -160,12 +197,15 @@ def _fr_statVar_ ( self  , expression ,  cuts = '' ) :
 #  # apply some cuts 
 #  stat1 , stat2 , cov2 , len = frame.statCov( 'x' , 'y' , 'z>0' )
 #  @endcode
+#  For <code>lazy=True</code> the (lazy) FrameResult is returned 
+#  @see frame_statCov
 #  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
 #  @date   2018-06-18
-def _fr_statCov_ ( frame       ,
-                   expression1 ,
-                   expression2 ,
-                   cuts = ''   ) :
+def _fr_statCov_ ( frame        ,
+                   expression1  ,
+                   expression2  ,
+                   cuts = ''    ,
+                   lazy = False ) :
     """Get the statistic for pair of expressions in DataFrame
     
     >>>  frame  = ...
@@ -174,7 +214,11 @@ def _fr_statCov_ ( frame       ,
     Apply some cuts:
     >>> stat1 , stat2 , cov2 , len = frame.statCov( 'x' , 'y' , 'z>0' )
     
+    For lazy=True the (lazy) FrameResult is returned 
+    >>> r = frame.statCov( 'x' , 'y' , 'z>0' , lazy = True )
+    >>> stat1 , stat2 , cov2 , len = r.GetValue () 
     """
+    if lazy : return frame_statCov ( frame , expression1 , expression2 , cuts ) 
     import ostap.math.linalg 
     stat1  = Ostap.WStatEntity       ()
     stat2  = Ostap.WStatEntity       ()
@@ -190,6 +234,235 @@ def _fr_statCov_ ( frame       ,
         
     return stat1 , stat2 , cov2 , length
 
+# =============================================================================
+## @class FrameResult
+#  The (lazy) result of the actions booked on the frame, similar to
+#  <code>ROOT::RDF::RResultPtr</code>. All actions booked before the first
+#  call of <code>GetValue</code> are executed in the same (multithreaded) event loop
+#  @code
+#  frame = ...
+#  s1 = frame.statVar ( 'x' , 'w' , lazy = True ) ## nothing is executed here 
+#  s2 = frame.statVar ( 'y' , 'w' , lazy = True ) ## nothing is executed here
+#  n  = frame.nEff    (       'w' , lazy = True ) ## nothing is executed here
+#  print ( s1.GetValue() ) ## the single event loop for all booked actions 
+#  print ( s2.GetValue() ) ## no event loop here 
+#  print ( n .GetValue() ) ## no event loop here 
+#  @endcode
+class FrameResult(object) :
+    """The (lazy) result of the actions booked on the frame, similar to
+    ROOT.RDF.RResultPtr. All actions booked before the first call of
+    `GetValue` are executed in the same (multithreaded) event loop
+    >>> frame = ...
+    >>> s1 = frame.statVar ( 'x' , 'w' , lazy = True ) ## nothing is executed here 
+    >>> s2 = frame.statVar ( 'y' , 'w' , lazy = True ) ## nothing is executed here
+    >>> n  = frame.nEff    (       'w' , lazy = True ) ## nothing is executed here
+    >>> print ( s1.GetValue() ) ## the single event loop for all booked actions 
+    >>> print ( s2.GetValue() ) ## no event loop here 
+    >>> print ( n .GetValue() ) ## no event loop here 
+    """
+    def __init__ ( self , results , transform = None ) :
+        
+        self.__results   = tuple ( results ) 
+        self.__transform = transform
+        self.__value     = None
+        self.__ready     = False
+        
+    ## get the value (trigger the event loop, if needed) 
+    def GetValue ( self ) :
+        """Get the value (trigger the event loop, if needed)"""
+        if not self.__ready :
+            values = tuple ( r.GetValue() for r in self.__results )
+            if   self.__transform   : self.__value = self.__transform ( *values )
+            elif 1 == len ( values ) : self.__value = values [ 0 ]
+            else                     : self.__value = values
+            self.__ready   = True
+            self.__results = ()             ## release the results 
+        return self.__value
+
+    ## is the result ready? 
+    def IsReady ( self ) :
+        """Is the result ready?"""
+        return self.__ready or all ( r.IsReady() for r in self.__results ) 
+
+    @property
+    def value ( self ) :
+        """``value'' : the actual value (trigger the event loop, if needed)"""
+        return self.GetValue ()
+    
+    def __str__ ( self ) :
+        return str ( self.GetValue () ) if self.IsReady () else 'FrameResult(lazy)'
+    __repr__ = __str__
+    
+# =============================================================================
+## @class _FrameValue
+#  helper class to wrap already calculated value, used for old ROOT versions
+class _FrameValue(object) :
+    """Helper class to wrap already calculated value"""
+    def __init__ ( self , value ) : self.__value = value
+    def GetValue ( self ) : return self.__value
+    def IsReady  ( self ) : return True
+        
+# =============================================================================
+## are lazy frame actions available?
+#  @see Ostap::Actions
+def _fr_lazy_ () :
+    """Are lazy frame actions available?
+    - see Ostap.Actions 
+    """
+    return hasattr ( Ostap , 'Actions' ) and hasattr ( Ostap.Actions , 'book' )
+
+# =============================================================================
+## is this selection/weight a trivial one?
+def _fr_trivial_ ( cuts ) :
+    """Is this selection/weight a trivial one?"""
+    return str ( cuts ).strip() in ( '' , '1' , '1.' , '1.0' , 'true' , 'True' )
+
+# =============================================================================
+## prepare the frame node for the lazy actions:
+#  apply the selection and define the temporary columns
+#  for the expressions and weight
+#  @code
+#  node , columns , weight = _fr_node_ ( frame , [ 'x' , 'y' ] , 'pt>1' ) 
+#  @endcode
+def _fr_node_ ( frame , expressions , cuts = '' ) :
+    """Prepare the frame node for the lazy actions:
+    apply the selection and define the temporary columns
+    for the expressions and weight
+    >>> node , columns , weight = _fr_node_ ( frame , [ 'x' , 'y' ] , 'pt>1' )
+    """
+    from ostap.core.core import rootID
+    
+    node    = frame
+    cuts    = str ( cuts ).strip() 
+    trivial = _fr_trivial_ ( cuts )
+    
+    if not trivial : node = node.Filter ( '(bool) ( %s )' % cuts )
+    
+    columns = []
+    for e in expressions :
+        v    = rootID ( 'v_' )
+        node = node.Define ( v , '1.0*(%s)' % e )
+        columns.append ( v ) 
+
+    weight = rootID ( 'w_' )
+    node   = node.Define ( weight , '1.0' if trivial else '1.0*(%s)' % cuts )
+
+    return node , columns , weight
+
+# =============================================================================
+## Get the (lazy) statistics for the given expression in data frame
+#  @code
+#  frame = ...
+#  s1 = frame_statVar ( frame , 'S_sw' , 'pt>10' ) ## nothing is executed here 
+#  s2 = frame_statVar ( frame , 'pt'   , 'S_sw'  ) ## nothing is executed here 
+#  print ( s1.GetValue() , s2.GetValue() )        ## the single loop for both
+#  @endcode
+#  @return FrameResult for Ostap::WStatEntity 
+#  @see Ostap::Actions::WCounter
+def frame_statVar ( frame , expression , cuts = '' ) :
+    """Get the (lazy) statistics for the given expression in data frame
+    >>> frame = ...
+    >>> s1 = frame_statVar ( frame , 'S_sw' , 'pt>10' ) ## nothing is executed here 
+    >>> s2 = frame_statVar ( frame , 'pt'   , 'S_sw'  ) ## nothing is executed here 
+    >>> print ( s1.GetValue() , s2.GetValue() )        ## the single loop for both
+    - see Ostap.Actions.WCounter
+    """
+    if not _fr_lazy_ () :
+        return FrameResult ( [ _FrameValue ( Ostap.StatVar.statVar ( frame , expression , cuts ) ) ] )
+
+    node , columns , weight = _fr_node_ ( frame , [ expression ] , cuts )
+    result = Ostap.Actions.book ( node , Ostap.WStatEntity () , columns [ 0 ] , weight )
+    return FrameResult ( [ result ] , lambda s : Ostap.WStatEntity ( s ) )
+
+# =============================================================================
+## Get the (lazy) statistic for pair of expressions in data frame
+#  @code
+#  frame = ...
+#  r = frame_statCov ( frame , 'x' , 'y' , 'z>0' ) ## nothing is executed here 
+#  stat1 , stat2 , cov2 , length = r.GetValue()
+#  @endcode
+#  @return FrameResult for ( stat1 , stat2 , cov2 , length ) 
+#  @see Ostap::Actions::WCovariance
+def frame_statCov ( frame , expression1 , expression2 , cuts = '' ) :
+    """Get the (lazy) statistic for pair of expressions in data frame
+    >>> frame = ...
+    >>> r = frame_statCov ( frame , 'x' , 'y' , 'z>0' ) ## nothing is executed here 
+    >>> stat1 , stat2 , cov2 , length = r.GetValue()
+    - see Ostap.Actions.WCovariance
+    """
+    if not _fr_lazy_ () :
+        return FrameResult ( [ _FrameValue ( _fr_statCov_ ( frame , expression1 , expression2 , cuts ) ) ] )
+    
+    import ostap.math.linalg
+    node , columns , weight = _fr_node_ ( frame , [ expression1 , expression2 ] , cuts )
+    result = Ostap.Actions.covariance ( node , columns [ 0 ] , columns [ 1 ] , weight )
+    return FrameResult ( [ result ] ,
+                         lambda c : ( Ostap.WStatEntity ( c.stat1 () ) ,
+                                      Ostap.WStatEntity ( c.stat2 () ) ,
+                                      c.cov2 () , c.n () ) ) 
+
+# =============================================================================
+## Get the (lazy) number of effective entries in data frame
+#  \f$ n_{eff} = \frac{ (\sum w)^2}{ \sum w^2} \f$
+#  @code
+#  frame = ...
+#  r = frame_nEff ( frame , 'S_sw' ) ## nothing is executed here 
+#  print ( r.GetValue () ) 
+#  @endcode
+def frame_nEff ( frame , cuts = '' ) :
+    """Get the (lazy) number of effective entries in data frame
+    >>> frame = ...
+    >>> r = frame_nEff ( frame , 'S_sw' ) ## nothing is executed here 
+    >>> print ( r.GetValue () ) 
+    """
+    if _fr_trivial_ ( cuts ) :
+        return FrameResult ( [ frame.Count () ] , lambda n : float ( n ) )
+    
+    from ostap.core.core import rootID
+    node , columns , weight = _fr_node_ ( frame , [] , cuts )
+    weight2 = rootID ( 'w2_' )
+    node    = node.Define ( weight2 , '%s*%s' % ( weight , weight ) )
+    return FrameResult ( [ node.Sum ( weight ) , node.Sum ( weight2 ) ] ,
+                         lambda sw , sw2 : sw * sw / sw2 if sw2 else 0.0 )
+
+# =============================================================================
+## Get the (lazy) weighted moment-counter for the given expression in data frame
+#  @code
+#  frame = ...
+#  r = frame_moments ( frame , 4 , 'x' , 'S_sw' ) ## nothing is executed here 
+#  m = r.GetValue() 
+#  print ( m.mean () , m.variance () , m.skewness () , m.kurtosis () )
+#  @endcode
+#  @return FrameResult for Ostap::Math::WMoment_<order> 
+#  @see Ostap::Math::WMoment_
+#  @see Ostap::Actions::WCounter
+def frame_moments ( frame , order , expression , cuts = '' ) :
+    """Get the (lazy) weighted moment-counter for the given expression in data frame
+    >>> frame = ...
+    >>> r = frame_moments ( frame , 4 , 'x' , 'S_sw' ) ## nothing is executed here 
+    >>> m = r.GetValue() 
+    >>> print ( m.mean () , m.variance () , m.skewness () , m.kurtosis () )
+    - see Ostap.Math.WMoment_
+    - see Ostap.Actions.WCounter
+    """
+    assert isinstance ( order , integer_types ) and 0 <= order , 'Invalid order %s' % order
+
+    import ostap.stats.moment 
+    counter = Ostap.Math.WMoment_ ( order ) 
+    
+    if not _fr_lazy_ () :
+        ## old ROOT: no lazy actions, make the explicit loop 
+        cnt = counter ()
+        node , columns , weight = _fr_node_ ( frame , [ expression ] , cuts )
+        for v , w in zip ( node.Take['double'] ( columns [ 0 ] ).GetValue () ,
+                           node.Take['double'] ( weight       ).GetValue () ) :
+            cnt.add ( v , w )
+        return FrameResult ( [ _FrameValue ( cnt ) ] )
+    
+    node , columns , weight = _fr_node_ ( frame , [ expression ] , cuts )
+    result = Ostap.Actions.book ( node , counter () , columns [ 0 ] , weight )
+    return FrameResult ( [ result ] , lambda m : counter ( m ) ) 
+
 # =============================================================================
 ## Simplified print out for the  frame 
 #  @code 
@@ -293,6 +566,7 @@ DataFrame .__repr__    = _fr_print_
 DataFrame .nEff        = _fr_nEff_
 DataFrame .statVar     = _fr_statVar_
 DataFrame .statCov     = _fr_statCov_
+DataFrame .moments     = frame_moments 
 DataFrame .ProgressBar = _fr_progress_bar_
 DataFrame .progress    = _fr_progress_bar_
 
@@ -326,7 +600,7 @@ _new_methods_       = (
     DataFrame.nEff             ,
     DataFrame.statVar          ,
     DataFrame.statCov          ,
-    DataFrame.nEff             ,
+    DataFrame.moments          ,
     #
     DataFrame.get_moment       , 
     DataFrame.central_moment   , 
@@ -97,6 +97,48 @@ def test_frame2 ( ) :
     h1 = tree .draw('b1','1/b1')
     h2 = frame.draw('b1','1/b1')
     
+
+def test_frame3 ( ) :
+
+    ## book several lazy actions: nothing is executed here 
+    s1  = frame.statVar ( 'b1' , 'b1/(b2+1)'       , lazy = True )
+    s2  = frame.statVar ( 'b2' , 'b1>100'          , lazy = True )
+    c12 = frame.statCov ( 'b1' , 'b2' , 'b1<500'   , lazy = True )
+    w12 = frame.statCov ( 'b1' , 'b2' , 'b1/(b2+1)' , lazy = True )
+    ne  = frame.nEff    ( 'b1/(b2+1)'              , lazy = True )
+    m4  = frame.moments ( 4 , 'b1' , 'b1/(b2+1)'             )
+
+    ## the single event loop for all booked actions 
+    with timing ( 'Lazy actions' , logger ) :
+        logger.info ( 'statVar (lazy) : %s' % s1.GetValue() )
+    assert s2.IsReady () and ne.IsReady () , 'Lazy actions are not executed together!'
+
+    e1  = frame.statVar ( 'b1' , 'b1/(b2+1)' )
+    assert s1.GetValue().nEntries() == e1.nEntries ()   , 'Invalid lazy statVar!'
+    assert abs ( s1.GetValue().mean() - e1.mean() ) < 1.e-6 , 'Invalid lazy statVar!'
+    assert abs ( ne.GetValue() - frame.nEff ( 'b1/(b2+1)' ) ) < 1.e-6 , 'Invalid lazy nEff!'
+
+    _ , _ , cov2 , n = frame.statCov ( 'b1' , 'b2' , 'b1<500' ) 
+    _ , _ , lcov2 , ln = c12.GetValue()
+    assert n == ln and abs ( cov2 ( 0 , 1 ) - lcov2 ( 0 , 1 ) ) < 1.e-6 * abs ( cov2 ( 0 , 1 ) ) , \
+           'Invalid lazy statCov!'
+
+    ## weighted cut: lazy, eager and TTree-based covariances must agree 
+    _ , _ , tcov2 , tn = tree .statCov ( 'b1' , 'b2' , 'b1/(b2+1)' ) 
+    _ , _ , fcov2 , fn = frame.statCov ( 'b1' , 'b2' , 'b1/(b2+1)' ) 
+    _ , _ , wcov2 , wn = w12.GetValue()
+    assert tn == fn == wn , 'Invalid weighted statCov!'
+    for i , j in ( ( 0 , 0 ) , ( 0 , 1 ) , ( 1 , 1 ) ) :
+        assert abs ( tcov2 ( i , j ) - wcov2 ( i , j ) ) < 1.e-6 * abs ( tcov2 ( i , j ) ) , \
+               'Invalid lazy weighted statCov!'
+        assert abs ( tcov2 ( i , j ) - fcov2 ( i , j ) ) < 1.e-6 * abs ( tcov2 ( i , j ) ) , \
+               'Invalid eager weighted statCov!'
+    
+    logger.info ( 'moments (lazy) : %s' % m4.GetValue() )
+
+    ## cached length 
+    assert len ( frame ) == len ( frame ) == len ( tree ) , 'Invalid length!'
+    
         
 # =============================================================================
 if '__main__' == __name__ :
@@ -104,6 +146,7 @@ if '__main__' == __name__ :
     ## test_frame0 () 
     ## test_frame1 ()
     ## test_frame2 ()
+    ## test_frame3 ()
     
     pass
 
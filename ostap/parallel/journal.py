@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/journal.py
+#
+#  Checkpoint/resume journal for long parallel jobs.
+#
+#  The journal records the identifiers of the merged jobs together with
+#  the partial merged result of the task in <code>ostap.io</code> shelve-like
+#  database (SQLite- or ROOT-based).
+#  If the processing is interrupted (e.g. master crashes or session is killed)
+#  the restarted call with the same task and the same arguments skips the
+#  already completed jobs and continues from the last merged state
+#
+#  @code
+#  wm = WorkManager ( ... )
+#  wm.process ( task , items , journal = 'toys_journal.db' )
+#  @endcode
+#
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-02-20
+# =============================================================================
+"""Checkpoint/resume journal for long parallel jobs.
+
+The journal records the identifiers of the merged jobs together with
+the partial merged result of the task in `ostap.io` shelve-like
+database (SQLite- or ROOT-based).
+If the processing is interrupted (e.g. master crashes or session is killed)
+the restarted call with the same task and the same arguments skips the
+already completed jobs and continues from the last merged state
+
+>>> wm = WorkManager ( ... )
+>>> wm.process ( task , items , journal = 'toys_journal.db' )
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-02-20'
+__all__     = (
+    'TaskJournal'      , ## checkpoint/resume journal for the task
+    'task_fingerprint' , ## fingerprint of the task and its arguments
+    )
+# =============================================================================
+from   ostap.logger.logger import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.parallel.journal' )
+else                      : logger = getLogger ( __name__                 )
+# =============================================================================
+import os, pickle, hashlib, time
+from   ostap.core.ostap_types import string_types
+# =============================================================================
+## get the fingerprint of the task and its arguments
+#  @code
+#  fp = task_fingerprint ( task , items )
+#  @endcode
+#  - the type of the task,
+#  - the serialized state of the task; if the task can't be serialized,
+#    its attributes are serialized one-by-one, and for non-serializable
+#    attributes only their types and names are used 
+#  - the string representation of all the arguments
+def task_fingerprint ( task , items , tag = '' ) :
+    """Get the fingerprint of the task and its arguments
+    >>> fp = task_fingerprint ( task , items )
+    - the type of the task,
+    - the serialized state of the task; if the task can't be serialized,
+    its attributes are serialized one-by-one, and for non-serializable
+    attributes only their types and names are used 
+    - the string representation of all the arguments
+    """
+    hash_obj = hashlib.sha1 ()
+    hash_obj.update ( ( '%s.%s' % ( type ( task ).__module__ , type ( task ).__name__ ) ).encode() )
+    try :
+        hash_obj.update ( pickle.dumps ( task , protocol = 2 ) )
+    except Exception :
+        state = vars ( task ) 
+        for key in sorted ( state ) :
+            value = state [ key ] 
+            hash_obj.update ( key.encode () ) 
+            try :
+                hash_obj.update ( pickle.dumps ( value , protocol = 2 ) )
+            except Exception :
+                name = getattr ( value , 'name' , '' )
+                hash_obj.update ( ( '%s:%s' % ( type ( value ).__name__ , name ) ).encode () )
+    for item in items :
+        hash_obj.update ( str ( item ).encode () )
+    if tag : hash_obj.update ( str ( tag ).encode () )
+    return hash_obj.hexdigest ()
+
+# =============================================================================
+## @class TaskJournal
+#  Checkpoint/resume journal for the task.
+#  It records the identifiers of the merged jobs together with
+#  the partial merged result of the task in <code>ostap.io</code>
+#  shelve-like database
+#  @code
+#  with TaskJournal ( 'journal.db' , task , items ) as journal :
+#     task.initialize_local ()
+#     journal.restore ( task )
+#     done = journal.done 
+#     for jobid , item in enumerate ( items ) :
+#        if jobid in done : continue
+#        ...
+#        task.merge_results ( result , jobid )
+#        journal.record ( jobid , task )
+#     journal.complete ( task )
+#  @endcode
+#  - files with <code>.root</code> extension are opened with
+#    <code>ostap.io.rootshelve</code>, other files with
+#    <code>ostap.io.sqliteshelve</code>;
+#  - already opened shelve-like database can be used as well
+#  - the checkpoint (the pickled merged result) is made every <code>every</code>
+#    merged jobs or every <code>timeout</code> seconds, whatever comes first
+class TaskJournal(object) :
+    """Checkpoint/resume journal for the task.
+    It records the identifiers of the merged jobs together with
+    the partial merged result of the task in `ostap.io`
+    shelve-like database
+    >>> with TaskJournal ( 'journal.db' , task , items ) as journal :
+    ...     task.initialize_local ()
+    ...     journal.restore ( task )
+    ...     done = journal.done 
+    ...     for jobid , item in enumerate ( items ) :
+    ...        if jobid in done : continue
+    ...        ...
+    ...        task.merge_results ( result , jobid )
+    ...        journal.record ( jobid , task )
+    ...     journal.complete ( task )
+    - files with `.root` extension are opened with `ostap.io.rootshelve`,
+    other files with `ostap.io.sqliteshelve`;
+    - already opened shelve-like database can be used as well
+    - the checkpoint (the pickled merged result) is made every `every`
+    merged jobs or every `timeout` seconds, whatever comes first
+    """
+    def __init__ ( self           ,
+                   dbase          ,   ## file name or opened shelve-like database
+                   task           ,   ## the task
+                   items          ,   ## the arguments
+                   every   = 10   ,   ## make checkpoint every N merged jobs
+                   timeout = 60   ,   ## ... or every N seconds 
+                   tag    = ''    ) : ## additional tag for the fingerprint
+
+        self.__close = False
+        if isinstance ( dbase , string_types ) :
+            if dbase.lower().endswith ( '.root' ) :
+                import ostap.io.rootshelve   as DBASE
+            else :
+                import ostap.io.sqliteshelve as DBASE
+            dbase        = DBASE.open ( dbase , 'c' )
+            self.__close = True
+
+        self.__dbase   = dbase
+        self.__key     = 'journal_%s' % task_fingerprint ( task , items , tag )
+        self.__every   = max ( 1 , int ( every ) )
+        self.__timeout = max ( 0 , timeout )
+        self.__nitems  = len ( items )
+        self.__pending = 0
+        self.__last    = time.time () 
+
+        entry = self.__dbase.get ( self.__key , None )
+        if entry and entry.get ( 'nitems' , -1 ) == self.__nitems :
+            self.__done     = set ( entry [ 'done'   ] )
+            self.__state    =       entry [ 'result' ]
+            self.__complete =       entry [ 'complete' ]
+            logger.info ( "TaskJournal: %d/%d jobs are already done, resume processing" % (
+                len ( self.__done ) , self.__nitems ) )
+        else :
+            self.__done     = set ()
+            self.__state    = None
+            self.__complete = False
+
+    ## context manager: ENTER
+    def __enter__ ( self      ) : return self
+    ## context manager: EXIT
+    def __exit__  ( self , *_ ) : self.close ()
+
+    # =========================================================================
+    ## close the journal
+    def close ( self ) :
+        """Close the journal"""
+        if self.__dbase is not None and self.__close :
+            self.__dbase.close ()
+        self.__dbase = None
+
+    # =========================================================================
+    ## restore the task from the last merged state
+    #  @attention the task must be initialized before!
+    def restore ( self , task ) :
+        """Restore the task from the last merged state
+        - attention: the task must be initialized before!
+        """
+        if self.__done and self.__state is not None :
+            task.merge_results ( self.__state , -1 )
+        self.__state = None
+
+    # =========================================================================
+    ## record the merged job, make checkpoint if needed
+    def record ( self , jobid , task ) :
+        """Record the merged job, make checkpoint if needed
+        """
+        self.__done.add ( jobid )
+        self.__pending += 1
+        if self.__every <= self.__pending or self.__timeout <= time.time () - self.__last : 
+            self.checkpoint ( task )
+
+    # =========================================================================
+    ## make checkpoint: write the merged jobs and the merged result
+    def checkpoint ( self , task , complete = False ) :
+        """Make checkpoint: write the merged jobs and the merged result
+        """
+        if self.__dbase is None : return
+        self.__dbase [ self.__key ] = { 'nitems'   : self.__nitems        ,
+                                        'done'     : sorted ( self.__done ) ,
+                                        'result'   : task.results ()       ,
+                                        'complete' : complete              }
+        if hasattr ( self.__dbase , 'sync'   ) : self.__dbase.sync   ()
+        if hasattr ( self.__dbase , 'commit' ) : self.__dbase.commit ()
+        self.__pending = 0
+        self.__last    = time.time () 
+
+    # =========================================================================
+    ## mark the processing as completed
+    def complete ( self , task ) :
+        """Mark the processing as completed"""
+        self.__complete = True
+        self.checkpoint ( task , complete = True )
+
+    @property
+    def done ( self ) :
+        """``done'' : identifiers of already merged jobs"""
+        return frozenset ( self.__done )
+
+    @property
+    def completed ( self ) :
+        """``completed'' : is processing already completed?"""
+        return self.__complete
+
+    @property
+    def key ( self ) :
+        """``key'' : the key of the journal in the database"""
+        return self.__key
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
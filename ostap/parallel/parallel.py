@@ -30,7 +30,7 @@ from ostap.parallel.task import  Task, GenericTask
 
 import os
 
-workers = 'PATHOS' , 'GAUDIMP'
+workers = 'PATHOS' , 'GAUDIMP' , 'FUTURES'
 
 worker  = '' 
 
@@ -48,12 +48,21 @@ if not worker :
 
 # ===============================================================================
 from ostap.core.known_issues import DILL_ROOT_issue
-if DILL_ROOT_issue  :
+if DILL_ROOT_issue and 'FUTURES' != worker :
     worker = 'GAUDIMP'
 
 # ===============================================================================
 
-if  'GAUDIMP' != worker :
+if  'FUTURES' == worker :
+
+    try :
+        from ostap.parallel.parallel_futures import WorkManager 
+        logger.debug ('Use TaskManager from ostap.parallel.parallel_futures')
+    except ImportError :
+        from ostap.parallel.parallel_gaudi   import WorkManager 
+        logger.info  ('Use TaskManager from GaudiMP.Parallel'     )
+        
+elif  'GAUDIMP' != worker :
     
     try :
         from ostap.parallel.parallel_pathos import WorkManager 
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/parallel_booking.py
+#  (parallel) execution of the batch booking of projections and statistics
+#  for looong TChains/TTrees
+#  @see ostap.trees.booking
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-01
+# =============================================================================
+"""(parallel) execution of the batch booking of projections and statistics
+for looong TChains/TTrees
+- see ostap.trees.booking
+"""
+# =============================================================================
+__version__ = "$Revision$"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-01"
+__all__     = (
+    'pbooking'   , ## execute the booked requests in parallel
+    )
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.parallel.booking' )
+else                       : logger = getLogger ( __name__     )
+# =============================================================================
+import ROOT
+from   ostap.parallel.parallel import Task, WorkManager
+# =============================================================================
+## The simple task object to execute the booked requests for loooong chains
+#  @see ostap.trees.booking
+class BookingTask(Task) :
+    """The simple task object to execute the booked requests for loooong chains
+    - see ostap.trees.booking
+    """
+    ## constructor
+    def __init__ ( self , histos , stats , cuts = '' , covs = () ) :
+        """Constructor
+        >>> task  = BookingTask ( [ ( histo , [ 'mass' ] ) ] , [ 'pt' ] , 'pt>0' )
+        """
+        self.histos   = [ ( h , list ( e ) ) for h , e in histos ]
+        self.stats    = list ( stats )
+        self.cuts     = str  ( cuts  )
+        self.covs     = [ tuple ( c ) for c in covs ] 
+        self.__output = None
+
+    ## local initialization (executed once in parent process)
+    def initialize_local   ( self ) :
+        """Local initialization (executed once in parent process)
+        """
+        self.__output = None
+
+    ## the actual processing
+    def process ( self , jobid , item ) :
+        """The actual processing
+        """
+        import ROOT
+        from ostap.logger.utils import logWarning
+        with logWarning() :
+            import ostap.core.pyrouts
+            import ostap.trees.trees
+            import ostap.histos.histos
+            from ostap.trees.trees   import Chain
+            from ostap.trees.booking import book_run
+
+        input    = Chain ( name    = item.name    ,
+                           files   = item.files   ,
+                           first   = item.first   ,
+                           nevents = item.nevents )
+
+        chain    = input.chain
+        first    = input.first
+        nevents  = input.nevents
+
+        from ostap.core.core import ROOTCWD
+        with ROOTCWD() :
+            ROOT.gROOT.cd()
+            histos = [ ( h.Clone () , e ) for h , e in self.histos ]
+
+        length , stats , covs = book_run ( chain , histos , self.stats , self.cuts , first , nevents , self.covs )
+
+        self.__output = length , [ h for h , e in histos ] , stats , covs 
+
+        return self.__output
+
+    ## merge results
+    def merge_results ( self , result , jobid = -1 ) :
+
+        import ostap.histos.histos
+        from   ostap.stats.counters import WSE
+        from   ostap.trees.booking  import WCovariance
+
+        if not self.__output : self.__output = result
+        else :
+            length , histos , stats , covs = self.__output
+            length += result [ 0 ]
+            for h , r in zip ( histos , result [ 1 ] ) : h.Add ( r )
+            stats   = [ WSE         ( s ) + r for s , r in zip ( stats , result [ 2 ] ) ]
+            covs    = [ WCovariance ( c ) + r for c , r in zip ( covs  , result [ 3 ] ) ]
+            self.__output = length , histos , stats , covs 
+
+    ## get the results
+    def results (  self ) :
+        return self.__output
+
+# =============================================================================
+## execute the booked requests for loooong chain/tree in parallel
+#  @code
+#  chain = ...
+#  length , histos , stats , covs = pbooking ( chain , [ ( h1 , [ 'mass' ] ) ] , [ 'pt' , 'eta' ] , 'pt>1' )
+#  @endcode
+#  The typical usage is via ostap.trees.booking.Booking
+#  @code
+#  book = chain.booking ( 'pt>1' )
+#  ...
+#  book.run ( parallel = True )
+#  @endcode
+#  @param chain      the chain/tree
+#  @param histos     list of pairs ( histo , [ expressions ] )
+#  @param stats      list of expressions for statistics
+#  @param cuts       selection/weighting criteria
+#  @param first      the first entry to process
+#  @param nentries   number of entries to process
+#  @param chunk_size chunk size for parallel processing
+#  @param max_files  maximal number of files per chunk
+#  @param covs       list of pairs of expressions for covariances
+#  @return number of selected entries, the list of histograms, the list of statistics
+#          and the list of covariance counters
+#  @see ostap.trees.booking.Booking
+def pbooking ( chain                ,
+               histos               ,
+               stats                ,
+               cuts       = ''      ,
+               first      =  0      ,
+               nentries   = -1      ,
+               chunk_size = -1      ,
+               max_files  =  5      ,
+               silent     = False   ,
+               covs       = ()      , **kwargs ) :
+    """Execute the booked requests for loooong chain/tree in parallel
+    >>> chain = ...
+    >>> length , histos , stats , covs = pbooking ( chain , [ ( h1 , [ 'mass' ] ) ] , [ 'pt' , 'eta' ] , 'pt>1' )
+    The typical usage is via ostap.trees.booking.Booking
+    >>> book = chain.booking ( 'pt>1' )
+    >>> ...
+    >>> book.run ( parallel = True )
+    - see ostap.trees.booking.Booking
+    """
+
+    from ostap.trees.trees import Chain, Tree
+
+    if isinstance ( chain , ROOT.TChain ) :
+        ch     = Chain ( chain , first = first , nevents = nentries )
+        chunks = ch.split ( chunk_size = chunk_size , max_files = max_files )
+    else :
+        ch     = Tree  ( chain , first = first , nevents = nentries )
+        chunks = ch.split ( chunk_size = chunk_size if 0 < chunk_size else 1000000 )
+
+    task  = BookingTask ( histos , stats , cuts , covs )
+    wmgr  = WorkManager ( silent = silent , **kwargs )
+    wmgr.process ( task , chunks )
+
+    result = task.results ()
+    if not result :
+        from ostap.stats.counters import WSE
+        from ostap.trees.booking  import WCovariance
+        empty  = [ h.Clone () for h , e in histos ]
+        for h in empty : h.Reset ()
+        result = 0 , empty , [ WSE () for s in stats ] , [ WCovariance () for c in covs ]
+
+    return result
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
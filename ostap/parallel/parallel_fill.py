@@ -68,25 +68,32 @@ class  FillTask(Task) :
         first    = item.first
         nevents  = item.nevents 
 
-        all = 0 == first and ( nevents < 0 or ll <= nevents )
+        whole = 0 == first and ( nevents < 0 or ll <= nevents )
         
-        if self.trivial and all : 
+        if self.trivial and whole : 
             import ostap.fitting.pyselectors
             self.__output = chain.make_dataset ( self.variables , self.selection , silent = True ) 
             return self.__output 
 
-        from   ostap.fitting.pyselectors import SelectorWithVars
+        from   ostap.fitting.pyselectors import SelectorWithVars, _frame_fill_
         
         ## use selector  
         selector = SelectorWithVars ( self.variables ,
                                       self.selection ,
                                       silence = True )
+
+        ## all variables are formulas: use frame machinery (no implicit MT here)
+        if whole and selector.trivial_vars :
+            ds , stat = _frame_fill_ ( chain , selector , silent = True , enable = False )
+            if ds :
+                self.__output = ds , stat
+                return self.__output
         
         args = ()  
-        if not all : args  = nevents , first 
+        if not whole : args  = nevents , first 
             
         num = chain.process ( selector , *args                 ,
-                              shortcut  = all and self.trivial ,
+                              shortcut  = whole and self.trivial ,
                               use_frame = self.use_frame       )
         
         self.__output = selector.data, selector.stat  
@@ -144,6 +151,7 @@ def pprocess ( chain               ,
     >>>chain    = ...
     >>> selector =  ...
     >>> chain.pprocess ( selector )
+    >>> chain.pprocess ( selector , balance = 'bytes' ) ## chunks with the same bytes to read 
     """
     
     from ostap.trees.trees import Chain
@@ -156,17 +164,32 @@ def pprocess ( chain               ,
     ## trivial   = selector.trivial_vars and not selector.morecuts
     
     trivial   = selector.really_trivial and not selector.morecuts 
+    lowered   = selector.trivial_vars   and not selector.morecuts 
     
-    all = 0 == first and ( 0 > nevents or len ( chain ) <= nevents )
+    whole = 0 == first and ( 0 > nevents or len ( chain ) <= nevents )
     
-    if all and trivial and 1 < len( ch.files ) :
+    if whole and lowered and 1 < len( ch.files ) :
         logger.info ("Configuration is ``trivial'': redefine ``chunk-size'' to -1")
         chunk_size = -1
         
     task  = FillTask ( variables , selection , trivial , use_frame )
+    
+    ## pop all non-WorkManager keywords before the WorkManager is built 
+    journal = kwargs.pop ( 'journal'    , None  ) 
+    tmerge  = kwargs.pop ( 'tree_merge' , False ) 
+    balance = kwargs.pop ( 'balance'    , None  )
+    
+    ## (optional) cost-balanced splitting 
+    branches = ()
+    if 'bytes' == balance and selector.trivial_vars :
+        from ostap.parallel.utils import used_branches 
+        branches = used_branches ( chain , [ v.formula for v in variables ] , selection ) 
+    
     wmgr  = WorkManager ( silent     = silent     , **kwargs )
-    trees = ch.split    ( chunk_size = chunk_size , max_files = max_files )
-    wmgr.process( task , trees )
+    
+    trees = ch.split    ( chunk_size = chunk_size , max_files = max_files ,
+                          balance    = balance    , branches  = branches  )
+    wmgr.process( task , trees , journal = journal , tree_merge = tmerge )
     del trees
     
     dataset, stat = task.results()  
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/parallel_futures.py
+#
+#  Simple work manager with the warm persistent pool of local workers
+#  based on <code>concurrent.futures</code> and <code>multiprocessing</code>
+#  from the standard library:
+#  - the worker processes are forked once and preload ROOT and Ostap;
+#  - the pool stays alive between the subsequent calls of
+#    <code>WorkManager.process</code> and <code>WorkManager.iexecute</code>;
+#  - the task/function is serialized only once per call, and it is
+#    deserialized only once per worker process
+#
+#  It makes a lot of sense for interactive sessions, where many
+#  small parallel jobs (e.g. projections) are executed, and for each of them
+#  the startup of fresh workers takes several seconds
+#
+#  @code
+#  wm = WorkManager ( ncpus = 8 )
+#  wm.process ( task , items )
+#  wm.process ( task , items ) ## the same workers are used
+#  @endcode
+#
+#  @see https://docs.python.org/3/library/concurrent.futures.html
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-02-15
+# =============================================================================
+"""Simple work manager with the warm persistent pool of local workers
+based on `concurrent.futures` and `multiprocessing` from the standard library:
+- the worker processes are forked once and preload ROOT and Ostap;
+- the pool stays alive between the subsequent calls of
+  `WorkManager.process` and `WorkManager.iexecute`;
+- the task/function is serialized only once per call, and it is
+  deserialized only once per worker process
+
+It makes a lot of sense for interactive sessions, where many
+small parallel jobs (e.g. projections) are executed, and for each of them
+the startup of fresh workers takes several seconds
+
+>>> wm = WorkManager ( ncpus = 8 )
+>>> wm.process ( task , items )
+>>> wm.process ( task , items ) ## the same workers are used
+- see https://docs.python.org/3/library/concurrent.futures.html
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-02-15'
+__all__     = (
+    'WorkManager'    , ## task manager
+    'get_pool'       , ## get the warm persistent pool of workers
+    'shutdown_pools' , ## shutdown all persistent pools
+    )
+# =============================================================================
+from ostap.logger.logger        import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.parallel.parallel_futures' )
+else                      : logger = getLogger ( __name__                          )
+# =============================================================================
+import sys, os, pickle, uuid, atexit
+import multiprocessing                  as MP
+import concurrent.futures               as CF
+from   contextlib               import contextmanager
+from   ostap.utils.progress_bar import progress_bar
+from   ostap.parallel.task      import TaskManager
+# =============================================================================
+try :
+    import dill
+except ImportError :
+    dill = None
+# =============================================================================
+## modules to be preloaded by each worker
+preload_modules = (
+    'ostap.core.pyrouts'    ,
+    'ostap.histos.histos'   ,
+    'ostap.trees.trees'     ,
+    'ostap.fitting.roofit'  ,
+    'ostap.fitting.dataset' ,
+    )
+# =============================================================================
+## the warm persistent pools of workers: { ncpus : pool }
+_pools = {}
+# =============================================================================
+## worker-side cache of deserialized objects : { token : object }
+_cache       = {}
+_cache_order = []
+_cache_size  = 16
+# =============================================================================
+## initialize the worker process: preload ROOT and Ostap
+def _initialize_worker ( modules ) :
+    """Initialize the worker process: preload ROOT and Ostap
+    """
+    import importlib
+    import ROOT
+    ROOT.gROOT.SetBatch ( True )
+    for m in modules :
+        try :
+            importlib.import_module ( m )
+        except ImportError :
+            logger.warning ( "Worker %s: cannot preload module ``%s''" % ( os.getpid() , m ) )
+
+# =============================================================================
+## serialize the object
+#  - use <code>pickle</code> and fallback to <code>dill</code>, if available
+def _dumps ( obj ) :
+    """Serialize the object, use `pickle` and fall back to `dill`, if available
+    """
+    try :
+        return False , pickle.dumps ( obj , protocol = pickle.HIGHEST_PROTOCOL )
+    except Exception :
+        if not dill : raise
+        return True  , dill.dumps   ( obj )
+
+# =============================================================================
+## deserialize the object
+def _loads ( packed ) :
+    """Deserialize the object"""
+    use_dill , blob = packed
+    return dill.loads ( blob ) if use_dill else pickle.loads ( blob )
+
+# =============================================================================
+## get the object from the worker-side cache or deserialize it
+def _get_cached ( token , packed ) :
+    """Get the object from the worker-side cache or deserialize it"""
+    if token in _cache : return _cache [ token ]
+    obj = _loads ( packed )
+    _cache       [ token ] = obj
+    _cache_order.append ( token )
+    while _cache_size < len ( _cache_order ) :
+        _cache.pop ( _cache_order.pop ( 0 ) , None )
+    return obj
+
+# =============================================================================
+## execute the job at the worker
+#  @param job   token and serialized job function
+#  @param head  token and serialized first argument (e.g. the Task), or None
+#  @param rest  serialized remaining arguments
+def _execute ( job , head , rest ) :
+    """Execute the job at the worker
+    - job   : token and serialized job function
+    - head  : token and serialized first argument (e.g. the Task), or None
+    - rest  : serialized remaining arguments
+    """
+    fun  = _get_cached ( *job  )
+    args = _loads ( rest )
+    if head is None : return fun ( args )
+    return fun ( ( _get_cached ( *head ) , ) + args )
+
+# =============================================================================
+## get the warm persistent pool of workers
+#  @code
+#  pool = get_pool ( 8 )
+#  @endcode
+def get_pool ( ncpus , preload = preload_modules ) :
+    """Get the warm persistent pool of workers
+    >>> pool = get_pool ( 8 )
+    """
+    pool = _pools.get ( ncpus , None )
+    if pool is None :
+        ## prefer ``fork'': the workers inherit the state of the main process
+        methods = MP.get_all_start_methods ()
+        context = MP.get_context ( 'fork' ) if 'fork' in methods else MP.get_context ()
+        sys.stdout.flush ()
+        sys.stderr.flush ()
+        pool    = CF.ProcessPoolExecutor ( max_workers = ncpus              ,
+                                           mp_context  = context            ,
+                                           initializer = _initialize_worker ,
+                                           initargs    = ( tuple ( preload ) , ) )
+        _pools [ ncpus ] = pool
+        logger.debug ( 'get_pool: new pool of %d workers is created' % ncpus )
+    return pool
+
+# =============================================================================
+## shutdown all persistent pools
+@atexit.register
+def shutdown_pools () :
+    """Shutdown all persistent pools"""
+    while _pools :
+        ncpus , pool = _pools.popitem ()
+        pool.shutdown ( wait = True )
+        logger.debug ( 'shutdown_pools: the pool of %d workers is shut down' % ncpus )
+
+# =============================================================================
+## @class _Handle
+#  Simple handle for the submitted job: <code>ready()</code> and <code>get()</code>
+class _Handle(object) :
+    """Simple handle for the submitted job: `ready()` and `get()`"""
+    def __init__ ( self , future ) : self.__future = future
+    def ready    ( self ) : return self.__future.done   ()
+    def get      ( self ) : return self.__future.result ()
+    
+# =============================================================================
+## @class WorkManager
+#  Class in charge of managing the tasks and distributing them to
+#  the warm persistent pool of local workers
+#  @code
+#  wm = WorkManager ( ncpus = 8 )
+#  wm.process ( task , items )
+#  @endcode
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+class WorkManager(TaskManager) :
+    """ Class in charge of managing the tasks and distributing them to
+    the warm persistent pool of local workers
+    >>> wm = WorkManager ( ncpus = 8 )
+    >>> wm.process ( task , items )
+    """
+    def __init__( self                     ,
+                  ncpus     = 'autodetect' ,
+                  ppservers = ()           ,
+                  silent    = False        , **kwargs ) :
+
+        if isinstance ( ncpus , int ) and 1 <= ncpus : pass
+        else                                         : ncpus = MP.cpu_count()
+
+        from ostap.utils.cidict import cidict
+        kwa = cidict ( **kwargs )
+
+        if ppservers or kwa.pop ( 'PP' , False ) or kwa.pop ( 'Parallel' , False ) :
+            logger.warning ( "WorkManager: remote servers are not supported, ignore them" )
+
+        ## initialize the base class
+        TaskManager.__init__ ( self                                              ,
+                               ncpus         = ncpus                             ,
+                               silent        = silent                            ,
+                               adaptive      = kwa.pop ( 'adaptive'      , False ) , 
+                               shared_memory = kwa.pop ( 'shared_memory' , False ) )
+
+        self.__preload = tuple ( kwa.pop ( 'preload' , preload_modules ) )
+
+        if not self.silent : logger.info ( 'WorkManager is warm pool of %d local workers' % self.ncpus )
+
+    @property
+    def pool ( self ) :
+        """``pool'' : the actual (warm and persistent) pool of workers"""
+        return get_pool ( self.ncpus , self.__preload )
+
+    ## context protocol: nothing to do, the pool is persistent
+    def __enter__  ( self      ) :
+        sys.stdout .flush ()
+        sys.stderr .flush ()
+        return self
+
+    ## context protocol: nothing to do, the pool is persistent
+    def __exit__   ( self , *_ ) :
+        sys.stdout .flush ()
+        sys.stderr .flush ()
+
+    # =========================================================================
+    ## process the bare <code>executor</code> function
+    #  @param job   function to be executed
+    #  @param jobs_args the arguments, one entry per job
+    #  @return iterator to results
+    #  @code
+    #  mgr  = WorkManager  ( .... )
+    #  job  = ...
+    #  args = ...
+    #  for result in mgr.iexecute ( func , args ) :
+    #  ...
+    #  ...
+    #  @endcode
+    #  It is a "bare minimal" interface
+    #  - no statistics
+    #  - no summary printout
+    #  - no merging of results
+    #  @attention the job function and the first element of the argument tuples
+    #  (e.g. the Task) are serialized only once
+    def iexecute ( self , job , jobs_args , progress = False ) :
+        """Process the bare `executor` function
+        >>> mgr  = WorkManager  ( .... )
+        >>> job  = ...
+        >>> args = ...
+        >>> for result in mgr.iexecute ( job , args ) :
+        ...
+        ...
+        It is a ``minimal'' interface
+        - no statistics
+        - no summary prin
+        - no merging of results
+        - the job function and the first element of the argument tuples
+        (e.g. the Task) are serialized only once
+        """
+
+        ## serialize each distinct object only once: { id : ( object , token , packed ) }
+        ## (keep the reference to the object to avoid the reuse of its id) 
+        packed = {}
+        def _pack ( obj ) :
+            key = id ( obj )
+            if not key in packed : packed [ key ] = obj , uuid.uuid4().hex , _dumps ( obj )
+            return packed [ key ] [ 1: ]
+
+        pool    = self.pool
+        futures = []
+        try :
+            for args in jobs_args :
+                if isinstance ( args , tuple ) and args :
+                    head , rest = _pack ( args [ 0 ] ) , _dumps ( args [ 1: ] )
+                else :
+                    head , rest = None , _dumps ( args )
+                futures.append ( pool.submit ( _execute , _pack ( job ) , head , rest ) )
+        except CF.process.BrokenProcessPool :
+            _pools.pop ( self.ncpus , None )
+            raise
+
+        silent = self.silent or not progress
+
+        ## retrive (asynchronous) results from the jobs
+        try :
+            for f in progress_bar ( CF.as_completed ( futures )  ,
+                                    max_value   = len ( futures ) ,
+                                    description = "# Jobs execution" ,
+                                    silent      = silent             ) :
+                yield f.result ()
+        except CF.process.BrokenProcessPool :
+            ## the pool is broken, it will be recreated for the next call
+            _pools.pop ( self.ncpus , None )
+            raise
+        finally :
+            for f in futures : f.cancel ()
+
+    # =========================================================================
+    ## context manager that provides the function for asynchronous submission
+    #  of the single job
+    #  @attention the job function and the first element of the argument tuple
+    #  (e.g. the Task) are serialized only once
+    #  @see TaskManager.submitter
+    #  @see TaskManager.iexecute_dynamic
+    @contextmanager
+    def submitter ( self ) :
+        """Context manager that provides the function for asynchronous submission
+        of the single job
+        - the job function and the first element of the argument tuple
+        (e.g. the Task) are serialized only once
+        - see TaskManager.submitter
+        - see TaskManager.iexecute_dynamic
+        """
+        packed = {}
+        def _pack ( obj ) :
+            key = id ( obj )
+            if not key in packed : packed [ key ] = obj , uuid.uuid4().hex , _dumps ( obj )
+            return packed [ key ] [ 1: ]
+
+        pool    = self.pool
+        futures = []
+        def _submit ( job , args ) :
+            if isinstance ( args , tuple ) and args :
+                head , rest = _pack ( args [ 0 ] ) , _dumps ( args [ 1: ] )
+            else :
+                head , rest = None , _dumps ( args )
+            f = pool.submit ( _execute , _pack ( job ) , head , rest )
+            futures.append ( f ) 
+            return _Handle ( f )
+
+        try :
+            yield _submit
+        except CF.process.BrokenProcessPool :
+            ## the pool is broken, it will be recreated for the next call
+            _pools.pop ( self.ncpus , None )
+            raise
+        finally :
+            for f in futures : f.cancel ()
+            
+    # ========================================================================-
+    ## get PP-statistics if/when posisble
+    def get_pp_stat ( self ) :
+        """Get PP-statistics if/when posisble
+        """
+        return None
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
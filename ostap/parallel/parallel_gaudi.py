@@ -24,6 +24,7 @@ __all__ = (
     )
 # =============================================================================
 import sys, os, time
+from   contextlib                import contextmanager 
 from   collections               import Sized
 from   itertools                 import repeat , count
 from   ostap.utils.progress_bar  import progress_bar
@@ -72,7 +73,11 @@ class WorkManager(TaskManager) :
             logger.warning ( "WorkManager: option ``ppservers'' is ignored" )
         
         ## initialize the base class 
-        TaskManager.__init__  ( self , ncpus = ncpus , silent = silent )        
+        TaskManager.__init__  ( self                                                 ,
+                                ncpus         = ncpus                                ,
+                                silent        = silent                               ,
+                                adaptive      = kwargs.pop ( 'adaptive'      , False ) ,
+                                shared_memory = kwargs.pop ( 'shared_memory' , False ) )
         
         self.pool   = MP.Pool ( self.ncpus )
 
@@ -107,7 +112,11 @@ class WorkManager(TaskManager) :
         - no merging of results  
         """
                 
-        with pool_context ( self.pool ) as pool :
+        ## the pool is closed at the exit from the context, recreate it if needed
+        pool      = self.pool if self.pool else MP.Pool ( self.ncpus )
+        self.pool = None 
+        
+        with pool_context ( pool ) as pool :
 
             ## create and submit jobs 
             jobs = pool.imap_unordered ( job , jobs_args )
@@ -119,6 +128,25 @@ class WorkManager(TaskManager) :
             for result in progress_bar ( jobs , max_value = njobs , silent = silent ) :
                 yield result                
 
+    # =========================================================================
+    ## context manager that provides the function for asynchronous submission
+    #  of the single job
+    #  @see TaskManager.submitter
+    #  @see TaskManager.iexecute_dynamic
+    @contextmanager 
+    def submitter ( self ) :
+        """Context manager that provides the function for asynchronous submission
+        of the single job
+        - see TaskManager.submitter
+        - see TaskManager.iexecute_dynamic
+        """
+        ## the pool is closed at the exit from the context, recreate it if needed
+        pool      = self.pool if self.pool else MP.Pool ( self.ncpus )
+        self.pool = None 
+        
+        with pool_context ( pool ) as pool :
+            yield lambda job , args : pool.apply_async ( job , ( args , ) )
+            
     # ========================================================================-
     ## get PP-statistics if/when posisble 
     def get_pp_stat ( self ) : 
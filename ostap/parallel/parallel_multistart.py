@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/parallel_multistart.py
+#  (parallel) Multi-start global minimisation:
+#  the fit is started from many points in the parameter space
+#  and the best minimum is chosen:
+#  - starting points are generated using the Latin hypercube sampling
+#    within the parameter ranges or around the current values
+#  - the starting points are split into the contiguous pieces,
+#    and each piece is processed by the single job:
+#    the model and NLL are created only once per job
+#  @code
+#  pdf    = ...
+#  minima = multistart_fit ( pdf , dataset , n = 20 , parallel = True )
+#  r , f  = pdf.fitTo ( dataset , multistart = 20 ) ## ditto + final fit from the best point
+#  @endcode
+#  @see ostap.fitting.basic.PDF.fitTo
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-26
+# =============================================================================
+"""(parallel) Multi-start global minimisation:
+the fit is started from many points in the parameter space
+and the best minimum is chosen:
+- starting points are generated using the Latin hypercube sampling
+  within the parameter ranges or around the current values
+- the starting points are split into the contiguous pieces,
+  and each piece is processed by the single job:
+  the model and NLL are created only once per job
+>>> pdf    = ...
+>>> minima = multistart_fit ( pdf , dataset , n = 20 , parallel = True )
+>>> r , f  = pdf.fitTo ( dataset , multistart = 20 ) ## ditto + final fit from the best point
+- see ostap.fitting.basic.PDF.fitTo
+"""
+# =============================================================================
+__version__ = "$Revision$"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-26"
+__all__     = (
+    'starting_points'     , ## generate the starting points
+    'multistart_fits'     , ## fits from the given starting points (single job)
+    'parallel_multistart' , ## fits from the given starting points (parallel processing)
+    'multistart_fit'      , ## multi-start global minimisation
+    'minima_table'        , ## print the table of minima
+    )
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.parallel.multistart' )
+else                       : logger = getLogger ( __name__                    )
+# =============================================================================
+import ROOT, random
+# =============================================================================
+## get the floating parameters of PDF
+def _floating_ ( pdf , dataset ) :
+    """Get the floating parameters of PDF"""
+    pars = pdf.params ( dataset )
+    return [ p for p in pars if isinstance ( p , ROOT.RooRealVar ) and not p.isConstant () ]
+
+# =============================================================================
+## generate the starting points for the multi-start minimisation
+#  - the first point is always the current values of the parameters
+#  - <code>'lhs'</code> : Latin hypercube sampling within the parameter ranges,
+#    for parameters without range the points are uniformly distributed
+#    within <code>width</code> errors around the current value
+#  - <code>'around'</code> : gaussian points around the current values
+#    with the spread of <code>width</code> errors
+#  @code
+#  params = ...
+#  points = starting_points ( params , 20 , mode = 'lhs' )
+#  @endcode
+#  @param params list of parameters
+#  @param n      number of points
+#  @param mode   mode: 'lhs' or 'around'
+#  @param width  width (in units of errors) for 'around' mode
+#  @param seed   the seed for random generator
+#  @return list of points, each point is dictionary { name : value }
+def starting_points ( params , n , mode = 'lhs' , width = 3 , seed = None ) :
+    """Generate the starting points for the multi-start minimisation
+    - the first point is always the current values of the parameters
+    - 'lhs'    : Latin hypercube sampling within the parameter ranges,
+    for parameters without range the points are uniformly distributed
+    within `width` errors around the current value
+    - 'around' : gaussian points around the current values
+    with the spread of `width` errors
+    >>> params = ...
+    >>> points = starting_points ( params , 20 , mode = 'lhs' )
+    - returns list of points, each point is dictionary { name : value }
+    """
+    assert mode in ( 'lhs' , 'around' ) , "starting_points: invalid mode ``%s''" % mode
+
+    rnd    = random.Random ( seed )
+    n      = max ( 1 , n )
+    points = [ dict ( ( p.GetName () , float ( p.getVal () ) ) for p in params ) ]
+    if 1 == n : return points
+
+    nn     = n - 1
+    values = {}
+    for p in params :
+
+        v , e = float ( p.getVal () ) , p.getError ()
+        if e <= 0 :
+            if p.hasMin () and p.hasMax () : e = 0.1 * ( p.getMax () - p.getMin () )
+            else                           : e = 0.1 * max ( 1.0 , abs ( v ) )
+
+        low  = p.getMin () if p.hasMin () else v - width * e
+        high = p.getMax () if p.hasMax () else v + width * e
+
+        if 'lhs' == mode :
+            if not ( p.hasMin () and p.hasMax () ) :
+                low , high = max ( low , v - width * e ) , min ( high , v + width * e )
+            strata = list ( range ( nn ) )
+            rnd.shuffle ( strata )
+            values [ p.GetName () ] = [ low + ( s + rnd.random () ) * ( high - low ) / nn for s in strata ]
+        else :
+            values [ p.GetName () ] = [ min ( max ( rnd.gauss ( v , width * e ) , low ) , high ) for i in range ( nn ) ]
+
+    for i in range ( nn ) :
+        points.append ( dict ( ( k , v [ i ] ) for k , v in values.items () ) )
+
+    return points
+
+# =============================================================================
+## Perform the fits from the given starting points (single job)
+#  - NLL and the minimizer are created only once
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  minima  = multistart_fits ( pdf , dataset , [ ( 0 , { 'S' : 10 } ) , ( 1 , { 'S' : 100 } ) ] )
+#  @endcode
+#  @param pdf       the PDF
+#  @param dataset   the dataset
+#  @param points    the list of indexed starting points:  ( index , { name : value } )
+#  @param strategy  MINUIT strategy
+#  @return list of minima: dictionaries with keys
+#   <code>index, start, status, covqual, nll, edm, values</code>
+def multistart_fits ( pdf              ,
+                      dataset          ,
+                      points           ,
+                      strategy  = None ,
+                      silent    = True ,
+                      args      = ()   , **kwargs ) :
+    """Perform the fits from the given starting points (single job)
+    - NLL and the minimizer are created only once
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> minima  = multistart_fits ( pdf , dataset , [ ( 0 , { 'S' : 10 } ) , ( 1 , { 'S' : 100 } ) ] )
+    - returns list of minima: dictionaries with keys `index, start, status, covqual, nll, edm, values`
+    """
+    from ostap.logger.utils import roo_silent
+
+    floating = _floating_ ( pdf , dataset )
+    saved    = [ ( p , float ( p.getVal () ) , float ( p.getError () ) ) for p in floating ]
+
+    ## no offsetting here: the values from different jobs must be comparable
+    kwargs [ 'offset' ] = False
+    kwargs [ 'clone'  ] = False
+
+    minima = []
+    with roo_silent ( silent ) :
+
+        try :
+
+            ## create NLL and the minimizer only once
+            nll , sf = pdf.nll    ( dataset , silent = silent , args = args , **kwargs )
+            m        = pdf.minuit ( nLL = nll , silent = True , offset = False , strategy = strategy )
+
+            from ostap.utils.progress_bar import progress_bar
+            for index , start in progress_bar ( points , silent = silent ) :
+
+                for p , v , e in saved :
+                    p.setVal   ( start.get ( p.GetName () , v ) )
+                    p.setError ( e )
+
+                m.migrad ()
+                m.hesse  ()
+                r = m.save ()
+
+                minima.append ( { 'index'   : index                ,
+                                  'start'   : start                ,
+                                  'status'  : r.status  ()         ,
+                                  'covqual' : r.covQual ()         ,
+                                  'nll'     : r.minNll  ()         ,
+                                  'edm'     : r.edm     ()         ,
+                                  'values'  : dict ( ( p.GetName () , float ( p.getVal () ) ) for p in floating ) } )
+                del r
+
+            del m , nll
+
+        finally :
+            for p , v , e in saved :
+                p.setVal   ( v )
+                p.setError ( e )
+
+    return minima
+
+# =============================================================================
+## Perform the fits from the given starting points in parallel
+#  - the starting points are split into <code>nSplit</code> contiguous pieces
+#    (by default, one piece per worker),
+#  - the model and NLL are created only once per piece
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  minima  = parallel_multistart ( pdf , dataset , [ ( 0 , { 'S' : 10 } ) , ( 1 , { 'S' : 100 } ) ] , ncpus = 4 )
+#  @endcode
+#  @param pdf        the PDF
+#  @param dataset    the dataset
+#  @param points     the list of indexed starting points:  ( index , { name : value } )
+#  @param nSplit     number of pieces (default: number of workers)
+#  @param nll_config configuration of <code>multistart_fits</code>
+#  @return list of minima, ordered by index
+#  @see ostap.parallel.parallel_points.parallel_points
+def parallel_multistart ( pdf               ,
+                          dataset           ,
+                          points            ,
+                          nSplit     = None ,
+                          silent     = True ,
+                          nll_config = {}   , **kwargs ) :
+    """Perform the fits from the given starting points in parallel
+    - the starting points are split into `nSplit` contiguous pieces
+      (by default, one piece per worker)
+    - the model and NLL are created only once per piece
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> minima  = parallel_multistart ( pdf , dataset , [ ( 0 , { 'S' : 10 } ) , ( 1 , { 'S' : 100 } ) ] , ncpus = 4 )
+    - returns list of minima, ordered by index
+    - see ostap.parallel.parallel_points.parallel_points
+    """
+
+    from ostap.parallel.parallel_points import parallel_points
+    minima = parallel_points ( multistart_fits     ,
+                               pdf                 ,
+                               dataset             ,
+                               points              ,
+                               nSplit = nSplit     ,
+                               silent = silent     ,
+                               config = nll_config , **kwargs )
+
+    return sorted ( minima if minima else [] , key = lambda m : m [ 'index' ] )
+
+# =============================================================================
+## Multi-start global minimisation
+#  - generate the starting points (the first point is the current values)
+#  - perform the fits from all starting points (optionally in parallel)
+#  - order the minima: the converged fits with the smallest NLL first
+#  @code
+#  pdf    = ...
+#  minima = multistart_fit ( pdf , dataset , n = 20 , parallel = True )
+#  best   = minima [ 0 ]
+#  print ( minima_table ( minima ) )
+#  @endcode
+#  @param pdf      the PDF
+#  @param dataset  the dataset
+#  @param n        number of starting points
+#  @param mode     mode for the starting points: 'lhs' or 'around'
+#  @param width    width (in units of errors) for the starting points
+#  @param seed     the seed for the starting points
+#  @param parallel use parallel processing: <code>True</code> or the configuration of <code>WorkManager</code>
+#  @param nll_config configuration of NLL
+#  @return list of minima, the best first
+#  @see starting_points
+#  @see multistart_fits
+#  @see parallel_multistart
+def multistart_fit ( pdf                ,
+                     dataset            ,
+                     n          = 10    ,
+                     mode       = 'lhs' ,
+                     width      = 3     ,
+                     seed       = None  ,
+                     parallel   = True  ,
+                     silent     = True  ,
+                     args       = ()    ,
+                     nll_config = {}    ) :
+    """Multi-start global minimisation
+    - generate the starting points (the first point is the current values)
+    - perform the fits from all starting points (optionally in parallel)
+    - order the minima: the converged fits with the smallest NLL first
+    >>> pdf    = ...
+    >>> minima = multistart_fit ( pdf , dataset , n = 20 , parallel = True )
+    >>> best   = minima [ 0 ]
+    >>> print ( minima_table ( minima ) )
+    - returns list of minima, the best first
+    - see starting_points
+    - see multistart_fits
+    - see parallel_multistart
+    """
+    ## convert if needed
+    if not isinstance ( dataset , ROOT.RooAbsData ) and hasattr ( dataset , 'dset' ) :
+        dataset = dataset.dset
+
+    floating = _floating_ ( pdf , dataset )
+    points   = list ( enumerate ( starting_points ( floating , n , mode = mode , width = width , seed = seed ) ) )
+
+    config   = dict ( nll_config )
+    config [ 'args' ] = args
+
+    if parallel and 1 < len ( points ) :
+        wconfig = parallel if isinstance ( parallel , dict ) else {}
+        minima  = parallel_multistart ( pdf , dataset , points ,
+                                        silent     = silent ,
+                                        nll_config = config , **wconfig )
+    else :
+        minima  = multistart_fits     ( pdf , dataset , points , silent = silent , **config )
+
+    minima.sort ( key = lambda m : ( 0 != m [ 'status' ] , m [ 'nll' ] ) )
+    return minima
+
+# =============================================================================
+## print the table of minima
+#  @code
+#  minima = multistart_fit ( ... )
+#  print ( minima_table ( minima ) )
+#  @endcode
+def minima_table ( minima , title = 'Multi-start minima' , prefix = '' ) :
+    """Print the table of minima
+    >>> minima = multistart_fit ( ... )
+    >>> print ( minima_table ( minima ) )
+    """
+    from ostap.fitting.utils import fit_status, cov_qual
+
+    nll0 = min ( m [ 'nll' ] for m in minima ) if minima else 0
+    rows = [ ( '#' , 'start' , 'status' , 'covqual' , 'NLL-min(NLL)' , 'EDM' ) ]
+    for i , m in enumerate ( minima ) :
+        rows.append ( ( '%d' % i , '%d' % m [ 'index' ] ,
+                        fit_status ( m [ 'status' ] ) , '%s' % m [ 'covqual' ] ,
+                        '%-.5g' % ( m [ 'nll' ] - nll0 ) , '%-.3g' % m [ 'edm' ] ) )
+
+    import ostap.logger.table as Table
+    return Table.table ( rows , title = title , alignment = 'rrcccc' , prefix = prefix )
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
@@ -45,6 +45,7 @@ import sys, os
 from   builtins                 import range
 from   itertools                import repeat , count
 from   collections              import Sized
+from   contextlib               import contextmanager 
 # =============================================================================
 from   ostap.utils.progress_bar import progress_bar
 from   ostap.parallel.task      import ( TaskManager   ,
@@ -97,12 +98,22 @@ class WorkManager (TaskManager) :
             from pathos.helpers import cpu_count
             ncpus = cpu_count ()
             
-        ## initialize the base class 
-        TaskManager.__init__ ( self, ncpus =  ncpus , silent = silent )
-        
         from ostap.utils.cidict import cidict
         kwa = cidict ( **kwargs ) 
 
+        ## shared-memory transport works only for local workers
+        shared_memory = kwa.pop ( 'shared_memory' , False )
+        if shared_memory and ppservers :
+            logger.warning ( "WorkManager: shared-memory transport is disabled for remote servers" )
+            shared_memory = False
+            
+        ## initialize the base class 
+        TaskManager.__init__ ( self                                              ,
+                               ncpus         = ncpus                             ,
+                               silent        = silent                            ,
+                               adaptive      = kwa.pop ( 'adaptive'      , False ) , 
+                               shared_memory = shared_memory                     )
+
             
         self.__ppservers = ()
         self.__locals    = ()
@@ -302,6 +313,21 @@ class WorkManager (TaskManager) :
                 yield result
             
 
+    # =========================================================================
+    ## context manager that provides the function for asynchronous submission
+    #  of the single job
+    #  @see TaskManager.submitter
+    #  @see TaskManager.iexecute_dynamic
+    @contextmanager 
+    def submitter ( self ) :
+        """Context manager that provides the function for asynchronous submission
+        of the single job
+        - see TaskManager.submitter
+        - see TaskManager.iexecute_dynamic
+        """
+        with pool_context ( self.pool ) as pool :
+            yield lambda job , args : pool.apipe ( job , args )
+            
     # =========================================================================
     ## get the statistics from the paralell python
     def get_pp_stat ( self ) :
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/parallel_points.py
+#  (parallel) Evaluation of the list of points over the parameters of PDF:
+#  the points are split into the contiguous pieces,
+#  and each piece is processed by the single job with the (pickled) PDF
+#  and dataset, e.g. scans of NLL/LL-profiles or multi-start minimisation
+#  @code
+#  def evaluate ( pdf , dataset , points , silent = True , **config ) : ...
+#  results = parallel_points ( evaluate , pdf , dataset , points , ncpus = 4 )
+#  @endcode
+#  @see ostap.parallel.parallel_scan
+#  @see ostap.parallel.parallel_multistart
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-26
+# =============================================================================
+"""(parallel) Evaluation of the list of points over the parameters of PDF:
+the points are split into the contiguous pieces,
+and each piece is processed by the single job with the (pickled) PDF
+and dataset, e.g. scans of NLL/LL-profiles or multi-start minimisation
+>>> def evaluate ( pdf , dataset , points , silent = True , **config ) : ...
+>>> results = parallel_points ( evaluate , pdf , dataset , points , ncpus = 4 )
+- see ostap.parallel.parallel_scan
+- see ostap.parallel.parallel_multistart
+"""
+# =============================================================================
+__version__ = "$Revision$"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-26"
+__all__     = (
+    'split_points'    , ## split the points into the contiguous pieces
+    'parallel_points' , ## evaluate the points over the parameters of PDF (parallel processing)
+    )
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.parallel.points' )
+else                       : logger = getLogger ( __name__                )
+# =============================================================================
+import ROOT
+from   ostap.parallel.parallel import Task, WorkManager
+# =============================================================================
+## split the points into <code>nSplit</code> contiguous pieces
+#  @code
+#  pieces = split_points ( [ 1 , 2 , 3 , 4 , 5 ] , 2 ) ## [ [1,2,3] , [4,5] ]
+#  @endcode
+def split_points ( points , nSplit ) :
+    """Split the points into `nSplit` contiguous pieces
+    >>> pieces = split_points ( [ 1 , 2 , 3 , 4 , 5 ] , 2 ) ## [ [1,2,3] , [4,5] ]
+    """
+    nSplit = max ( 1 , min ( nSplit , len ( points ) ) )
+    n , r  = divmod ( len ( points ) , nSplit )
+    pieces = []
+    first  = 0
+    for i in range ( nSplit ) :
+        last = first + n + ( 1 if i < r else 0 )
+        pieces.append ( points [ first : last ] )
+        first = last
+    return pieces
+
+# =============================================================================
+## The simple task object for parallel evaluation of points over
+#  the parameters of PDF
+#  - the evaluation function is called as
+#  <code>evaluate ( pdf , dataset , points = points , silent = True , **config )</code>
+#    and returns dictionary or list of results
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-26
+class  PointsTask(Task) :
+    """The simple task object for parallel evaluation of points over
+    the parameters of PDF
+    - the evaluation function is called as
+    `evaluate ( pdf , dataset , points = points , silent = True , **config )`
+    and returns dictionary or list of results
+    """
+    ##
+    def __init__ ( self               ,
+                   evaluate           ,
+                   pdf                ,
+                   dataset            ,
+                   config     = {}    ) :
+
+        self.evaluate   = evaluate
+        self.pdf        = pdf
+        self.dataset    = dataset
+        self.config     = config
+
+        self.__output   = None
+
+    def initialize_local   ( self ) : self.__output = None
+
+    ## get the results
+    def results ( self ) :
+        return self.__output
+
+    ## the actual processing
+    def process ( self , jobid , points ) :
+
+        import ROOT
+        from ostap.logger.logger import logWarning
+        with logWarning() :
+            import ostap.core.pyrouts
+            import ostap.fitting.roofit
+            import ostap.fitting.dataset
+            import ostap.fitting.variables
+
+        config = dict ( self.config )
+        self.__output = self.evaluate ( self.pdf         ,
+                                        self.dataset     ,
+                                        points  = points ,
+                                        silent  = True   , **config )
+        return self.__output
+
+    ## merge results
+    def merge_results ( self , result , jobid = -1 ) :
+        if   not result               : logger.error ( "No valid results for merging" )
+        elif self.__output is None    : self.__output = result
+        elif isinstance ( self.__output , dict ) : self.__output.update ( result )
+        else                          : self.__output += result
+
+# =============================================================================
+## Evaluate the points over the parameters of PDF in parallel
+#  - the points are split into <code>nSplit</code> contiguous pieces
+#    (by default, one piece per worker),
+#  - each piece is processed by the single call of the evaluation function:
+#  <code>evaluate ( pdf , dataset , points = piece , silent = True , **config )</code>
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  results = parallel_points ( scan_nll , pdf , dataset , points ,
+#                              config = { 'variables' : [ 'S' ] } , ncpus = 4 )
+#  @endcode
+#  @param evaluate  the evaluation function (must be pickleable)
+#  @param pdf       the PDF
+#  @param dataset   the dataset
+#  @param points    the list of points
+#  @param nSplit    number of pieces (default: number of workers)
+#  @param config    configuration of the evaluation function
+#  @return merged results of the evaluation function
+def parallel_points ( evaluate          ,
+                      pdf               ,
+                      dataset           ,
+                      points            ,
+                      nSplit     = None ,
+                      silent     = True ,
+                      config     = {}   , **kwargs ) :
+    """Evaluate the points over the parameters of PDF in parallel
+    - the points are split into `nSplit` contiguous pieces
+      (by default, one piece per worker)
+    - each piece is processed by the single call of the evaluation function:
+    `evaluate ( pdf , dataset , points = piece , silent = True , **config )`
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> results = parallel_points ( scan_nll , pdf , dataset , points ,
+    ...                             config = { 'variables' : [ 'S' ] } , ncpus = 4 )
+    - returns merged results of the evaluation function
+    """
+
+    ## convert if needed
+    if not isinstance ( dataset , ROOT.RooAbsData ) and hasattr ( dataset , 'dset' ) :
+        dataset = dataset.dset
+
+    points  = list ( points )
+
+    journal = kwargs.pop ( 'journal' , None )
+    wmgr    = WorkManager ( silent = silent , **kwargs )
+
+    pieces  = split_points ( points , nSplit if nSplit else wmgr.ncpus )
+
+    task    = PointsTask ( evaluate = evaluate ,
+                           pdf      = pdf      ,
+                           dataset  = dataset  ,
+                           config   = config   )
+
+    wmgr.process ( task , pieces , journal = journal )
+
+    return task.results ()
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
@@ -149,6 +149,8 @@ class ProjectTask(Task) :
 #  >>> project        ( chain , histo , 'mass' , 'pt>10' )
 #  >>> chain.pproject ( histo , 'mass' , 'pt>0' ) ## ditto 
 #  >>> chain.cproject ( histo , 'mass' , 'pt>0' ) ## ditto 
+#  >>> chain.pproject ( histo , 'mass' , 'pt>0' , shared_memory = True ) ## use shared memory for the results
+#  >>> chain.pproject ( histo , 'mass' , 'pt>0' , balance = 'bytes' ) ## chunks with the same bytes to read 
 #  @endcode
 #  For 12-core machine, clear speedup factor of about 8 is achieved 
 #  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
@@ -168,15 +170,25 @@ def  cproject ( chain                ,
     >>> cproject        ( chain , histo , 'mass' , 'pt>10' )
     >>> chain.ppropject ( histo , 'mass' , 'pt>0' ) ## ditto 
     >>> chain.cpropject ( histo , 'mass' , 'pt>0' ) ## ditto     
+    >>> chain.pproject  ( histo , 'mass' , 'pt>0' , shared_memory = True ) ## use shared memory for the results
+    >>> chain.pproject  ( histo , 'mass' , 'pt>0' , balance = 'bytes' ) ## chunks with the same bytes to read 
     For 12-core machine, clear speedup factor of about 8 is achieved     
     """
     #
     from ostap.trees.trees import Chain
     ch    = Chain ( chain , first = first , nevents = nentries )
+
+    ## (optional) cost-balanced splitting 
+    balance  = kwargs.pop ( 'balance' , None )
+    branches = ()
+    if 'bytes' == balance :
+        from ostap.parallel.utils import used_branches 
+        branches = used_branches ( chain , what , cuts ) 
     
     task  = ProjectTask ( histo , what , cuts )
     wmgr  = WorkManager ( silent = silent , **kwargs )    
-    wmgr.process ( task , ch.split ( chunk_size = chunk_size , max_files = max_files ) )
+    wmgr.process ( task , ch.split ( chunk_size = chunk_size , max_files = max_files ,
+                                     balance    = balance    , branches  = branches  ) )
 
     ## unpack results 
     _f , _h    = task.results ()
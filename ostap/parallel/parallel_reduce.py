@@ -123,6 +123,7 @@ def reduce ( chain               ,
     >>>chain    = ...
     >>> selector =  ...
     >>> chain.pprocess ( selector )
+    - with balance='bytes' the files are packed into chunks with the same bytes to read 
     """
 
     from ostap.trees.trees        import Chain
@@ -151,8 +152,12 @@ def reduce ( chain               ,
                         addselvars = addselvars ,
                         name       = name       )
     
+    ## (optional) cost-balanced splitting: whole files only, packed into chains 
+    balance   = kwargs.pop ( 'balance'   , None )
+    max_files = kwargs.pop ( 'max_files' , 10 if balance else 1 ) 
+    
     wmgr  = WorkManager  ( silent = silent , **kwargs )
-    trees = ch.split     ( max_files = 1  )
+    trees = ch.split     ( max_files = max_files , balance = balance )
     wmgr.process         ( task , trees   )
 
     result , table  = task.results ()
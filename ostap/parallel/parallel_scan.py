@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/parallel_scan.py
+#  (parallel) Scans of NLL and LL-profiles:
+#  the scan points are split into the contiguous pieces,
+#  and each piece is processed by the single job:
+#  - NLL is created only once per job
+#  - scan points are processed in the "snake"-order,
+#    and each profile minimisation starts from the minimum
+#    found for the neighbouring point
+#  @see ostap.fitting.basic.PDF.graph_nll
+#  @see ostap.fitting.basic.PDF.graph_profile
+#  @see ostap.fitting.basic.PDF.graph_profile2
+#  @see ostap.fitting.basic.PDF.wilks
+#  @see ostap.fitting.basic.PDF.wilks2
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-18
+# =============================================================================
+"""(parallel) Scans of NLL and LL-profiles:
+the scan points are split into the contiguous pieces,
+and each piece is processed by the single job:
+- NLL is created only once per job
+- scan points are processed in the ``snake''-order,
+  and each profile minimisation starts from the minimum
+  found for the neighbouring point
+- see ostap.fitting.basic.PDF.graph_nll
+- see ostap.fitting.basic.PDF.graph_profile
+- see ostap.fitting.basic.PDF.graph_profile2
+- see ostap.fitting.basic.PDF.wilks
+- see ostap.fitting.basic.PDF.wilks2
+"""
+# =============================================================================
+__version__ = "$Revision$"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-18"
+__all__     = (
+    'scan_nll'      , ## scan NLL/LL-profile  (single job)
+    'parallel_scan' , ## scan NLL/LL-profile  (parallel processing)
+    )
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.parallel.scan' )
+else                       : logger = getLogger ( __name__              )
+# =============================================================================
+import ROOT
+# =============================================================================
+## order the scan points in the "snake"-order:
+#  the neighbouring points are close to each other
+#  @code
+#  points = [ ( 1 , 1 ) , ( 1 , 2 ) , ( 2 , 1 ) , ( 2 , 2 ) ]
+#  snake  = snake_order ( points ) ## [ (1,1) , (1,2) , (2,2) , (2,1) ]
+#  @endcode
+def snake_order ( points ) :
+    """Order the scan points in the ``snake''-order:
+    the neighbouring points are close to each other
+    >>> points = [ ( 1 , 1 ) , ( 1 , 2 ) , ( 2 , 1 ) , ( 2 , 2 ) ]
+    >>> snake  = snake_order ( points ) ## [ (1,1) , (1,2) , (2,2) , (2,1) ]
+    """
+    points = sorted ( set ( points ) )
+    if not points or 1 == len ( points [ 0 ] ) : return points
+
+    ## group by the first coordinate
+    rows = []
+    for p in points :
+        if rows and rows [ -1 ][ 0 ][ 0 ] == p [ 0 ] : rows [ -1 ].append ( p )
+        else                                         : rows.append ( [ p ] )
+
+    result = []
+    for i , row in enumerate ( rows ) :
+        result += reversed ( row ) if i % 2 else row
+    return result
+
+# =============================================================================
+## Scan NLL or LL-profile for the given points (single job)
+#  - NLL is created only once
+#  - the points are processed in the "snake"-order,
+#    and each profile minimisation starts from the minimum
+#    found for the previous (neighbouring) point
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  results = scan_nll ( pdf , dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] )
+#  for point , value in results.items() : ...
+#  @endcode
+#  @param pdf       the PDF
+#  @param dataset   the dataset
+#  @param variables the list of (names of) scanned variables
+#  @param points    the list of scan points (tuples with the same length as variables)
+#  @param fix       the list of (names of) variables to be fixed for the profile
+#  @param profile   make profile (minimize the NLL for each point)?
+#  @return dictionary { point : NLL-value } (without the scale factor)
+def scan_nll ( pdf               ,
+               dataset           ,
+               variables         ,
+               points            ,
+               fix      = ()     ,
+               profile  = True   ,
+               silent   = True   ,
+               args     = ()     , **kwargs ) :
+    """Scan NLL or LL-profile for the given points (single job)
+    - NLL is created only once
+    - the points are processed in the ``snake''-order,
+      and each profile minimisation starts from the minimum
+      found for the previous (neighbouring) point
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> results = scan_nll ( pdf , dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] )
+    >>> for point , value in results.items() : ...
+    - returns dictionary { point : NLL-value } (without the scale factor)
+    """
+
+    from ostap.fitting.utils     import RangeVar
+    from ostap.fitting.variables import FIXVAR
+    from ostap.logger.utils      import roo_silent
+
+    ## get the parameters
+    pars  = pdf.params ( dataset )
+
+    vars  = []
+    for v in variables :
+        assert v in pars , "Variable %s is not a parameter" % v
+        vars.append ( v if isinstance ( v , ROOT.RooAbsReal ) else pars [ v ] )
+
+    fixed = []
+    for f in fix :
+        assert f in pars , "Variable %s is not a parameter" % f
+        fixed.append ( f if isinstance ( f , ROOT.RooAbsReal ) else pars [ f ] )
+
+    points = snake_order ( points )
+    assert all ( len ( p ) == len ( vars ) for p in points ) , \
+           'Invalid dimension of scan points!'
+
+    ## keep the current values of all parameters
+    saved   = [ ( p , float ( p.getVal () ) ) for p in pars ]
+
+    ## extend the ranges of the scanned variables, if needed
+    ranges  = []
+    for i , v in enumerate ( vars ) :
+        vmin = min ( v.getMin () , min ( p [ i ] for p in points ) )
+        vmax = max ( v.getMax () , max ( p [ i ] for p in points ) )
+        ranges.append ( RangeVar ( v , vmin , vmax ) )
+
+    ## no offsetting here: the values from different jobs must be comparable
+    kwargs [ 'offset' ] = False
+    kwargs [ 'clone'  ] = False
+
+    results = {}
+    with roo_silent ( silent ) , FIXVAR ( vars + fixed ) :
+
+        for r in ranges : r.__enter__ ()
+        try :
+
+            ## create NLL only once
+            nll , sf = pdf.nll ( dataset , silent = silent , args = args , **kwargs )
+
+            ## minimizer for the profile
+            m = pdf.minuit ( nLL = nll , silent = True , offset = False ) if profile else None
+
+            from ostap.utils.progress_bar import progress_bar
+            for point in progress_bar ( points , silent = silent ) :
+                for v , x in zip ( vars , point ) : v.setVal ( x )
+                ## the minimization starts from the minimum for the previous point
+                if m : m.migrad ()
+                results [ point ] = nll.getVal ()
+
+            del m , nll
+
+        finally :
+            for r in reversed ( ranges ) : r.__exit__ ()
+            for p , v in saved : p.setVal ( v )
+
+    return results
+
+# =============================================================================
+## Scan NLL or LL-profile in parallel
+#  - the scan points are split into <code>nSplit</code> contiguous pieces
+#    (by default, one piece per worker),
+#  - NLL is created only once per piece
+#  - each profile minimisation starts from the minimum
+#    found for the neighbouring point
+#  @code
+#  pdf     = ...
+#  dataset = ...
+#  results = parallel_scan ( pdf , dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] , ncpus = 4 )
+#  for point , value in results.items() : ...
+#  @endcode
+#  @param pdf       the PDF
+#  @param dataset   the dataset
+#  @param variables the list of (names of) scanned variables
+#  @param points    the list of scan points (tuples with the same length as variables)
+#  @param fix       the list of (names of) variables to be fixed for the profile
+#  @param profile   make profile (minimize the NLL for each point)?
+#  @param nSplit    number of pieces (default: number of workers)
+#  @param nll_config configuration of <code>pdf.nll</code>
+#  @return dictionary { point : NLL-value } (without the scale factor)
+#  @see ostap.parallel.parallel_points.parallel_points
+def parallel_scan ( pdf               ,
+                    dataset           ,
+                    variables         ,
+                    points            ,
+                    fix        = ()   ,
+                    profile    = True ,
+                    nSplit     = None ,
+                    silent     = True ,
+                    nll_config = {}   , **kwargs ) :
+    """Scan NLL or LL-profile in parallel
+    - the scan points are split into `nSplit` contiguous pieces
+      (by default, one piece per worker)
+    - NLL is created only once per piece
+    - each profile minimisation starts from the minimum
+      found for the neighbouring point
+    >>> pdf     = ...
+    >>> dataset = ...
+    >>> results = parallel_scan ( pdf , dataset , [ 'S' ] , [ (0,) , (10,) , (20,) ] , ncpus = 4 )
+    >>> for point , value in results.items() : ...
+    - returns dictionary { point : NLL-value } (without the scale factor)
+    - see ostap.parallel.parallel_points.parallel_points
+    """
+
+    variables = tuple ( v.GetName() if isinstance ( v , ROOT.RooAbsReal ) else v for v in variables )
+    fix       = tuple ( f.GetName() if isinstance ( f , ROOT.RooAbsReal ) else f for f in fix       )
+
+    config    = dict ( nll_config )
+    config.update ( variables = variables , fix = fix , profile = profile )
+
+    from ostap.parallel.parallel_points import parallel_points
+    results   = parallel_points ( scan_nll                 ,
+                                  pdf                      ,
+                                  dataset                  ,
+                                  snake_order ( points )   ,
+                                  nSplit = nSplit          ,
+                                  silent = silent          ,
+                                  config = config          , **kwargs )
+    
+    return results if results else {}
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
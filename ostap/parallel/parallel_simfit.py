@@ -0,0 +1,425 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/parallel_simfit.py
+#  Simultaneous fit with per-category parallelisation of NLL:
+#  - the dataset is split into categories
+#  - the categories are grouped into (balanced) groups, one group per worker
+#    process, small categories are packed together
+#  - each worker keeps NLLs for its categories and, for the given values
+#    of the parameters, returns the partial NLL and its gradient
+#    with respect to the "local" parameters of its categories
+#  - the total NLL and gradient are minimized by MINUIT in the main process
+#  @code
+#  simfit = SimFit ( sample , { 'A' : pdfA , 'B' : pdfB } )
+#  result , _ = simfit.fitTo ( dataset , parallel = True )
+#  result , _ = simfit.fitTo ( dataset , parallel = 8    ) ## 8 worker processes
+#  @endcode
+#  @see ostap.fitting.simfit.SimFit.fitTo
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-25
+# =============================================================================
+"""Simultaneous fit with per-category parallelisation of NLL:
+- the dataset is split into categories
+- the categories are grouped into (balanced) groups, one group per worker
+  process, small categories are packed together
+- each worker keeps NLLs for its categories and, for the given values
+  of the parameters, returns the partial NLL and its gradient
+  with respect to the ``local'' parameters of its categories
+- the total NLL and gradient are minimized by MINUIT in the main process
+>>> simfit = SimFit ( sample , { 'A' : pdfA , 'B' : pdfB } )
+>>> result , _ = simfit.fitTo ( dataset , parallel = True )
+>>> result , _ = simfit.fitTo ( dataset , parallel = 8    ) ## 8 worker processes
+- see ostap.fitting.simfit.SimFit.fitTo
+"""
+# =============================================================================
+__version__ = "$Revision$"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-25"
+__all__     = (
+    'balance_categories' , ## group categories into balanced groups
+    'SimNLL'             , ## NLL for simultaneous fit, evaluated per-category in workers
+    'parallel_simfit'    , ## simultaneous fit with per-category parallel NLL
+    )
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.parallel.simfit' )
+else                       : logger = getLogger ( __name__                )
+# =============================================================================
+import ROOT
+import multiprocessing as MP
+from   ostap.core.meta_info import old_PyROOT
+# =============================================================================
+## group categories into the balanced groups
+#  (the greedy "longest processing time first" algorithm):
+#  the largest categories get their own groups,
+#  and the small categories are packed together
+#  @code
+#  groups = balance_categories ( { 'A' : 100000 , 'B' : 10 , 'C' : 20 } , 2 )
+#  ## [ ['A'] , ['C','B'] ]
+#  @endcode
+#  @param sizes   dictionary { category : cost }, e.g. number of entries
+#  @param ngroups number of groups
+#  @return list of groups, ordered by the decreasing cost
+def balance_categories ( sizes , ngroups ) :
+    """Group categories into the balanced groups
+    (the greedy ``longest processing time first'' algorithm):
+    the largest categories get their own groups,
+    and the small categories are packed together
+    >>> groups = balance_categories ( { 'A' : 100000 , 'B' : 10 , 'C' : 20 } , 2 )
+    >>> ## [ ['A'] , ['C','B'] ]
+    - returns list of groups, ordered by the decreasing cost
+    """
+    ngroups = max ( 1 , min ( ngroups , len ( sizes ) ) )
+    groups  = [ [ 0 , [] ] for i in range ( ngroups ) ]
+    for label in sorted ( sizes , key = lambda k : ( -sizes [ k ] , k ) ) :
+        group = min ( groups , key = lambda g : g [ 0 ] )
+        group [ 0 ] += sizes [ label ]
+        group [ 1 ].append ( label )
+    groups.sort ( key = lambda g : -g [ 0 ] )
+    return [ g [ 1 ] for g in groups if g [ 1 ] ]
+
+# =============================================================================
+## the worker: keep NLLs for the group of categories and
+#  calculate the partial NLL and its gradient on request
+#  - <code>None</code> as request stops the worker
+#  @param conn     the connection to the main process
+#  @param pdfs     list of (category) PDFs
+#  @param datasets list of (category) datasets
+#  @param names    names of all floating parameters
+#  @param steps    steps for the numerical derivatives
+#  @param config   configuration of <code>PDF.nll</code>
+def _simfit_worker_ ( conn , pdfs , datasets , names , steps , config ) :
+    """The worker: keep NLLs for the group of categories and
+    calculate the partial NLL and its gradient on request
+    - None as request stops the worker
+    """
+    try :
+
+        nlls = []
+        for pdf , ds in zip ( pdfs , datasets ) :
+            nll , sf = pdf.nll ( ds , silent = True , **config )
+            nlls.append ( nll )
+
+        ## "local" parameters and NLLs that depend on them
+        local = []
+        for i , name in enumerate ( names ) :
+            deps = [ n for n in nlls if n.getVariables ().find ( name ) ]
+            if deps : local.append ( ( i , deps [ 0 ].getVariables ().find ( name ) , deps ) )
+
+        conn.send ( tuple ( i for i , v , d in local ) )
+
+    except Exception as e :
+        conn.send ( e )
+        return
+
+    while True :
+
+        request = conn.recv ()
+        if request is None : break
+
+        try :
+
+            values , gradient = request
+            for i , v , deps in local : v.setVal ( values [ i ] )
+
+            value = sum ( n.getVal () for n in nlls )
+            grad  = {}
+            if gradient :
+                for i , v , deps in local :
+                    x  = values [ i ]
+                    x1 = max ( x - steps [ i ] , v.getMin () )
+                    x2 = min ( x + steps [ i ] , v.getMax () )
+                    if x2 <= x1 : continue
+                    v.setVal ( x2 )
+                    f2 = sum ( n.getVal () for n in deps )
+                    v.setVal ( x1 )
+                    f1 = sum ( n.getVal () for n in deps )
+                    v.setVal ( x  )
+                    grad [ i ] = ( f2 - f1 ) / ( x2 - x1 )
+
+            conn.send ( ( value , grad ) )
+
+        except Exception as e :
+            conn.send ( e )
+
+    conn.close ()
+
+# =============================================================================
+## @class SimNLL
+#  NLL for the simultaneous fit, evaluated per category in the worker processes
+#  - each worker keeps the NLLs for its group of categories
+#  - for the given values of the parameters, workers return the partial
+#    NLLs and gradients, that are summed in the main process
+#  @code
+#  simfit = SimFit ( ... )
+#  with SimNLL ( simfit , dataset , ncpus = 8 ) as nll :
+#     value , grad = nll.evaluate ( values , gradient = True )
+#  @endcode
+#  @attention worker processes are created using <code>fork</code>
+class SimNLL(object) :
+    """NLL for the simultaneous fit, evaluated per category in the worker processes
+    - each worker keeps the NLLs for its group of categories
+    - for the given values of the parameters, workers return the partial
+      NLLs and gradients, that are summed in the main process
+    >>> simfit = SimFit ( ... )
+    >>> with SimNLL ( simfit , dataset , ncpus = 8 ) as nll :
+    ...     value , grad = nll.evaluate ( values , gradient = True )
+    - attention: worker processes are created using `fork`
+    """
+    def __init__ ( self           ,
+                   simfit         ,
+                   dataset        ,
+                   ncpus   = None ,
+                   silent  = True , **config ) :
+
+        ## convert if needed
+        if not isinstance ( dataset , ROOT.RooAbsData ) and hasattr ( dataset , 'dset' ) :
+            dataset = dataset.dset
+
+        ## all floating parameters
+        pars   = simfit.pdf.params ( dataset )
+        self.__params = [ p for p in pars
+                          if isinstance ( p , ROOT.RooRealVar ) and not p.isConstant () ]
+        self.__names  = tuple ( p.GetName () for p in self.__params )
+
+        ## steps for the numerical derivatives
+        self.__steps  = tuple ( 1.e-3 * self.step ( p ) for p in self.__params )
+
+        ## split dataset into categories (keep empty categories for extended terms)
+        self.__split  = dataset.split ( simfit.sample , True )
+        self.__data   = {}
+        for ds in self.__split : self.__data [ ds.GetName () ] = ds
+
+        sizes   = dict ( ( k , d.numEntries () + 1 ) for k , d in self.__data.items () )
+        if not ncpus : ncpus = MP.cpu_count ()
+        self.__groups = balance_categories ( sizes , ncpus )
+
+        ## no nested parallelism and no offsetting
+        config = dict ( config )
+        for k in list ( config.keys () ) :
+            if k.upper ().replace ( '_' , '' ) in ( 'CPU'     , 'CPUS'    , 'NCPU'    ,
+                                                    'NCPUS'   , 'NUMCPU'  , 'NUMCPUS' ) : del config [ k ]
+        config [ 'ncpu'   ] = 1
+        config [ 'offset' ] = False
+
+        context = MP.get_context ( 'fork' ) if hasattr ( MP , 'get_context' ) else MP
+
+        self.__workers = []
+        self.__calls   = 0
+        for group in self.__groups :
+            pdfs     = [ simfit.categories [ k ] for k in group ]
+            datasets = [ self.__data       [ k ] for k in group ]
+            conn , child = context.Pipe ()
+            process = context.Process ( target = _simfit_worker_ ,
+                                        args   = ( child , pdfs , datasets , self.__names ,
+                                                   self.__steps , config ) )
+            process.daemon = True
+            process.start ()
+            self.__workers.append ( ( process , conn ) )
+
+        ## get the local parameters from the workers
+        self.__locals = []
+        for process , conn in self.__workers :
+            local = conn.recv ()
+            if isinstance ( local , Exception ) :
+                self.close ()
+                raise local
+            self.__locals.append ( local )
+
+        if not silent :
+            for group , local in zip ( self.__groups , self.__locals ) :
+                logger.info ( 'SimNLL: worker with %d entries, %d local parameters, categories: %s' % (
+                    sum ( sizes [ k ] - 1 for k in group ) , len ( local ) , ','.join ( group ) ) )
+
+    ## context manager: ENTER
+    def __enter__ ( self      ) : return self
+    ## context manager: EXIT
+    def __exit__  ( self , *_ ) : self.close ()
+    ##
+    def __del__   ( self      ) : self.close ()
+
+    # =========================================================================
+    ## the step (the scale) for the parameter
+    @staticmethod
+    def step ( p ) :
+        """The step (the scale) for the parameter
+        """
+        e = p.getError ()
+        if 0 < e                       : return e
+        if p.hasMin () and p.hasMax () : return 0.1 * ( p.getMax () - p.getMin () )
+        return 0.1 * max ( 1.0 , abs ( p.getVal () ) )
+
+    # =========================================================================
+    ## stop all workers
+    def close ( self ) :
+        """Stop all workers
+        """
+        workers , self.__workers = getattr ( self , '_SimNLL__workers' , [] ) , []
+        for process , conn in workers :
+            try :
+                conn.send ( None )
+                conn.close ()
+            except Exception :
+                pass
+        for process , conn in workers :
+            process.join ( 5 )
+            if process.is_alive () : process.terminate ()
+
+    # =========================================================================
+    ## evaluate the NLL and (optionally) its gradient
+    #  @code
+    #  nll = SimNLL ( ... )
+    #  value , grad = nll.evaluate ( values , gradient = True )
+    #  @endcode
+    #  @param values   values of all floating parameters (in the order of <code>names</code>)
+    #  @param gradient calculate the gradient?
+    #  @return NLL and the list of its derivatives (empty if not requested)
+    def evaluate ( self , values , gradient = False ) :
+        """Evaluate the NLL and (optionally) its gradient
+        >>> nll = SimNLL ( ... )
+        >>> value , grad = nll.evaluate ( values , gradient = True )
+        - returns NLL and the list of its derivatives (empty if not requested)
+        """
+        assert self.__workers , 'SimNLL: no active workers!'
+
+        values = tuple ( float ( v ) for v in values )
+        for process , conn in self.__workers : conn.send ( ( values , gradient ) )
+
+        self.__calls += 1
+        value = 0.0
+        grad  = [ 0.0 ] * len ( values ) if gradient else []
+        error = None
+        for process , conn in self.__workers :
+            result = conn.recv ()
+            if isinstance ( result , Exception ) :
+                error = result
+                continue
+            v , g = result
+            value += v
+            for i , d in g.items () : grad [ i ] += d
+
+        if error is not None : raise error
+        return value , grad
+
+    __call__ = evaluate
+
+    @property
+    def params ( self ) :
+        """``params'' : list of all floating parameters"""
+        return self.__params
+
+    @property
+    def names ( self ) :
+        """``names'' : names of all floating parameters"""
+        return self.__names
+
+    @property
+    def groups ( self ) :
+        """``groups'' : groups of categories, one group per worker"""
+        return tuple ( tuple ( g ) for g in self.__groups )
+
+    @property
+    def calls ( self ) :
+        """``calls'' : number of NLL evaluations"""
+        return self.__calls
+
+# =============================================================================
+## Simultaneous fit with per-category parallelisation of NLL
+#  - categories are grouped into balanced groups, one group per worker
+#  - each worker keeps NLLs for its categories and returns the partial
+#    NLL and gradient for the given values of the parameters
+#  - the total NLL is minimized by MINUIT (<code>MIGRAD</code> + <code>HESSE</code>)
+#  @code
+#  simfit = SimFit ( ... )
+#  result = parallel_simfit ( simfit , dataset , ncpus = 8 )
+#  @endcode
+#  @param simfit   the simultaneous fit model
+#  @param dataset  the (combined) dataset
+#  @param ncpus    number of worker processes (default: all cores)
+#  @param gradient use the gradient, calculated by workers?
+#  @param strategy MINUIT strategy
+#  @param maxcalls maximal number of calls
+#  @return RooFitResult
+#  @see ostap.fitting.simfit.SimFit.fitTo
+def parallel_simfit ( simfit            ,
+                      dataset           ,
+                      ncpus     = None  ,
+                      silent    = False ,
+                      gradient  = True  ,
+                      strategy  = 1     ,
+                      maxcalls  = 10000 ,
+                      tolerance = 0.1   , **config ) :
+    """Simultaneous fit with per-category parallelisation of NLL
+    - categories are grouped into balanced groups, one group per worker
+    - each worker keeps NLLs for its categories and returns the partial
+      NLL and gradient for the given values of the parameters
+    - the total NLL is minimized by MINUIT (MIGRAD + HESSE)
+    >>> simfit = SimFit ( ... )
+    >>> result = parallel_simfit ( simfit , dataset , ncpus = 8 )
+    - returns RooFitResult
+    - see ostap.fitting.simfit.SimFit.fitTo
+    """
+    import ostap.fitting.minuit
+
+    with SimNLL ( simfit , dataset , ncpus = ncpus , silent = silent , **config ) as nll :
+
+        params = nll.params
+        npars  = len ( params )
+
+        ## the MINUIT function
+        def _fcn_ ( npar , gin , f , par , iflag ) :
+            value , grad = nll.evaluate ( [ par [ i ] for i in range ( npars ) ] ,
+                                          gradient and 2 == iflag )
+            if old_PyROOT : f [ 0 ] = value ## *OLD* PyROOT uses arrays/buffers 
+            else          : f.value = value ## *NEW* PyROOT uses ctypes.c_double 
+            for i , d in enumerate ( grad ) : gin [ i ] = d
+
+        mn = ROOT.TMinuit ( npars )
+        mn.SetPrintLevel  ( -1 if silent else 0 )
+        mn.SetFCN         ( _fcn_ )
+        mn.SetErrorDef    ( 0.5   )
+
+        for p in params :
+            low , high = ( p.getMin () , p.getMax () ) if p.hasMin () and p.hasMax () else ( 0 , 0 )
+            mn.addPar ( p.GetName () , p.getVal () , SimNLL.step ( p ) , low , high )
+
+        mn.execute ( 'SET STR' , strategy )
+        if gradient : mn.execute ( 'SET GRA' , 1 )
+
+        status = mn.migrad ( maxcalls , tolerance )
+        mn.hesse ( maxcalls )
+
+        plist  = ROOT.RooArgList ()
+        for p in params : plist.add ( p )
+        result = ROOT.RooFitResult.lastMinuitFit ( plist )
+        result.SetName  ( 'fitresult_%s' % simfit.name )
+        result.SetTitle ( 'Parallel simultaneous fit of %s' % simfit.name )
+
+        ## update the parameters
+        final = result.floatParsFinal ()
+        for p in params :
+            q = final.find ( p.GetName () )
+            if q :
+                p.setVal   ( q.getVal   () )
+                p.setError ( q.getError () )
+
+        if not silent :
+            logger.info ( 'parallel_simfit: status %s, %d workers, %d NLL calls, groups: %s' % (
+                status , len ( nll.groups ) , nll.calls , [ ','.join ( g ) for g in nll.groups ] ) )
+
+        del mn
+
+    return result
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
@@ -14,6 +14,7 @@ __author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
 __date__    = "2011-06-07"
 __all__     = (
     'pStatVar'   , ## get the statistics from loooong TChain in paralell
+    'pDigest'    , ## get the t-digest (quantile sketch) from loooong TChain in paralell
     ) 
 # =============================================================================
 # logging 
@@ -78,8 +79,7 @@ class StatVarTask(Task) :
 
         chain   = item.chain 
         first   = item.first
-        ## last    = min ( n_large , first + item.nevents if 0 < item.nevents else n_large )
-        last    = n_large
+        last    = min ( n_large , first + item.nevents if 0 < item.nevents else n_large )
         
         from ostap.trees.trees  import _stat_vars_
         self.__output = _stat_vars_ ( chain , self.what , self.cuts , first , last )
@@ -121,6 +121,7 @@ def pStatVar ( chain               ,
     """ Parallel processing of loooong chain/tree 
     >>> chain    = ...
     >>> chain.pstatVar( 'mass' , 'pt>1') 
+    >>> chain.pstatVar( 'mass' , 'pt>1' , balance = 'bytes' ) ## chunks with the same bytes to read 
     """
 
     ## few special/trivial cases
@@ -139,10 +140,18 @@ def pStatVar ( chain               ,
     from ostap.trees.trees import Chain
     ch     = Chain ( chain , first = first , nevents = nevents )
 
+    ## (optional) cost-balanced splitting 
+    balance  = kwargs.pop ( 'balance' , None )
+    branches = ()
+    if 'bytes' == balance :
+        from ostap.parallel.utils import used_branches 
+        branches = used_branches ( chain , what , cuts ) 
+
     task   = StatVarTask ( what , cuts )
     wmgr   = WorkManager ( silent = silent , **kwargs )
 
-    trees  = ch.split ( chunk_size = chunk_size , max_files = max_files )
+    trees  = ch.split ( chunk_size = chunk_size , max_files = max_files ,
+                        balance    = balance    , branches  = branches  )
 
     wmgr.process ( task , trees )
 
@@ -156,6 +165,147 @@ def pStatVar ( chain               ,
 ROOT.TChain.pstatVar = pStatVar 
 ROOT.TTree .pstatVar = pStatVar
 
+# =============================================================================
+## The simple task object to fill the mergeable quantile sketch (t-digest)
+#  for loooooong chains 
+#  @see Ostap::Math::TDigest
+#  @see ostap.stats.statvars.data_digest
+class DigestTask(Task) :
+    """The simple task object to fill the mergeable quantile sketch (t-digest)
+    for loooooong chains 
+    - see Ostap.Math.TDigest
+    - see ostap.stats.statvars.data_digest
+    """
+    ## constructor
+    def __init__ ( self , what , cuts = '' , compression = 200 ) :
+        """Constructor        
+        >>> task  = DigestTask ( 'mass' , 'pt>0' , 200 ) 
+        """
+        self.what        = str   ( what        ) 
+        self.cuts        = str   ( cuts        ) 
+        self.compression = float ( compression ) 
+        self.__output    = None
+        
+    ## local initialization (executed once in parent process)
+    def initialize_local   ( self ) :
+        """Local initialization (executed once in parent process)
+        """
+        self.__output = None
+            
+    ## the actual processing
+    def process ( self , jobid , item ) :
+        """The actual processing
+        """
+
+        import ROOT
+        from ostap.logger.utils import logWarning
+        with logWarning() :
+            import ostap.core.pyrouts 
+            import ostap.trees.trees 
+
+        chain   = item.chain 
+        first   = item.first
+        last    = min ( n_large , first + item.nevents if 0 < item.nevents else n_large )
+        
+        from ostap.trees.trees    import AutoBranches 
+        from ostap.stats.digest   import TDigest
+        from ostap.core.core      import Ostap
+        ## the rejected entries are reported for the merged digest 
+        self.__output = TDigest ( self.compression )
+        with AutoBranches ( chain , self.what , self.cuts ) : 
+            Ostap.StatVar.digest ( chain , self.__output , self.what , self.cuts , first , last )
+
+        return self.__output 
+        
+    ## merge results 
+    def merge_results ( self , result , jobid = -1 ) :
+        
+        if self.__output is None : self.__output  = result
+        else                     : self.__output += result
+
+    ## get the results 
+    def results ( self ) : return self.__output 
+
+# ===================================================================================
+## fill the mergeable quantile sketch (t-digest) for loooong chain/tree in parallel 
+#  @code
+#  chain  = ...
+#  digest = chain.pdigest ( 'mass' , 'pt>1' ) 
+#  print ( digest.quantiles ( 0.05 , 0.5 , 0.95 ) ) 
+#  @endcode
+#  @param chain       the chain/tree
+#  @param what        the expression 
+#  @param cuts        selection/weighting criteria
+#  @param compression the compression parameter for t-digest
+#  @return the digest 
+#  @see Ostap::Math::TDigest
+#  @see ostap.stats.statvars.data_digest
+def pDigest ( chain               ,
+              what                ,
+              cuts        = ''     ,
+              compression = 200    , 
+              nevents     = -1     ,
+              first       =  0     ,
+              chunk_size  = 100000 ,
+              max_files   = 10     ,
+              silent      = True   , **kwargs ) :
+    """Fill the mergeable quantile sketch (t-digest) for loooong chain/tree in parallel 
+    >>> chain  = ...
+    >>> digest = chain.pdigest ( 'mass' , 'pt>1' ) 
+    >>> print ( digest.quantiles ( 0.05 , 0.5 , 0.95 ) ) 
+    >>> digest = chain.pdigest ( 'mass' , 'pt>1' , balance = 'bytes' ) ## chunks with the same bytes to read 
+    - see Ostap.Math.TDigest
+    - see ostap.stats.statvars.data_digest
+    """
+
+    from ostap.stats.statvars import data_digest
+    
+    ## few special/trivial cases
+
+    last = min ( n_large , first + nevents if 0 < nevents else n_large )
+    
+    if 0 <= first and 0 < nevents < chunk_size :
+        return data_digest ( chain , what , cuts , compression , first , last )
+    elif isinstance ( chain , ROOT.TChain ) : 
+        if chain.nFiles() < 5 and len ( chain ) < chunk_size :
+            return data_digest ( chain , what , cuts , compression , first , last )
+    elif isinstance ( chain , ROOT.TTree  ) and len ( chain ) < chunk_size :
+        return data_digest ( chain , what , cuts , compression , first , last )
+    
+    from ostap.trees.trees import Chain
+    ch     = Chain ( chain , first = first , nevents = nevents )
+
+    ## (optional) cost-balanced splitting 
+    balance  = kwargs.pop ( 'balance' , None )
+    branches = ()
+    if 'bytes' == balance :
+        from ostap.parallel.utils import used_branches 
+        branches = used_branches ( chain , what , cuts ) 
+
+    task   = DigestTask  ( what , cuts , compression )
+    wmgr   = WorkManager ( silent = silent , **kwargs )
+
+    trees  = ch.split ( chunk_size = chunk_size , max_files = max_files ,
+                        balance    = balance    , branches  = branches  )
+
+    wmgr.process ( task , trees )
+
+    del trees
+    del ch    
+
+    result = task.results()
+    if result is None :
+        from ostap.stats.digest import TDigest 
+        result = TDigest ( compression ) 
+
+    from ostap.stats.statvars import _digest_rejected_
+    _digest_rejected_ ( result , what )
+    
+    return result 
+
+ROOT.TChain.pdigest = pDigest 
+ROOT.TTree .pdigest = pDigest
+
 # =============================================================================
 _decorated_classes_ = (
     ROOT.TTree  ,
@@ -165,6 +315,8 @@ _decorated_classes_ = (
 _new_methods_       = (
     ROOT.TTree .pstatVar,
     ROOT.TChain.pstatVar,
+    ROOT.TTree .pdigest ,
+    ROOT.TChain.pdigest ,
     )
 
 # =============================================================================
@@ -52,7 +52,9 @@ class  ToysTask(Task) :
                    fit_fun    = None  , 
                    accept_fun = None  , 
                    silent     = True  ,
-                   progress   = False ) :
+                   progress   = False ,
+                   dbase      = None  ,
+                   seed       = None  ) :
         
         self.pdf        = pdf
                 
@@ -68,6 +70,10 @@ class  ToysTask(Task) :
         
         self.silent     = silent
         self.progress   = progress 
+
+        ## streaming mode: results are merged through the database
+        self.dbase      = dbase
+        self.seed       = seed 
         
         self.__the_output   = () 
 
@@ -108,9 +114,7 @@ class  ToysTask(Task) :
             import ostap.fitting.roofitresult            
             import ostap.fitting.variables
             
-        from   ostap.core.ostap_types import integer_types 
-        assert isinstance ( nToys , integer_types ) and 0 < nToys,\
-               'Jobid %s: Invalid "nToys" argument %s/%s' % ( jobid , nToys , type ( nToys ) )
+        nToys , toys , part = self.job_toys ( jobid , nToys )
         
         import ostap.fitting.toys as Toys 
         results , stats = Toys.make_toys ( pdf        = self.pdf        ,
@@ -124,15 +128,45 @@ class  ToysTask(Task) :
                                            fit_fun    = self.fit_fun    , 
                                            accept_fun = self.accept_fun ,
                                            silent     = self.silent     ,
-                                           progress   = self.progress   )
+                                           progress   = self.progress   ,
+                                           dbase      = part            ,
+                                           seed       = self.seed       ,
+                                           toys       = toys            )
         
-        
-        self.the_output = results , stats
+        ## streaming mode: only the name of database is returned 
+        self.the_output = part if part else ( results , stats )
         
         return self.results() 
 
+    ## get the number of toys, their indices and the name of the database for the job
+    def job_toys ( self , jobid , item ) :
+        """Get the number of toys, their indices and the name of the database for the job
+        - in the streaming mode the item is the list of toy indices, and the results
+        are stored in the separate database for each job 
+        """
+        from   ostap.core.ostap_types import integer_types 
+        if not self.dbase :
+            assert isinstance ( item , integer_types ) and 0 < item ,\
+                   'Jobid %s: Invalid "nToys" argument %s/%s' % ( jobid , item , type ( item ) )
+            return item , None , None 
+
+        import os, uuid 
+        toys = list ( item )
+        assert toys , 'Jobid %s: Invalid list of toys' % jobid
+        root , ext = os.path.splitext ( self.dbase )
+        part = '%s_job%d_%s%s' % ( root , jobid , uuid.uuid4().hex[:8] , ext )
+        return len ( toys ) , toys , part 
+
     ## merge results/datasets 
     def merge_results ( self , result , jobid = -1 ) :
+
+        ## streaming mode: merge through the database 
+        if result and isinstance ( result , string_types ) :
+            import os 
+            from ostap.fitting.toysdb import ToysDB
+            with ToysDB ( self.dbase ) as db : db.merge ( result )
+            if os.path.exists ( result ) : os.remove ( result )
+            return 
         
         if result :
             results , stat = result
@@ -184,7 +218,9 @@ class  ToysTask2(ToysTask) :
                    fit_fun    = None  , 
                    accept_fun = None  , 
                    silent     = True  ,
-                   progress   = False ) :
+                   progress   = False ,
+                   dbase      = None  ,
+                   seed       = None  ) :
 
         ToysTask.__init__ ( self                    ,
                             pdf        = gen_pdf    ,
@@ -197,7 +233,9 @@ class  ToysTask2(ToysTask) :
                             fit_fun    = fit_fun    ,
                             accept_fun = accept_fun ,
                             silent     = silent     ,
-                            progress   = progress   )
+                            progress   = progress   ,
+                            dbase      = dbase      ,
+                            seed       = seed       )
                           
         self.gen_pdf    = self.pdf 
         self.fit_pdf    = fit_pdf
@@ -216,9 +254,7 @@ class  ToysTask2(ToysTask) :
             import ostap.fitting.roofitresult            
             import ostap.fitting.variables
             
-        from   ostap.core.ostap_types import integer_types 
-        assert isinstance ( nToys , integer_types ) and 0 < nToys,\
-               'Jobid %s: Invalid "nToys" argument %s/%s' % ( jobid , nToys , type ( nToys ) )
+        nToys , toys , part = self.job_toys ( jobid , nToys )
         
         import ostap.fitting.toys as Toys 
         results , stats = Toys.make_toys2 ( gen_pdf    = self.gen_pdf    ,
@@ -234,12 +270,96 @@ class  ToysTask2(ToysTask) :
                                             fit_fun    = self.fit_fun    ,
                                             accept_fun = self.accept_fun ,
                                             silent     = self.silent     ,
-                                            progress   = self.progress   )
+                                            progress   = self.progress   ,
+                                            dbase      = part            ,
+                                            seed       = self.seed       ,
+                                            toys       = toys            )
                 
-        self.the_output = results , stats
+        ## streaming mode: only the name of database is returned 
+        self.the_output = part if part else ( results , stats )
         
         return self.results () 
 
+# ===================================================================================
+## split the toys into pieces for the streaming mode:
+#  - initialize the campaign in the database
+#  - the already stored toys are skipped
+#  @return the base seed and the list of pieces (lists of toy indices)
+def _stream_pieces_ ( dbase , seed , nToys , nSplit , init = {} , more_vars = {} ) :
+    """Split the toys into pieces for the streaming mode:
+    - initialize the campaign in the database
+    - the already stored toys are skipped
+    - returns the base seed and the list of pieces (lists of toy indices)
+    """
+    assert isinstance ( dbase , string_types ) , \
+           'Database for the parallel toys must be specified by the file name!'
+    
+    from ostap.fitting.toysdb import ToysDB
+    with ToysDB ( dbase ) as db :
+        seed = db.init ( seed , init = init , more = tuple ( more_vars ) )
+        done = db.done
+        
+    todo   = [ i for i in range ( nToys ) if not i in done ]
+    if done : logger.info ( "parallel_toys: %d toys are already done, resume processing" % len ( done ) )
+    
+    nSplit = max ( 1 , min ( nSplit , len ( todo ) ) )
+    n , r  = divmod ( len ( todo ) , nSplit )
+    pieces = []
+    first  = 0
+    for i in range ( nSplit ) :
+        last = first + n + ( 1 if i < r else 0 )
+        if first < last : pieces.append ( todo [ first : last ] )
+        first = last
+        
+    return seed , pieces
+
+# ===================================================================================
+## process the subjobs for the precision-driven mode:
+#  - the subjobs are handed out on demand by the adaptive scheduler,
+#    (pieces of toys are getting smaller towards the end of the budget) 
+#  - the running statistics are updated after each merged subjob
+#  - no more subjobs are handed out once the target precision is reached
+#  @param wmgr       the work manager
+#  @param task       the task
+#  @param pieces     the subjobs 
+#  @param precision  the target precision <code>{ quantity : error }</code>
+#  @param init       the initial values of the parameters (for pulls)
+#  @param dbase      the database (streaming mode)
+#  @see ostap.fitting.toys.ToysPrecision 
+#  @see ostap.parallel.task.AdaptiveScheduler
+def _precision_process_ ( wmgr , task , pieces , precision , init = {} , dbase = None ) :
+    """Process the subjobs for the precision-driven mode:
+    - the subjobs are handed out on demand by the adaptive scheduler,
+    (pieces of toys are getting smaller towards the end of the budget) 
+    - the running statistics are updated after each merged subjob
+    - no more subjobs are handed out once the target precision is reached
+    - see ostap.fitting.toys.ToysPrecision 
+    - see ostap.parallel.task.AdaptiveScheduler
+    """
+    import ostap.fitting.toys as Toys
+    from   ostap.fitting.toysdb import ToysDB
+    
+    def _tracker_ () :
+        if not dbase : return Toys.ToysPrecision ( precision , init = init )
+        with ToysDB ( dbase ) as db : return Toys._toys_tracker_ ( precision , init , db )
+
+    tracker = [ _tracker_ () ]
+    if tracker [ 0 ].reached :
+        logger.info ( 'parallel_toys: target precision is already reached' )
+        return 
+    
+    ## update the running statistics and check the target precision 
+    def _stop_ ( jobid , result ) :
+        if dbase  : tracker [ 0 ] = _tracker_ ()          ## merged through the database 
+        elif result : tracker [ 0 ].update ( result [ 0 ] ) 
+        return tracker [ 0 ].reached 
+    
+    wmgr.process ( task , pieces , adaptive = True , stop = _stop_ )
+
+    if tracker [ 0 ].reached :
+        logger.info ( 'parallel_toys: target precision is reached' ) 
+    logger.info ( 'Toys precision:\n%s' % tracker [ 0 ].table ( prefix = '# ' ) ) 
+        
 # ===================================================================================
 ## Run fitting toys in parallel
 #
@@ -282,6 +402,17 @@ class  ToysTask2(ToysTask) :
 #  - <code>ncpus</code>, number of local cpus to use,
 #   default is <code>'autodetect'</code>, that means - use all local processors
 #  - <code>ppservers</code>,  list of serevers to be used (for parallel python)
+#  The optional <code>journal</code> argument (database name) allows to resume
+#  the interrupted processing, see ostap.parallel.journal.TaskJournal 
+#  With the optional <code>dbase</code> argument (database name) the results
+#  are streamed into database, one row per toy, and merged through the file;
+#  the interrupted campaign is resumed from the stored seed and toy index,
+#  see ostap.fitting.toysdb.ToysDB 
+#  With the optional <code>precision</code> argument <code>{ quantity : error }</code>
+#  the subjobs are handed out on demand (adaptive scheduling) and no more subjobs 
+#  are handed out once the target precision is reached for all quantities;
+#  <code>nToys</code> is the budget, <code>journal</code> is not supported in this mode,
+#  see ostap.fitting.toys.ToysPrecision 
 #   
 # @see ostap.fitting.toys
 # @see ostap.fitting.toys.make_toys
@@ -370,6 +501,17 @@ def parallel_toys ( pdf                       ,
     - `ncpus` :  number of local cpus to use, default is `'autodetect'`,
     that means all local processors
     - `ppservers`:  list of serevers to be used (for parallel python)
+    The optional `journal` argument (database name) allows to resume
+    the interrupted processing, see ostap.parallel.journal.TaskJournal 
+    With the optional `dbase` argument (database name) the results
+    are streamed into database, one row per toy, and merged through the file;
+    the interrupted campaign is resumed from the stored seed and toy index,
+    see ostap.fitting.toysdb.ToysDB 
+    With the optional `precision` argument `{ quantity : error }`
+    the subjobs are handed out on demand (adaptive scheduling) and no more subjobs 
+    are handed out once the target precision is reached for all quantities;
+    `nToys` is the budget, `journal` is not supported in this mode,
+    see ostap.fitting.toys.ToysPrecision 
 
     - If `gen_fun`    is not specified `generate_data` is used 
     - If `fit_fun`    is not specified `make_fit`      is used 
@@ -387,6 +529,11 @@ def parallel_toys ( pdf                       ,
     assert isinstance ( nSplit , integer_types ) and 0 < nSplit ,\
                'Jobid %s: Invalid "nSplit" argument %s/%s' % ( jobid , nSplit , type ( nSplit ) )
 
+    dbase     = kwargs.pop ( 'dbase'     , None )
+    seed      = kwargs.pop ( 'seed'      , None )
+    precision = kwargs.pop ( 'precision' , {}   )
+    batch     = { 'batch' : kwargs.pop ( 'batch' ) } if 'batch' in kwargs else {} 
+    
     import ostap.fitting.toys as Toys
     if 1 == nSplit :
         return Toys.make_toys ( pdf        = pdf        ,
@@ -400,7 +547,11 @@ def parallel_toys ( pdf                       ,
                                 fit_fun    = fit_fun    ,
                                 accept_fun = accept_fun ,
                                 silent     = silent     ,
-                                progress   = progress   )
+                                progress   = progress   ,
+                                dbase      = dbase      ,
+                                seed       = seed       ,
+                                precision  = precision  ,
+                                **batch    )
         
     import ostap.fitting.roofit
     import ostap.fitting.dataset
@@ -440,17 +591,37 @@ def parallel_toys ( pdf                       ,
                           fit_fun    = fit_fun        ,
                           accept_fun = accept_fun     ,
                           silent     = silent         ,
-                          progress   = progress       )
+                          progress   = progress       ,
+                          dbase      = dbase          )
                           
+    journal = kwargs.pop ( 'journal'    , None  ) 
+    tmerge  = kwargs.pop ( 'tree_merge' , False ) 
+    if precision :
+        ## the precision-driven mode relies on the adaptive scheduling of subjobs  
+        assert journal is None , \
+               "parallel_toys: ``journal'' is not supported for the precision-driven mode, use ``dbase'' to resume"
+        if tmerge : logger.warning ( "parallel_toys: ``tree_merge'' is ignored for the precision-driven mode" )
     wmgr  = WorkManager ( silent = False , **kwargs )
 
-    data  = nSplit * [ nToy ]
-    if nRest : data.append ( nRest )
-    
-    wmgr.process( task , data )
-
-    results , stats = task.results () 
-    Toys.print_stats ( stats , nToys ) 
+    init = Toys.vars_transform ( params )
+    init.update ( toy_init_pars )
+    if dbase :
+        task.seed , data = _stream_pieces_ ( dbase , seed , nToys , nSplit ,
+                                             init = init , more_vars = more_vars )
+    else : 
+        data  = nSplit * [ nToy ]
+        if nRest : data.append ( nRest )
+
+    if   data and precision :
+        _precision_process_ ( wmgr , task , data , precision , init = init , dbase = dbase ) 
+    elif data : wmgr.process( task , data , journal = journal , tree_merge = tmerge )
+
+    if dbase :
+        from ostap.fitting.toysdb import ToysDB
+        with ToysDB ( dbase ) as db : results , stats = db.results () , db.stats () 
+    else : 
+        results , stats = task.results () 
+    Toys.print_stats ( stats , len ( results.get ( '#' , () ) ) if precision else nToys ) 
         
     return results, stats   
 
@@ -499,6 +670,17 @@ def parallel_toys ( pdf                       ,
 #  - <code>ncpus</code>, number of local cpus to use,
 #   default is <code>'autodetect'</code>, that means - use all local processors
 #  - <code>ppservers</code>,  list of serevers to be used (for parallel python)
+#  The optional <code>journal</code> argument (database name) allows to resume
+#  the interrupted processing, see ostap.parallel.journal.TaskJournal 
+#  With the optional <code>dbase</code> argument (database name) the results
+#  are streamed into database, one row per toy, and merged through the file;
+#  the interrupted campaign is resumed from the stored seed and toy index,
+#  see ostap.fitting.toysdb.ToysDB 
+#  With the optional <code>precision</code> argument <code>{ quantity : error }</code>
+#  the subjobs are handed out on demand (adaptive scheduling) and no more subjobs 
+#  are handed out once the target precision is reached for all quantities;
+#  <code>nToys</code> is the budget, <code>journal</code> is not supported in this mode,
+#  see ostap.fitting.toys.ToysPrecision 
 # 
 # @see ostap.fitting.toys
 # @see ostap.fitting.toys.make_toys2
@@ -594,6 +776,17 @@ def parallel_toys2(
     - `ncpus` :  number of local cpus to use, default is `'autodetect'`,
     that means all local processors
     - `ppservers`:  list of serevers to be used (for parallel python)
+    The optional `journal` argument (database name) allows to resume
+    the interrupted processing, see ostap.parallel.journal.TaskJournal 
+    With the optional `dbase` argument (database name) the results
+    are streamed into database, one row per toy, and merged through the file;
+    the interrupted campaign is resumed from the stored seed and toy index,
+    see ostap.fitting.toysdb.ToysDB 
+    With the optional `precision` argument `{ quantity : error }`
+    the subjobs are handed out on demand (adaptive scheduling) and no more subjobs 
+    are handed out once the target precision is reached for all quantities;
+    `nToys` is the budget, `journal` is not supported in this mode,
+    see ostap.fitting.toys.ToysPrecision 
 
     
     """
@@ -608,6 +801,11 @@ def parallel_toys2(
     assert isinstance ( nSplit , integer_types ) and 0 < nSplit ,\
                'Jobid %s: Invalid "nSplit" argument %s/%s' % ( jobid , nSplit , type ( nSplit ) )
 
+    dbase     = kwargs.pop ( 'dbase'     , None )
+    seed      = kwargs.pop ( 'seed'      , None )
+    precision = kwargs.pop ( 'precision' , {}   )
+    batch     = { 'batch' : kwargs.pop ( 'batch' ) } if 'batch' in kwargs else {} 
+    
     import ostap.fitting.toys as Toys
     if 1 == nSplit :
         return Toys.make_toys2 (
@@ -624,7 +822,11 @@ def parallel_toys2(
             fit_fun    = fit_fun    , 
             accept_fun = accept_fun , 
             silent     = silent     ,
-            progress   = progress   )
+            progress   = progress   ,
+            dbase      = dbase      ,
+            seed       = seed       ,
+            precision  = precision  ,
+            **batch    )
         
     import ostap.fitting.roofit
     import ostap.fitting.dataset
@@ -667,17 +869,36 @@ def parallel_toys2(
                           fit_fun    = fit_fun        , 
                           accept_fun = accept_fun     , 
                           silent     = silent         ,
-                          progress   = progress       )
-
+                          progress   = progress       ,
+                          dbase      = dbase          )
+
+    journal = kwargs.pop ( 'journal'    , None  ) 
+    tmerge  = kwargs.pop ( 'tree_merge' , False ) 
+    if precision :
+        ## the precision-driven mode relies on the adaptive scheduling of subjobs  
+        assert journal is None , \
+               "parallel_toys2: ``journal'' is not supported for the precision-driven mode, use ``dbase'' to resume"
+        if tmerge : logger.warning ( "parallel_toys2: ``tree_merge'' is ignored for the precision-driven mode" )
     wmgr  = WorkManager ( silent = False , **kwargs )
 
-    data  = nSplit * [ nToy ]
-    if nRest : data.append ( nRest )
+    if dbase :
+        task.seed , data = _stream_pieces_ ( dbase , seed , nToys , nSplit , more_vars = more_vars )
+    else : 
+        data  = nSplit * [ nToy ]
+        if nRest : data.append ( nRest )
     
-    wmgr.process( task , data )
-
-    results , stats = task.results () 
-    Toys.print_stats ( stats , nToys ) 
+    if   data and precision :
+        init = Toys.vars_transform ( params )
+        init.update ( gen_init_pars )
+        _precision_process_ ( wmgr , task , data , precision , init = init , dbase = dbase ) 
+    elif data : wmgr.process( task , data , journal = journal , tree_merge = tmerge )
+
+    if dbase :
+        from ostap.fitting.toysdb import ToysDB
+        with ToysDB ( dbase ) as db : results , stats = db.results () , db.stats () 
+    else : 
+        results , stats = task.results () 
+    Toys.print_stats ( stats , len ( results.get ( '#' , () ) ) if precision else nToys ) 
 
     return results, stats   
 
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/shmem.py
+#
+#  Shared-memory transport for histogram and array results from local workers.
+#
+#  The bin contents and <code>sumw2</code> arrays of the histograms
+#  (and flat <code>numpy</code> arrays) are written by the worker into
+#  <code>multiprocessing.shared_memory</code> blocks, and only small
+#  descriptors are sent back through the pool.
+#  The master rebuilds the objects directly from the shared blocks,
+#  avoiding the (expensive) serialization of large histograms.
+#
+#  @code
+#  wm = WorkManager ( shared_memory = True )
+#  wm.process ( task , items )
+#  wm.process ( task , items , shared_memory = True ) ## ditto
+#  @endcode
+#
+#  @attention it works only for the local workers
+#  @attention it requires python 3.8+ and numpy
+#  - TH1/TH2/TH3 histograms (but not profiles, TH2Poly and histograms with labels)
+#  - flat <code>numpy</code> arrays
+#  - other objects are transferred in the regular way
+#
+#  @see https://docs.python.org/3/library/multiprocessing.shared_memory.html
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-02-22
+# =============================================================================
+"""Shared-memory transport for histogram and array results from local workers.
+
+The bin contents and `sumw2` arrays of the histograms (and flat `numpy`
+arrays) are written by the worker into `multiprocessing.shared_memory`
+blocks, and only small descriptors are sent back through the pool.
+The master rebuilds the objects directly from the shared blocks,
+avoiding the (expensive) serialization of large histograms.
+
+>>> wm = WorkManager ( shared_memory = True )
+>>> wm.process ( task , items )
+>>> wm.process ( task , items , shared_memory = True ) ## ditto
+
+- it works only for the local workers
+- it requires python 3.8+ and numpy
+- TH1/TH2/TH3 histograms (but not profiles, TH2Poly and histograms with labels)
+- flat `numpy` arrays
+- other objects are transferred in the regular way
+- see https://docs.python.org/3/library/multiprocessing.shared_memory.html
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-02-22'
+__all__     = (
+    'SharedHisto'     , ## descriptor of the histogram in shared memory
+    'SharedArray'     , ## descriptor of the numpy array in shared memory
+    'to_shared'       , ## move histograms and arrays into shared memory
+    'from_shared'     , ## rebuild histograms and arrays from shared memory
+    'shared_executor' , ## executor that uses shared-memory transport for results
+    'shared_memory'   , ## is shared-memory transport available?
+    )
+# =============================================================================
+from   ostap.logger.logger import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.parallel.shmem' )
+else                      : logger = getLogger ( __name__               )
+# =============================================================================
+try :
+    import numpy
+    from   multiprocessing import shared_memory as SHM
+    from   multiprocessing import resource_tracker
+except ImportError :
+    numpy            = None
+    SHM              = None
+    resource_tracker = None
+# =============================================================================
+## is shared-memory transport available?
+shared_memory = bool ( SHM and numpy )
+# =============================================================================
+## minimal size (number of bins or array elements) to use shared memory;
+#  smaller objects are transferred in the regular way
+min_size      = 1024
+# =============================================================================
+## the ROOT array types of the histograms and corresponding numpy types
+_array_types  = ( ( 'TArrayD'   , 'f8' ) ,
+                  ( 'TArrayF'   , 'f4' ) ,
+                  ( 'TArrayL64' , 'i8' ) ,
+                  ( 'TArrayI'   , 'i4' ) ,
+                  ( 'TArrayS'   , 'i2' ) ,
+                  ( 'TArrayC'   , 'i1' ) )
+# =============================================================================
+## get numpy view for the (raw) ROOT buffer
+def _view ( buffer , size , dtype ) :
+    """Get numpy view for the (raw) ROOT buffer"""
+    if hasattr ( buffer , 'reshape' ) :
+        reshaped = buffer.reshape ( ( size , ) )
+        if reshaped is not None : buffer = reshaped
+    return numpy.frombuffer ( buffer , dtype = dtype , count = size )
+
+# =============================================================================
+## create new shared-memory block (not tracked by this process)
+#  - the block is unlinked by the master, therefore it should not be
+#    tracked (and unlinked) by the resource tracker of the worker process
+def _create ( size ) :
+    """Create new shared-memory block (not tracked by this process)
+    - the block is unlinked by the master, therefore it should not be
+    tracked (and unlinked) by the resource tracker of the worker process
+    """
+    try :
+        return SHM.SharedMemory ( create = True , size = size , track = False )
+    except TypeError :
+        ## python < 3.13
+        shm = SHM.SharedMemory  ( create = True , size = size )
+        resource_tracker.unregister ( shm._name , 'shared_memory' )
+        return shm
+
+# =============================================================================
+## @class SharedArray
+#  Descriptor of the numpy array, placed in shared memory
+#  @code
+#  a    = numpy.array ( ... )
+#  desc = SharedArray ( a ) ## in the worker
+#  b    = desc.get     ()   ## in the master
+#  @endcode
+class SharedArray(object) :
+    """Descriptor of the numpy array, placed in shared memory
+    >>> a    = numpy.array ( ... )
+    >>> desc = SharedArray ( a ) ## in the worker
+    >>> b    = desc.get     ()   ## in the master
+    """
+    def __init__ ( self , array ) :
+
+        array        = numpy.ascontiguousarray ( array )
+        shm          = _create ( max ( 1 , array.nbytes ) )
+        numpy.ndarray ( array.shape , dtype = array.dtype , buffer = shm.buf ) [...] = array
+        self.__name  = shm.name
+        self.__shape = array.shape
+        self.__dtype = array.dtype.str
+        shm.close ()
+
+    # =========================================================================
+    ## get the array from shared memory and release the shared block
+    def get ( self ) :
+        """Get the array from shared memory and release the shared block"""
+        shm = SHM.SharedMemory ( name = self.__name )
+        try :
+            view   = numpy.ndarray ( self.__shape , dtype = self.__dtype , buffer = shm.buf )
+            result = numpy.array   ( view , copy = True )
+            del view
+        finally :
+            shm.close  ()
+            shm.unlink ()
+        return result
+
+    @property
+    def name  ( self ) :
+        """``name'' : the name of the shared-memory block"""
+        return self.__name
+
+    def __repr__ ( self ) :
+        return 'SharedArray(%s,shape=%s,dtype=%s)' % ( self.__name , self.__shape , self.__dtype )
+
+# =============================================================================
+## @class SharedHisto
+#  Descriptor of the histogram, placed in shared memory:
+#  - the bin contents and <code>sumw2</code> are in the shared-memory block
+#  - the type, the axes, the number of entries and the statistics
+#    are kept in the descriptor
+#  @code
+#  h    = ...
+#  desc = SharedHisto ( h ) ## in the worker
+#  h2   = desc.get    ()   ## in the master
+#  @endcode
+class SharedHisto(object) :
+    """Descriptor of the histogram, placed in shared memory:
+    - the bin contents and `sumw2` are in the shared-memory block
+    - the type, the axes, the number of entries and the statistics
+    are kept in the descriptor
+    >>> h    = ...
+    >>> desc = SharedHisto ( h ) ## in the worker
+    >>> h2   = desc.get    ()   ## in the master
+    """
+    def __init__ ( self , histo ) :
+
+        import ROOT
+        from   array import array
+
+        self.__type  = type ( histo ).__name__
+        self.__hname = histo.GetName  ()
+        self.__title = histo.GetTitle ()
+
+        axes = [ histo.GetXaxis () ]
+        if 2 <= histo.GetDimension () : axes.append ( histo.GetYaxis () )
+        if 3 <= histo.GetDimension () : axes.append ( histo.GetZaxis () )
+        self.__axes = tuple ( SharedHisto._axis ( a ) for a in axes )
+
+        self.__entries = histo.GetEntries ()
+        stats          = array ( 'd' , 13 * [ 0.0 ] )
+        histo.GetStats ( stats )
+        self.__stats   = tuple ( stats )
+
+        size  = histo.GetSize ()
+        dtype = SharedHisto._dtype ( histo )
+
+        contents = _view ( histo.GetArray () , size , dtype )
+        sumw2    = _view ( histo.GetSumw2 ().GetArray () , size , 'f8' ) if histo.GetSumw2N () else None
+
+        ## sumw2 is aligned to 8 bytes
+        offset = ( ( contents.nbytes + 7 ) // 8 ) * 8
+        nbytes = offset + ( sumw2.nbytes if sumw2 is not None else 0 )
+
+        shm = _create ( nbytes )
+        numpy.ndarray ( size , dtype = dtype , buffer = shm.buf ) [:] = contents
+        if sumw2 is not None :
+            numpy.ndarray ( size , dtype = 'f8' , buffer = shm.buf , offset = offset ) [:] = sumw2
+
+        self.__name   = shm.name
+        self.__size   = size
+        self.__dtype  = dtype
+        self.__offset = offset if sumw2 is not None else -1
+        shm.close ()
+
+    # =========================================================================
+    ## is this histogram supported by shared-memory transport?
+    @staticmethod
+    def supported ( histo ) :
+        """Is this histogram supported by shared-memory transport?"""
+        import ROOT
+        if not isinstance ( histo , ROOT.TH1 )                   : return False
+        if isinstance ( histo , ( ROOT.TProfile  ,
+                                  ROOT.TProfile2D ,
+                                  ROOT.TProfile3D ,
+                                  ROOT.TH2Poly    ) )            : return False
+        if SharedHisto._dtype ( histo ) is None                  : return False
+        for a in ( histo.GetXaxis () , histo.GetYaxis () , histo.GetZaxis () ) :
+            if a.GetLabels ()                                    : return False
+        return True
+
+    # =========================================================================
+    ## get numpy type of the histogram bin contents
+    @staticmethod
+    def _dtype ( histo ) :
+        """Get numpy type of the histogram bin contents"""
+        import ROOT
+        for t , d in _array_types :
+            a = getattr ( ROOT , t , None )
+            if a and isinstance ( histo , a ) : return d
+        return None
+
+    # =========================================================================
+    ## get the axis description
+    @staticmethod
+    def _axis ( axis ) :
+        """Get the axis description"""
+        nbins = axis.GetNbins ()
+        if axis.IsVariableBinSize () :
+            return nbins , tuple ( axis.GetBinLowEdge ( i ) for i in range ( 1 , nbins + 2 ) )
+        return nbins , ( axis.GetXmin () , axis.GetXmax () )
+
+    # =========================================================================
+    ## rebuild the histogram from shared memory and release the shared block
+    def get ( self ) :
+        """Rebuild the histogram from shared memory and release the shared block"""
+
+        import ROOT
+        from   array            import array
+        from   ostap.core.core  import ROOTCWD, hID
+
+        ## bin edges for all axes
+        args = []
+        for nbins , edges in self.__axes :
+            if 2 == len ( edges ) :
+                xmin , xmax = edges
+                edges = [ xmin + ( xmax - xmin ) * i / float ( nbins ) for i in range ( nbins + 1 ) ]
+            args += [ nbins , array ( 'd' , edges ) ]
+
+        with ROOTCWD () :
+            ROOT.gROOT.cd ()
+            histo = getattr ( ROOT , self.__type ) ( hID () , self.__title , *args )
+
+        ## restore the fixed binning
+        axes = histo.GetXaxis () , histo.GetYaxis () , histo.GetZaxis ()
+        for axis , ( nbins , edges ) in zip ( axes , self.__axes ) :
+            if 2 == len ( edges ) : axis.Set ( nbins , *edges )
+
+        shm = SHM.SharedMemory ( name = self.__name )
+        try :
+            size = self.__size
+            _view ( histo.GetArray () , size , self.__dtype ) [:] = \
+                  numpy.ndarray ( size , dtype = self.__dtype , buffer = shm.buf )
+            if 0 <= self.__offset :
+                histo.Sumw2 ()
+                _view ( histo.GetSumw2 ().GetArray () , size , 'f8' ) [:] = \
+                      numpy.ndarray ( size , dtype = 'f8' , buffer = shm.buf , offset = self.__offset )
+        finally :
+            shm.close  ()
+            shm.unlink ()
+
+        histo.PutStats   ( array ( 'd' , self.__stats ) )
+        histo.SetEntries ( self.__entries )
+        histo.SetName    ( self.__hname   )
+        return histo
+
+    @property
+    def name  ( self ) :
+        """``name'' : the name of the shared-memory block"""
+        return self.__name
+
+    def __repr__ ( self ) :
+        return 'SharedHisto(%s,%s,size=%d)' % ( self.__type , self.__name , self.__size )
+
+# =============================================================================
+## move (large) histograms and numpy arrays into shared memory,
+#  replacing them with the descriptors. Tuples, lists and dictionaries
+#  are processed recursively, other objects are left intact
+#  @code
+#  result = ...
+#  result = to_shared   ( result ) ## in the worker
+#  result = from_shared ( result ) ## in the master
+#  @endcode
+def to_shared ( obj , min_size = min_size ) :
+    """Move (large) histograms and numpy arrays into shared memory,
+    replacing them with the descriptors. Tuples, lists and dictionaries
+    are processed recursively, other objects are left intact
+    >>> result = ...
+    >>> result = to_shared   ( result ) ## in the worker
+    >>> result = from_shared ( result ) ## in the master
+    """
+    if not shared_memory : return obj
+
+    if   isinstance ( obj , tuple ) and not hasattr ( obj , '_fields' ) :
+        return tuple ( to_shared ( o , min_size ) for o in obj )
+    elif isinstance ( obj , list  ) :
+        return [ to_shared ( o , min_size ) for o in obj ]
+    elif isinstance ( obj , dict  ) and type ( obj ) is dict :
+        return dict ( ( k , to_shared ( v , min_size ) ) for k , v in obj.items () )
+    elif isinstance ( obj , numpy.ndarray ) :
+        if min_size <= obj.size and not obj.dtype.hasobject : return SharedArray ( obj )
+    elif hasattr ( obj , 'GetSize' ) and hasattr ( obj , 'GetDimension' ) :
+        if SharedHisto.supported ( obj ) and min_size <= obj.GetSize () :
+            return SharedHisto ( obj )
+
+    return obj
+
+# =============================================================================
+## rebuild histograms and numpy arrays from the shared memory
+#  @see to_shared
+def from_shared ( obj ) :
+    """Rebuild histograms and numpy arrays from the shared memory
+    - see to_shared
+    """
+    if   isinstance ( obj , ( SharedHisto , SharedArray ) ) : return obj.get ()
+    elif isinstance ( obj , tuple ) and not hasattr ( obj , '_fields' ) :
+        return tuple ( from_shared ( o ) for o in obj )
+    elif isinstance ( obj , list  ) :
+        return [ from_shared ( o ) for o in obj ]
+    elif isinstance ( obj , dict  ) and type ( obj ) is dict :
+        return dict ( ( k , from_shared ( v ) ) for k , v in obj.items () )
+    return obj
+
+# =============================================================================
+## executor that uses the shared-memory transport for the results
+#  @code
+#  from functools import partial
+#  executor = partial ( shared_executor , task_executor )
+#  @endcode
+#  @see task_executor
+#  @see to_shared
+def shared_executor ( executor , item ) :
+    """Executor that uses the shared-memory transport for the results
+    >>> from functools import partial
+    >>> executor = partial ( shared_executor , task_executor )
+    - see task_executor
+    - see to_shared
+    """
+    jobid , result , stat = executor ( item )
+    return jobid , to_shared ( result ) , stat
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
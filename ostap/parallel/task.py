@@ -34,15 +34,17 @@ __version__ = '$Revision$'
 __author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
 __date__    = '2016-02-23'
 __all__     = (
-    'Task'          , ## the base class for task
-    'TaskManager'   , ## the base class for task-manager 
-    'GenericTask'   , ## the generic ``templated'' task
-    'FuncTask'      , ## the simple ``function'' task
-    'Statistics'    , ## helper class to collect statistics 
-    'StatMerger'    , ## helper class to merge   statistics
-    'TaskMerger'    , ## simple merger for task results
-    'task_executor' , ## helper function to execute Task  
-    'func_executor' , ## helper function to execute callable
+    'Task'              , ## the base class for task
+    'TaskManager'       , ## the base class for task-manager 
+    'GenericTask'       , ## the generic ``templated'' task
+    'FuncTask'          , ## the simple ``function'' task
+    'Statistics'        , ## helper class to collect statistics 
+    'StatMerger'        , ## helper class to merge   statistics
+    'TaskMerger'        , ## simple merger for task results
+    'task_executor'     , ## helper function to execute Task
+    'func_executor'     , ## helper function to execute callable
+    'tree_executor'     , ## helper function to execute jobs and merge partial results 
+    'AdaptiveScheduler' , ## helper class for adaptive scheduling of jobs
     )
 # =============================================================================
 from   ostap.logger.logger import getLogger
@@ -403,6 +405,7 @@ class Statistics(object):
         self.__start = time.time ( )
         self.time  = 0.0
         self.njobs = 0
+        self.merge = 0.0 ## time spent for merging of results 
         
     def stop ( self ) :
         import time
@@ -445,6 +448,7 @@ class StatMerger(object) :
         se  = self.__merged [ stat.host ]
         se.time  += stat.time
         se.njobs += stat.njobs 
+        se.merge += getattr ( stat , 'merge' , 0.0 )
         
         return self
 
@@ -523,7 +527,11 @@ class StatMerger(object) :
     ## standard printout as table 
     def table  ( self , title = 'Jobs execution statistics' , prefix = '' ) :
 
-        text =  [ (' #jobs ' , '%' , ' total  time' , 'time/job' , 'job server') ]
+        ## show the merge time only if merging was performed at workers 
+        merge = 0 < self.merge
+        
+        if merge : text = [ (' #jobs ' , '%' , ' total  time' , 'time/job' , 'merge time' , 'job server') ]
+        else     : text = [ (' #jobs ' , '%' , ' total  time' , 'time/job' ,                'job server') ]
         
         njobs = self.njobs        
         keys  = self.__merged.keys()
@@ -539,10 +547,11 @@ class StatMerger(object) :
                 line = ( "%6d "     % nj                    ,
                          " %5.1f "  % ( 100. * nj / njobs ) ,
                          " %10.4g " % time ,
-                         " %10.4g " % mean ,
-                         " %-s"     % host )
+                         " %10.4g " % mean ) 
+                if merge : line += ( " %10.4g " % se.merge , )
+                line += ( " %-s"     % host , ) 
             else :
-                line = "%6d "% nj , '', '' , '' , " %-s" % host
+                line = ( "%6d "% nj , '', '' , '' ) + ( ( '' , ) if merge else () ) + ( " %-s" % host , ) 
 
             text.append ( line )
             
@@ -557,6 +566,11 @@ class StatMerger(object) :
     def njobs ( self ) :
         """``njobs'' : total number of jobs"""
         return sum ( s.njobs for s in self.__merged.values() ) 
+
+    @property 
+    def merge ( self ) :
+        """``merge'' : total time spent for merging of results at workers"""
+        return sum ( s.merge for s in self.__merged.values() ) 
     
     __repr__ = __str__
 
@@ -653,6 +667,208 @@ class TaskMerger(object) :
     def __bool__    ( self ) : return 0 < self.__nmerged
     def __len__     ( self ) : return     self.__nmerged
 
+# =============================================================================
+## @class AdaptiveScheduler
+#  Helper class for adaptive (``guided'') scheduling of the jobs.
+#  Instead of sending the fixed list of items to the pool at once,
+#  the new job is submitted as soon as any running job is completed
+#  (see TaskManager.iexecute_dynamic):
+#  - the first (``probe'') jobs are small, and they are used to measure
+#    the processing rate (using the job execution statistics);
+#  - the size of each next piece is defined using the measured rate
+#    and the remaining work, so the pieces become smaller towards the
+#    end of processing;
+#  - when there is no more work in the queue, but some workers are idle,
+#    the work of the ``straggler'' jobs (running much longer than expected)
+#    is split into smaller pieces and re-submitted to idle workers.
+#    The first of the original job or the complete set of its pieces
+#    is merged, and the other one is discarded.
+#
+#  The cost of the item is its length (number of entries for
+#  <code>Chain</code>/<code>Tree</code>), or the value itself for
+#  positive integers (e.g. number of toys), or 1 otherwise.
+#  Items with <code>split</code> method (e.g. <code>Chain</code>/<code>Tree</code>)
+#  and positive integers can be re-split into smaller pieces
+#  @code
+#  wm = WorkManager ( adaptive = True )
+#  wm.process ( task , chain.split ( max_files = 1 ) )
+#  @endcode
+#  @see Statistics
+#  @see TaskManager.iexecute_dynamic 
+class AdaptiveScheduler(object) :
+    """Helper class for adaptive (``guided'') scheduling of the jobs.
+    Instead of sending the fixed list of items to the pool at once,
+    the new job is submitted as soon as any running job is completed
+    (see TaskManager.iexecute_dynamic):
+    - the first (``probe'') jobs are small, and they are used to measure
+    the processing rate (using the job execution statistics);
+    - the size of each next piece is defined using the measured rate and the
+    remaining work, so the pieces become smaller towards the end of processing;
+    - when there is no more work in the queue, but some workers are idle,
+    the work of the ``straggler'' jobs (running much longer than expected)
+    is split into smaller pieces and re-submitted to idle workers.
+    The first of the original job or the complete set of its pieces is merged,
+    and the other one is discarded.
+
+    >>> wm = WorkManager ( adaptive = True )
+    >>> wm.process ( task , chain.split ( max_files = 1 ) )
+    """
+    def __init__ ( self                ,
+                   ncpus               ,
+                   target_time = 60.0  ,  ## target time for the single job (seconds)
+                   granularity = 4     ,  ## number of pieces per worker for the remaining work
+                   min_cost    = 1     ,  ## minimal cost of the piece
+                   straggler   = 2.0   ) :## the job is a straggler if it runs longer than ``straggler'' x expected time 
+
+        self.__ncpus       = max ( 1 , ncpus if isinstance ( ncpus , int ) else 1 )
+        self.__target_time = float ( target_time )
+        self.__granularity = max ( 1 , int ( granularity ) )
+        self.__min_cost    = max ( 1 , min_cost )
+        self.__straggler   = max ( 1.0 , float ( straggler ) ) 
+
+        self.__done  = 0    ## processed cost
+        self.__time  = 0.0  ## total time spent for processing
+        self.__hosts = {}   ## per-host (cost,time)
+
+        self.__queue = []   ## the queue of ( cost , item ) pairs 
+        self.__total = 0    ## the total cost of the queue 
+
+    # =========================================================================
+    ## get the cost of the item
+    @staticmethod
+    def cost ( item ) :
+        """Get the cost of the item:
+        - the length for the sized items (e.g. Chain/Tree)
+        - the value itself for positive integers (e.g. number of toys)
+        - 1 otherwise
+        """
+        from ostap.core.ostap_types import integer_types
+        if isinstance ( item , integer_types ) and not isinstance ( item , bool ) :
+            return max ( 1 , item )
+        if hasattr ( item , 'split' ) and hasattr ( item , '__len__' ) :
+            try :
+                return max ( 1 , len ( item ) )
+            except Exception :
+                pass
+        return 1
+
+    # =========================================================================
+    ## split the item into pieces with cost not exceeding <code>size</code>
+    @staticmethod
+    def split ( item , size ) :
+        """Split the item into pieces with cost not exceeding ``size''
+        """
+        size = max ( 1 , int ( size ) )
+        cost = AdaptiveScheduler.cost ( item )
+        if cost <= size : return [ item ]
+
+        from ostap.core.ostap_types import integer_types
+        if isinstance ( item , integer_types ) and not isinstance ( item , bool ) :
+            ## split into (almost) equal pieces
+            n      = ( item + size - 1 ) // size
+            q , r  = divmod ( item , n )
+            return r * [ q + 1 ] + ( n - r ) * [ q ]
+
+        if hasattr ( item , 'split' ) :
+            try :
+                pieces = item.split ( chunk_size = size )
+            except TypeError :
+                return [ item ]
+            if pieces : return list ( pieces )
+
+        return [ item ]
+
+    # =========================================================================
+    ## add items to the queue, the largest items go first 
+    def push ( self , items ) :
+        """Add items to the queue, the largest items go first"""
+        pairs = [ ( self.cost ( i ) , i ) for i in items ]
+        pairs.sort ( key = lambda p : p [ 0 ] , reverse = True )
+        self.__queue += pairs
+        self.__total += sum ( c for c , i in pairs )
+        
+    # =========================================================================
+    ## the size of the next piece 
+    def piece_size ( self ) :
+        """The size of the next piece"""
+        rate = self.rate
+        if rate is None :
+            ## probe: small jobs 
+            size = self.__total // ( 2 * self.__ncpus * self.__granularity )
+        else :
+            ## guided: decreasing with remaining work, limited by the target time
+            size = min ( self.__total // ( self.__granularity * self.__ncpus ) , rate * self.__target_time )
+            ## ... but avoid too small pieces: at least 10% of the target time 
+            size = max ( size , 0.1 * rate * self.__target_time )
+        return max ( self.__min_cost , int ( size ) )
+        
+    # =========================================================================
+    ## get the next piece of work from the queue (or <code>None</code>)
+    def pop ( self ) :
+        """Get the next piece of work from the queue (or None)"""
+        if not self.__queue : return None
+
+        size = self.piece_size () 
+        cost , item = self.__queue.pop ( 0 )
+        self.__total -= cost
+        
+        if size < cost :
+            pieces = self.split ( item , size )
+            if 1 < len ( pieces ) :
+                ## return the remaining pieces to the head of the queue 
+                rest = [ ( self.cost ( p ) , p ) for p in pieces [ 1: ] ]
+                self.__queue  = rest + self.__queue
+                self.__total += sum ( c for c , p in rest )
+                item = pieces [ 0 ]
+                
+        return item
+                
+    # =========================================================================
+    ## expected processing time for the item (or <code>None</code>)
+    def expected ( self , item ) :
+        """Expected processing time for the item (or None)"""
+        rate = self.rate
+        return None if rate is None else self.cost ( item ) / rate 
+
+    # =========================================================================
+    ## is the running item a straggler?
+    #  @param item    the item
+    #  @param elapsed the elapsed time since the submission 
+    def is_straggler ( self , item , elapsed ) :
+        """Is the running item a straggler?
+        - item    : the item
+        - elapsed : the elapsed time since the submission 
+        """
+        expected = self.expected ( item )
+        if expected is None : return False
+        return self.__straggler * max ( expected , 1.0 ) < elapsed 
+
+    # =========================================================================
+    ## update the scheduler with the statistics for the processed item
+    def update ( self , item , stat ) :
+        """Update the scheduler with the statistics for the processed item"""
+        c = self.cost ( item )
+        self.__done += c
+        self.__time += stat.time
+        hc , ht = self.__hosts.get ( stat.host , ( 0 , 0.0 ) )
+        self.__hosts [ stat.host ] = hc + c , ht + stat.time
+
+    @property
+    def empty ( self ) :
+        """``empty'' : is the queue empty?"""
+        return not self.__queue
+    
+    @property
+    def rate ( self ) :
+        """``rate'' : average processing rate (cost per second per worker)"""
+        if self.__done <= 0 or self.__time <= 0 : return None
+        return self.__done / self.__time
+
+    @property
+    def rates ( self ) :
+        """``rates'' : per-host processing rate (cost per second per worker)"""
+        return dict ( ( h , c / t ) for h , ( c , t ) in self.__hosts.items () if 0 < t )
+
 # =============================================================================
 ## helper function to execute the task and collect statistic
 #  (unfortunately due to limitation of <code>parallel python</code> one cannot
@@ -733,6 +949,47 @@ def task_executor ( item ) :
             return jobid , result , stat
 
         
+# =============================================================================
+## helper function for the tree-merging of results (see TaskManager.process):
+#  - execute the job, <code>item = 'job' , task , jobid , args</code>
+#  - or merge two partial results at the worker,
+#    <code>item = 'merge' , task , jobid , first , second</code>
+#  @code
+#  jobid , result , stat = tree_executor ( ( 'job'   , task , jobid , args            ) ) 
+#  jobid , merged , stat = tree_executor ( ( 'merge' , task , jobid , result1 , result2 ) ) 
+#  @endcode
+#  The time spent for merging is reported as <code>stat.merge</code>
+#  @attention the task must accept the output of <code>Task.results</code>
+#             as the input for <code>Task.merge_results</code>
+#  @see task_executor
+def tree_executor ( item ) :
+    """Helper function for the tree-merging of results (see TaskManager.process):
+    - execute the job, `item = 'job' , task , jobid , args`
+    - or merge two partial results at the worker, `item = 'merge' , task , jobid , first , second`
+    >>> jobid , result , stat = tree_executor ( ( 'job'   , task , jobid , args            ) ) 
+    >>> jobid , merged , stat = tree_executor ( ( 'merge' , task , jobid , result1 , result2 ) ) 
+    - the time spent for merging is reported as `stat.merge`
+    - the task must accept the output of `Task.results` as the input for `Task.merge_results`
+    - see task_executor
+    """
+    if 'job' == item [ 0 ] : return task_executor ( item [ 1: ] )
+
+    task , jobid , first , second = item [ 1: ]
+    
+    import copy
+    stat   = Statistics ()
+    merger = copy.copy ( task )
+    merger.initialize_local () 
+    merger.merge_results ( first  , jobid )
+    merger.merge_results ( second , jobid )
+    result = merger.results () 
+    stat.stop ()
+    
+    ## report it as merge time, not as job 
+    stat.merge , stat.time , stat.njobs = stat.time , 0.0 , 0 
+    
+    return jobid , result , stat 
+
 # =============================================================================
 ## helper function to execute the function and collect stattistic
 #  (unfornately due to limitation of <code>parallel python</code> one cannot
@@ -762,12 +1019,16 @@ class TaskManager(object) :
     
     __metaclass__ = abc.ABCMeta
 
-    def __init__  ( self           ,
-                    ncpus          ,
-                    silent = False ) :
+    def __init__  ( self                  ,
+                    ncpus                 ,
+                    silent        = False ,
+                    adaptive      = False ,
+                    shared_memory = False ) :
         
-        self.__ncpus  = ncpus        
-        self.__silent = silent
+        self.__ncpus         = ncpus        
+        self.__silent        = silent
+        self.__adaptive      = adaptive 
+        self.__shared_memory = shared_memory 
             
     # =========================================================================
     ## process Task or callable object :
@@ -789,6 +1050,26 @@ class TaskManager(object) :
     #  ## get sum of them 
     #  result2 =  wm.process ( my_fun , items , merger = TaskMerger () )    
     #  @endcode
+    #  - adaptive scheduling of the task 
+    #  @code
+    #  result = wm.process ( my_task , items , adaptive = True )
+    #  @endcode
+    #  @see AdaptiveScheduler 
+    #  - checkpoint/resume journal for the task 
+    #  @code
+    #  result = wm.process ( my_task , items , journal = 'journal.db' )
+    #  @endcode
+    #  @see ostap.parallel.journal.TaskJournal 
+    #  - tree-merging: partial results are merged pairwise at workers 
+    #  @code
+    #  result = wm.process ( my_task , items , tree_merge = True )
+    #  @endcode
+    #  @see tree_executor 
+    #  - shared-memory transport of (large) histograms and arrays from local workers 
+    #  @code
+    #  result = wm.process ( my_task , items , shared_memory = True ) 
+    #  @endcode
+    #  @see ostap.parallel.shmem 
     def process ( self , task , args , **kwargs ) :
         """Process callable object or Task :
         
@@ -806,21 +1087,90 @@ class TaskManager(object) :
         >>> items = range ( 10 )
         >>> result1 =  wm.process ( my_fun , items , merger = TaskMerger ( lambda  a,b : a+[b] , init = [] ) )
         >>> result2 =  wm.process ( my_fun , items , merger = TaskMerger () )    
+
+        - adaptive scheduling of the task (see AdaptiveScheduler)
+        
+        >>> result = wm.process ( my_task , items , adaptive = True ) 
+
+        - adaptive scheduling with the stop condition: `stop ( jobid , result )` is called
+        after each merged result, and no more jobs are handed out once it returns True
+        
+        >>> result = wm.process ( my_task , items , adaptive = True , stop = lambda j , r : ... ) 
+
+        - checkpoint/resume journal for the task (see ostap.parallel.journal.TaskJournal)
+        
+        >>> result = wm.process ( my_task , items , journal = 'journal.db' ) 
+
+        - checkpoint every 50 merged jobs or every 5 minutes, whatever comes first 
+        
+        >>> result = wm.process ( my_task , items , journal = 'journal.db' , journal_every = 50 , journal_time = 300 ) 
+
+        - tree-merging: partial results are merged pairwise at workers (see tree_executor)
+        
+        >>> result = wm.process ( my_task , items , tree_merge = True )
+
+        - shared-memory transport of (large) histograms and arrays from local workers (see ostap.parallel.shmem)
+        
+        >>> result = wm.process ( my_task , items , shared_memory = True ) 
         
         """
         
-        job_chunk = kwargs.pop ( 'chunk_size', 10000 )
+        job_chunk = kwargs.pop ( 'chunk_size'    , 10000 )
+        adaptive  = kwargs.pop ( 'adaptive'      , self.adaptive )
+        journal   = kwargs.pop ( 'journal'       , None )
+        every     = kwargs.pop ( 'journal_every' , 10   )
+        jtime     = kwargs.pop ( 'journal_time'  , 60   )
+        jtag      = kwargs.pop ( 'journal_tag'   , ''   )
+        tree_merge = kwargs.pop ( 'tree_merge'   , False )
+        shared     = kwargs.pop ( 'shared_memory' , self.shared_memory )
+        stop       = kwargs.pop ( 'stop'          , None )
         
-        from ostap.utils.utils import chunked 
-        chunks    = list ( chunked ( args , job_chunk ) )
+        if shared :
+            from ostap.parallel.shmem import shared_memory as shm_available
+            if not shm_available :
+                logger.warning ( "Shared-memory transport is not available, ignore it" )
+                shared = False 
+
+        if adaptive and journal and isinstance ( task , Task ) :
+            logger.warning ( "Adaptive scheduling is disabled for the journaled processing" )
+            adaptive = False 
+        if adaptive and tree_merge and isinstance ( task , Task ) :
+            logger.warning ( "Adaptive scheduling is disabled for the tree-merging" )
+            adaptive = False 
+        if journal and tree_merge and isinstance ( task , Task ) :
+            logger.warning ( "Tree-merging is disabled for the journaled processing" )
+            tree_merge = False 
+            
+        if adaptive and isinstance ( task , Task ) :
+            scheduler = adaptive if isinstance ( adaptive , AdaptiveScheduler ) else AdaptiveScheduler ( self.ncpus )
+            return self.__process_task_adaptive ( task , list ( args ) , scheduler , shared = shared , stop = stop , **kwargs )
 
-        if isinstance ( task , Task ) :
-            result = self.__process_task ( task , chunks , **kwargs )
-        else : 
-            result = self.__process_func ( task , chunks , **kwargs )
+        if stop : logger.warning ( "The stop condition is ignored for the non-adaptive processing" ) 
         
-        return result 
+        from ostap.utils.utils import chunked 
+
+        if not isinstance ( task , Task ) :
+            chunks    = list ( chunked ( args , job_chunk ) )
+            return self.__process_func ( task , chunks , **kwargs )
+
+        ## jobs are (jobid,item) pairs 
+        args = list ( args ) 
+        jobs = list ( enumerate ( args ) )
+
+        if tree_merge :
+            return self.__process_task_tree ( task , jobs , shared = shared , **kwargs ) 
 
+        if journal :
+            from ostap.parallel.journal import TaskJournal
+            with TaskJournal ( journal , task , args , every = every , timeout = jtime , tag = jtag ) as jrnl :
+                done   = jrnl.done 
+                jobs   = [ ( jobid , item ) for jobid , item in jobs if not jobid in done ]
+                chunks = list ( chunked ( jobs , job_chunk ) )
+                return self.__process_task ( task , chunks , journal = jrnl , shared = shared , **kwargs )
+
+        chunks = list ( chunked ( jobs , job_chunk ) )
+        return self.__process_task ( task , chunks , shared = shared , **kwargs )
+        
     # ===================================================================================
     ## Helper internal method for parallel processing of
     #  the plain function with chunks of data
@@ -889,9 +1239,15 @@ class TaskManager(object) :
         return results 
 
     # ===================================================================================
-    ## helper internal method to process the task with chunks of data 
-    def __process_task  ( self , task , chunks , **kwargs ) :
+    ## helper internal method to process the task with chunks of data
+    #  @param chunks  chunks of (jobid,item) pairs 
+    #  @param journal (optional) the journal
+    #  @param shared  (optional) use shared-memory transport for results
+    def __process_task  ( self , task , chunks , journal = None , shared = False , **kwargs ) :
         """Helper internal method to process the task with chunks of data 
+        - chunks  : chunks of (jobid,item) pairs 
+        - journal : (optional) the journal
+        - shared  : (optional) use shared-memory transport for results
         """
             
         from timeit import  default_timer as _timer
@@ -899,14 +1255,19 @@ class TaskManager(object) :
 
         ## inialize the task
         task.initialize_local ()
+
+        ## restore the last merged state from the journal 
+        if journal : journal.restore ( task )
         
         ## mergers for statistics 
         merged_stat    = StatMerger ()
         merged_stat_pp = StatMerger ()
 
-        ## start index for jobs
-        index = 0 
+        ## time spent for merging in the master 
+        merge_time = 0.0
 
+        if shared : from ostap.parallel.shmem import from_shared
+        
         ## total number of jobs 
         njobs = sum  ( len ( c ) for c in chunks ) 
         from ostap.utils.progress_bar import ProgressBar
@@ -915,29 +1276,289 @@ class TaskManager(object) :
             while chunks :
 
                 chunk = chunks.pop ( 0 ) 
-                
-                jobs_args = zip ( repeat ( task ) , count ( index ) , chunk )
 
-                for jobid , result , stat in self.iexecute ( task_executor    ,
+                jobs_args = [ ( task , j , i ) for j , i in chunk ] 
+                executor  = task_executor
+
+                if shared :
+                    from functools            import partial 
+                    from ostap.parallel.shmem import shared_executor
+                    executor = partial ( shared_executor , executor ) 
+
+                for jobid , result , stat in self.iexecute ( executor         ,
                                                              jobs_args        ,
                                                              progress = False ) :
 
                     ## merge statistics 
                     merged_stat += stat
 
+                    ## rebuild results from the shared memory
+                    if shared : result = from_shared ( result )
+                    
                     ## merge/collect resuls
+                    mstart = _timer() 
                     task.merge_results ( result , jobid )
+                    merge_time += _timer() - mstart 
+
+                    ## record the merged job in the journal
+                    if journal : journal.record ( jobid , task ) 
 
                     bar += 1 
 
-                index           += len ( chunk )
-                
                 pp_stat = self.get_pp_stat() 
                 if pp_stat : merged_stat_pp  += pp_stat 
 
+        ## mark the journaled processing as completed 
+        if journal : journal.complete ( task )
+        
         ## finalize the task 
         task.finalize () 
         self.print_statistics ( merged_stat_pp , merged_stat , _timer() - start )
+        if not self.silent and 0.1 < merge_time : 
+            logger.info ( 'Merge time: master %.4gs' % merge_time )
+        ## 
+        return task.results ()
+
+    # ===================================================================================
+    ## helper internal method to process the task with adaptive scheduling of jobs
+    #  - the new jobs are submitted as soon as the running jobs are completed
+    #  - the work of straggler jobs is split and re-submitted to idle workers 
+    #  - no more jobs are handed out once <code>stop ( jobid , result )</code>
+    #    (called after each merged result) returns <code>True</code>
+    #  @see AdaptiveScheduler 
+    #  @see TaskManager.iexecute_dynamic 
+    def __process_task_adaptive ( self , task , items , scheduler , shared = False , stop = None , **kwargs ) :
+        """Helper internal method to process the task with adaptive scheduling of jobs
+        - the new jobs are submitted as soon as the running jobs are completed
+        - the work of straggler jobs is split and re-submitted to idle workers 
+        - no more jobs are handed out once `stop ( jobid , result )`
+        (called after each merged result) returns True
+        - see AdaptiveScheduler
+        - see TaskManager.iexecute_dynamic 
+        """
+
+        executor = task_executor 
+        if shared :
+            from functools            import partial 
+            from ostap.parallel.shmem import shared_executor, from_shared 
+            executor = partial ( shared_executor , executor ) 
+        
+        from timeit import  default_timer as _timer
+        start = _timer()
+
+        ## inialize the task
+        task.initialize_local ()
+        
+        ## mergers for statistics 
+        merged_stat    = StatMerger ()
+        merged_stat_pp = StatMerger ()
+
+        scheduler.push ( items ) 
+
+        jobids    = count ( 0 )
+        running   = {}      ## jobid -> ( item , submission time )
+        finished  = set ()  ## completed (or replaced) original jobs 
+        groups    = {}      ## original jobid -> { 'pending' : set of jobids , 'results' : [] }
+        piece_of  = {}      ## speculative jobid -> original jobid 
+        spec_jobs = []      ## speculative pieces to be submitted: ( original jobid , item ) 
+        nspec     = [ 0 ]   ## number of speculative jobs 
+        stopped   = [ False ] ## is the stop condition satisfied? 
+
+        ## merge the result and check the stop condition 
+        def merge ( result , jobid ) :
+            task.merge_results ( result , jobid )
+            if stop and not stopped [ 0 ] and stop ( jobid , result ) : stopped [ 0 ] = True 
+            
+        ## feeder of the new jobs for idle workers 
+        def feeder ( nslots ) :
+            
+            jobs = []
+            if stopped [ 0 ] : return jobs  ## no more jobs after the stop condition 
+            now  = _timer ()
+            
+            ## no more regular work: split the work of the stragglers 
+            if scheduler.empty and not spec_jobs and 0 < nslots :
+                for jobid , ( item , t0 ) in list ( running.items () ) :
+                    if jobid in piece_of or jobid in groups or jobid in finished : continue
+                    if not scheduler.is_straggler ( item , now - t0 ) : continue 
+                    cost   = scheduler.cost ( item )
+                    pieces = scheduler.split ( item , ( cost + nslots ) // max ( 2 , nslots ) )
+                    if len ( pieces ) < 2 : continue
+                    groups [ jobid ] = { 'pending' : set () , 'results' : [] }
+                    spec_jobs.extend ( ( jobid , p ) for p in pieces )
+                    logger.debug ( 'AdaptiveScheduler: straggler job #%s is split into %d pieces' % ( jobid , len ( pieces ) ) ) 
+                    break
+                
+            while len ( jobs ) < nslots :
+                
+                if spec_jobs :
+                    orig , item = spec_jobs.pop ( 0 )
+                    jobid = next ( jobids )
+                    piece_of [ jobid ] = orig
+                    groups   [ orig  ] [ 'pending' ].add ( jobid )
+                    nspec [ 0 ] += 1 
+                else :
+                    item = scheduler.pop ()
+                    if item is None : break
+                    jobid = next ( jobids )
+                    
+                running [ jobid ] = item , now 
+                jobs.append ( ( task , jobid , item ) )
+                
+            return jobs 
+
+        ## the total work to be done 
+        total = sum ( scheduler.cost ( i ) for i in items ) 
+        from ostap.utils.progress_bar import ProgressBar
+        with ProgressBar ( max_value = total , silent = self.silent ) as bar :
+
+            for jobid , result , stat in self.iexecute_dynamic ( executor , feeder ) :
+
+                ## merge statistics 
+                merged_stat += stat
+
+                ## rebuild results from the shared memory
+                if shared : result = from_shared ( result )
+                    
+                ## update the scheduler 
+                item , t0 = running.pop ( jobid ) 
+                scheduler.update ( item , stat ) 
+
+                if jobid in piece_of :
+                    ## the speculative piece of the straggler job 
+                    orig = piece_of.pop ( jobid )
+                    if orig in finished : continue                ## CONTINUE: the original job is already merged
+                    group = groups [ orig ]
+                    group [ 'pending' ].discard ( jobid ) 
+                    group [ 'results' ].append  ( ( jobid , result ) )
+                    if group [ 'pending' ] or any ( o == orig for o , p in spec_jobs ) : continue 
+                    ## all pieces are done: merge them and discard the original job 
+                    for j , r in group [ 'results' ] : merge ( r , j ) 
+                    finished.add ( orig )
+                    del groups [ orig ]
+                    bar += scheduler.cost ( running [ orig ] [ 0 ] ) 
+                    continue
+                
+                if jobid in finished :
+                    ## the straggler job is already replaced by its pieces 
+                    finished.discard ( jobid )
+                    continue
+                
+                ## merge/collect resuls
+                merge ( result , jobid )
+                bar += scheduler.cost ( item ) 
+
+                ## discard the speculative pieces (if any) 
+                if jobid in groups :
+                    del groups [ jobid ]
+                    finished.add ( jobid ) 
+                    spec_jobs [ : ] = [ ( o , p ) for o , p in spec_jobs if o != jobid ]
+
+            pp_stat = self.get_pp_stat() 
+            if pp_stat : merged_stat_pp  += pp_stat 
+
+        if stopped [ 0 ] and not scheduler.empty : 
+            logger.info ( 'Adaptive scheduling: the stop condition is satisfied, the remaining work is cancelled' ) 
+        if not self.silent :
+            rates = scheduler.rates 
+            logger.info ( 'Adaptive scheduling: %d jobs (%d speculative), rates: %s' % (
+                merged_stat.njobs , nspec [ 0 ] , 
+                ', '.join ( '%s: %.4g/s' % ( h , rates [ h ] ) for h in sorted ( rates ) ) ) )
+            
+        ## finalize the task 
+        task.finalize () 
+        self.print_statistics ( merged_stat_pp , merged_stat , _timer() - start )
+        ## 
+        return task.results ()
+    
+    # ===================================================================================
+    ## helper internal method to process the task with tree-merging of results
+    #  - the partial results of the same depth are merged pairwise at workers,
+    #    as soon as the pair is available, so the depth of the merge tree is
+    #    about <code>log2(njobs)</code>, and merging overlaps with processing 
+    #  - the master merges only the final partial results (at most one per depth)
+    #  @param jobs  list of (jobid,item) pairs 
+    #  @see tree_executor
+    #  @see TaskManager.iexecute_dynamic
+    def __process_task_tree ( self , task , jobs , shared = False , **kwargs ) :
+        """Helper internal method to process the task with tree-merging of results
+        - the partial results of the same depth are merged pairwise at workers,
+        as soon as the pair is available, so the depth of the merge tree is
+        about log2(njobs), and merging overlaps with processing 
+        - the master merges only the final partial results (at most one per depth)
+        - see tree_executor
+        - see TaskManager.iexecute_dynamic
+        """
+        
+        executor = tree_executor 
+        if shared :
+            from functools            import partial 
+            from ostap.parallel.shmem import shared_executor, from_shared 
+            executor = partial ( shared_executor , executor ) 
+
+        from timeit import  default_timer as _timer
+        start = _timer()
+
+        ## inialize the task
+        task.initialize_local ()
+
+        ## mergers for statistics 
+        merged_stat    = StatMerger ()
+        merged_stat_pp = StatMerger ()
+
+        queue    = list ( jobs ) 
+        partials = {}     ## depth -> list of partial results
+        nmerges  = [ 0 ]  ## number of merges at workers
+        
+        ## feeder of new jobs: pairwise merges first, then the regular jobs 
+        def feeder ( nslots ) :
+            items = []
+            for depth in sorted ( partials ) :
+                results = partials [ depth ]
+                while 2 <= len ( results ) and len ( items ) < nslots :
+                    first , second = results.pop ( 0 ) , results.pop ( 0 )
+                    ## negative jobid encodes the depth of the merged result 
+                    items.append ( ( 'merge' , task , -1 - ( depth + 1 ) , first , second ) )
+                    nmerges [ 0 ] += 1 
+            while queue and len ( items ) < nslots :
+                jobid , item = queue.pop ( 0 ) 
+                items.append ( ( 'job' , task , jobid , item ) )
+            return items
+
+        from ostap.utils.progress_bar import ProgressBar
+        with ProgressBar ( max_value = len ( queue ) , silent = self.silent ) as bar :
+
+            for jobid , result , stat in self.iexecute_dynamic ( executor , feeder ) :
+
+                ## merge statistics 
+                merged_stat += stat
+
+                ## rebuild results from the shared memory
+                if shared : result = from_shared ( result )
+
+                depth = -1 - jobid if jobid < 0 else 0
+                partials.setdefault ( depth , [] ).append ( result )
+                
+                if 0 <= jobid : bar += 1
+
+            pp_stat = self.get_pp_stat() 
+            if pp_stat : merged_stat_pp  += pp_stat 
+
+        ## merge the final partial results in the master 
+        mstart  = _timer() 
+        nfinal  = 0 
+        for depth in sorted ( partials ) :
+            for result in partials [ depth ] :
+                task.merge_results ( result )
+                nfinal += 1 
+        merge_time = _timer() - mstart 
+
+        ## finalize the task 
+        task.finalize () 
+        self.print_statistics ( merged_stat_pp , merged_stat , _timer() - start )
+        if not self.silent :
+            logger.info ( 'Tree-merging: %d merges at workers (%.4gs), %d final results merged in master (%.4gs)' % (
+                nmerges [ 0 ] , merged_stat.merge , nfinal , merge_time ) )
         ## 
         return task.results ()
     
@@ -946,6 +1567,16 @@ class TaskManager(object) :
         """``silent'' : silent processing?"""
         return self.__silent
 
+    @property
+    def adaptive ( self ) :
+        """``adaptive'' : use adaptive scheduling of jobs? (see AdaptiveScheduler)"""
+        return self.__adaptive
+
+    @property
+    def shared_memory ( self ) :
+        """``shared_memory'' : use shared-memory transport for results from local workers? (see ostap.parallel.shmem)"""
+        return self.__shared_memory
+
     @property
     def ncpus ( self ) :
         """``ncpus'' : number of CPUs"""
@@ -992,6 +1623,89 @@ class TaskManager(object) :
         """
         return None
     
+    # =========================================================================
+    ## context manager that provides the function for asynchronous submission
+    #  of the single job: <code>handle = submit ( job , args )</code>.
+    #  The handle has <code>ready()</code> and <code>get()</code> methods
+    #  @code
+    #  with mgr.submitter () as submit :
+    #      handle = submit ( job , args ) 
+    #      ...
+    #      if handle.ready () : result = handle.get () 
+    #  @endcode
+    #  @see TaskManager.iexecute_dynamic
+    @abc.abstractmethod 
+    def submitter ( self ) :
+        """Context manager that provides the function for asynchronous submission
+        of the single job: `handle = submit ( job , args )`.
+        The handle has `ready()` and `get()` methods
+        >>> with mgr.submitter () as submit :
+        ...     handle = submit ( job , args ) 
+        ...     if handle.ready () : result = handle.get () 
+        - see TaskManager.iexecute_dynamic
+        """
+        return None
+    
+    # =========================================================================
+    ## process the bare <code>executor</code> function with dynamic submission of jobs:
+    #  the new jobs are requested from the <code>feeder</code> and submitted
+    #  as soon as the running jobs are completed, so no job waits for others.
+    #  - <code>feeder ( nslots )</code> returns the list of (at most <code>nslots</code>)
+    #    new job arguments, the processing stops when there are no running jobs
+    #    and the feeder returns an empty list 
+    #  - the feeder is called after the yielded result is consumed,
+    #    so the new jobs could be defined using the results/statistics of
+    #    the completed jobs 
+    #  @code
+    #  mgr    = WorkManager  ( .... )
+    #  queue  = [ ... ] 
+    #  feeder = lambda n : [ queue.pop ( 0 ) for i in range ( min ( n , len ( queue ) ) ) ] 
+    #  for result in mgr.iexecute_dynamic ( func , feeder ) :
+    #  ...
+    #  @endcode
+    #  @param job      function to be executed
+    #  @param feeder   the source of new jobs 
+    #  @param capacity the maximal number of running jobs (default: number of CPUs)
+    #  @return iterator to results 
+    #  @see AdaptiveScheduler 
+    def iexecute_dynamic ( self , job , feeder , capacity = None ) :
+        """Process the bare `executor` function with dynamic submission of jobs:
+        the new jobs are requested from the `feeder` and submitted
+        as soon as the running jobs are completed, so no job waits for others.
+        - `feeder ( nslots )` returns the list of (at most `nslots`) new job arguments,
+        the processing stops when there are no running jobs and the feeder returns an empty list 
+        - the feeder is called after the yielded result is consumed,
+        so the new jobs could be defined using the results/statistics of the completed jobs 
+        >>> mgr    = WorkManager  ( .... )
+        >>> queue  = [ ... ] 
+        >>> feeder = lambda n : [ queue.pop ( 0 ) for i in range ( min ( n , len ( queue ) ) ) ] 
+        >>> for result in mgr.iexecute_dynamic ( func , feeder ) :
+        ...
+        - see AdaptiveScheduler
+        """
+        import time 
+        capacity = max ( 1 , capacity if capacity else self.ncpus )
+        
+        with self.submitter () as submit :
+
+            pending = [] 
+            while True :
+
+                ## fill the idle slots 
+                for args in feeder ( capacity - len ( pending ) ) :
+                    pending.append ( submit ( job , args ) ) 
+                    
+                if not pending : break
+
+                ready = [ h for h in pending if h.ready () ]
+                if not ready :
+                    time.sleep ( 0.002 )
+                    continue
+                
+                for h in ready :
+                    pending.remove ( h ) 
+                    yield h.get ()
+                    
     # =========================================================================
     ## print the job execution statistics 
     def print_statistics ( self , stat_pp , stat_loc , cputime = None ) :
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Copyright (c) Ostap developers.
+# =============================================================================
+# @file test_parallel_multistart.py
+# Test module for ostap/parallel/parallel_multistart.py
+# - multi-start global minimisation
+# =============================================================================
+""" Test module for ostap/parallel/parallel_multistart.py
+- multi-start global minimisation
+"""
+# =============================================================================
+from   __future__        import print_function
+# =============================================================================
+__author__ = "Ostap developers"
+__all__    = () ## nothing to import
+# =============================================================================
+import ROOT
+import ostap.fitting.roofit
+import ostap.fitting.models            as     Models
+from   ostap.parallel.parallel_multistart import multistart_fit, minima_table
+from   ostap.utils.timing              import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' == __name__  or '__builtin__' == __name__ :
+    logger = getLogger ( 'test_parallel_multistart' )
+else :
+    logger = getLogger ( __name__ )
+# =============================================================================
+
+mass  = ROOT.RooRealVar ( 'mass' , '', 0 , 1 )
+model = Models.Fit1D ( signal     = Models.Gauss_pdf ( 'G' , xvar = mass , mean = ( 0.4 , 0.05 , 0.95 ) , sigma = ( 0.05 , 0.01 , 0.2 ) ) ,
+                       background = None )
+model.S = 1000
+model.B = 1000
+
+data  = model.generate ( 2000 )
+
+# ==============================================================================
+## multi-start global minimisation
+def test_parallel_multistart ( ) :
+    """Multi-start global minimisation
+    """
+
+    ## reference fit
+    r0 , _ = model.fitTo ( data , silent = True )
+
+    ## bad starting point
+    model.signal.mean  = 0.9
+    model.signal.sigma = 0.01
+
+    with timing ( 'Serial   multistart' , logger = logger ) :
+        m1 = multistart_fit ( model , data , n = 8 , parallel = False , seed = 1 )
+    with timing ( 'Parallel multistart' , logger = logger ) :
+        m2 = multistart_fit ( model , data , n = 8 , parallel = { 'ncpus' : 4 } , seed = 1 )
+
+    logger.info ( 'Serial minima:\n%s'   % minima_table ( m1 , prefix = '# ' ) )
+    logger.info ( 'Parallel minima:\n%s' % minima_table ( m2 , prefix = '# ' ) )
+    assert abs ( m1 [ 0 ] [ 'nll' ] - m2 [ 0 ] [ 'nll' ] ) < 1.e-3 , 'Mismatch in serial/parallel minima!'
+
+    model.signal.mean  = 0.9
+    model.signal.sigma = 0.01
+    with timing ( 'fitTo    multistart' , logger = logger ) :
+        r , _ = model.fitTo ( data , silent = True , multistart = 8 )
+
+    logger.info ( 'Fit result:\n%s' % r.table ( prefix = '# ' ) )
+    assert abs ( r.mean_G.value () - r0.mean_G.value () ) < 0.1 * r0.mean_G.error () , 'Global minimum is not found!'
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_parallel_multistart ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# Copyright (c) Ostap developers.
+# =============================================================================
+# @file test_parallel_scan.py
+# Test module for ostap/parallel/parallel_scan.py
+# - compare serial and parallel scans of LL-profile
+# =============================================================================
+""" Test module for ostap/parallel/parallel_scan.py
+- compare serial and parallel scans of LL-profile
+"""
+# =============================================================================
+from   __future__        import print_function
+# =============================================================================
+__author__ = "Ostap developers"
+__all__    = () ## nothing to import
+# =============================================================================
+import ROOT
+import ostap.fitting.roofit
+import ostap.fitting.models as     Models
+from   ostap.utils.utils    import vrange
+from   ostap.utils.timing   import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' == __name__  or '__builtin__' == __name__ :
+    logger = getLogger ( 'test_parallel_scan' )
+else :
+    logger = getLogger ( __name__ )
+# =============================================================================
+
+mass  = ROOT.RooRealVar ( 'mass' , '', 0 , 1 )
+model = Models.Fit1D ( signal     = Models.Gauss_pdf ( 'G' , xvar = mass , mean = 0.4 , sigma = 0.1 ) ,
+                       background = None )
+model.S = 1000
+model.B = 1000
+
+data  = model.generate ( 2000 )
+r , _ = model.fitTo ( data , silent = True )
+
+# ==============================================================================
+## compare serial and parallel scans of LL-profile
+def test_parallel_scan ( ) :
+    """Compare serial and parallel scans of LL-profile
+    """
+
+    values = tuple ( vrange ( 700 , 1300 , 12 ) )
+
+    with timing ( 'Serial   profile' , logger = logger ) :
+        g1 = model.graph_profile ( 'S' , values , data , parallel = False )
+    with timing ( 'Parallel profile' , logger = logger ) :
+        g2 = model.graph_profile ( 'S' , values , data , parallel = { 'ncpus' : 4 } )
+
+    for i in range ( len ( g1 ) ) :
+        x1 , y1 = g1 [ i ]
+        x2 , y2 = g2 [ i ]
+        logger.info ( 'Profile at S=%-8.2f : serial %.5f parallel %.5f' % ( x1 , y1 , y2 ) )
+        assert abs ( x1 - x2 ) < 1.e-8           , 'Mismatch in abscissas!'
+        assert abs ( y1 - y2 ) < 1.e-3 * ( 1 + y1 ) , 'Mismatch in profiles!'
+
+    with timing ( '2D   profile' , logger = logger ) :
+        g3 = model.graph_profile2 ( 'S' , vrange ( 800 , 1200 , 5 ) ,
+                                    'B' , vrange ( 800 , 1200 , 5 ) , data , parallel = True )
+    assert 36 == g3.GetN () , 'Invalid number of points in 2D-profile'
+
+    s1 = model.wilks2 ( 'S' , data , fix = [ 'mean_G' ] )
+    s2 = model.wilks2 ( 'S' , data , fix = [ 'mean_G' ] , parallel = True )
+    logger.info ( 'Significance: serial %.3f parallel %.3f' % ( s1 , s2 ) )
+    assert abs ( s1 - s2 ) < 1.e-2 * abs ( s1 ) , 'Mismatch in significances!'
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_parallel_scan ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
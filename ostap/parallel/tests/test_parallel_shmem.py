@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/parallel/tests/test_parallel_shmem.py
+#  Test and benchmark for the shared-memory transport of histograms:
+#  compare it with the regular pickling for 1D/2D/3D histograms of increasing size
+#  @see ostap.parallel.shmem
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date 2021-02-22
+# =============================================================================
+"""Test and benchmark for the shared-memory transport of histograms:
+compare it with the regular pickling for 1D/2D/3D histograms of increasing size
+- see ostap.parallel.shmem
+"""
+# =============================================================================
+__version__ = "$Revision:"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-02-22"
+__all__     = ()  ## nothing to be imported
+# =============================================================================
+import ROOT, random
+import ostap.histos.histos
+from   ostap.core.core        import hID
+from   ostap.utils.timing     import timing
+import ostap.parallel.shmem   as     SHMEM
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' == __name__ or '__builtin__' == __name__ :
+    logger = getLogger( 'ostap.test_parallel_shmem' )
+else :
+    logger = getLogger( __name__ )
+# =============================================================================
+## histograms for the benchmark: ( dimension , number of bins per axis )
+configs = ( ( 1 , 1000 ) , ( 1 , 100000 ) , ( 1 , 1000000 ) ,
+            ( 2 ,  100 ) , ( 2 ,    300 ) , ( 2 ,     1000 ) ,
+            ( 3 ,   20 ) , ( 3 ,     50 ) , ( 3 ,      100 ) )
+
+# =============================================================================
+## create and fill the histogram
+def make_histo ( config ) :
+    """Create and fill the histogram"""
+    dim , nbins = config
+    if   1 == dim : h = ROOT.TH1D ( hID() , '' , nbins , 0 , 1 )
+    elif 2 == dim : h = ROOT.TH2D ( hID() , '' , nbins , 0 , 1 , nbins , 0 , 1 )
+    else          : h = ROOT.TH3D ( hID() , '' , nbins , 0 , 1 , nbins , 0 , 1 , nbins , 0 , 1 )
+    h.Sumw2()
+    for i in range ( 10000 ) :
+        h.Fill ( *[ random.random() for j in range ( dim ) ] )
+    return h
+
+# =============================================================================
+## create the histogram and send it via shared memory
+def make_shared ( config ) :
+    """Create the histogram and send it via shared memory"""
+    return SHMEM.to_shared ( make_histo ( config ) )
+
+# =============================================================================
+## check the round-trip via shared memory
+def test_shmem_roundtrip () :
+    """Check the round-trip via shared memory
+    """
+    if not SHMEM.shared_memory :
+        logger.warning ( "Shared-memory transport is not available, skip the test" )
+        return
+
+    for config in configs [ : : 3 ] :
+
+        h1 = make_histo ( config )
+        h2 = SHMEM.from_shared ( SHMEM.to_shared ( h1 ) )
+
+        assert type ( h1 ) == type ( h2 ) , 'Invalid type of the histogram!'
+        assert h1.GetSize    () == h2.GetSize    () , 'Invalid size of the histogram!'
+        assert h1.GetEntries () == h2.GetEntries () , 'Invalid number of entries!'
+        assert h1.Integral   () == h2.Integral   () , 'Invalid integral!'
+        for i in range ( h1.GetSize () ) :
+            assert h1.GetBinContent ( i ) == h2.GetBinContent ( i ) , 'Invalid bin content!'
+            assert h1.GetBinError   ( i ) == h2.GetBinError   ( i ) , 'Invalid bin error!'
+
+        logger.info ( 'Round-trip via shared memory is OK for %dD-histogram with %d bins' % (
+            config [ 0 ] , h1.GetSize () ) )
+
+# =============================================================================
+## benchmark: shared-memory transport vs pickling
+def test_shmem_benchmark () :
+    """Benchmark: shared-memory transport vs pickling
+    """
+    if not SHMEM.shared_memory :
+        logger.warning ( "Shared-memory transport is not available, skip the test" )
+        return
+
+    import multiprocessing as MP
+
+    rows = [ ( 'dim' , '#bins' , 'pickle [s]' , 'shared [s]' , 'gain' ) ]
+
+    pool = MP.Pool ( 4 )
+    try :
+        for config in configs :
+
+            jobs = 4 * [ config ]
+
+            with timing ( 'pickle' , logger = lambda *s : '' ) as t1 :
+                hs1 = pool.map ( make_histo , jobs )
+
+            with timing ( 'shared' , logger = lambda *s : '' ) as t2 :
+                hs2 = [ SHMEM.from_shared ( r ) for r in pool.map ( make_shared , jobs ) ]
+
+            assert all ( h1.GetSize () == h2.GetSize () for h1 , h2 in zip ( hs1 , hs2 ) ) , \
+                   'Invalid size of the histogram!'
+
+            gain = t1.delta / t2.delta if 0 < t2.delta else 0
+            rows.append ( ( '%d'    % config [ 0 ]     ,
+                            '%d'    % hs1[0].GetSize() ,
+                            '%.3f'  % t1.delta         ,
+                            '%.3f'  % t2.delta         ,
+                            '%.2f'  % gain             ) )
+    finally :
+        pool.close ()
+        pool.join  ()
+
+    import ostap.logger.table as T
+    title = 'Shared memory vs pickle'
+    logger.info ( '%s\n%s' % ( title , T.table ( rows , title = title , prefix = '# ' ) ) )
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_shmem_roundtrip ()
+    test_shmem_benchmark ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -41,6 +41,7 @@ __all__     = (
     'good_pings'       , ## get alive hosts
     'get_local_port'   , ## get local port number
     'pool_context'     , ## useful context for the pathos's Pools
+    'used_branches'    , ## branches needed for the expressions (for balanced splitting)
     )
 # =============================================================================
 import sys
@@ -384,6 +385,44 @@ def pool_context  ( pool ) :
     """    
     return  PoolContext ( pool )
 
+# =============================================================================
+## get the branches needed to evaluate the expressions,
+#  e.g. for the bytes-balanced splitting of the chain
+#  @code
+#  chain    = ...
+#  branches = used_branches ( chain , 'pt,eta' , 'mass>10' ) 
+#  @endcode
+#  @param chain the chain
+#  @param what  the expression(s): list or comma/semicolon/colon-separated string
+#  @param cuts  the selection/weighting criteria
+#  @return the tuple of branches or empty tuple (all branches) if they can't be deduced 
+def used_branches ( chain , what , cuts = '' ) :
+    """Get the branches needed to evaluate the expressions,
+    e.g. for the bytes-balanced splitting of the chain
+    >>> chain    = ...
+    >>> branches = used_branches ( chain , 'pt,eta' , 'mass>10' ) 
+    - chain : the chain
+    - what  : the expression(s): list or comma/semicolon/colon-separated string
+    - cuts  : the selection/weighting criteria
+    - return the tuple of branches or empty tuple (all branches) if they can't be deduced 
+    """
+    from ostap.core.ostap_types import string_types
+    from ostap.core.core        import split_string
+    import ostap.trees.trees
+    
+    if isinstance ( what , string_types ) : what = split_string ( what , ',;:' )
+    exprs = [ str ( e ) for e in what ]
+    cuts  = str ( cuts ).strip () 
+    if cuts : exprs.append ( cuts )
+
+    if not exprs : return ()
+    
+    from ostap.logger.utils import rootError 
+    with rootError () :
+        variables = chain.the_variables ( exprs )
+        
+    return tuple ( variables ) if variables else () 
+
 # =============================================================================
 if '__main__' == __name__ :
     
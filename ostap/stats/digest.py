@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/stats/digest.py
+#  Mergeable streaming sketch for the (approximate) quantiles: t-digest
+#  @see Ostap::Math::TDigest
+#  @see T.Dunning, O.Ertl, "Computing extremely accurate quantiles using t-digests"
+#  @see https://arxiv.org/abs/1902.04023
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date 2021-03-12
+# =============================================================================
+"""Mergeable streaming sketch for the (approximate) quantiles: t-digest
+- see Ostap::Math::TDigest
+- see T.Dunning, O.Ertl, ``Computing extremely accurate quantiles using t-digests''
+- see https://arxiv.org/abs/1902.04023
+
+>>> digest = TDigest ( 200 )
+>>> for x in ... : digest.add ( x )
+>>> print ( digest.quantile  ( 0.5 ) )
+>>> print ( digest.quantiles ( 0.1 , 0.5 , 0.9 ) )
+"""
+# =============================================================================
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-12"
+__version__ = "$Revision$"
+# =============================================================================
+__all__     = (
+    'TDigest' , ## mergeable streaming sketch for quantiles: Ostap::Math::TDigest
+    )
+# =============================================================================
+import ROOT
+from   ostap.core.core import Ostap
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.stats.digest' )
+else                       : logger = getLogger ( __name__             )
+# =============================================================================
+TDigest = Ostap.Math.TDigest
+# =============================================================================
+## factory function to unpickle t-digest
+#  @see Ostap::Math::TDigest
+def _td_factory_ ( compression , means , weights , xmin , xmax , n , rejected = 0 ) :
+    """Factory function to unpickle t-digest
+    - see Ostap.Math.TDigest
+    """
+    from ostap.math.base import doubles
+    return TDigest ( compression      ,
+                     doubles ( means   ) ,
+                     doubles ( weights ) ,
+                     xmin , xmax , n , rejected )
+
+# =============================================================================
+## pickle t-digest
+#  @code
+#  digest = ...
+#  import pickle
+#  s = pickle.dumps ( digest )
+#  @endcode
+def _td_reduce_ ( digest ) :
+    """Pickle t-digest
+    >>> digest = ...
+    >>> import pickle
+    >>> s = pickle.dumps ( digest )
+    """
+    return _td_factory_ , ( digest.compression ()                  ,
+                            tuple ( m for m in digest.means   () ) ,
+                            tuple ( w for w in digest.weights () ) ,
+                            digest.xmin () , digest.xmax ()        ,
+                            digest.n    () , digest.rejected ()    )
+
+# =============================================================================
+## add the value or merge with another t-digest
+#  @code
+#  digest  = ...
+#  digest += 1.0
+#  digest += other_digest
+#  @endcode
+def _td_iadd_ ( self , other ) :
+    """Add the value or merge with another t-digest
+    >>> digest  = ...
+    >>> digest += 1.0
+    >>> digest += other_digest
+    """
+    if isinstance ( other , TDigest ) : self.add ( other )
+    else                              : self.add ( float ( other ) )
+    return self
+
+# =============================================================================
+## merge two t-digests
+#  @code
+#  digest1 = ...
+#  digest2 = ...
+#  digest  = digest1 + digest2
+#  @endcode
+def _td_add_ ( self , other ) :
+    """Merge two t-digests
+    >>> digest1 = ...
+    >>> digest2 = ...
+    >>> digest  = digest1 + digest2
+    """
+    if not isinstance ( other , TDigest ) : return NotImplemented
+    result = TDigest ( self )
+    result.add ( other )
+    return result
+
+# =============================================================================
+## get (approximate) quantiles
+#  @code
+#  digest = ...
+#  print ( digest.quantiles ( 0.1 , 0.5 , 0.9 ) )
+#  print ( digest.quantiles ( [ 0.1 , 0.5 , 0.9 ] ) )
+#  print ( digest.quantiles ( 10 ) ) ## deciles
+#  @endcode
+def _td_quantiles_ ( self , *quantiles ) :
+    """Get (approximate) quantiles
+    >>> digest = ...
+    >>> print ( digest.quantiles ( 0.1 , 0.5 , 0.9 ) )
+    >>> print ( digest.quantiles ( [ 0.1 , 0.5 , 0.9 ] ) )
+    >>> print ( digest.quantiles ( 10 ) ) ## deciles
+    """
+    if 1 == len ( quantiles ) :
+        q = quantiles [ 0 ]
+        if   isinstance ( q , int ) and 1 < q :
+            quantiles = tuple ( float ( i ) / q for i in range ( 1 , q ) )
+        elif not isinstance ( q , float ) :
+            quantiles = tuple ( q )
+    return tuple ( self.quantile ( q ) for q in quantiles )
+
+# =============================================================================
+## printout of t-digest
+def _td_str_ ( self ) :
+    """Printout of t-digest"""
+    rejected = ',rejected=%d' % self.rejected () if self.rejected () else ''
+    if self.empty () : return 'TDigest(compression=%s,empty%s)' % ( self.compression () , rejected )
+    return 'TDigest(compression=%s,n=%d,centroids=%d,[%.5g,%.5g]%s)' % (
+        self.compression () , self.n () , self.size () , self.xmin () , self.xmax () , rejected )
+
+TDigest.__reduce__  = _td_reduce_
+TDigest.__iadd__    = _td_iadd_
+TDigest.__add__     = _td_add_
+TDigest.quantiles   = _td_quantiles_
+TDigest.__str__     = _td_str_
+TDigest.__repr__    = _td_str_
+
+# =============================================================================
+_decorated_classes_ = (
+    TDigest ,
+    )
+_new_methods_       = (
+    TDigest.__reduce__ ,
+    TDigest.__iadd__   ,
+    TDigest.__add__    ,
+    TDigest.quantiles  ,
+    TDigest.__str__    ,
+    TDigest.__repr__   ,
+    )
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -85,6 +85,7 @@ __all__     = (
     "Width"         , ## calculate "width"    for functions/distributions, etc 
     "CL_symm"       , ## calcualte symmetrical confidence intervals            
     "CL_asymm"      , ## calcualte asymmetrical confidence intervals           
+    "Tabulated"     , ## tabulated (vectorized) function: moments, quantiles, width 
     ##
     ## stat-quantities   
     "moment"        , ## calculate N-th moment of functions/distributions, etc 
@@ -984,6 +985,233 @@ class CL_asymm(object) :
         "``prop'' - confidence level"
         return self.__prob
     
+# =============================================================================
+## @class Tabulated
+#  Statistical quantities for the function, that is tabulated once
+#  at the nodes of the composite Gauss-Legendre quadrature.
+#  The function <code>vfunc</code> is <em>vectorized</em>: it accepts
+#  the numpy-array of abscissas and returns the numpy-array of values,
+#  e.g. <code>FUNC.evaluate_array</code>
+#  @code
+#  pdf   = ...
+#  tab   = Tabulated ( pdf.evaluate_array , xmin , xmax )
+#  print ( 'RMS   : %s' % tab.rms     () )
+#  print ( 'Median: %s' % tab.median  () )
+#  print ( 'FWHM  : %s' % tab.fwhm    () )
+#  @endcode
+#  - moments are calculated as sums over the nodes
+#  - quantiles are found by root-finding within a single panel
+#  - mode and width use the nodes for bracketing, and the final
+#    refinement is done with the scalar function
+#  @attention numpy is required
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-27
+class Tabulated(object) :
+    """Statistical quantities for the function, that is tabulated once
+    at the nodes of the composite Gauss-Legendre quadrature.
+    The function `vfunc` is vectorized: it accepts the numpy-array of abscissas
+    and returns the numpy-array of values, e.g. `FUNC.evaluate_array`
+    >>> pdf   = ...
+    >>> tab   = Tabulated ( pdf.evaluate_array , xmin , xmax )
+    >>> print ( 'RMS   : %s' % tab.rms     () )
+    >>> print ( 'Median: %s' % tab.median  () )
+    >>> print ( 'FWHM  : %s' % tab.fwhm    () )
+    - numpy is required 
+    """
+    def __init__ ( self , vfunc , xmin , xmax , npoints = 4000 , order = 8 ) :
+
+        import numpy
+        from   numpy.polynomial.legendre import leggauss
+
+        assert isinstance ( npoints , integer_types ) and 0 < npoints , \
+               "Tabulated: invalid ``npoints'' %s" % npoints 
+        assert isinstance ( order   , integer_types ) and 0 < order   , \
+               "Tabulated: invalid ``order'' %s"   % order 
+        
+        xmin , xmax  = float ( xmin ) , float ( xmax )
+        assert xmin < xmax , "Tabulated: invalid interval %s/%s" % ( xmin , xmax )
+        
+        self.__vfunc = vfunc 
+        self.__xmin  = xmin
+        self.__xmax  = xmax
+
+        npanels      = max ( 1 , npoints // order )
+        self.__edges = numpy.linspace ( xmin , xmax , npanels + 1 )
+        self.__t , self.__w = leggauss ( order )
+
+        mids  = 0.5 * ( self.__edges [ 1:  ] + self.__edges [ :-1 ] )
+        half  = 0.5 * ( self.__edges [ 1:  ] - self.__edges [ :-1 ] )
+
+        ## nodes and weights of the composite quadrature 
+        x     = mids [ : , None ] + half [ : , None ] * self.__t [ None , : ]
+        w     =                     half [ : , None ] * self.__w [ None , : ]
+        
+        self.__x   = x.ravel ()
+        self.__f   = numpy.asarray ( vfunc ( self.__x ) , dtype = float ).ravel ()
+        self.__wf  = w.ravel () * self.__f 
+        
+        ## cumulative integral at the panel edges 
+        panels     = self.__wf.reshape ( npanels , order ).sum ( axis = 1 )
+        self.__cdf = numpy.concatenate ( ( [ 0.0 ] , numpy.cumsum ( panels ) ) )
+        
+        assert 0 < self.__cdf [ -1 ] , "Tabulated: non-positive integral %s" % self.__cdf [ -1 ]
+
+    ## evaluate the function at the single point 
+    def _value_ ( self , x ) :
+        """Evaluate the function at the single point"""
+        import numpy
+        return float ( self.__vfunc ( numpy.array ( [ x ] , dtype = float ) ) [ 0 ] )
+
+    ## integral from the panel low edge <code>a</code> till <code>x</code>
+    def _partial_ ( self , a , x ) :
+        """Integral from the panel low edge `a` till `x`"""
+        if x <= a : return 0.0
+        h  = 0.5 * ( x - a )
+        xx = a + h * ( self.__t + 1.0 )
+        return h * float ( ( self.__w * self.__vfunc ( xx ) ).sum () ) 
+        
+    # =========================================================================
+    ## the integral over the interval 
+    def integral ( self ) :
+        """The integral over the interval"""
+        return float ( self.__cdf [ -1 ] ) 
+
+    ## get the N-th moment, normalized by the integral
+    def moment ( self , N , x0 = 0 ) :
+        """Get the N-th moment (normalized)"""
+        if not isinstance ( N , integer_types ) or 0 > N :
+            raise TypeError ( 'Tabulated: illegal order' )        
+        return float ( ( self.__wf * ( self.__x - x0 ) ** N ).sum () ) / self.integral ()
+
+    ## get the mean value 
+    def mean ( self ) :
+        """Get the mean value"""
+        return self.moment ( 1 )
+
+    ## get the N-th central moment 
+    def central_moment ( self , N ) :
+        """Get the N-th central moment"""
+        return self.moment ( N , self.mean () )
+    
+    ## get the variance 
+    def variance ( self ) :
+        """Get the variance"""
+        return self.central_moment ( 2 )
+    
+    ## get the RMS 
+    def rms ( self ) :
+        """Get the RMS"""
+        return self.variance () ** 0.5
+    
+    ## get the skewness 
+    def skewness ( self ) :
+        """Get the skewness"""
+        mu = self.mean () 
+        m2 = self.moment ( 2 , mu )
+        m3 = self.moment ( 3 , mu )
+        return m3 / m2 ** 1.5 
+        
+    ## get the (excess) kurtosis 
+    def kurtosis ( self ) :
+        """Get the (excess) kurtosis"""
+        mu = self.mean () 
+        m2 = self.moment ( 2 , mu )
+        m4 = self.moment ( 4 , mu )
+        return m4 / ( m2 * m2 ) - 3.0 
+    
+    # =========================================================================
+    ## get the quantile 
+    def quantile ( self , Q ) :
+        """Get the quantile"""
+        
+        assert 0 <= Q <= 1 , 'Tabulated: quantile is invalid %s' % Q
+        
+        if   0 == Q : return self.__xmin
+        elif 1 == Q : return self.__xmax
+        
+        import numpy
+        target = Q * self.integral ()
+        k      = int ( numpy.searchsorted ( self.__cdf , target ) ) - 1
+        k      = min ( max ( k , 0 ) , len ( self.__edges ) - 2 )
+
+        a , b  = float ( self.__edges [ k ] ) , float ( self.__edges [ k + 1 ] )
+        c0     = float ( self.__cdf   [ k ] ) 
+        ifun   = lambda x : c0 + self._partial_ ( a , x ) - target
+
+        from ostap.math.rootfinder import findroot
+        return findroot ( ifun , a , b ) 
+    
+    ## get the median 
+    def median ( self ) :
+        """Get the median"""
+        return self.quantile ( 0.5 )
+
+    # =========================================================================
+    ## get the mode
+    def mode ( self ) :
+        """Get the mode"""
+        import numpy
+        i   = int ( numpy.argmax ( self.__f ) )
+        mn  = float ( self.__x [ i - 1 ] ) if 0 < i                    else self.__xmin
+        mx  = float ( self.__x [ i + 1 ] ) if i + 1 < len ( self.__x ) else self.__xmax 
+        
+        ifun = lambda x : -1.0 * self._value_ ( x )
+        
+        from ostap.math.minimize import minimize_scalar as _ms 
+        result = _ms ( ifun , method = 'bounded' , bounds = [ mn , mx ] )
+        return result.x 
+
+    ## get the width at the given fraction of the height 
+    def width ( self , height_factor = 0.5 , mode = None ) :
+        """Get the width at the given fraction of the height"""
+        import numpy
+        
+        m0 = mode if isinstance ( mode , float ) and self.__xmin < mode < self.__xmax else self.mode () 
+        v0 = self._value_ ( m0 )
+        vh = height_factor * v0 
+
+        ifun = lambda x : self._value_ ( x ) - vh
+        from ostap.math.rootfinder import findroot
+        
+        i0 = int ( numpy.searchsorted ( self.__x , m0 ) )
+        
+        ## left crossing 
+        below = numpy.nonzero ( self.__f [ :i0 ] < vh ) [ 0 ]
+        if len ( below ) :
+            j  = int ( below [ -1 ] ) 
+            xr = float ( self.__x [ j + 1 ] ) if j + 1 < len ( self.__x ) else m0 
+            x1 = findroot ( ifun , float ( self.__x [ j ] ) , min ( xr , m0 ) )
+        else : x1 = self.__xmin
+        
+        ## right crossing 
+        below = numpy.nonzero ( self.__f [ i0: ] < vh ) [ 0 ]
+        if len ( below ) :
+            j  = i0 + int ( below [ 0 ] ) 
+            xl = float ( self.__x [ j - 1 ] ) if 0 < j else m0 
+            x2 = findroot ( ifun , max ( xl , m0 ) , float ( self.__x [ j ] ) )
+        else : x2 = self.__xmax
+        
+        return x1 , x2 
+
+    ## get FWHM 
+    def fwhm ( self , mode = None ) :
+        """Get the full width at the half maximum"""
+        x1 , x2 = self.width ( 0.5 , mode )
+        return x2 - x1 
+
+    @property
+    def  xmin ( self ) :
+        "``xmin''- low edge of the interval"
+        return self.__xmin
+    @property
+    def  xmax ( self ) :
+        "``xmax''- high edge of the interval"
+        return self.__xmax
+    @property
+    def npoints ( self ) :
+        "``npoints'' - number of tabulation nodes"
+        return len ( self.__x )
+
 # =============================================================================
 ## calculate some statistical quantities of variable,
 #  considering function to be PDF 
@@ -24,6 +24,7 @@
 - data_quartiles       - get three quartiles 
 - data_quintiles       - get four  quintiles 
 - data_deciles         - get nine  deciles
+- data_digest          - fill the mergeable quantile sketch (t-digest)
 """
 # =============================================================================
 __version__ = "$Revision$"
@@ -47,6 +48,7 @@ __all__     = (
     'data_quartiles'      , ## get three quartiles 
     'data_quintiles'      , ## get four  quintiles 
     'data_deciles'        , ## get nine  deciles
+    'data_digest'         , ## fill the mergeable quantile sketch (t-digest)
     'data_decorate'       , ## technical function to decorate the class
     )
 # =============================================================================
@@ -58,7 +60,8 @@ from ostap.logger.logger import getLogger
 if '__main__' ==  __name__ : logger = getLogger ( 'ostap.stats.statvars' )
 else                       : logger = getLogger ( __name__               )
 # =============================================================================
-from   ostap.core.core import Ostap
+from   ostap.core.core    import Ostap
+from   ostap.stats.digest import TDigest 
 import ostap.stats.moment 
 # =============================================================================
 StatVar = Ostap.StatVar 
@@ -67,6 +70,12 @@ StatVar = Ostap.StatVar
 #  use it as threshold for exact/slow vs approximate/fast quanitle calcualtion 
 QEXACT = 10000
 # =============================================================================
+## @var QDIGEST
+#  the default compression parameter for t-digest based quantiles,
+#  used for <code>exact='digest'</code>
+#  @see Ostap::Math::TDigest
+QDIGEST = 200
+# =============================================================================
 ## get the moment of order 'order' relative to 'center'
 #  @code
 #  data =  ...
@@ -177,19 +186,28 @@ def data_kurtosis ( data , expression , cuts  = '' , *args ) :
 #  print data_quantile ( data , 0.10 , 'mass' , 'pt>1' ) 
 #  print data.quantile (        0.10 , 'mass' , 'pt>1' ) ## ditto
 #  @endcode
+#  Use <code>exact='digest'</code> for the one-pass t-digest sketch
 #  @see Ostap::StatVar::quantile
 #  @see Ostap::StatVar::p2quantile
+#  @see Ostap::Math::TDigest
 def  data_quantile ( data , q , expression , cuts  = '' , exact = QEXACT , *args ) :
     """Get the quantile
     >>> data =  ...
     >>> print data_quantile ( data , 0.1 , 'mass' , 'pt>1' ) 
     >>> print data.quantile (        0.1 , 'mass' , 'pt>1' ) ## ditto
+    - use exact='digest' for the one-pass t-digest sketch 
     - see Ostap.StatVar.quantile
     - see Ostap.StatVar.p2quantile
+    - see Ostap.Math.TDigest
     """
     assert isinstance ( q , float ) and 0 < q < 1 , 'Invalid quantile:%s' % q
 
-    if   exact is True  :
+    if   'digest' == exact :
+        ## approximate one-pass algorithm with t-digest
+        digest = data_digest ( data , expression , cuts , QDIGEST , *args )
+        qn     = StatVar.Quantile ( digest.quantile ( q ) , digest.n () )
+        
+    elif exact is True  :
         ##  exact slow algorithm 
         qn = StatVar.  quantile ( data , q , expression , cuts , *args )
 
@@ -214,21 +232,31 @@ def  data_quantile ( data , q , expression , cuts  = '' , exact = QEXACT , *args
 #  print data_interval ( data , 0.05, 0.95 , 'mass' , 'pt>1' ) ##   get 90% interval
 #  print data.interval (        0.05, 0.95 , 'mass' , 'pt>1' ) ##   get 90% interval
 #  @endcode
+#  Use <code>exact='digest'</code> for the one-pass t-digest sketch
 #  @see Ostap::StatVar::interval
 #  @see Ostap::StatVar::p2interval
+#  @see Ostap::Math::TDigest
 def data_interval ( data , qmin ,  qmax , expression , cuts = '' , exact = QEXACT , *args ) :
     """Get the interval 
     >>> data =  ...
     >>> print data_interval ( data , 0.05 , 0.95 , 'mass' , 'pt>1' ) ## get 90% interval
     >>> print data.interval (        0.05 , 0.95 , 'mass' , 'pt>1' ) ## get 90% interval
+    - use exact='digest' for the one-pass t-digest sketch 
     - see Ostap::StatVar::interval
+    - see Ostap::Math::TDigest
     """
     assert isinstance ( qmin , float ) and 0 < qmin < 1 , 'Invalid quantile-1:%s' % qmin 
     assert isinstance ( qmax , float ) and 0 < qmax < 1 , 'Invalid quantile-2:%s' % qmax
 
     qmin, qmax = min ( qmin ,  qmax ) , max  ( qmin, qmax  )
     
-    if   exact is True  :
+    if   'digest' == exact :
+        ## approximate one-pass algorithm with t-digest
+        digest = data_digest ( data , expression , cuts , QDIGEST , *args )
+        rn     = StatVar.QInterval ( StatVar.Interval ( digest.quantile ( qmin ) ,
+                                                        digest.quantile ( qmax ) ) , digest.n () )
+        
+    elif exact is True  :
         ##  exact slow algorithm 
         rn = StatVar.  interval ( data , qmin , qmax  , expression , cuts , *args )
 
@@ -275,7 +303,9 @@ def data_median ( data , expression , cuts = '' , exact = QEXACT , *args ) :
 #  print data.quantiles (        0.12  , 'mass' , 'pt>1' ) 
 #  print data.quantiles (        20    , 'mass' , 'pt>1' ) 
 #  @endcode
+#  Use <code>exact='digest'</code> for the one-pass t-digest sketch
 #  @see Ostap::StatVar::quantile
+#  @see Ostap::Math::TDigest
 def data_quantiles ( data , quantiles , expression , cuts  = '' , exact = QEXACT , *args ) :
     """Get the quantiles
     >>> data =  ...
@@ -285,7 +315,9 @@ def data_quantiles ( data , quantiles , expression , cuts  = '' , exact = QEXACT
     >>> print data.quantiles (        0.1       , 'mass' , 'pt>1' ) ## quantile 
     >>> print data.quantiles (        (0.1,0.5) , 'mass' , 'pt>1' )
     >>> print data.quantiles (        10        , 'mass' , 'pt>1' ) ## deciles!     
+    - use exact='digest' for the one-pass t-digest sketch 
     - see Ostap::StatVar::quantile
+    - see Ostap::Math::TDigest
     """
     if   isinstance ( quantiles , float ) and 0 < quantiles < 1 : 
         quantiles = [ quantiles ]
@@ -302,7 +334,12 @@ def data_quantiles ( data , quantiles , expression , cuts  = '' , exact = QEXACT
     from ostap.math.base import doubles
     qqq = doubles ( qq )
 
-    if   exact is True  :
+    if   'digest' == exact :
+        ## approximate one-pass algorithm with t-digest
+        digest = data_digest ( data , expression , cuts , QDIGEST , *args )
+        qn     = StatVar.Quantiles ( doubles ( digest.quantiles ( qqq ) ) , digest.n () )
+        
+    elif exact is True  :
         ##  exact slow algorithm 
         qn = StatVar.  quantiles ( data , qqq , expression , cuts , *args )
 
@@ -453,6 +490,79 @@ def data_rms ( data , expression , cuts  = '' , *args ) :
     return data_variance ( data ,  expression , cuts , *args ) ** 0.5
 
 
+# =============================================================================
+## warn about the entries, rejected by t-digest (non-positive weights, non-finite values)
+#  - t-digest accepts only positive weights, e.g. for sWeighted data
+#    the quantiles are biased
+#  @param digest     (INPUT) the digest
+#  @param expression (INPUT) the expression (for the message)
+#  @param before     (INPUT) number of rejected entries before the filling
+#  @return number of newly rejected entries 
+#  @see Ostap::Math::TDigest::rejected
+def _digest_rejected_ ( digest , expression = '' , before = 0 ) :
+    """Warn about the entries, rejected by t-digest (non-positive weights, non-finite values)
+    - t-digest accepts only positive weights, e.g. for sWeighted data
+    the quantiles are biased
+    - return number of newly rejected entries 
+    - see Ostap.Math.TDigest.rejected
+    """
+    rejected = digest.rejected () - before
+    if 0 < rejected :
+        logger.warning ( "digest('%s'): %d entries with non-positive weights (or non-finite values) are rejected, quantiles are biased!" % ( expression , rejected ) )
+    return rejected 
+
+# =============================================================================
+## fill the mergeable quantile sketch (t-digest) in one pass
+#  - bounded memory, any number of quantiles from the single loop 
+#  - weighted datasets and weighting cuts are supported
+#  - the digests can be merged, e.g. for parallel processing 
+#  @code
+#  data   =  ...
+#  digest = data_digest ( data , 'mass' , 'pt>1' ) 
+#  digest = data.digest (        'mass' , 'pt>1' ) ## ditto
+#  print ( digest.quantiles ( 0.05 , 0.5 , 0.95 ) ) 
+#  @endcode
+#  The existing digest can be updated: 
+#  @code
+#  digest = TDigest ( 500 ) 
+#  data_digest ( data1 , 'mass' , 'pt>1' , digest )
+#  data_digest ( data2 , 'mass' , 'pt>1' , digest )
+#  @endcode
+#  @param data        (INPUT) the data (TTree/TChain or RooAbsData) 
+#  @param expression  (INPUT) the expression 
+#  @param cuts        (INPUT) selection/weighting criteria
+#  @param compression (INPUT) the compression parameter or the digest to be updated 
+#  @return the digest 
+#  - only positive weights are accepted: the warning is issued for the rejected entries
+#  @see Ostap::Math::TDigest
+#  @see Ostap::StatVar::digest
+def data_digest ( data , expression , cuts = '' , compression = QDIGEST , *args ) :
+    """Fill the mergeable quantile sketch (t-digest) in one pass
+    - bounded memory, any number of quantiles from the single loop 
+    - weighted datasets and weighting cuts are supported
+    - the digests can be merged, e.g. for parallel processing 
+    >>> data   =  ...
+    >>> digest = data_digest ( data , 'mass' , 'pt>1' ) 
+    >>> digest = data.digest (        'mass' , 'pt>1' ) ## ditto
+    >>> print ( digest.quantiles ( 0.05 , 0.5 , 0.95 ) ) 
+    The existing digest can be updated: 
+    >>> digest = TDigest ( 500 ) 
+    >>> data_digest ( data1 , 'mass' , 'pt>1' , digest )
+    >>> data_digest ( data2 , 'mass' , 'pt>1' , digest )
+    - only positive weights are accepted: the warning is issued for the rejected entries
+    - see Ostap.Math.TDigest
+    - see Ostap.StatVar.digest
+    """
+    import ROOT
+    if not isinstance ( data , ( ROOT.TTree , ROOT.RooAbsData ) ) :
+        raise TypeError ( "data_digest: unsupported data type %s" % type ( data ) )
+
+    digest = compression if isinstance ( compression , TDigest ) else TDigest ( compression )
+    before = digest.rejected () 
+    StatVar.digest ( data , digest , expression , cuts , *args )
+    _digest_rejected_ ( digest , expression , before )
+    return digest 
+
 data_get_moment      .__doc__ += '\n' + StatVar.get_moment     .__doc__  
 data_moment          .__doc__ += '\n' + StatVar.moment         .__doc__
 data_central_moment  .__doc__ += '\n' + StatVar.central_moment .__doc__ 
@@ -461,6 +571,7 @@ data_kurtosis        .__doc__ += '\n' + StatVar.kurtosis       .__doc__
 data_quantile        .__doc__ += '\n' + StatVar.quantile       .__doc__ 
 data_quantiles       .__doc__ += '\n' + StatVar.quantiles      .__doc__ 
 data_interval        .__doc__ += '\n' + StatVar.interval       .__doc__ 
+data_digest          .__doc__ += '\n' + StatVar.digest         .__doc__ 
 
 def data_decorate ( klass ) :
     
@@ -483,6 +594,7 @@ def data_decorate ( klass ) :
     if hasattr ( klass , 'quartiles'      ) : klass.orig_quartiles      = klass.quartiles
     if hasattr ( klass , 'quintiles'      ) : klass.orig_quintiles      = klass.quintiles
     if hasattr ( klass , 'deciles'        ) : klass.orig_deciles        = klass.deciles
+    if hasattr ( klass , 'digest'         ) : klass.orig_digest         = klass.digest
 
     klass.get_moment      = data_get_moment
     klass.moment          = data_moment
@@ -502,6 +614,7 @@ def data_decorate ( klass ) :
     klass.quartiles       = data_quartiles
     klass.quintiles       = data_quintiles
     klass.deciles         = data_deciles
+    klass.digest          = data_digest
 
 
 # =============================================================================
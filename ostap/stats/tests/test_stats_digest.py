@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# @file ostap/stats/tests/test_stats_digest.py
+# Test module for ostap/stats/digest.py
+# Copyright (c) Ostap developpers.
+# =============================================================================
+""" Test module for ostap/stats/digest.py
+"""
+# =============================================================================
+import ROOT, random, pickle, bisect
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'test_stats_digest' )
+else                       : logger = getLogger ( __name__            )
+# =============================================================================
+from   ostap.stats.digest import TDigest
+# =============================================================================
+def test_digest () :
+
+    values  = [ random.gauss ( 0 , 1 ) for i in range ( 100000 ) ]
+
+    d1 , d2 = TDigest ( 200 ) , TDigest ( 200 )
+    for v in values [ : 50000 ] : d1 += v
+    for v in values [ 50000 : ] : d2 += v
+
+    ## merge two digests
+    digest  = d1 + d2
+    assert digest.n () == len ( values ) , 'Invalid number of entries!'
+    assert digest.size () < 10 * digest.compression () , 'Digest is not compressed!'
+
+    ## compare with the exact quantiles (in the rank space)
+    values.sort ()
+    for q in ( 0.001 , 0.01 , 0.1 , 0.5 , 0.9 , 0.99 , 0.999 ) :
+        exact  = values [ int ( q * len ( values ) ) ]
+        approx = digest.quantile ( q )
+        logger.info ( 'Quantile %5.3f: exact %+.4f t-digest %+.4f' % ( q , exact , approx ) )
+        rank   = float ( bisect.bisect ( values , approx ) ) / len ( values )
+        assert abs ( rank - q ) < 0.002 , 'Invalid %s-quantile' % q
+
+    ## pickling
+    d3 = pickle.loads ( pickle.dumps ( digest ) )
+    assert d3.n () == digest.n ()  , 'Invalid pickling!'
+    assert d3.quantiles ( 10 ) == digest.quantiles ( 10 ) , 'Invalid pickling!'
+
+    ## non-positive weights are rejected and counted 
+    d1.add ( 0.5 , -1.0 )
+    d1.add ( 0.5 ,  0.0 )
+    assert 2 == d1.rejected () , 'Invalid number of rejected entries!'
+    assert 2 == ( d1 + d2 ).rejected () , 'Rejected entries are not merged!'
+    assert 2 == pickle.loads ( pickle.dumps ( d1 ) ).rejected () , 'Invalid pickling!'
+    
+    logger.info ( 'Digest: %s' % digest )
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    test_digest ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -0,0 +1,558 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/trees/booking.py
+#  Batch booking of many projections and statistics for TTree/TChain,
+#  that are executed in a single loop over the tree
+#  @code
+#  tree = ...
+#  book = tree.booking ( 'pt>1' )     ## the same selection for all requests
+#  h1   = book.project  ( histo1 , 'mass'  )
+#  h2   = book.project  ( histo2 , 'y:x'   )
+#  s1   = book.statVar  ( 'pt'             )
+#  c12  = book.statCov  ( 'x' , 'y'        )
+#  ne   = book.nEff     (                  )
+#  book.run ()                        ## single loop over the tree
+#  book.run ( parallel = True )       ## use WorkManager
+#  print ( h1.result () , s1.result () , ne.result () )
+#  @endcode
+#  @see Ostap::HistoProject::projectMany
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-03-01
+# =============================================================================
+"""Batch booking of many projections and statistics for TTree/TChain,
+that are executed in a single loop over the tree
+>>> tree = ...
+>>> book = tree.booking ( 'pt>1' )     ## the same selection for all requests
+>>> h1   = book.project  ( histo1 , 'mass'  )
+>>> h2   = book.project  ( histo2 , 'y:x'   )
+>>> s1   = book.statVar  ( 'pt'             )
+>>> c12  = book.statCov  ( 'x' , 'y'        )
+>>> ne   = book.nEff     (                  )
+>>> book.run ()                        ## single loop over the tree
+>>> book.run ( parallel = True )       ## use WorkManager
+>>> print ( h1.result () , s1.result () , ne.result () )
+- see Ostap::HistoProject::projectMany
+"""
+# =============================================================================
+__version__ = "$Revision$"
+__author__  = "Vanya BELYAEV Ivan.Belyaev@itep.ru"
+__date__    = "2021-03-01"
+__all__     = (
+    'Booking'  , ## batch booking of projections and statistics
+    'Handle'   , ## futures-style handle for the booked result
+    'book_run' , ## execute the booked requests in a single loop over the tree
+    )
+# =============================================================================
+import ROOT
+from   ostap.core.core        import std, Ostap, WSE, VE
+from   ostap.core.ostap_types import string_types, integer_types
+from   ostap.trees.trees      import _tt_axes_, _tt_exprs_, _large, AutoBranches, CachedSelection
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'ostap.trees.booking' )
+else                       : logger = getLogger ( __name__ )
+# =============================================================================
+## the (weighted) counter for the means and covariances of two variables
+#  @see Ostap::Math::WCovariance
+WCovariance = Ostap.Math.WCovariance
+# =============================================================================
+## factory function to unpickle the covariance counter
+#  @see Ostap::Math::WCovariance
+def _wcov_factory_ ( *args ) :
+    """Factory function to unpickle the covariance counter
+    - see Ostap.Math.WCovariance
+    """
+    return WCovariance ( *args )
+# =============================================================================
+## pickle the covariance counter
+#  @see Ostap::Math::WCovariance
+def _wcov_reduce_ ( cnt ) :
+    """Pickle the covariance counter
+    - see Ostap.Math.WCovariance
+    """
+    return _wcov_factory_ , ( cnt.n   () , cnt.w   () ,
+                              cnt.mu1 () , cnt.mu2 () ,
+                              cnt.c11 () , cnt.c12 () , cnt.c22 () )
+# =============================================================================
+## merge two covariance counters
+#  @see Ostap::Math::WCovariance
+def _wcov_add_ ( self , other ) :
+    """Merge two covariance counters
+    - see Ostap.Math.WCovariance
+    """
+    if not isinstance ( other , WCovariance ) : return NotImplemented
+    result = WCovariance ( self )
+    result.add ( other )
+    return result
+
+WCovariance.__reduce__ = _wcov_reduce_
+WCovariance.__add__    = _wcov_add_
+# =============================================================================
+## execute the booked requests in a single loop over the tree
+#  @code
+#  tree = ...
+#  n , stats , covs = book_run ( tree , [ ( h1 , [ 'm1' , 'm2' ] ) , ( h2 , [ 'y:x' ] ) ] , [ 'pt' , 'eta' ] , 'pt>1' )
+#  @endcode
+#  @param tree    the tree
+#  @param histos  list of pairs ( histo , [ expressions ] )
+#  @param stats   list of expressions for statistics
+#  @param cuts    selection/weighting criteria
+#  @param first   the first entry to process
+#  @param nevents number of entries to process
+#  @param covs    list of pairs of expressions for covariances
+#  @return number of selected entries, the list of statistics and the list of covariance counters
+#  @see Ostap::HistoProject::projectMany
+#  @see Ostap::Math::WCovariance
+def book_run ( tree , histos , stats , cuts = '' , first = 0 , nevents = -1 , covs = () ) :
+    """Execute the booked requests in a single loop over the tree
+    >>> tree = ...
+    >>> n , stats , covs = book_run ( tree , [ ( h1 , [ 'm1' , 'm2' ] ) , ( h2 , [ 'y:x' ] ) ] , [ 'pt' , 'eta' ] , 'pt>1' )
+    - histos  : list of pairs ( histo , [ expressions ] )
+    - stats   : list of expressions for statistics
+    - cuts    : selection/weighting criteria
+    - first   : the first entry to process
+    - nevents : number of entries to process
+    - covs    : list of pairs of expressions for covariances
+    - return number of selected entries, the list of statistics and the list of covariance counters
+    - see Ostap::HistoProject::projectMany
+    - see Ostap::Math::WCovariance
+    """
+
+    hvct = std.vector ( 'TH1*'        ) ()
+    evct = std.vector ( 'std::string' ) ()
+    for histo , whats in histos :
+        for what in whats :
+            hvct.push_back ( histo )
+            for a in _tt_axes_ ( what ) : evct.push_back ( a )
+
+    svct = std.vector ( 'std::string' ) ()
+    for s in stats : svct.push_back ( s )
+
+    cvct = std.vector ( 'std::string' ) ()
+    for e1 , e2 in covs :
+        cvct.push_back ( e1 )
+        cvct.push_back ( e2 )
+
+    results  = std.vector ( WSE ) ()
+    cresults = std.vector ( WCovariance ) ()
+
+    first = max ( 0 , first )
+    last  = _large if nevents < 0 else min ( _large , first + nevents )
+
+    with AutoBranches ( tree , evct , svct , cvct , str ( cuts ) ) , CachedSelection ( tree , cuts , first , last ) : 
+        n = Ostap.HistoProject.projectMany ( tree , hvct , evct , results , svct , cresults , cvct , str ( cuts ) , first , last )
+    assert 0 <= n , "book_run: invalid expressions or selection!"
+
+    return n , [ WSE ( s ) for s in results ] , [ WCovariance ( c ) for c in cresults ]
+
+# =============================================================================
+## @class Handle
+#  Futures-style handle for the result, booked via <code>Booking</code>
+#  - the access to the result triggers the loop, if not executed yet
+#  @code
+#  book = tree.booking ( 'pt>1' )
+#  s1   = book.statVar ( 'pt' )
+#  print ( s1.done () )
+#  print ( s1.result () )
+#  @endcode
+class Handle(object) :
+    """Futures-style handle for the result, booked via `Booking`
+    - the access to the result triggers the loop, if not executed yet
+    >>> book = tree.booking ( 'pt>1' )
+    >>> s1   = book.statVar ( 'pt' )
+    >>> print ( s1.done () )
+    >>> print ( s1.result () )
+    """
+    def __init__ ( self , booking , getter , what = '' ) :
+        self.__booking = booking
+        self.__getter  = getter
+        self.__what    = what
+
+    ## is the result ready?
+    def done   ( self ) :
+        """Is the result ready?"""
+        return self.__booking.done
+
+    ## get the result (and trigger the loop, if needed)
+    def result ( self ) :
+        """Get the result (and trigger the loop, if needed)"""
+        if not self.__booking.done : self.__booking.run ()
+        return self.__getter ( self.__booking )
+
+    def __repr__ ( self ) :
+        return "Handle(%s,%s)" % ( self.__what , 'done' if self.done () else 'pending' )
+    __str__ = __repr__
+
+# =============================================================================
+## @class Booking
+#  Batch booking of many projections and statistics for TTree/TChain,
+#  that are executed in a single loop over the tree with the same selection
+#  @code
+#  tree = ...
+#  book = Booking ( tree , 'pt>1' )
+#  h1   = book.project    ( histo1 , 'mass'  ) ## histogram
+#  h2   = book.project    ( histo2 , 'm1,m2' ) ## sum of projections
+#  s1   = book.statVar    ( 'pt'             ) ## counter
+#  c12  = book.statCov    ( 'x' , 'y'        ) ## covariance
+#  m3   = book.get_moment ( 3 , 0.0 , 'x'    ) ## moment
+#  ne   = book.nEff       (                  ) ## effective number of entries
+#  book.run ()                        ## single loop over the tree
+#  book.run ( parallel = True )       ## use WorkManager
+#  print ( h1.result () , s1.result () , ne.result () )
+#  @endcode
+#  - for array-like expressions the covariances and moments are calculated
+#    from the per-entry products of values
+#  - the covariances are accumulated with the numerically stable
+#    one-pass co-moment counter Ostap::Math::WCovariance
+#  @see Ostap::HistoProject::projectMany
+class Booking(object) :
+    """Batch booking of many projections and statistics for TTree/TChain,
+    that are executed in a single loop over the tree with the same selection
+    >>> tree = ...
+    >>> book = Booking ( tree , 'pt>1' )
+    >>> h1   = book.project    ( histo1 , 'mass'  ) ## histogram
+    >>> h2   = book.project    ( histo2 , 'm1,m2' ) ## sum of projections
+    >>> s1   = book.statVar    ( 'pt'             ) ## counter
+    >>> c12  = book.statCov    ( 'x' , 'y'        ) ## covariance
+    >>> m3   = book.get_moment ( 3 , 0.0 , 'x'    ) ## moment
+    >>> ne   = book.nEff       (                  ) ## effective number of entries
+    >>> book.run ()                        ## single loop over the tree
+    >>> book.run ( parallel = True )       ## use WorkManager
+    >>> print ( h1.result () , s1.result () , ne.result () )
+    - for array-like expressions the covariances and moments are calculated
+    from the per-entry products of values
+    - the covariances are accumulated with the numerically stable
+    one-pass co-moment counter Ostap::Math::WCovariance
+    - see Ostap::HistoProject::projectMany
+    """
+    def __init__ ( self , tree , cuts = '' , first = 0 , nevents = -1 ) :
+
+        assert isinstance ( tree , ROOT.TTree ) , "Booking: invalid tree type %s" % type ( tree )
+        assert isinstance ( first   , integer_types ) and 0 <= first , "Booking: invalid first %s"   % first
+        assert isinstance ( nevents , integer_types )                , "Booking: invalid nevents %s" % nevents
+
+        self.__tree    = tree
+        self.__cuts    = str ( cuts ).strip() if cuts else ''
+        self.__first   = first
+        self.__nevents = nevents
+
+        self.__histos  = [] ## list of ( histo , [ expressions ] )
+        self.__stats   = [] ## list of expressions for statistics
+        self.__covs    = [] ## list of pairs of expressions for covariances
+
+        self.__done    = False
+        self.__length  = 0
+        self.__results = []
+        self.__cresults = []
+
+    # =========================================================================
+    ## get the index of the (unique) statistic expression
+    def __stat ( self , expression ) :
+        """Get the index of the (unique) statistic expression"""
+        expression = str ( expression ).strip()
+        if not expression in self.__stats :
+            self.__stats.append ( expression )
+            self.__done = False
+        return self.__stats.index ( expression )
+
+    # =========================================================================
+    ## get the index of the (unique) pair of expressions for covariance
+    def __cov ( self , expression1 , expression2 ) :
+        """Get the index of the (unique) pair of expressions for covariance"""
+        pair = str ( expression1 ).strip() , str ( expression2 ).strip()
+        if not pair in self.__covs :
+            self.__covs.append ( pair )
+            self.__done = False
+        return self.__covs.index ( pair )
+
+    # =========================================================================
+    ## book the projection of the expression(s) into histogram
+    #  @code
+    #  book = ...
+    #  h1   = book.project ( histo1 , 'mass'  )
+    #  h2   = book.project ( histo2 , 'm1,m2' ) ## sum of projections
+    #  h3   = book.project ( histo3 , 'y:x'   ) ## 2D-projection
+    #  @endcode
+    def project ( self , histo , what ) :
+        """Book the projection of the expression(s) into histogram
+        >>> book = ...
+        >>> h1   = book.project ( histo1 , 'mass'  )
+        >>> h2   = book.project ( histo2 , 'm1,m2' ) ## sum of projections
+        >>> h3   = book.project ( histo3 , 'y:x'   ) ## 2D-projection
+        """
+        assert isinstance ( histo , ROOT.TH1 ) , "Booking.project: invalid histogram type %s" % type ( histo )
+        assert not isinstance ( histo , ( ROOT.TProfile , ROOT.TProfile2D ) ) , \
+               "Booking.project: profiles are not supported"
+
+        whats = _tt_exprs_ ( what )
+        assert whats , "Booking.project: no expressions are specified!"
+        for w in whats :
+            assert len ( _tt_axes_ ( w ) ) == histo.GetDimension() , \
+                   "Booking.project: mismatch of expression '%s' and histogram dimension" % w
+
+        for h , exprs in self.__histos :
+            if h is histo :
+                exprs.extend ( whats )
+                break
+        else :
+            self.__histos.append ( ( histo , whats ) )
+
+        self.__done = False
+        return Handle ( self , lambda b : histo , what = ','.join ( whats ) )
+
+    # =========================================================================
+    ## book the statistic for the expression
+    #  @code
+    #  book = ...
+    #  s1   = book.statVar ( 'pt' )
+    #  print ( s1.result () )
+    #  @endcode
+    def statVar ( self , expression ) :
+        """Book the statistic for the expression
+        >>> book = ...
+        >>> s1   = book.statVar ( 'pt' )
+        >>> print ( s1.result () )
+        """
+        i = self.__stat ( expression )
+        return Handle ( self , lambda b : b.results [ i ] , what = expression )
+
+    # =========================================================================
+    ## book the effective number of entries
+    #  @code
+    #  book = ...
+    #  ne   = book.nEff ()
+    #  print ( ne.result () )
+    #  @endcode
+    def nEff ( self ) :
+        """Book the effective number of entries
+        >>> book = ...
+        >>> ne   = book.nEff ()
+        >>> print ( ne.result () )
+        """
+        i = self.__stat ( '1' )
+        return Handle ( self , lambda b : b.results [ i ].nEff () , what = 'nEff' )
+
+    # =========================================================================
+    ## book the statistics and covariance for the pair of expressions
+    #  @code
+    #  book = ...
+    #  c12  = book.statCov ( 'x' , 'y' )
+    #  stat1 , stat2 , cov2 , length = c12.result ()
+    #  @endcode
+    #  @see Ostap::StatVar::statCov
+    def statCov ( self , expression1 , expression2 ) :
+        """Book the statistics and covariance for the pair of expressions
+        >>> book = ...
+        >>> c12  = book.statCov ( 'x' , 'y' )
+        >>> stat1 , stat2 , cov2 , length = c12.result ()
+        - see Ostap::StatVar::statCov
+        """
+        e1  = str ( expression1 ).strip()
+        e2  = str ( expression2 ).strip()
+        i1  = self.__stat ( e1 )
+        i2  = self.__stat ( e2 )
+        i12 = self.__cov  ( e1 , e2 )
+
+        def _cov_ ( b ) :
+            import ostap.math.linalg
+            s1 , s2 = b.results  [ i1  ] , b.results [ i2 ]
+            c12     = b.cresults [ i12 ]
+            cov2    = Ostap.Math.SymMatrix(2)()
+            cov2 [ 0 , 0 ] = c12.cov11 ()
+            cov2 [ 0 , 1 ] = c12.cov12 ()
+            cov2 [ 1 , 1 ] = c12.cov22 ()
+            return s1 , s2 , cov2 , s1.nEntries ()
+
+        return Handle ( self , _cov_ , what = '%s,%s' % ( e1 , e2 ) )
+
+    # =========================================================================
+    ## book the moment of order 'order' relative to 'center'
+    #  @code
+    #  book = ...
+    #  m3   = book.get_moment ( 3 , 0.0 , 'mass' )
+    #  print ( m3.result () )
+    #  @endcode
+    #  @see Ostap::StatVar::get_moment
+    def get_moment ( self , order , center , expression ) :
+        """Book the moment of order 'order' relative to 'center'
+        >>> book = ...
+        >>> m3   = book.get_moment ( 3 , 0.0 , 'mass' )
+        >>> print ( m3.result () )
+        - see Ostap::StatVar::get_moment
+        """
+        assert isinstance ( order  , integer_types ) and 0 <= order , 'Invalid order  %s'  % order
+        if 0 == order : return Handle ( self , lambda b : 1.0 , what = expression )
+        i = self.__stat ( 'pow((%s)-(%.17g),%d)' % ( expression , center , order ) )
+        return Handle ( self , lambda b : b.results [ i ].mean () , what = expression )
+
+    # =========================================================================
+    ## book the moment (with uncertainty) of order 'order'
+    #  @code
+    #  book = ...
+    #  m3   = book.moment ( 3 , 'mass' )
+    #  print ( m3.result () )
+    #  @endcode
+    #  @see Ostap::StatVar::moment
+    def moment ( self , order , expression ) :
+        """Book the moment (with uncertainty) of order 'order'
+        >>> book = ...
+        >>> m3   = book.moment ( 3 , 'mass' )
+        >>> print ( m3.result () )
+        - see Ostap::StatVar::moment
+        """
+        assert isinstance ( order  , integer_types ) and 0 < order , 'Invalid order  %s'  % order
+        i = self.__stat ( 'pow(%s,%d)' % ( expression , order ) )
+        def _moment_ ( b ) :
+            s = b.results [ i ]
+            return VE ( s.mean () , s.meanErr () ** 2 )
+        return Handle ( self , _moment_ , what = expression )
+
+    # =========================================================================
+    ## execute all booked requests in a single loop over the tree
+    #  @code
+    #  book = ...
+    #  book.run ()
+    #  book.run ( parallel = True , ncpus = 8 ) ## use WorkManager
+    #  @endcode
+    #  @param parallel use the parallel processing with WorkManager
+    #  @param kwargs   the arguments for parallel processing
+    #  @return number of selected entries
+    def run ( self , parallel = False , **kwargs ) :
+        """Execute all booked requests in a single loop over the tree
+        >>> book = ...
+        >>> book.run ()
+        >>> book.run ( parallel = True , ncpus = 8 ) ## use WorkManager
+        - parallel : use the parallel processing with WorkManager
+        - kwargs   : the arguments for parallel processing
+        - return number of selected entries
+        """
+
+        if not self.__histos and not self.__stats and not self.__covs :
+            logger.warning ( 'Booking.run: nothing is booked, skip' )
+            self.__done = True
+            return 0
+
+        if parallel :
+            from ostap.parallel.parallel_booking import pbooking
+            length , histos , stats , covs = pbooking ( self.__tree    ,
+                                                        self.__histos  ,
+                                                        self.__stats   ,
+                                                        self.__cuts    ,
+                                                        first    = self.__first   ,
+                                                        nentries = self.__nevents ,
+                                                        covs     = self.__covs    , **kwargs )
+            ## copy the merged histograms into the booked ones
+            for ( histo , exprs ) , h in zip ( self.__histos , histos ) :
+                histo.Reset ()
+                histo.Add   ( h )
+        else :
+            length , stats , covs = book_run ( self.__tree    ,
+                                               self.__histos  ,
+                                               self.__stats   ,
+                                               self.__cuts    ,
+                                               self.__first   ,
+                                               self.__nevents ,
+                                               self.__covs    )
+
+        self.__length   = length
+        self.__results  = stats
+        self.__cresults = covs 
+        self.__done     = True
+
+        return length
+
+    @property
+    def tree     ( self ) :
+        """``tree'' : the tree to process"""
+        return self.__tree
+
+    @property
+    def cuts     ( self ) :
+        """``cuts'' : the selection/weighting criteria for all requests"""
+        return self.__cuts
+
+    @property
+    def done     ( self ) :
+        """``done'' : are all booked requests executed?"""
+        return self.__done
+
+    @property
+    def length   ( self ) :
+        """``length'' : number of selected entries"""
+        return self.__length
+
+    @property
+    def results  ( self ) :
+        """``results'' : list of statistics for all booked expressions"""
+        return self.__results
+
+    @property
+    def cresults ( self ) :
+        """``cresults'' : list of covariance counters for all booked pairs of expressions"""
+        return self.__cresults
+
+    @property
+    def expressions ( self ) :
+        """``expressions'' : all booked expressions for statistics"""
+        return tuple ( self.__stats )
+
+    @property
+    def histos   ( self ) :
+        """``histos'' : all booked histograms"""
+        return tuple ( h for h , e in self.__histos )
+
+    def __repr__ ( self ) :
+        return "Booking(%s,cuts='%s',#histos=%d,#stats=%d,%s)" % (
+            self.__tree.GetName () , self.__cuts  ,
+            len ( self.__histos )  , len ( self.__stats ) , 'done' if self.__done else 'pending' )
+    __str__ = __repr__
+
+# =============================================================================
+## create the booking object for the tree
+#  @code
+#  tree = ...
+#  book = tree.booking ( 'pt>1' )
+#  h1   = book.project ( histo1 , 'mass' )
+#  s1   = book.statVar ( 'pt' )
+#  book.run ()
+#  @endcode
+#  @see Booking
+def _tt_booking_ ( tree , cuts = '' , first = 0 , nevents = -1 ) :
+    """Create the booking object for the tree
+    >>> tree = ...
+    >>> book = tree.booking ( 'pt>1' )
+    >>> h1   = book.project ( histo1 , 'mass' )
+    >>> s1   = book.statVar ( 'pt' )
+    >>> book.run ()
+    - see Booking
+    """
+    return Booking ( tree , cuts , first , nevents )
+
+ROOT.TTree .booking = _tt_booking_
+ROOT.TChain.booking = _tt_booking_
+
+# =============================================================================
+_decorated_classes_ = (
+    ROOT.TTree  ,
+    ROOT.TChain ,
+    WCovariance ,
+    )
+_new_methods_       = (
+    ROOT.TTree .booking    ,
+    ROOT.TChain.booking    ,
+    WCovariance.__reduce__ ,
+    WCovariance.__add__    ,
+    )
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
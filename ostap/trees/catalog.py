@@ -0,0 +1,558 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+## @file ostap/trees/catalog.py
+#
+#  Persistent (SQLite-based) catalog of file metadata for trees and chains.
+#
+#  For each file (keyed by its path, size and modification time) and
+#  each tree, the catalog keeps
+#  - the number of entries,
+#  - the list of top-level branches with their compressed sizes,
+#  - the list of leaves,
+#  - the total compressed and uncompressed sizes of the tree.
+#
+#  Opening thousands of files (e.g. on the network file systems) just to get
+#  the number of entries can take minutes; with the catalog it is done only once.
+#  The missing entries are filled in parallel by the pool of threads,
+#  if ROOT is configured for multithreading by the caller.
+#
+#  The catalog also keeps the lists of entries (<code>TEntryList</code>) that
+#  pass the given selection for the given list of files (keyed by the checksum
+#  of the file list), see ostap.trees.trees.CachedSelection.
+#  The entry lists are stored in ROOT files in <code>selections</code>
+#  subdirectory of the catalog directory.
+#
+#  @code
+#  catalog = get_catalog ()
+#  lens    = catalog.entries ( files , 'Bc/MyTree' )
+#  info    = catalog.info    ( 'a.root' , 'Bc/MyTree' )
+#  print ( info.entries , info.zipbytes , info.branches )
+#  @endcode
+#
+#  The default catalog is disabled unless its location is explicitly specified:
+#  - <code>$OSTAP_CATALOG</code> environment variable
+#  - <code>Catalog</code> option in <code>[General]</code> section of the configuration file
+#  Setting it to <code>none</code> disables the catalog.
+#
+#  The missing entries of the default catalog are scanned sequentially,
+#  unless the thread-safe scan is explicitly requested:
+#  - <code>$OSTAP_CATALOG_THREADSAFE</code> environment variable
+#  - <code>CatalogThreadSafe</code> option in <code>[General]</code> section of the configuration file
+#  In this case <code>ROOT.ROOT.EnableThreadSafety()</code> is called when
+#  the default catalog is opened.
+#
+#  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+#  @date   2021-02-24
+# =============================================================================
+"""Persistent (SQLite-based) catalog of file metadata for trees and chains.
+
+For each file (keyed by its path, size and modification time) and
+each tree, the catalog keeps
+- the number of entries,
+- the list of top-level branches with their compressed sizes,
+- the list of leaves,
+- the total compressed and uncompressed sizes of the tree.
+
+Opening thousands of files (e.g. on the network file systems) just to get
+the number of entries can take minutes; with the catalog it is done only once.
+The missing entries are filled in parallel by the pool of threads,
+if ROOT is configured for multithreading by the caller.
+
+The catalog also keeps the lists of entries (TEntryList) that pass the given
+selection for the given list of files (keyed by the checksum of the file list),
+see ostap.trees.trees.CachedSelection. The entry lists are stored in ROOT files
+in `selections` subdirectory of the catalog directory.
+
+>>> catalog = get_catalog ()
+>>> lens    = catalog.entries ( files , 'Bc/MyTree' )
+>>> info    = catalog.info    ( 'a.root' , 'Bc/MyTree' )
+>>> print ( info.entries , info.zipbytes , info.branches )
+
+The default catalog is disabled unless its location is explicitly specified:
+- $OSTAP_CATALOG environment variable
+- `Catalog` option in `[General]` section of the configuration file
+Setting it to `none` disables the catalog.
+
+The missing entries of the default catalog are scanned sequentially,
+unless the thread-safe scan is explicitly requested:
+- $OSTAP_CATALOG_THREADSAFE environment variable
+- `CatalogThreadSafe` option in `[General]` section of the configuration file
+In this case `ROOT.ROOT.EnableThreadSafety()` is called when
+the default catalog is opened.
+"""
+# =============================================================================
+__version__ = '$Revision$'
+__author__  = 'Vanya BELYAEV Ivan.Belyaev@itep.ru'
+__date__    = '2021-02-24'
+__all__     = (
+    'FileCatalog' , ## persistent catalog of file metadata
+    'TreeInfo'    , ## metadata for the tree in the file
+    'get_catalog' , ## get the default catalog
+    'tree_infos'  , ## get the metadata for the tree in the files 
+    'files_checksum' , ## get the checksum for the list of files 
+    )
+# =============================================================================
+import os, sqlite3, json, hashlib
+from   collections         import namedtuple
+# =============================================================================
+from   ostap.logger.logger import getLogger
+if '__main__' == __name__ : logger = getLogger ( 'ostap.trees.catalog' )
+else                      : logger = getLogger ( __name__              )
+# =============================================================================
+## metadata for the tree in the file
+#  - <code>entries</code>  : number of entries
+#  - <code>zipbytes</code> : total compressed size of the tree
+#  - <code>totbytes</code> : total uncompressed size of the tree
+#  - <code>branches</code> : dictionary { branch : compressed size } for the top-level branches
+#  - <code>leaves</code>   : tuple of leaves
+TreeInfo = namedtuple ( 'TreeInfo' , ( 'entries' , 'zipbytes' , 'totbytes' , 'branches' , 'leaves' ) )
+# =============================================================================
+## protocols that prevent caching (no way to check the size and modification time)
+protocols = ( 'root:/' , 'http:/' , 'https:/' )
+# =============================================================================
+## default number of threads to fill the catalog
+nthreads  = 8
+# =============================================================================
+## get the key for the file: ( path , size , mtime ) or None for remote files
+def _file_key ( fname ) :
+    """Get the key for the file: ( path , size , mtime ) or None for remote files
+    """
+    for p in protocols :
+        if p in fname : return None
+    try :
+        s = os.stat ( fname )
+    except OSError :
+        return None
+    return os.path.normpath ( os.path.abspath ( fname ) ) , s.st_size , s.st_mtime
+
+# =============================================================================
+## get the checksum for the list of files (path, size and modification time)
+#  @code
+#  checksum = files_checksum ( chain.files() ) 
+#  @endcode
+#  @return the checksum or None if some files are remote or missing 
+def files_checksum ( files ) :
+    """Get the checksum for the list of files (path, size and modification time)
+    >>> checksum = files_checksum ( chain.files() ) 
+    - return the checksum or None if some files are remote or missing 
+    """
+    keys = [ _file_key ( f ) for f in files ]
+    if not keys or None in keys : return None
+    return hashlib.sha1 ( json.dumps ( keys ).encode ( 'utf-8' ) ).hexdigest ()
+
+# =============================================================================
+## scan the file and get the metadata for the tree (executed in threads)
+#  @return TreeInfo or None if the tree is missing
+def _scan ( fname , tree ) :
+    """Scan the file and get the metadata for the tree (executed in threads)
+    - return TreeInfo or None if the tree is missing
+    """
+    import ROOT
+    rfile = ROOT.TFile.Open ( fname , 'READ' )
+    if not rfile or rfile.IsZombie () : return None
+    try :
+        t = rfile.Get ( tree )
+        if not t or not isinstance ( t , ROOT.TTree ) : return None
+        branches = dict ( ( b.GetName () , b.GetZipBytes ( '*' ) ) for b in t.GetListOfBranches () )
+        leaves   = tuple ( l.GetName () for l in t.GetListOfLeaves () )
+        return TreeInfo ( t.GetEntries  () ,
+                          t.GetZipBytes () ,
+                          t.GetTotBytes () ,
+                          branches         ,
+                          leaves           )
+    finally :
+        rfile.Close ()
+
+# =============================================================================
+## @class FileCatalog
+#  Persistent (SQLite-based) catalog of file metadata for trees and chains,
+#  keyed by the path, the size and the modification time of the file
+#  @code
+#  catalog = FileCatalog ( 'catalog.db' )
+#  lens    = catalog.entries ( files , 'Bc/MyTree' )
+#  infos   = catalog.infos   ( files , 'Bc/MyTree' )
+#  info    = catalog.info    ( 'a.root' , 'Bc/MyTree' )
+#  @endcode
+class FileCatalog(object) :
+    """Persistent (SQLite-based) catalog of file metadata for trees and chains,
+    keyed by the path, the size and the modification time of the file
+    >>> catalog = FileCatalog ( 'catalog.db' )
+    >>> lens    = catalog.entries ( files , 'Bc/MyTree' )
+    >>> infos   = catalog.infos   ( files , 'Bc/MyTree' )
+    >>> info    = catalog.info    ( 'a.root' , 'Bc/MyTree' )
+    """
+    def __init__ ( self , dbname , nthreads = nthreads , thread_safe = False ) :
+
+        dirname = os.path.dirname ( os.path.abspath ( dbname ) )
+        if not os.path.exists ( dirname ) : os.makedirs ( dirname )
+
+        self.__dbname   = dbname
+        self.__nthreads    = max ( 1 , int ( nthreads ) )
+        self.__thread_safe = True if thread_safe else False 
+        self.__conn     = sqlite3.connect ( dbname , timeout = 60 )
+        with self.__conn :
+            self.__conn.execute ( """CREATE TABLE IF NOT EXISTS files (
+            path     TEXT    ,
+            size     INTEGER ,
+            mtime    REAL    ,
+            tree     TEXT    ,
+            entries  INTEGER ,
+            zipbytes INTEGER ,
+            totbytes INTEGER ,
+            branches TEXT    ,
+            leaves   TEXT    ,
+            PRIMARY KEY ( path , size , mtime , tree ) )""" )
+            self.__conn.execute ( """CREATE TABLE IF NOT EXISTS selections (
+            checksum TEXT    ,
+            tree     TEXT    ,
+            cuts     TEXT    ,
+            selected INTEGER ,
+            fname    TEXT    ,
+            PRIMARY KEY ( checksum , tree , cuts ) )""" )
+
+    # =========================================================================
+    ## get the metadata for the files and the tree
+    #  @code
+    #  catalog = ...
+    #  infos   = catalog.infos ( files , 'Bc/MyTree' )
+    #  @endcode
+    #  @return list of TreeInfo objects (None for the missing trees)
+    #  - the missing entries are filled by the pool of threads
+    def infos ( self , files , tree ) :
+        """Get the metadata for the files and the tree
+        >>> catalog = ...
+        >>> infos   = catalog.infos ( files , 'Bc/MyTree' )
+        - return list of TreeInfo objects (None for the missing trees)
+        - the missing entries are filled by the pool of threads
+        """
+        files   = list ( files )
+        keys    = [ _file_key ( f ) for f in files ]
+        results = [ None ] * len ( files )
+
+        missing = []
+        cursor  = self.__conn.cursor ()
+        for i , key in enumerate ( keys ) :
+            if key is None : missing.append ( i ) ; continue
+            cursor.execute ( "SELECT entries, zipbytes, totbytes, branches, leaves FROM files "
+                             "WHERE path = ? AND size = ? AND mtime = ? AND tree = ?" , key + ( tree , ) )
+            row = cursor.fetchone ()
+            if row is None : missing.append ( i ) ; continue
+            entries , zipbytes , totbytes , branches , leaves = row
+            if 0 <= entries :
+                results [ i ] = TreeInfo ( entries , zipbytes , totbytes ,
+                                           json.loads ( branches ) , tuple ( json.loads ( leaves ) ) )
+
+        if missing :
+            scanned = self.__scan ( [ files [ i ] for i in missing ] , tree )
+            rows    = []
+            for i , info in zip ( missing , scanned ) :
+                results [ i ] = info
+                if keys [ i ] is None : continue
+                if info is None : rows.append ( keys [ i ] + ( tree , -1 , 0 , 0 , '{}' , '[]' ) )
+                else            : rows.append ( keys [ i ] + ( tree ,
+                                                               info.entries  ,
+                                                               info.zipbytes ,
+                                                               info.totbytes ,
+                                                               json.dumps ( info.branches ) ,
+                                                               json.dumps ( info.leaves   ) ) )
+            if rows :
+                with self.__conn :
+                    self.__conn.executemany ( "INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,?,?,?,?)" , rows )
+
+        return results
+
+    # =========================================================================
+    ## scan the files in parallel using the pool of threads
+    #  - the pool of threads is used only if ROOT is already configured for
+    #    multithreading by the caller, e.g. via <code>ROOT.ROOT.EnableImplicitMT()</code>
+    #    or <code>ROOT.ROOT.EnableThreadSafety()</code> (the latter is not
+    #    detectable, use <code>thread_safe=True</code> in this case).
+    #  - otherwise the files are scanned sequentially
+    #  - GIL is released for <code>TFile.Open</code> only for the duration of the scan
+    def __scan ( self , files , tree ) :
+        """Scan the files in parallel using the pool of threads
+        - the pool of threads is used only if ROOT is already configured for
+        multithreading by the caller, e.g. via `ROOT.ROOT.EnableImplicitMT()`
+        or `ROOT.ROOT.EnableThreadSafety()` (the latter is not detectable,
+        use `thread_safe=True` in this case)
+        - otherwise the files are scanned sequentially
+        - GIL is released for `TFile.Open` only for the duration of the scan
+        """
+
+        import ROOT
+        from ostap.logger.utils import rootError
+        
+        parallel = 1 < self.__nthreads and 1 < len ( files ) and \
+                   ( self.__thread_safe or ROOT.ROOT.IsImplicitMTEnabled () )
+        
+        if not parallel :
+            with rootError () :
+                return [ _scan ( f , tree ) for f in files ]
+
+        ## allow parallel I/O: release GIL for opening the files (and restore it afterwards)
+        fopen = ROOT.TFile.Open
+        gil   = getattr ( fopen , '__release_gil__' , None )
+        try :
+            if gil is not None : fopen.__release_gil__ = True            
+            import concurrent.futures as CF
+            with rootError () , CF.ThreadPoolExecutor ( max_workers = self.__nthreads ) as pool :
+                return list ( pool.map ( _scan , files , [ tree ] * len ( files ) ) )
+        finally :
+            if gil is not None : fopen.__release_gil__ = gil
+
+    # =========================================================================
+    ## get metadata for the single file and the tree
+    #  @code
+    #  catalog = ...
+    #  info    = catalog.info ( 'a.root' , 'Bc/MyTree' )
+    #  @endcode
+    #  @return TreeInfo object (None for the missing tree)
+    def info ( self , fname , tree ) :
+        """Get metadata for the single file and the tree
+        >>> catalog = ...
+        >>> info    = catalog.info ( 'a.root' , 'Bc/MyTree' )
+        - return TreeInfo object (None for the missing tree)
+        """
+        return self.infos ( [ fname ] , tree ) [ 0 ]
+
+    # =========================================================================
+    ## get number of entries for the files and the tree
+    #  @code
+    #  catalog = ...
+    #  lens    = catalog.entries ( files , 'Bc/MyTree' )
+    #  @endcode
+    #  @return tuple with numbers of entries (0 for the missing trees)
+    def entries ( self , files , tree ) :
+        """Get number of entries for the files and the tree
+        >>> catalog = ...
+        >>> lens    = catalog.entries ( files , 'Bc/MyTree' )
+        - return tuple with numbers of entries (0 for the missing trees)
+        """
+        return tuple ( i.entries if i else 0 for i in self.infos ( files , tree ) )
+
+    # =========================================================================
+    ## get the persistent list of entries that pass the selection
+    #  @code
+    #  catalog = ...
+    #  elist   = catalog.get_selection ( chain.files() , 'Bc/MyTree' , 'pt>1' )
+    #  @endcode
+    #  @return TEntryList (not attached to any directory) or None 
+    def get_selection ( self , files , tree , cuts ) :
+        """Get the persistent list of entries that pass the selection
+        >>> catalog = ...
+        >>> elist   = catalog.get_selection ( chain.files() , 'Bc/MyTree' , 'pt>1' )
+        - return TEntryList (not attached to any directory) or None 
+        """
+        checksum = files_checksum ( files )
+        if checksum is None : return None 
+        row = self.__conn.execute ( "SELECT fname FROM selections "
+                                    "WHERE checksum = ? AND tree = ? AND cuts = ?" ,
+                                    ( checksum , tree , cuts ) ).fetchone ()
+        if row is None or not os.path.exists ( row [ 0 ] ) : return None
+
+        import ROOT
+        from ostap.core.core    import ROOTCWD
+        from ostap.logger.utils import rootError
+        with ROOTCWD () , rootError () :
+            rfile = ROOT.TFile.Open ( row [ 0 ] , 'READ' )
+            if not rfile or rfile.IsZombie () : return None
+            try :
+                elist = rfile.Get ( 'elist' )
+                if not elist or not isinstance ( elist , ROOT.TEntryList ) : return None
+                ROOT.gROOT.cd ()
+                elist = elist.Clone ()
+                elist.SetDirectory ( ROOT.nullptr )
+                return elist 
+            finally :
+                rfile.Close ()
+            
+    # =========================================================================
+    ## store the list of entries that pass the selection
+    #  @code
+    #  catalog = ...
+    #  catalog.put_selection ( chain.files() , 'Bc/MyTree' , 'pt>1' , elist )
+    #  @endcode
+    #  @return True if the list is stored 
+    def put_selection ( self , files , tree , cuts , elist ) :
+        """Store the list of entries that pass the selection
+        >>> catalog = ...
+        >>> catalog.put_selection ( chain.files() , 'Bc/MyTree' , 'pt>1' , elist )
+        - return True if the list is stored 
+        """
+        checksum = files_checksum ( files )
+        if checksum is None : return False 
+
+        key     = json.dumps ( ( checksum , tree , cuts ) ).encode ( 'utf-8' ) 
+        dirname = os.path.join ( os.path.dirname ( os.path.abspath ( self.__dbname ) ) , 'selections' )
+        fname   = os.path.join ( dirname , '%s.root' % hashlib.sha1 ( key ).hexdigest () )
+        tmpname = '%s.%d.tmp.root' % ( fname , os.getpid () )
+        
+        import ROOT
+        from ostap.core.core import ROOTCWD
+        try :
+            if not os.path.exists ( dirname ) : os.makedirs ( dirname )
+            with ROOTCWD () :
+                rfile = ROOT.TFile.Open ( tmpname , 'RECREATE' )
+                if not rfile or rfile.IsZombie () : return False
+                rfile.WriteTObject ( elist , 'elist' )
+                rfile.Close ()
+            os.rename ( tmpname , fname )
+        except OSError as e :
+            logger.warning ( "Cannot store the selection '%s': %s" % ( cuts , e ) )
+            return False 
+        
+        with self.__conn :
+            self.__conn.execute ( "INSERT OR REPLACE INTO selections VALUES (?,?,?,?,?)" ,
+                                  ( checksum , tree , cuts , elist.GetN () , fname ) )
+        return True 
+
+    # =========================================================================
+    ## remove all stored selections 
+    def clear_selections ( self ) :
+        """Remove all stored selections
+        """
+        rows = self.__conn.execute ( "SELECT fname FROM selections" ).fetchall ()
+        for row in rows :
+            if os.path.exists ( row [ 0 ] ) : os.remove ( row [ 0 ] )
+        with self.__conn :
+            self.__conn.execute ( "DELETE FROM selections" )
+
+    # =========================================================================
+    ## remove the entries for the given files (or all entries)
+    def clear ( self , files = () ) :
+        """Remove the entries for the given files (or all entries)
+        """
+        with self.__conn :
+            if not files :
+                self.__conn.execute ( "DELETE FROM files" )
+            else :
+                paths = [ ( os.path.normpath ( os.path.abspath ( f ) ) , ) for f in files ]
+                self.__conn.executemany ( "DELETE FROM files WHERE path = ?" , paths )
+
+    ## close the catalog
+    def close ( self ) :
+        """Close the catalog"""
+        if self.__conn is not None :
+            self.__conn.close ()
+            self.__conn = None
+
+    ## context manager: ENTER
+    def __enter__ ( self      ) : return self
+    ## context manager: EXIT
+    def __exit__  ( self , *_ ) : self.close ()
+
+    ## number of entries in the catalog
+    def __len__   ( self ) :
+        return self.__conn.execute ( "SELECT COUNT(*) FROM files" ).fetchone () [ 0 ]
+
+    ## valid (opened) catalog? Note: the empty catalog is valid! 
+    def __bool__  ( self ) : return self.__conn is not None
+    ## valid (opened) catalog? Note: the empty catalog is valid! 
+    def __nonzero__ ( self ) : return self.__bool__ ()
+
+    def __str__   ( self ) :
+        return "FileCatalog('%s',#entries=%d)" % ( self.__dbname , len ( self ) )
+    __repr__ = __str__
+
+    @property
+    def dbname ( self ) :
+        """``dbname'' : the name of the catalog database"""
+        return self.__dbname
+
+    @property
+    def nthreads ( self ) :
+        """``nthreads'' : number of threads to fill the catalog"""
+        return self.__nthreads
+
+    @property
+    def thread_safe ( self ) :
+        """``thread_safe'' : is ROOT thread safety enabled by the caller?"""
+        return self.__thread_safe
+
+# =============================================================================
+## the default catalog(s): { pid : catalog }
+#  (SQLite connections can't be shared between the processes)
+_catalogs = {}
+# =============================================================================
+## get the default catalog
+#  - the location is defined by <code>$OSTAP_CATALOG</code> environment variable
+#    or <code>Catalog</code> option in <code>[General]</code> section of the configuration file
+#  - the catalog is disabled if the location is not specified or set to <code>none</code>
+#  - the missing entries are scanned by the pool of threads only if requested by
+#    <code>$OSTAP_CATALOG_THREADSAFE</code> environment variable or
+#    <code>CatalogThreadSafe</code> option in <code>[General]</code> section,
+#    otherwise they are scanned sequentially 
+#  @code
+#  catalog = get_catalog ()
+#  if catalog : lens = catalog.entries ( files , 'Bc/MyTree' )
+#  @endcode
+#  @return the catalog or None if disabled
+def get_catalog () :
+    """Get the default catalog
+    - the location is defined by $OSTAP_CATALOG environment variable
+    or `Catalog` option in `[General]` section of the configuration file
+    - the catalog is disabled if the location is not specified or set to `none`
+    - the missing entries are scanned by the pool of threads only if requested by
+    $OSTAP_CATALOG_THREADSAFE environment variable or `CatalogThreadSafe` option
+    in `[General]` section, otherwise they are scanned sequentially 
+    >>> catalog = get_catalog ()
+    >>> if catalog : lens = catalog.entries ( files , 'Bc/MyTree' )
+    - return the catalog or None if disabled
+    """
+    pid = os.getpid ()
+    if pid in _catalogs : return _catalogs [ pid ]
+
+    import ostap.core.config as _CONFIG
+    
+    dbname = os.environ.get ( 'OSTAP_CATALOG' , '' )
+    if not dbname :
+        dbname = _CONFIG.general.get ( 'CATALOG' , fallback = '' )
+
+    disabled    = ( 'none' , 'no' , 'off' , 'false' , '0' , '' )
+    thread_safe = os.environ.get ( 'OSTAP_CATALOG_THREADSAFE' , '' )
+    if thread_safe : thread_safe = not thread_safe.lower () in disabled 
+    else           : thread_safe = _CONFIG.general.getboolean ( 'CatalogThreadSafe' , fallback = False )
+    
+    catalog = None
+    if dbname and not dbname.lower () in disabled :
+        try :
+            if thread_safe :
+                import ROOT
+                ROOT.ROOT.EnableThreadSafety ()
+            catalog = FileCatalog ( os.path.expandvars ( os.path.expanduser ( dbname ) ) ,
+                                    thread_safe = thread_safe )
+        except ( OSError , sqlite3.Error ) as e :
+            logger.warning ( "Cannot open the file catalog '%s': %s" % ( dbname , e ) )
+
+    _catalogs [ pid ] = catalog
+    return catalog
+
+# =============================================================================
+## get the metadata for the tree in the files
+#  - the default catalog is used, if available
+#  @code
+#  infos = tree_infos ( 'Bc/MyTree' , files )
+#  @endcode
+#  @return list of TreeInfo objects (None for the missing trees)
+def tree_infos ( tree , files ) :
+    """Get the metadata for the tree in the files
+    - the default catalog is used, if available
+    >>> infos = tree_infos ( 'Bc/MyTree' , files )
+    - return list of TreeInfo objects (None for the missing trees)
+    """
+    catalog = get_catalog ()
+    if catalog : return catalog.infos ( files , tree )
+    from ostap.logger.utils import rootError
+    with rootError () :
+        return [ _scan ( f , tree ) for f in files ]
+
+# =============================================================================
+if '__main__' == __name__ :
+
+    from ostap.utils.docme import docme
+    docme ( __name__ , logger = logger )
+
+# =============================================================================
+#                                                                       The END
+# =============================================================================
@@ -225,6 +225,10 @@ class Files(object):
         files.sort ()
         nf    = len ( files )
         max_value = nf if 0 >= self.maxfiles else min ( nf , self.maxfiles )
+        
+        ## prefetch the metadata for the files (if needed) 
+        self.prefetch ( files [ : max_value ] )
+        
         from ostap.utils.progress_bar import ProgressBar 
         with ProgressBar ( max_value = max_value , silent = self.silent ) as bar :
             self.progress = bar 
@@ -235,6 +239,16 @@ class Files(object):
                     logger.debug ('Maxfiles limit is reached %s ' % self.maxfiles )
                     break
                 
+    ## prefetch the metadata for the files before their treatment
+    #  - nothing to do for plain files
+    #  @see ostap.trees.catalog.FileCatalog 
+    def prefetch ( self , files ) :
+        """Prefetch the metadata for the files before their treatment
+        - nothing to do for plain files
+        - see ostap.trees.catalog.FileCatalog 
+        """
+        pass
+    
     ## the specific action for each file 
     def treatFile ( self, the_file ) :
         self.__files.append ( the_file )
@@ -580,6 +594,43 @@ class Data(Files):
         self.chain       = ROOT.TChain( state['chain'] )
         for f in  self.files :   self.chain.Add ( f ) 
 
+    ## the names of the trees to be prefetched from the file catalog
+    def tree_names ( self ) :
+        """The names of the trees to be prefetched from the file catalog"""
+        return self.chain.GetName () ,
+    
+    ## prefetch the metadata for the files from the file catalog
+    #  - the missing entries in the catalog are filled in parallel
+    #  @see ostap.trees.catalog.FileCatalog 
+    def prefetch ( self , files ) :
+        """Prefetch the metadata for the files from the file catalog
+        - the missing entries in the catalog are filled in parallel
+        - see ostap.trees.catalog.FileCatalog 
+        """
+        self.__prefetched = {}
+        from ostap.trees.catalog import get_catalog
+        catalog = get_catalog ()
+        if catalog and files : 
+            for tree in self.tree_names () :
+                for f , info in zip ( files , catalog.infos ( files , tree ) ) :
+                    self.__prefetched [ ( f , tree ) ] = info
+                    
+    ## get the metadata for the tree in the file from the file catalog 
+    def tree_info ( self , catalog , the_file , tree ) :
+        """Get the metadata for the tree in the file from the file catalog"""
+        key = the_file , tree 
+        if key in self.__prefetched : return self.__prefetched.pop ( key )
+        return catalog.info ( the_file , tree )
+
+    ## check the metadata for the tree in the file against the already added files 
+    def check_info ( self , catalog , info , tree , files , the_file = '' ) :
+        """Check the metadata for the tree in the file against the already added files"""
+        ref = catalog.info ( files [ 0 ] , tree ) if files else None 
+        if info and ref :
+            self.check_branches ( tree ,
+                                  set ( info.branches ) , set ( info.leaves ) ,
+                                  set ( ref .branches ) , set ( ref .leaves ) , the_file ) 
+        
     ## check the content of the two trees 
     def check_trees ( self , tree1 , tree2 , the_file = '' ) :
 
@@ -591,25 +642,48 @@ class Data(Files):
             branches2 = set ( tree2.branches () )                
             leaves2   = set ( tree2.leaves   () )
 
-            if branches1 != branches2 :
-                missing = list ( branches1 - branches2 )
-                missing . sort ()
-                extra   = list ( branches2 - branches1 )
-                extra   . sort ()                    
-                logger.warning ( "Tree('%s'): missing/extra branches %s/%s in %s" %  ( tree1.GetName() , missing , extra , the_file ) )
-                
-            if ( ( branches1 != leaves1 ) or ( branches2 != leaves2 ) ) and leaves1 != leaves2 :
-                missing = list ( leaves1 - leaves2 )
-                missing . sort ()
-                extra   = list ( leaves2 - leaves1 )
-                extra   . sort ()                    
-                logger.warning ( "Tree('%s'): missing/extra leaves   %s/%s in %s" %  ( tree1.GetName() , missing , extra , the_file ) )
+            self.check_branches ( tree1.GetName() , branches1 , leaves1 , branches2 , leaves2 , the_file ) 
+
+    ## compare the branches and leaves of two trees 
+    def check_branches ( self , name , branches1 , leaves1 , branches2 , leaves2 , the_file = '' ) :
+        """Compare the branches and leaves of two trees"""
+        if branches1 != branches2 :
+            missing = list ( branches1 - branches2 )
+            missing . sort ()
+            extra   = list ( branches2 - branches1 )
+            extra   . sort ()                    
+            logger.warning ( "Tree('%s'): missing/extra branches %s/%s in %s" %  ( name , missing , extra , the_file ) )
+            
+        if ( ( branches1 != leaves1 ) or ( branches2 != leaves2 ) ) and leaves1 != leaves2 :
+            missing = list ( leaves1 - leaves2 )
+            missing . sort ()
+            extra   = list ( leaves2 - leaves1 )
+            extra   . sort ()                    
+            logger.warning ( "Tree('%s'): missing/extra leaves   %s/%s in %s" %  ( name , missing , extra , the_file ) )
 
-                
+            
     ## the specific action for each file 
     def treatFile ( self, the_file ) :
         """Add the file to TChain
         """
+        
+        ## use the file catalog, if available
+        from ostap.trees.catalog import get_catalog
+        catalog = get_catalog ()
+        if catalog :
+            
+            name = self.chain.GetName ()
+            info = self.tree_info ( catalog , the_file , name )
+            if info and 0 < info.entries :
+                self.check_info ( catalog , info , name , self.files , the_file )
+                Files.treatFile ( self , the_file )
+                self.chain.Add  ( the_file , info.entries )
+            else : 
+                self.e_list1.add ( the_file )
+                if not self.silent : 
+                    logger.warning ( "No/empty chain  '%s' in file '%s'" % ( name , the_file ) )
+            return
+        
         ## suppress Warning/Error messages from ROOT 
         from ostap.logger.utils import rootError
         with rootError() :
@@ -855,6 +929,11 @@ class Data2(Data):
             if not self.silent :
                 logger.info ('Loaded: %s' % self )
 
+    ## the names of the trees to be prefetched from the file catalog
+    def tree_names ( self ) :
+        """The names of the trees to be prefetched from the file catalog"""
+        return self.chain.GetName () , self.chain2.GetName () 
+
     @property 
     def files2    ( self ) :
         """``files2'' : the list of files"""
@@ -898,37 +977,58 @@ class Data2(Data):
     def treatFile ( self, the_file ) :
         """Add the file to TChain
         """
+
+        ## use the file catalog, if available
+        from ostap.trees.catalog import get_catalog
+        catalog = get_catalog ()
         
         ## suppress Warning/Error messages from ROOT 
         from ostap.logger.utils import rootError
         with rootError() :
-            
-            tmp1 = ROOT.TChain ( self.chain .GetName() )
-            tmp1.Add ( the_file )            
-            tmp2 = ROOT.TChain ( self.chain2.GetName() )
-            tmp2.Add ( the_file )
 
-            if tmp1 : self.check_trees ( tmp1 , self.chain  , the_file )
-            if tmp2 : self.check_trees ( tmp2 , self.chain2 , the_file )
+            if catalog :
+                
+                name1 = self.chain .GetName ()
+                name2 = self.chain2.GetName ()
+                info1 = self.tree_info ( catalog , the_file , name1 )
+                info2 = self.tree_info ( catalog , the_file , name2 )
+                n1    = info1.entries if info1 else 0
+                n2    = info2.entries if info2 else 0
+                tmp1  = 0 < n1
+                tmp2  = 0 < n2
+                if tmp1 : self.check_info ( catalog , info1 , name1 , self.files  , the_file )
+                if tmp2 : self.check_info ( catalog , info2 , name2 , self.files2 , the_file )
+
+            else :
+                
+                tmp1 = ROOT.TChain ( self.chain .GetName() )
+                tmp1.Add ( the_file )            
+                tmp2 = ROOT.TChain ( self.chain2.GetName() )
+                tmp2.Add ( the_file )
+                n1   = ROOT.TTree.kMaxEntries
+                n2   = ROOT.TTree.kMaxEntries 
+
+                if tmp1 : self.check_trees ( tmp1 , self.chain  , the_file )
+                if tmp2 : self.check_trees ( tmp2 , self.chain2 , the_file )
   
             if  tmp1 and tmp2      : 
                 Files.treatFile ( self     , the_file ) 
-                self.chain .Add      ( the_file )
-                self.chain2.Add      ( the_file )
+                self.chain .Add      ( the_file , n1 )
+                self.chain2.Add      ( the_file , n2 )
                 self.__files2.append ( the_file ) 
             elif tmp2 and not tmp1 and self.missing1st :
                 self.e_list1.add ( the_file  )
                 if not self.silent : 
                     logger.warning ( "No/empty chain1 '%s'      in file '%s'" % ( self.chain .GetName() ,
                                                                                   the_file )            )
-                self.chain2.Add ( the_file )
+                self.chain2.Add ( the_file , n2 )
                 self.__files2.append ( the_file ) 
             elif tmp1 and not tmp2 and self.missing2nd :  
                 self.e_list2.add ( the_file )
                 if not self.silent : 
                     logger.warning ( "No/empty chain2 '%s'      in file '%s'" % ( self.chain2.GetName() ,
                                                                                   the_file )            ) 
-                self.chain .Add ( the_file )            
+                self.chain .Add ( the_file , n1 )            
                 self.set_files  ( self.files + ( the_file , ) )  
             else :
                 self.e_list1.add ( the_file )
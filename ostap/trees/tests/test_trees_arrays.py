@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# @file ostap/trees/tests/test_trees_arrays.py
+# Test for the chunked columnar numpy reader for TTree/TChain
+# @see Ostap::Trees::Arrays
+# Copyright (c) Ostap developers.
+# =============================================================================
+""" Test module for the chunked columnar numpy reader for TTree/TChain
+- see Ostap::Trees::Arrays
+"""
+# =============================================================================
+from   __future__               import print_function
+import ROOT, random
+import ostap.trees.trees
+from   ostap.trees.trees        import Chain
+from   ostap.core.core          import ROOTCWD
+from   ostap.utils.cleanup      import CleanUp
+from   ostap.utils.timing       import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'test_trees_arrays' )
+else                       : logger = getLogger ( __name__           )
+# =============================================================================
+try :
+    import numpy
+except ImportError :
+    numpy = None
+# =============================================================================
+## create a file with tree
+def create_tree ( fname , nentries = 10000 ) :
+    """Create a file with a tree
+    >>> create_tree ( 'file.root' ,  1000 )
+    """
+
+    import ostap.io.root_file
+    from array import array
+
+    var1 = array ( 'd', [ 0 ] )
+    var2 = array ( 'd', [ 0 ] )
+
+    with ROOTCWD() , ROOT.TFile.Open( fname , 'new' ) as root_file:
+        root_file.cd ()
+        tree = ROOT.TTree ( 'S','tree' )
+        tree.SetDirectory ( root_file  )
+        tree.Branch ( 'mass'  , var1 , 'mass/D'  )
+        tree.Branch ( 'pt'    , var2 , 'pt/D'    )
+
+        for i in range ( nentries ) :
+            var1[0] = random.gauss   ( 3.1 , 0.015 )
+            var2[0] = random.uniform ( 0   , 10    )
+            tree.Fill()
+
+        root_file.Write()
+
+# =============================================================================
+def test_arrays () :
+    """Test for the chunked columnar numpy reader
+    """
+    if not numpy :
+        logger.warning ( 'numpy is not available, skip the test' )
+        return
+
+    files = [ CleanUp.tempfile ( prefix = 'ostap-test-trees-arrays-%d-' % i ,
+                                 suffix = '.root' ) for i in range ( 3 ) ]
+    for f in files : create_tree ( f )
+
+    chain = ROOT.TChain ( 'S' )
+    for f in files : chain.Add ( f )
+
+    cuts  = 'pt>5'
+    with timing ( 'Columnar reader' , logger = logger ) :
+        chunks = list ( chain.arrays ( [ 'mass' , 'pt' , 'mass*pt' ] , cuts , chunk_size = 7000 ) )
+
+    npt   = sum ( len ( c [ 'pt' ] ) for c in chunks )
+    assert npt == chain.statVar ( 'pt' , cuts ).nEntries () , 'Invalid number of rows!'
+    assert all ( numpy.all ( c [ 'pt' ] > 5 ) for c in chunks ) , 'Invalid selection!'
+    assert all ( numpy.allclose ( c [ 'mass' ] * c [ 'pt' ] , c [ 'mass*pt' ] ) for c in chunks ) , \
+           'Invalid columns!'
+
+    ## Chain slice, e.g. inside the parallel task
+    ch    = Chain ( chain , first = 5000 , nevents = 10000 )
+    nrows = sum ( len ( c [ 'm' ] ) for c in ch.arrays ( { 'm' : 'mass' } ) )
+    assert nrows == 10000 , 'Invalid number of rows for the Chain slice!'
+
+# =============================================================================
+if '__main__' ==  __name__  :
+
+    test_arrays ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
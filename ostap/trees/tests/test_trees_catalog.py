@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# @file ostap/trees/tests/test_trees_catalog.py
+# Test for the persistent file-metadata catalog
+# @see ostap.trees.catalog
+# Copyright (c) Ostap developers.
+# =============================================================================
+""" Test module for ostap/trees/catalog.py
+- persistent file-metadata catalog
+"""
+# =============================================================================
+from   __future__               import print_function
+import ROOT, random, os
+import ostap.trees.trees
+from   ostap.trees.trees        import Chain
+from   ostap.trees.data         import Data
+from   ostap.trees.catalog      import FileCatalog
+from   ostap.utils.cleanup      import CleanUp
+from   ostap.utils.timing       import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'test_trees_catalog' )
+else                       : logger = getLogger ( __name__             )
+# =============================================================================
+## create a file with tree
+def create_tree ( fname , nentries = 1000 ) :
+    """Create a file with a tree
+    >>> create_tree ( 'file.root' ,  1000 )
+    """
+
+    import ostap.io.root_file
+
+    from array import array
+    var1 = array ( 'd', [ 0 ] )
+    var2 = array ( 'd', [ 0 ] )
+
+    from ostap.core.core import ROOTCWD
+
+    with ROOTCWD() , ROOT.TFile.Open( fname , 'new' ) as root_file:
+        root_file.cd ()
+        tree = ROOT.TTree ( 'S','tree' )
+        tree.SetDirectory ( root_file  )
+        tree.Branch ( 'mass'  , var1 , 'mass/D'  )
+        tree.Branch ( 'pt'    , var2 , 'pt/D'    )
+
+        for i in range ( nentries ) :
+            var1[0] = random.gauss   ( 3.1 , 0.015 )
+            var2[0] = random.uniform ( 0   , 10    )
+            tree.Fill()
+
+        root_file.Write()
+
+# =============================================================================
+def test_catalog () :
+    """Test for the persistent file-metadata catalog
+    """
+
+    lens  = [ random.randint ( 100 , 1000 ) for i in range ( 20 ) ]
+    files = [ CleanUp.tempfile ( prefix = 'ostap-test-trees-catalog-%d-' % i ,
+                                 suffix = '.root' ) for i in range ( len ( lens ) ) ]
+    for f , n in zip ( files , lens ) : create_tree ( f , n )
+
+    dbname = CleanUp.tempfile ( prefix = 'ostap-test-trees-catalog-' , suffix = '.db' )
+    
+    ## thread safety is the responsibility of the caller 
+    ROOT.ROOT.EnableThreadSafety ()
+    with FileCatalog ( dbname , nthreads = 4 , thread_safe = True ) as catalog :
+
+        with timing ( 'Fill the catalog' , logger = logger ) :
+            entries = catalog.entries ( files , 'S' )
+        assert entries == tuple ( lens ) , 'Invalid numbers of entries!'
+
+        with timing ( 'Use  the catalog' , logger = logger ) :
+            entries = catalog.entries ( files , 'S' )
+        assert entries == tuple ( lens ) , 'Invalid numbers of entries!'
+
+        info = catalog.info ( files [ 0 ] , 'S' )
+        assert set ( info.branches ) == set ( [ 'mass' , 'pt' ] ) , 'Invalid branches!'
+        assert 0 < info.zipbytes <= info.totbytes                 , 'Invalid sizes!'
+
+        assert catalog.info ( files [ 0 ] , 'Missing' ) is None   , 'Invalid missing tree!'
+
+        logger.info ( 'Catalog: %s' % catalog )
+
+    ## Chain and Data use the default catalog (if specified):
+    #  the fresh (empty) default catalog must be filled 
+    import ostap.trees.catalog as CATALOG
+    dbname2 = CleanUp.tempfile ( prefix = 'ostap-test-trees-catalog-' , suffix = '.db' )
+    os.environ [ 'OSTAP_CATALOG'            ] = dbname2
+    os.environ [ 'OSTAP_CATALOG_THREADSAFE' ] = '1'
+    CATALOG._catalogs.clear () 
+    catalog = CATALOG.get_catalog ()
+    assert catalog and 0 == len ( catalog ) , 'Invalid default catalog!'
+    assert catalog.thread_safe              , 'Thread-safety flag is not propagated!'
+    
+    data  = Data  ( 'S' , files )
+    chain = Chain ( data.chain )
+    assert len ( chain      ) == sum ( lens ) , 'Invalid length of Chain!'
+    assert len ( data.chain ) == sum ( lens ) , 'Invalid length of Data!'
+    assert len ( catalog    ) == len ( files ) , 'The default catalog is not filled!'
+    logger.info ( 'Default catalog: %s' % catalog )
+
+# =============================================================================
+if '__main__' ==  __name__  :
+
+    test_catalog ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
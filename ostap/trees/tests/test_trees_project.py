@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# =============================================================================
+# @file ostap/trees/tests/test_trees_project.py
+# Test for the single-pass projection of trees into many histograms
+# @see Ostap::HistoProject::projectMany
+# Copyright (c) Ostap developers.
+# =============================================================================
+""" Test module for the single-pass projection of trees into many histograms
+- see Ostap::HistoProject::projectMany
+"""
+# =============================================================================
+from   __future__               import print_function
+import ROOT, random
+import ostap.trees.trees
+import ostap.histos.histos
+from   ostap.core.core          import hID, ROOTCWD
+from   ostap.utils.cleanup      import CleanUp
+from   ostap.utils.timing       import timing
+# =============================================================================
+# logging
+# =============================================================================
+from ostap.logger.logger import getLogger
+if '__main__' ==  __name__ : logger = getLogger ( 'test_trees_project' )
+else                       : logger = getLogger ( __name__             )
+# =============================================================================
+fname = CleanUp.tempfile ( prefix = 'ostap-test-trees-project-' , suffix = '.root' )
+# =============================================================================
+## create a file with tree
+def create_tree ( fname , nentries = 10000 , nvars = 10 ) :
+    """Create a file with a tree
+    >>> create_tree ( 'file.root' ,  1000 )
+    """
+
+    import ostap.io.root_file
+    from array import array
+
+    variables = [ array ( 'd', [ 0 ] ) for i in range ( nvars ) ]
+
+    with ROOTCWD() , ROOT.TFile.Open( fname , 'new' ) as root_file:
+        root_file.cd ()
+        tree = ROOT.TTree ( 'S','tree' )
+        tree.SetDirectory ( root_file  )
+        for i , v in enumerate ( variables ) :
+            tree.Branch ( 'm%d' % i , v , 'm%d/D' % i )
+
+        for i in range ( nentries ) :
+            for v in variables : v[0] = random.gauss ( 3.1 , 0.015 )
+            tree.Fill()
+
+        root_file.Write()
+
+# =============================================================================
+def test_project_many () :
+    """Test for the single-pass projection of trees into many histograms
+    """
+
+    create_tree ( fname )
+
+    with ROOT.TFile.Open ( fname , 'READ' ) as root_file :
+
+        tree  = root_file.S
+        exprs = [ 'm%d' % i for i in range ( 10 ) ]
+        cuts  = 'm0>3.09'
+
+        ## regular ROOT projections, one loop per expression
+        hs1   = [ ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 ) for e in exprs ]
+        with timing ( 'Individual projections' , logger = logger ) :
+            n1 = sum ( tree.Project ( h.GetName() , e , cuts ) for h , e in zip ( hs1 , exprs ) ) 
+
+        ## single-pass projection
+        hs2   = [ ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 ) for e in exprs ]
+        with timing ( 'Single-pass projection' , logger = logger ) :
+            n2 , _ = tree.project_many ( [ ( h , e ) for h , e in zip ( hs2 , exprs ) ] , cuts )
+
+        assert n1 == n2 , 'Invalid number of selected rows!'
+
+        for h1 , h2 in zip ( hs1 , hs2 ) :
+            assert h1.GetEntries () == h2.GetEntries () , 'Invalid number of entries!'
+            assert h1.Integral   () == h2.Integral   () , 'Invalid integral!'
+
+        ## the sum of projections
+        hsum  = ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 )
+        with timing ( 'Single-pass sum of projections' , logger = logger ) :
+            n3 , _ = tree.project ( hsum , ','.join ( exprs ) , cuts )
+
+        assert n1 == n3 , 'Invalid number of selected rows!'
+
+        assert abs ( hsum.Integral() - sum ( h.Integral() for h in hs1 ) ) < 1.e-6 , \
+               'Invalid sum of projections!'
+
+        ## 2D histogram
+        h2d1  = ROOT.TH2D ( hID() , '' , 20 , 3.0 , 3.2 , 20 , 3.0 , 3.2 )
+        h2d2  = ROOT.TH2D ( hID() , '' , 20 , 3.0 , 3.2 , 20 , 3.0 , 3.2 )
+        tree.Project      ( h2d1.GetName() , 'm1:m0' , cuts )
+        tree.project_many ( { h2d2 : 'm1:m0' } , cuts )
+        assert h2d1.Integral () == h2d2.Integral () , 'Invalid 2D projection!'
+
+# =============================================================================
+def test_booking () :
+    """Test for the batch booking of projections and statistics
+    """
+
+    import ostap.trees.booking
+
+    with ROOT.TFile.Open ( fname , 'READ' ) as root_file :
+
+        tree  = root_file.S
+        cuts  = 'm0>3.09'
+
+        h1    = ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 )
+        h2    = ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 )
+
+        book  = tree.booking ( cuts )
+        r1    = book.project ( h1   , 'm1'        )
+        s1    = book.statVar ( 'm1'               )
+        c12   = book.statCov ( 'm1' , 'm2'        )
+        ne    = book.nEff    (                    )
+        assert not r1.done () , 'Booking is executed too early!'
+
+        with timing ( 'Single loop for all booked requests' , logger = logger ) :
+            book.run ()
+
+        tree.Project ( h2.GetName() , 'm1' , cuts )
+        assert r1.result ().Integral () == h2.Integral () , 'Invalid booked projection!'
+
+        stat = tree.statVar ( 'm1' , cuts )
+        assert stat.nEntries () == s1.result ().nEntries () , 'Invalid booked statistic!'
+        assert abs ( stat.mean () - s1.result ().mean () ) < 1.e-8 , 'Invalid booked statistic!'
+
+        _ , _ , cov2 , _  = tree.statCov ( 'm1' , 'm2' , cuts )
+        _ , _ , bcov2 , _ = c12.result ()
+        assert abs ( cov2 ( 0 , 1 ) - bcov2 ( 0 , 1 ) ) < 1.e-8 , 'Invalid booked covariance!'
+
+        ## the covariance is insensitive to the large common offset 
+        book2 = tree.booking ( cuts )
+        c12s  = book2.statCov ( 'm1+1.e8' , 'm2+1.e8' )
+        _ , _ , scov2 , _ = c12s.result ()
+        for i , j in ( ( 0 , 0 ) , ( 0 , 1 ) , ( 1 , 1 ) ) :
+            assert abs ( scov2 ( i , j ) - bcov2 ( i , j ) ) < 1.e-8 , 'Unstable booked covariance!'
+
+        assert abs ( tree.nEff ( cuts ) - ne.result () ) < 1.e-6 , 'Invalid booked nEff!'
+
+        logger.info ( 'Booking: %s' % book )
+
+# =============================================================================
+def test_formula_cache () :
+    """Test for the formula compilation cache
+    """
+
+    from ostap.trees.trees import formula_cache_stat, formula_cache_clear
+
+    with ROOT.TFile.Open ( fname , 'READ' ) as root_file :
+
+        tree  = root_file.S
+        formula_cache_clear ()
+
+        s1    = tree.statVar ( 'm1' , 'm0>3.09' )
+        st1   = formula_cache_stat ()
+        s2    = tree.statVar ( 'm1' , 'm0>3.09' )
+        st2   = formula_cache_stat ()
+
+        assert s1.nEntries () == s2.nEntries ()   , 'Invalid cached statistic!'
+        if st1 [ 'enabled' ] :
+            assert st1 [ 'hits' ] < st2 [ 'hits' ]     , 'Formula cache is not used!'
+            assert st1 [ 'misses' ] == st2 [ 'misses' ] , 'Formula is recompiled!'
+
+        logger.info ( 'Formula cache: %s' % st2 )
+
+# =============================================================================
+def test_auto_branches () :
+    """Test for the automatic pruning of active branches
+    """
+
+    from ostap.trees.trees import AutoBranches, set_auto_branches
+
+    wname = CleanUp.tempfile ( prefix = 'ostap-test-trees-wide-' , suffix = '.root' )
+    create_tree ( wname , nentries = 10000 , nvars = 100 )
+
+    with ROOT.TFile.Open ( wname , 'READ' ) as root_file :
+
+        tree  = root_file.S
+
+        ## automatic pruning is disabled by default: explicitly enable it 
+        old = set_auto_branches ( True )
+        
+        with AutoBranches ( tree , 'm1' , 'm0>3.09' ) :
+            assert     tree.GetBranchStatus ( 'm1'  ) , 'Branch m1 must be active!'
+            assert not tree.GetBranchStatus ( 'm50' ) , 'Branch m50 must be inactive!'
+        assert tree.GetBranchStatus ( 'm50' ) , 'Branch status is not restored!'
+
+        with timing ( 'statVar with    pruning' , logger = logger ) :
+            s1 = tree.statVar ( 'm1' , 'm0>3.09' )
+
+        set_auto_branches ( False )
+        with timing ( 'statVar without pruning' , logger = logger ) :
+            s2 = tree.statVar ( 'm1' , 'm0>3.09' )
+        set_auto_branches ( old )
+
+        assert s1.nEntries () == s2.nEntries ()       , 'Invalid statistic with pruning!'
+        assert abs ( s1.mean () - s2.mean () ) < 1.e-8 , 'Invalid statistic with pruning!'
+
+# =============================================================================
+def test_cached_selection () :
+    """Test for the cached lists of the selected entries
+    """
+
+    from ostap.trees.trees import set_selection_cache, selection_cache_clear
+
+    with ROOT.TFile.Open ( fname , 'READ' ) as root_file :
+
+        tree  = root_file.S
+        cuts  = 'm0>3.11&&m1<3.1'
+
+        s0    = tree.statVar ( 'm2' , cuts )
+
+        old   = set_selection_cache ( True )
+        with timing ( 'statVar with    selection cache (1)' , logger = logger ) :
+            s1 = tree.statVar ( 'm2' , cuts )
+        with timing ( 'statVar with    selection cache (2)' , logger = logger ) :
+            s2 = tree.statVar ( 'm2' , cuts )
+
+        h1    = ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 )
+        h2    = ROOT.TH1D ( hID() , '' , 100 , 3.0 , 3.2 )
+        tree.project ( h1 , 'm3' , cuts )
+        set_selection_cache ( old )
+        
+        tree.project ( h2 , 'm3' , cuts )
+        selection_cache_clear ()
+
+        assert not tree.GetEntryList ()                 , 'Entry list is not reset!'
+        assert s0.nEntries () == s1.nEntries () == s2.nEntries () , 'Invalid cached selection!'
+        assert abs ( s0.mean () - s2.mean () ) < 1.e-8  , 'Invalid cached selection!'
+        assert h1.Integral () == h2.Integral ()         , 'Invalid cached selection!'
+
+# =============================================================================
+if '__main__' ==  __name__  :
+
+    test_project_many ()
+    test_booking      ()
+    test_formula_cache ()
+    test_auto_branches ()
+    test_cached_selection ()
+
+# =============================================================================
+##                                                                      The END
+# =============================================================================
@@ -17,9 +17,18 @@ __all__     = (
     'Tree'            , ## helper class , needed for multiprocessing
     'ActiveBranches'  , ## context manager to activate certain branches 
     'active_branches' , ## context manager to activate certain branches 
+    'AutoBranches'      , ## context manager to activate only needed branches 
+    'auto_branches'     , ## is automatic pruning of active branches enabled?
+    'set_auto_branches' , ## enable/disable automatic pruning of active branches
+    'CachedSelection'     , ## context manager to loop only over the selected entries 
+    'selection_cache'     , ## is automatic caching of the selected entries enabled?
+    'set_selection_cache' , ## enable/disable automatic caching of the selected entries
+    'selection_cache_clear' , ## clear the cache of the selected entries 
+    'formula_cache_stat'  , ## statistics of the formula compilation cache 
+    'formula_cache_clear' , ## clear the formula compilation cache 
   ) 
 # =============================================================================
-import ROOT, os, math
+import ROOT, os, math, re
 from   ostap.core.core        import std , Ostap, VE, hID, ROOTCWD
 from   ostap.core.ostap_types import integer_types , long_type, string_types 
 import ostap.trees.param
@@ -226,6 +235,87 @@ def _tc_call_ ( self , first = 0 , last = -1  , cuts = None , progress = False )
 ROOT.TTree .__call__  = _tc_call_ 
 ROOT.TChain.__call__  = _tc_call_
 
+# =============================================================================
+## separator of axes in the projection expressions, e.g. 'y:x', but not 'Ostap::x'
+_axes_sep = re.compile ( r'(?<!:):(?!:)' ) 
+# =============================================================================
+## split the projection expression into the list of axes (x,y,z)
+#  @code
+#  _tt_axes_ ( 'y:x' ) ## ( 'x' , 'y' )
+#  @endcode 
+def _tt_axes_ ( expression ) :
+    """Split the projection expression into the list of axes (x,y,z)
+    >>> _tt_axes_ ( 'y:x' ) ## ( 'x' , 'y' )
+    """
+    return tuple ( reversed ( [ a.strip() for a in _axes_sep.split ( expression ) ] ) ) 
+
+# =============================================================================
+## split the expression(s) into the list of individual expressions
+#  @code
+#  _tt_exprs_ ( 'm1,m2'         ) ## [ 'm1' , 'm2' ]
+#  _tt_exprs_ ( 'm1;m2'         ) ## [ 'm1' , 'm2' ]
+#  _tt_exprs_ ( ( 'm1' , 'm2' ) ) ## [ 'm1' , 'm2' ]
+#  @endcode 
+def _tt_exprs_ ( what ) :
+    """Split the expression(s) into the list of individual expressions
+    >>> _tt_exprs_ ( 'm1,m2'         ) ## [ 'm1' , 'm2' ]
+    >>> _tt_exprs_ ( 'm1;m2'         ) ## [ 'm1' , 'm2' ]
+    >>> _tt_exprs_ ( ( 'm1' , 'm2' ) ) ## [ 'm1' , 'm2' ]
+    """
+    if isinstance ( what , ROOT.TCut ) : what = str ( what )
+    if isinstance ( what , string_types ) :
+        if   ';' in what : what = what.split ( ';' )
+        elif ',' in what and not ( '(' in what and ')' in what ) : what = what.split ( ',' )
+        else             : what = [ what ]
+    return [ str ( w ).strip() for w in what if str ( w ).strip() ]
+
+# =============================================================================
+## single-pass projection of the tree into many histograms
+#  - all expressions and cuts are compiled only once
+#  - all histograms are filled in one event loop
+#  @code
+#  tree = ...
+#  r    = _tt_project_one_pass_ ( tree , [ ( h1 , 'm1' ) , ( h1 , 'm2' ) , ( h2 , 'y:x' ) ] , 'pt>1' )
+#  @endcode 
+#  @return number of selected rows summed over all projections
+#          (as for the sequence of TTree::Project calls), or -1 if the single-pass
+#          projection is not applicable 
+#  @see Ostap::HistoProject::projectMany 
+def _tt_project_one_pass_ ( tree , pairs , cuts = '' , nentries = -1 , firstentry = 0 ) :
+    """Single-pass projection of the tree into many histograms
+    - all expressions and cuts are compiled only once
+    - all histograms are filled in one event loop
+    >>> tree = ...
+    >>> r    = _tt_project_one_pass_ ( tree , [ ( h1 , 'm1' ) , ( h1 , 'm2' ) , ( h2 , 'y:x' ) ] , 'pt>1' )
+    - return number of selected rows summed over all projections
+    (as for the sequence of TTree::Project calls), or -1 if the single-pass
+    projection is not applicable 
+    """
+    
+    histos = std.vector ( 'TH1*'        ) ()
+    exprs  = std.vector ( 'std::string' ) ()
+    
+    for histo , what in pairs :
+        
+        ## profiles have different semantics
+        if isinstance ( histo , ( ROOT.TProfile , ROOT.TProfile2D ) ) : return -1
+        if not isinstance ( histo , ROOT.TH1 ) : return -1
+        
+        axes = _tt_axes_ ( str ( what ) )
+        if len ( axes ) != histo.GetDimension () : return -1
+        
+        histos.push_back ( histo )
+        for a in axes : exprs.push_back ( a ) 
+
+    if isinstance ( cuts , ROOT.TCut ) : cuts = str ( cuts )
+    cuts = cuts.strip() if cuts else ''
+    
+    first = max ( 0 , firstentry ) 
+    last  = _large if nentries < 0 else min ( _large , first + nentries )
+    
+    with AutoBranches ( tree , exprs , cuts ) , CachedSelection ( tree , cuts , first , last ) :
+        return Ostap.HistoProject.projectMany ( tree , histos , exprs , cuts , first , last )
+
 # =============================================================================
 ## help project method for ROOT-trees and chains 
 #
@@ -248,6 +338,9 @@ ROOT.TChain.__call__  = _tc_call_
 #    >>> tree.project ( h1           , "m1,m2"     , 'chi2<10' )
 #    >>> tree.project ( h1           , "m1;m2"     , 'chi2<10' )
 #  @endcode
+#  For the list of expressions and the existing histogram all the expressions 
+#  are projected in a single loop over the tree
+#  @return number of selected rows (summed over all expressions) and the histogram 
 #
 #  @param tree   the tree
 #  @param histo  the histogram or histogram name 
@@ -288,6 +381,7 @@ def _tt_project_ ( tree               ,
     - histo : the histogram (or histogram name)
     - what  : variable/expression to project. It can be expression or list/tuple of expression or comma (or semicolumn) separated expression
     - cuts  : selection criteria/weights 
+    - return number of selected rows (summed over all expressions) and the histogram 
     """
     #
 
@@ -328,11 +422,18 @@ def _tt_project_ ( tree               ,
     #
     if   isinstance ( what  , str       ) : what =       what 
     elif isinstance ( what  , ROOT.TCut ) : what = str ( what )  
-    elif isinstance ( histo , ROOT.TH1  ) : 
+    elif isinstance ( histo , ROOT.TH1  ) :
+        
+        ## single-pass projection of all expressions 
+        if not options :
+            rr = _tt_project_one_pass_ ( tree , [ ( histo , v ) for v in what ] ,
+                                         cuts , nentries , firstentry )
+            if 0 <= rr : return rr , histo
+            
         rr = 0 
         hh = histo.clone()
         for v in what :
-            r , h  = _tt_project_ ( tree , hh , v , cuts , options , *args )
+            r , h  = _tt_project_ ( tree , hh , v , cuts , *args )
             rr    += r
             histo += h
         hh.Delete()
@@ -358,7 +459,9 @@ def _tt_project_ ( tree               ,
         groot.cd ()
         ## make projection
         ## print 'HERE:   %s/%s' %  ( hname , type ( hname ) ) 
-        result = tree.Project ( hname , what , cuts , *args[:-1] )
+        with AutoBranches    ( tree , _tt_axes_ ( what ) , cuts ) , \
+             CachedSelection ( tree , cuts , firstentry , firstentry + nentries ) : 
+            result = tree.Project ( hname , what , cuts , *args[:-1] )
         if   isinstance ( histo , ROOT.TH1 ) :
             return result, histo
         elif isinstance ( histo , str      ) :
@@ -370,6 +473,55 @@ def _tt_project_ ( tree               ,
 ROOT.TTree .project = _tt_project_
 ROOT.TChain.project = _tt_project_
 
+# =============================================================================
+## project the tree into many histograms in a single loop over the tree
+#  @code
+#  tree = ...
+#  h1 , h2 , h3 = ...
+#  tree.project_many ( { h1 : 'm1' , h2 : 'm1,m2' , h3 : 'y:x' } , 'pt>1' ) 
+#  tree.project_many ( [ ( h1 , 'm1' ) , ( h2 , 'm1,m2' ) , ( h3 , 'y:x' ) ] , 'pt>1' ) ## ditto 
+#  @endcode
+#  - all expressions and cuts are compiled only once
+#  - the list of expressions for the histogram means the sum of projections
+#  @param tree   the tree
+#  @param histos mapping { histo : expression(s) } or list of pairs ( histo , expression(s) ) 
+#  @param cuts   expression for cuts/weights
+#  @return  number of selected rows (summed over all projections) and the histograms
+#  @see Ostap::HistoProject::projectMany 
+def _tt_project_many_ ( tree , histos , cuts = '' , nentries = -1 , firstentry = 0 ) :
+    """Project the tree into many histograms in a single loop over the tree
+    >>> tree = ...
+    >>> h1 , h2 , h3 = ...
+    >>> tree.project_many ( { h1 : 'm1' , h2 : 'm1,m2' , h3 : 'y:x' } , 'pt>1' ) 
+    >>> tree.project_many ( [ ( h1 , 'm1' ) , ( h2 , 'm1,m2' ) , ( h3 , 'y:x' ) ] , 'pt>1' ) ## ditto 
+    - all expressions and cuts are compiled only once
+    - the list of expressions for the histogram means the sum of projections
+    - return number of selected rows (summed over all projections) and the histograms
+    """
+    
+    items = histos.items() if isinstance ( histos , dict ) else histos
+    
+    pairs = []
+    for histo , what in items :
+        assert isinstance ( histo , ROOT.TH1 ) , "project_many: invalid histogram type %s" % type ( histo )
+        pairs += [ ( histo , w ) for w in _tt_exprs_ ( what ) ]
+        
+    if not pairs : return 0 , histos
+    
+    result = _tt_project_one_pass_ ( tree , pairs , cuts , nentries , firstentry )
+    if 0 <= result : return result , histos
+
+    ## fallback: individual projections for each histogram 
+    logger.debug ( 'project_many: single-pass projection is not applicable, use individual projections' )
+    result = 0 
+    for histo , what in items :
+        r , _ = _tt_project_ ( tree , histo , _tt_exprs_ ( what ) , cuts , '' , nentries , firstentry )
+        result += r 
+    return result , histos 
+
+ROOT.TTree .project_many = _tt_project_many_
+ROOT.TChain.project_many = _tt_project_many_
+
 # =============================================================================
 ## check if object is in tree/chain  :
 #  @code
@@ -429,7 +581,8 @@ def _stat_var_ ( tree , expression , *cuts ) :
     
     expression = expression[0] 
 
-    return Ostap.StatVar.statVar ( tree , expression , *cuts )
+    with AutoBranches ( tree , expression , *cuts ) , CachedSelection ( tree , *cuts ) : 
+        return Ostap.StatVar.statVar ( tree , expression , *cuts )
     
 ROOT.TTree     . statVar = _stat_var_
 ROOT.TChain    . statVar = _stat_var_
@@ -467,7 +620,8 @@ def _stat_vars_ ( tree , expressions , *cuts ) :
     vct = strings ( *expressions )
     res = std.vector(WSE)() 
 
-    ll  = Ostap.StatVar.statVars ( tree , res , vct , *cuts )
+    with AutoBranches ( tree , expressions , *cuts ) , CachedSelection ( tree , *cuts ) : 
+        ll  = Ostap.StatVar.statVars ( tree , res , vct , *cuts )
     assert res.size() == vct.size(), 'Invalid size of structures!'
 
     N = res.size()
@@ -513,23 +667,25 @@ def _stat_cov_ ( tree        ,
     stat2  = Ostap.WStatEntity       ()
     cov2   = Ostap.Math.SymMatrix(2) ()
 
-    if cuts : 
-        length = Ostap.StatVar.statCov ( tree        ,
-                                         expression1 ,
-                                         expression2 ,
-                                         cuts        ,
-                                         stat1       ,
-                                         stat2       ,
-                                         cov2        , 
-                                         *args       )
-    else :
-        length = Ostap.StatVar.statCov ( tree        ,
-                                         expression1 ,
-                                         expression2 ,
-                                         stat1       ,
-                                         stat2       ,
-                                         cov2        ,
-                                         *args       )
+    with AutoBranches    ( tree , expression1 , expression2 , cuts ) , \
+         CachedSelection ( tree , cuts , *args ) :
+        if cuts : 
+            length = Ostap.StatVar.statCov ( tree        ,
+                                             expression1 ,
+                                             expression2 ,
+                                             cuts        ,
+                                             stat1       ,
+                                             stat2       ,
+                                             cov2        , 
+                                             *args       )
+        else :
+            length = Ostap.StatVar.statCov ( tree        ,
+                                             expression1 ,
+                                             expression2 ,
+                                             stat1       ,
+                                             stat2       ,
+                                             cov2        ,
+                                             *args       )
         
     return stat1 , stat2 , cov2, length
 
@@ -576,19 +732,20 @@ def _stat_covs_ ( tree        ,
     _DV    =  std.vector('double')
     _cov2  = _DV()
 
-    if cuts : 
-        length = Ostap.StatVar._statCov ( tree   ,
-                                          _vars  ,
-                                          cuts   ,
-                                          _stats ,
-                                          _cov2  ,
-                                          *args  ) 
-    else :
-        length = Ostap.StatVar._statCov ( tree   ,
-                                          _vars  ,
-                                          _stats ,
-                                          _cov2  ,
-                                          *args  )
+    with AutoBranches ( tree , list ( expressions ) , cuts ) , CachedSelection ( tree , cuts , *args ) :
+        if cuts : 
+            length = Ostap.StatVar._statCov ( tree   ,
+                                              _vars  ,
+                                              cuts   ,
+                                              _stats ,
+                                              _cov2  ,
+                                              *args  ) 
+        else :
+            length = Ostap.StatVar._statCov ( tree   ,
+                                              _vars  ,
+                                              _stats ,
+                                              _cov2  ,
+                                              *args  )
         
     l = len(_vars)
     if 0 == length : 
@@ -1417,6 +1574,83 @@ def _not_implemented_ ( self , method , *args , **kwargs ) :
 ROOT.TChain.slice  = lambda s,*x : _not_implemented_( s , 'slice'  , *x ) 
 ROOT.TChain.slices = lambda s,*x : _not_implemented_( s , 'slices' , *x ) 
 
+# =============================================================================
+## read the columns from TTree/TChain in a form of numpy arrays, chunk-by-chunk
+#  @code
+#  tree = ...
+#  for chunk in tree.arrays ( [ 'pt' , 'eta' , 'm' ] , 'pt>1' , chunk_size = 100000 ) :
+#      pt  = chunk [ 'pt'  ] ## numpy array
+#      eta = chunk [ 'eta' ] ## numpy array
+#  for chunk in tree.arrays ( 'pt,eta' , 'pt>1' ) : ...
+#  for chunk in tree.arrays ( { 'pt' : 'sqrt(px*px+py*py)' , 'y' : 'y' } ) : ...
+#  @endcode
+#  - all columns are evaluated in a single loop over the tree
+#  - the values are written directly into the contiguous preallocated buffers
+#  - for array-like expressions only the first element is used
+#  @param tree       the tree
+#  @param columns    list of expressions, comma/semicolumn-separated expressions or mapping { name : expression } 
+#  @param cuts       the selection criteria
+#  @param chunk_size number of entries (before selection) per chunk
+#  @param first      the first entry to process
+#  @param nevents    number of entries to process
+#  @return generator of dictionaries { name : numpy.array }
+#  @see Ostap::Trees::Arrays
+def _tt_arrays_ ( tree , columns , cuts = '' , chunk_size = 100000 , first = 0 , nevents = -1 ) :
+    """Read the columns from TTree/TChain in a form of numpy arrays, chunk-by-chunk
+    >>> tree = ...
+    >>> for chunk in tree.arrays ( [ 'pt' , 'eta' , 'm' ] , 'pt>1' , chunk_size = 100000 ) :
+    ...     pt  = chunk [ 'pt'  ] ## numpy array
+    ...     eta = chunk [ 'eta' ] ## numpy array
+    >>> for chunk in tree.arrays ( 'pt,eta' , 'pt>1' ) : ...
+    >>> for chunk in tree.arrays ( { 'pt' : 'sqrt(px*px+py*py)' , 'y' : 'y' } ) : ...
+    - all columns are evaluated in a single loop over the tree
+    - the values are written directly into the contiguous preallocated buffers
+    - for array-like expressions only the first element is used
+    - chunk_size : number of entries (before selection) per chunk 
+    - see Ostap::Trees::Arrays
+    """
+    import numpy
+    
+    if isinstance ( columns , dict ) :
+        names = [ str ( k )          for k in columns.keys   () ]
+        exprs = [ str ( v ).strip () for v in columns.values () ]
+    else :
+        if isinstance ( columns , string_types ) : columns = re.split ( '[,;]' , columns ) 
+        exprs = [ str ( c ).strip () for c in columns if str ( c ).strip () ]
+        names = exprs
+        
+    assert exprs , 'arrays: no columns are specified!'
+    assert isinstance ( chunk_size , integer_types ) and 0 < chunk_size , \
+           'arrays: invalid chunk_size %s' % chunk_size 
+
+    vexprs = std.vector ( 'std::string' ) ()
+    for e in exprs : vexprs.push_back ( e )
+
+    if isinstance ( cuts , ROOT.TCut ) : cuts = str ( cuts )
+    cuts  = cuts.strip () if cuts else ''
+    
+    first = max ( 0 , first )
+    last  = len ( tree ) if nevents < 0 else min ( len ( tree ) , first + nevents )
+
+    N     = len ( exprs )
+    for start in range ( first , last , chunk_size ) :
+        
+        stop   = min ( start + chunk_size , last )
+        size   = stop - start
+        
+        ## contiguous column-major buffer: one row per column 
+        buffer = numpy.empty ( N * size , dtype = numpy.float64 )
+        
+        with AutoBranches ( tree , exprs , cuts ) : 
+            n = Ostap.Trees.Arrays.fill ( tree , buffer , size , vexprs , cuts , start , stop )
+        assert 0 <= n , 'arrays: invalid expressions/selection!'
+        
+        if 0 < n : yield dict ( ( name , buffer [ i * size : i * size + n ] )
+                                for i , name in enumerate ( names ) ) 
+
+ROOT.TTree .arrays = _tt_arrays_
+ROOT.TChain.arrays = _tt_arrays_
+
 # =============================================================================
 ## extending the existing chain 
 def _tc_iadd_ ( self ,  other ) :
@@ -1744,7 +1978,8 @@ def _rt_nEff_  ( self , cuts = '' , *args ) :
     >>> data = ...
     >>> neff = data.nEff('b1*b1')
     """
-    return Ostap.StatVar.nEff ( self , cuts , *args )
+    with AutoBranches ( self , cuts ) , CachedSelection ( self , cuts , *args ) : 
+        return Ostap.StatVar.nEff ( self , cuts , *args )
 
 ROOT.TTree.nEff = _rt_nEff_ 
 # =============================================================================
@@ -1904,6 +2139,408 @@ def active_branches ( tree , *vars ) :
     """
     return ActiveBranches ( tree , *vars ) 
     
+# =============================================================================
+## Use the automatic pruning of active branches for the tree loops?
+#  It is disabled by default and can be enabled via <code>AutoBranches</code>
+#  option in <code>[General]</code> section of the configuration file
+#  or via set_auto_branches 
+#  @see AutoBranches 
+def _auto_branches_config_ () :
+    try :
+        import ostap.core.config as _CONFIG
+        return _CONFIG.general.getboolean ( 'AutoBranches' , fallback = False )
+    except :
+        return False
+    
+__auto_branches__     = _auto_branches_config_ () 
+## the minimal number of branches in the tree to apply the automatic pruning
+__auto_branches_min__ = 20
+## already reported configurations 
+__auto_branches_log__ = set()
+# =============================================================================
+## Is the automatic pruning of active branches enabled?
+#  @see AutoBranches 
+def auto_branches () :
+    """Is the automatic pruning of active branches enabled?
+    - see AutoBranches 
+    """
+    return bool ( __auto_branches__ )
+# =============================================================================
+## Enable/disable the automatic pruning of active branches
+#  @code
+#  set_auto_branches ( True ) 
+#  @endcode 
+#  @return the previous state 
+#  @see AutoBranches 
+def set_auto_branches ( use ) :
+    """Enable/disable the automatic pruning of active branches
+    >>> set_auto_branches ( True ) 
+    - return the previous state
+    - see AutoBranches 
+    """
+    global __auto_branches__
+    old = bool ( __auto_branches__ )
+    __auto_branches__ = bool ( use )
+    return old
+
+# ===============================================================================
+## @class AutoBranches
+#  Context manager to activate only branches, needed for the given
+#  expressions and cuts. The set of branches is deduced with the_variables.
+#  The status of all branches is restored at exit.
+#  @code
+#  tree = ...
+#  with AutoBranches ( tree , [ 'pt' , 'eta' ] , 'mass>10' ) :
+#      tree.Project ( 'h1' , 'pt' , 'mass>10' ) 
+#  @endcode
+#  Nothing is done if
+#  - the automatic pruning is disabled (default), see set_auto_branches
+#  - the tree has less than 20 branches or it has friends
+#  - the expressions are invalid or need all branches 
+#  @see ActiveBranches
+#  @see the_variables 
+class AutoBranches(object) :
+    """Context manager to activate only branches, needed for the given
+    expressions and cuts. The set of branches is deduced with the_variables.
+    The status of all branches is restored at exit.
+    >>> tree = ...
+    >>> with AutoBranches ( tree , [ 'pt' , 'eta' ] , 'mass>10' ) :
+    ...     tree.Project ( 'h1' , 'pt' , 'mass>10' ) 
+    Nothing is done if
+    - the automatic pruning is disabled (default), see set_auto_branches
+    - the tree has less than 20 branches or it has friends
+    - the expressions are invalid or need all branches 
+    - see ActiveBranches
+    - see the_variables 
+    """
+    def __init__ ( self , tree , *expressions ) :
+        
+        exprs = []
+        for e in expressions :
+            if   isinstance ( e , string_types + ( ROOT.TCut , ) ) : exprs.append ( str ( e ) )
+            elif isinstance ( e , integer_types ) : pass  ## e.g. first/last entries 
+            elif hasattr    ( e , '__iter__'    ) : exprs += [ str ( i ) for i in e ] 
+                
+        self.__tree   = tree 
+        self.__exprs  = [ e.strip() for e in exprs if e.strip() ]
+        self.__status = ()
+        
+    ## context manager: ENTER 
+    def __enter__ ( self ) :
+
+        self.__status = () 
+        if not auto_branches () or not self.__exprs or not valid_pointer ( self.__tree ) :
+            return self.__tree
+        
+        tree   = self.__tree
+        friends = tree.GetListOfFriends () 
+        if friends and 0 < len ( friends ) : return tree 
+
+        branches = tree.GetListOfBranches ()
+        if not branches or len ( branches ) < __auto_branches_min__ : return tree
+        
+        from ostap.logger.utils  import rootError
+        from ostap.logger.logger import logFatal 
+        try : 
+            with rootError () , logFatal () :
+                used = tree.the_variables ( self.__exprs )
+        except :
+            used = None 
+        if not used : return tree
+
+        ## the top-level branches for the used leaves 
+        top = set()
+        for v in used :
+            leaf = tree.GetLeaf ( v )
+            if not leaf : return tree
+            b = leaf.GetBranch ()
+            m = b.GetMother    () if b else None 
+            top.add ( m.GetName () if m else b.GetName () ) 
+        if len ( branches ) <= len ( top ) : return tree
+
+        names = [ b.GetName() for b in branches ]
+        self.__status = tuple ( ( n , tree.GetBranchStatus ( n ) ) for n in names ) 
+
+        tree.SetBranchStatus ( '*' , 0 )        ## deactivate *ALL* branches 
+        for v in used : tree.SetBranchStatus ( v , 1 )  ## activate only needed branches
+        
+        self.__report ( branches , top ) 
+        return tree 
+
+    ## context manager: EXIT 
+    def __exit__ ( self , *_ ) :
+        if not self.__status : return
+        tree = self.__tree
+        if all ( s for n , s in self.__status ) :
+            tree.SetBranchStatus ( '*' , 1 )    ## reactivate *ALL* branches 
+        else :
+            tree.SetBranchStatus ( '*' , 0 )
+            for n , s in self.__status :
+                if s : tree.SetBranchStatus ( n , 1 )
+        self.__status = () 
+
+    ## report the fraction of saved bytes
+    #  - only the current tree (file) is inspected: no other files are opened 
+    def __report ( self , branches , top ) :
+        
+        tree   = self.__tree
+        total  = 0
+        used   = 0 
+        for b in branches :
+            zb     = b.GetZipBytes ( '*' )
+            total += zb
+            if b.GetName() in top : used += zb
+
+        key = tree.GetName () , tuple ( sorted ( top ) )
+        msg = 'AutoBranches: %d/%d branches are active, %.1f%% of compressed bytes are not read' % (
+            len ( top ) , len ( branches ) , 100.0 * ( total - used ) / max ( total , 1 ) )
+        if key in __auto_branches_log__ : logger.debug ( msg )
+        else :
+            __auto_branches_log__.add ( key )
+            logger.info ( msg )
+            
+
+# =============================================================================
+## Use the cached lists of selected entries for the tree loops?
+#  It can be changed via <code>SelectionCache</code> option in
+#  <code>[General]</code> section of the configuration file
+#  @see CachedSelection 
+def _selection_cache_config_ () :
+    try :
+        import ostap.core.config as _CONFIG
+        return _CONFIG.general.getboolean ( 'SelectionCache' , fallback = False )
+    except :
+        return False
+    
+__selection_cache__  = _selection_cache_config_ ()
+## in-memory cache of the selected entries { ( tree , files , cuts ) : TEntryList } 
+__selection_lists__  = {}
+# =============================================================================
+## Is the automatic caching of the selected entries enabled?
+#  @see CachedSelection 
+def selection_cache () :
+    """Is the automatic caching of the selected entries enabled?
+    - see CachedSelection 
+    """
+    return bool ( __selection_cache__ )
+# =============================================================================
+## Enable/disable the automatic caching of the selected entries
+#  @code
+#  set_selection_cache ( True ) 
+#  @endcode 
+#  @return the previous state 
+#  @see CachedSelection 
+def set_selection_cache ( use ) :
+    """Enable/disable the automatic caching of the selected entries
+    >>> set_selection_cache ( True ) 
+    - return the previous state
+    - see CachedSelection 
+    """
+    global __selection_cache__
+    old = bool ( __selection_cache__ )
+    __selection_cache__ = bool ( use )
+    return old
+# =============================================================================
+## Clear the in-memory (and optionally the persistent) cache of selected entries
+#  @code
+#  selection_cache_clear () 
+#  @endcode 
+#  @see CachedSelection 
+def selection_cache_clear ( persistent = False ) :
+    """Clear the in-memory (and optionally the persistent) cache of selected entries
+    >>> selection_cache_clear () 
+    - see CachedSelection 
+    """
+    __selection_lists__.clear ()
+    if persistent :
+        from ostap.trees.catalog import get_catalog
+        catalog = get_catalog ()
+        if catalog : catalog.clear_selections ()
+
+# =============================================================================
+## get the key for the selection cache: the tree name and the files
+#  @return ( name , files ) or None for trees not from (read-only) files 
+def _selection_key_ ( tree ) :
+    """Get the key for the selection cache: the tree name and the files
+    - return ( name , files ) or None for trees not from (read-only) files 
+    """
+    if isinstance ( tree , ROOT.TChain ) :
+        files = tuple ( tree.files () )
+        return ( tree.GetName () , files ) if files else None 
+    topdir = tree.topdir
+    if isinstance ( topdir , ROOT.TFile ) and not topdir.IsWritable () : 
+        return tree.path , ( topdir.GetName () , )
+    return None 
+
+# ===============================================================================
+## @class CachedSelection
+#  Context manager to loop only over the entries, that pass the selection.
+#  The list of selected entries (<code>TEntryList</code>) is calculated
+#  once per tree/chain and selection, cached in memory and
+#  stored in the file catalog (keyed by the checksum of the file list),
+#  so it is reused in the next sessions.
+#  @code
+#  tree = ...
+#  with CachedSelection ( tree , 'pt>1&&chi2<10' , force = True ) :
+#      s1 = tree.statVar ( 'pt'  , 'pt>1&&chi2<10' )
+#      tree.project ( h1 , 'eta' , 'pt>1&&chi2<10' )
+#  @endcode
+#  The tree loops (project, statVar, statCov, nEff, ...) use it automatically
+#  if the selection cache is enabled, see set_selection_cache
+#  - the selection itself is still applied (e.g. for weights)
+#  - nothing is done for the partial ranges of entries, for the trees
+#    not from the (read-only) files and for the trees with
+#    the entry list already set 
+#  @see TEntryList
+#  @see ostap.trees.catalog.FileCatalog.get_selection
+class CachedSelection(object) :
+    """Context manager to loop only over the entries, that pass the selection.
+    The list of selected entries (TEntryList) is calculated once per tree/chain
+    and selection, cached in memory and stored in the file catalog (keyed by the
+    checksum of the file list), so it is reused in the next sessions.
+    >>> tree = ...
+    >>> with CachedSelection ( tree , 'pt>1&&chi2<10' , force = True ) :
+    ...     s1 = tree.statVar ( 'pt'  , 'pt>1&&chi2<10' )
+    ...     tree.project ( h1 , 'eta' , 'pt>1&&chi2<10' )
+    The tree loops (project, statVar, statCov, nEff, ...) use it automatically
+    if the selection cache is enabled, see set_selection_cache
+    - the selection itself is still applied (e.g. for weights)
+    - nothing is done for the partial ranges of entries, for the trees
+    not from the (read-only) files and for the trees with the entry list already set 
+    - see ROOT.TEntryList
+    - see ostap.trees.catalog.FileCatalog.get_selection
+    """
+    def __init__ ( self , tree , cuts = '' , first = 0 , last = _large , force = False ) :
+        
+        self.__tree  = tree
+        self.__cuts  = str ( cuts ).strip () if isinstance ( cuts , string_types + ( ROOT.TCut , ) ) else ''
+        self.__first = first
+        self.__last  = last 
+        self.__force = force 
+        self.__set   = False
+        
+    ## context manager: ENTER 
+    def __enter__ ( self ) :
+
+        self.__set = False
+        tree       = self.__tree 
+        if not self.__force and not selection_cache () : return tree 
+        if not self.__cuts or not valid_pointer ( tree ) : return tree
+        if tree.GetEntryList ()                          : return tree 
+        if 0 != self.__first or self.__last < len ( tree ) : return tree
+        
+        elist = self.entry_list ()
+        if not elist : return tree
+
+        tree.SetEntryList ( elist )
+        self.__set = True 
+        return tree 
+
+    ## context manager: EXIT 
+    def __exit__ ( self , *_ ) :
+        if self.__set : self.__tree.SetEntryList ( ROOT.nullptr )
+        self.__set = False
+
+    ## get (calculate or load) the list of selected entries
+    def entry_list ( self ) :
+        """Get (calculate or load) the list of selected entries"""
+        
+        tree  = self.__tree
+        cuts  = self.__cuts 
+        key   = _selection_key_ ( tree )
+        if key is None : return None
+
+        name , files = key
+        mkey  = name , files , cuts
+        elist = __selection_lists__.get ( mkey , None )
+        if elist : return elist
+
+        ## try to get it from the file catalog 
+        from ostap.trees.catalog import get_catalog
+        catalog = get_catalog ()
+        if catalog :
+            elist = catalog.get_selection ( files , name , cuts )
+            if elist :
+                logger.debug ( 'CachedSelection: %d entries for "%s" from %s' % ( elist.GetN () , cuts , catalog ) ) 
+                __selection_lists__ [ mkey ] = elist 
+                return elist
+            
+        ## calculate it 
+        from ostap.core.core import hID 
+        lname = hID ()
+        with ROOTCWD () : 
+            ROOT.gROOT.cd ()
+            with AutoBranches ( tree , cuts ) : 
+                n = tree.Draw ( '>>%s' % lname , cuts , 'entrylist' )
+            elist = ROOT.gROOT.FindObject ( lname )
+            if n < 0 or not elist or not isinstance ( elist , ROOT.TEntryList ) : return None
+            elist.SetDirectory ( ROOT.nullptr )
+
+        logger.info ( 'CachedSelection: %d/%d entries are selected by "%s"' % ( elist.GetN () , len ( tree ) , cuts ) )
+        
+        __selection_lists__ [ mkey ] = elist 
+        if catalog : catalog.put_selection ( files , name , cuts , elist )
+        
+        return elist
+
+# =============================================================================
+## Context manager to loop only over the entries, that pass the selection
+#  @code
+#  tree = ...
+#  with tree.cached_selection ( 'pt>1&&chi2<10' ) :
+#      s1 = tree.statVar ( 'pt'  , 'pt>1&&chi2<10' )
+#      tree.project ( h1 , 'eta' , 'pt>1&&chi2<10' )
+#  @endcode
+#  @see CachedSelection 
+def _rt_cached_selection_ ( tree , cuts ) :
+    """Context manager to loop only over the entries, that pass the selection
+    >>> tree = ...
+    >>> with tree.cached_selection ( 'pt>1&&chi2<10' ) :
+    ...     s1 = tree.statVar ( 'pt'  , 'pt>1&&chi2<10' )
+    ...     tree.project ( h1 , 'eta' , 'pt>1&&chi2<10' )
+    - see CachedSelection 
+    """
+    return CachedSelection ( tree , cuts , force = True )
+
+ROOT.TTree .cached_selection = _rt_cached_selection_
+ROOT.TChain.cached_selection = _rt_cached_selection_
+
+# =============================================================================
+## Get the statistics of the formula compilation cache
+#  Formulas for the (tree,expression) pairs are compiled only once and
+#  reused by statVar/statCov/project_many/arrays/withCuts
+#  @code
+#  stat = formula_cache_stat ()
+#  print ( 'hits/misses: %(hits)d/%(misses)d' % stat )
+#  @endcode 
+#  @see Ostap::FormulaCache
+def formula_cache_stat () :
+    """Get the statistics of the formula compilation cache
+    - formulas for the (tree,expression) pairs are compiled only once and
+    reused by statVar/statCov/project_many/arrays/withCuts
+    >>> stat = formula_cache_stat ()
+    >>> print ( 'hits/misses: %(hits)d/%(misses)d' % stat )
+    - see Ostap::FormulaCache
+    """
+    FC = Ostap.FormulaCache
+    return { 'hits'    : FC.hits    () ,
+             'misses'  : FC.misses  () ,
+             'size'    : FC.size    () ,
+             'maxsize' : FC.maxSize () ,
+             'enabled' : FC.enabled () }
+
+# =============================================================================
+## Clear the formula compilation cache and reset the counters
+#  @code
+#  formula_cache_clear () 
+#  @endcode 
+#  @see Ostap::FormulaCache
+def formula_cache_clear () :
+    """Clear the formula compilation cache and reset the counters
+    >>> formula_cache_clear () 
+    - see Ostap::FormulaCache
+    """
+    Ostap.FormulaCache.clear ()
 
 # =============================================================================
 ## files and utilisties for TTree/TChain "serialization"
@@ -1919,6 +2556,25 @@ def file_info ( fname ) :
         return s.st_mode , s.st_size , s.st_uid, s.st_gid, s.st_atime , s.st_mtime , s.st_ctime
     return 'Invalid'
 # =============================================================================
+## get the numbers of entries in the tree for the given files
+#  - the persistent file catalog is used, if available
+#  @see ostap.trees.catalog.FileCatalog 
+def tree_lens ( name , files ) :
+    """Get the numbers of entries in the tree for the given files
+    - the persistent file catalog is used, if available
+    - see ostap.trees.catalog.FileCatalog 
+    """
+    from ostap.trees.catalog import get_catalog
+    catalog = get_catalog ()
+    if catalog : return catalog.entries ( files , name )
+    lens = []
+    for f in files :
+        t = ROOT.TChain ( name )
+        t.Add ( f )
+        lens.append ( t.GetEntries () )
+    return tuple ( lens ) 
+    
+# =============================================================================
 from ostap.utils.cleanup  import CleanUp
 # =============================================================================
 ## @class Chain
@@ -2111,13 +2767,18 @@ class Chain(CleanUp) :
             
             _first = self.__first
             _files = []
-            total  = 0 
-            for f in self.__files :
+            total  = 0
+            
+            ## get the lengths of the trees in (rather large) groups of files
+            from ostap.utils.utils import chunked
+            def _lens ( files ) :
+                for group in chunked ( files , 64 ) :
+                    group = list ( group ) 
+                    for f , clen in zip ( group , tree_lens ( self.name , group ) ) :
+                        yield f , clen 
+                        
+            for f , clen in _lens ( self.__files ) :
                 
-                t = ROOT.TChain ( self.name )
-                t.Add ( f )
-                clen = t.GetEntries() 
-
                 if _first < clen :
                     
                     _files.append (  ( f , clen ) )
@@ -2147,13 +2808,7 @@ class Chain(CleanUp) :
         """
         if self.__lens : return self.__lens
 
-        lens = []
-        for f in self.__files :
-            t = ROOT.TChain ( self.name )
-            t.Add ( f )
-            lens.append ( t.GetEntries () )
-            
-        self.__lens = tuple ( lens )
+        self.__lens = tree_lens ( self.name , self.__files ) 
         return self.__lens
         
     ## split the chain for several chains  with at most chunk_size entries
@@ -2202,11 +2857,32 @@ class Chain(CleanUp) :
 
 
     ## split the chain for several chains with at most chunk_size entries
-    def split ( self , chunk_size = -1 , max_files = 10 ) :
+    #  @code
+    #  chain  = ...
+    #  chains = chain.split ( chunk_size = 1000000 )
+    #  chains = chain.split ( chunk_size = 1000000 , balance = 'bytes' , branches = ( 'pt' , 'eta' ) )
+    #  @endcode
+    #  @param chunk_size maximal number of entries in the chunk
+    #  @param max_files  maximal number of files in the chunk 
+    #  @param balance    (optional) balancing of the chunks: <code>'bytes'</code> or <code>'entries'</code>
+    #  @param branches   (optional) branches to be read, used for <code>balance='bytes'</code>
+    #  @see Chain.balanced_split
+    def split ( self , chunk_size = -1 , max_files = 10 , balance = None , branches = () ) :
         """Split the tree for several trees with chunk_size entries
         >>> tree = ....
         >>> trees = tree.split ( chunk_size = 1000000 ) 
+        >>> trees = tree.split ( chunk_size = 1000000 , balance = 'bytes' , branches = ( 'pt' , 'eta' ) )
+        - chunk_size : maximal number of entries in the chunk
+        - max_files  : maximal number of files in the chunk
+        - balance    : (optional) balancing of the chunks: 'bytes' or 'entries'
+        - branches   : (optional) branches to be read, used for balance='bytes'
+        - see Chain.balanced_split 
         """
+        if balance :
+            if 0 == self.first and self.__nevents < 0 :
+                return self.balanced_split ( chunk_size , max_files , balance , branches )
+            logger.debug ( "split: balancing is not supported for first/nevents, ignore it" )
+            
         if chunk_size <= 0 : chunk_size = ROOT.TChain.kMaxEntries
         if max_files  <= 0 : max_files  = 1 
         
@@ -2232,6 +2908,108 @@ class Chain(CleanUp) :
 
         return  tuple ( result ) 
 
+    # =========================================================================
+    ## split the chain into cost-balanced chunks
+    #  - the cost of each file is estimated from the file catalog:
+    #    the compressed size of the (active) branches for <code>balance='bytes'</code>
+    #    or the number of entries for <code>balance='entries'</code>
+    #  - the target cost of the chunk corresponds to <code>chunk_size</code> entries
+    #    of the average size (or to the largest file for <code>chunk_size<=0</code>)
+    #  - the files with larger cost are split into the equal slices, 
+    #    the smaller files are packed into chains with at most <code>max_files</code> files 
+    #  - the chunks are ordered by decreasing cost 
+    #  @code
+    #  chain  = ...
+    #  chains = chain.balanced_split ( chunk_size = 1000000 , branches = ( 'pt' , 'eta' ) )
+    #  @endcode
+    #  @see ostap.trees.catalog.FileCatalog 
+    def balanced_split ( self , chunk_size = -1 , max_files = 10 , balance = 'bytes' , branches = () ) :
+        """Split the chain into cost-balanced chunks
+        - the cost of each file is estimated from the file catalog:
+        the compressed size of the (active) branches for balance='bytes'
+        or the number of entries for balance='entries'
+        - the target cost of the chunk corresponds to `chunk_size` entries
+        of the average size (or to the largest file for chunk_size<=0)
+        - the files with larger cost are split into the equal slices, 
+        the smaller files are packed into chains with at most `max_files` files 
+        - the chunks are ordered by decreasing cost 
+        >>> chain  = ...
+        >>> chains = chain.balanced_split ( chunk_size = 1000000 , branches = ( 'pt' , 'eta' ) )
+        - see ostap.trees.catalog.FileCatalog 
+        """
+        
+        assert balance in ( 'bytes' , 'entries' ) , "Invalid ``balance'' %s" % balance
+        if max_files <= 0 : max_files = 1
+        
+        from ostap.trees.catalog import tree_infos
+        infos    = tree_infos ( self.name , self.files )
+        branches = set ( branches ) 
+        
+        ## ( file , entries , cost ) for all non-empty files 
+        items = []
+        for f , info in zip ( self.files , infos ) :
+            if not info or info.entries <= 0 : continue 
+            if 'bytes' == balance :
+                cost = sum ( z for b , z in info.branches.items () if b in branches ) if branches else 0 
+                cost = cost if 0 < cost else info.zipbytes
+            else :
+                cost = info.entries 
+            items.append ( ( f , info.entries , max ( 1 , cost ) ) )
+            
+        if not items : return ()
+
+        ## the target cost of the chunk 
+        total_entries = sum ( i [ 1 ] for i in items )
+        total_cost    = sum ( i [ 2 ] for i in items )
+        if 0 < chunk_size : target = max ( 1.0 , float ( total_cost ) * chunk_size / total_entries )
+        else              : target = max ( i [ 2 ] for i in items ) 
+        
+        chunks = [] ## ( cost , chunk )
+        small  = [] ## ( cost , file  )
+        
+        ## (1) split the large files into the equal slices 
+        for f , n , cost in items :
+            if cost <= target or 1 == n : 
+                small.append ( ( cost , f ) )
+                continue
+            k    = min ( n , int ( math.ceil ( cost / target ) ) )
+            step = ( n + k - 1 ) // k
+            for first in range ( 0 , n , step ) :
+                nevents = min ( step , n - first )
+                tree    = Tree ( name = self.name , file = f , first = first , nevents = nevents ) 
+                chunks.append ( ( float ( cost ) * nevents / n , tree ) )
+                
+        ## (2) pack the small files into the chains: the largest files go to the least loaded chain 
+        if small :
+            import heapq 
+            from   itertools import count 
+            small.sort ( reverse = True ) 
+            nsmall = sum ( c for c , f in small )
+            nbins  = max ( int ( math.ceil ( nsmall / target ) ) ,
+                           int ( math.ceil ( float ( len ( small ) ) / max_files ) ) , 1 ) 
+            index  = count ()
+            bins   = [ ( 0 , next ( index ) , [] ) for i in range ( nbins ) ]
+            full   = [] 
+            for cost , f in small :
+                load , i , files = heapq.heappop ( bins )
+                files.append ( f )
+                if len ( files ) < max_files : heapq.heappush ( bins , ( load + cost , i , files ) )
+                else                         : full.append    (        ( load + cost , i , files ) )
+                if not bins :
+                    ## all chains are full: open the new one 
+                    heapq.heappush ( bins , ( 0 , next ( index ) , [] ) ) 
+            for load , i , files in full + bins :
+                if files : chunks.append ( ( load , Chain ( name = self.name , files = files ) ) ) 
+                    
+        chunks.sort ( key = lambda c : -c [ 0 ] )
+        
+        if chunks :
+            costs = [ c for c , ch in chunks ]
+            logger.debug ( 'balanced_split: %d chunks, cost/%s: min/max/mean %.4g/%.4g/%.4g' % (
+                len ( costs ) , balance , min ( costs ) , max ( costs ) , sum ( costs ) / len ( costs ) ) )
+            
+        return tuple ( ch for c , ch in chunks ) 
+
     ##  number of entries in the Tree/Chain
     def __len__ ( self ) :
 
@@ -2308,6 +3086,24 @@ class Chain(CleanUp) :
         df = DataFrame  ( self.name , fnames , vnames )
         for k in new_vars : df =  df.Define ( k , new_vars [k] )
         return  df                              
+
+    # ============================================================================
+    ## read the columns in a form of numpy arrays, chunk-by-chunk,
+    #  only for the entries from this chain slice 
+    #  @code
+    #  chain = Chain ( ... , first = 1000 , nevents = 10000 )  
+    #  for chunk in chain.arrays ( [ 'pt' , 'eta' ] , 'pt>1' ) :
+    #      pt  = chunk [ 'pt' ] ## numpy array 
+    #  @endcode 
+    #  @see _tt_arrays_ 
+    def arrays ( self , columns , cuts = '' , chunk_size = 100000 ) :
+        """Read the columns in a form of numpy arrays, chunk-by-chunk,
+        only for the entries from this chain slice 
+        >>> chain = Chain ( ... , first = 1000 , nevents = 10000 )  
+        >>> for chunk in chain.arrays ( [ 'pt' , 'eta' ] , 'pt>1' ) :
+        ...     pt  = chunk [ 'pt' ] ## numpy array 
+        """
+        return _tt_arrays_ ( self.chain , columns , cuts , chunk_size , self.first , self.nevents )
     
     def __str__ ( self ) :
         r = "Chain('%s',%s" % ( self.name , self.__files )
@@ -2465,6 +3261,12 @@ _new_methods_       = (
     #
     ROOT.TTree .project   ,
     ROOT.TChain.project   ,
+    ROOT.TTree .project_many ,
+    ROOT.TChain.project_many ,
+    ROOT.TTree .arrays    ,
+    ROOT.TChain.arrays    ,
+    ROOT.TTree .cached_selection ,
+    ROOT.TChain.cached_selection ,
     #
     ROOT.TTree .statVar   ,
     ROOT.TChain.statVar   ,
@@ -18,11 +18,13 @@ add_library(ostap SHARED src/format.cpp
                          src/Dalitz.cpp
                          src/DalitzIntegrator.cpp
                          src/DataFrameUtils.cpp
+                         src/DataHash.cpp
                          src/EigenSystem.cpp   
                          src/Error2Exception.cpp   
                          src/Exception.cpp
                          src/Faddeeva.cpp 
                          src/Formula.cpp   
+                         src/FormulaCache.cpp
                          src/FormulaVar.cpp   
                          src/Fourier.cpp   
                          src/Funcs.cpp   
@@ -80,15 +82,18 @@ add_library(ostap SHARED src/format.cpp
                          src/PySelector.cpp
                          src/PySelectorWithCuts.cpp
                          src/PyVar.cpp   
+                         src/RooFitArrays.cpp
                          src/RootID.cpp
                          src/SFactor.cpp
                          src/StatEntity.cpp
                          src/StatVar.cpp
                          src/StatusCode.cpp
+                         src/TDigest.cpp
                          src/Tee.cpp
                          src/Tensors.cpp
                          src/Topics.cpp
                          src/Tmva.cpp
+                         src/TreeArrays.cpp
                          src/UStat.cpp
                          src/Valid.cpp
                          src/ValueWithError.cpp
@@ -0,0 +1,166 @@
+// ============================================================================
+#ifndef OSTAP_COVARIANCE_H
+#define OSTAP_COVARIANCE_H 1
+// ============================================================================
+// Include files
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  namespace Math
+  {
+    // ========================================================================
+    /** @class WCovariance Ostap/Covariance.h
+     *  Simple (weighted) counter for the means and covariances of
+     *  two variables, that uses the numerically stable one-pass
+     *  (Welford-like) accumulation of the co-moments
+     *  \f$ C_{xy} = \sum w_i \left( x_i - \bar{x} \right) \left( y_i - \bar{y} \right) \f$
+     *  - the counters can be merged, e.g. for parallel processing
+     *  @code
+     *  WCovariance cnt ;
+     *  for ( ... ) { cnt.add ( x , y , w ) ; }
+     *  const double cov = cnt.cov12 () ;
+     *  @endcode
+     *  @see B.P.Welford, "Note on a method for calculating corrected sums
+     *       of squares and products", Technometrics 4 (1962) 419
+     *  @see T.F.Chan, G.H.Golub, R.J.LeVeque, "Updating Formulae and a
+     *       Pairwise Algorithm for Computing Sample Variances", STAN-CS-79-773
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-01
+     */
+    class WCovariance
+    {
+    public:
+      // ======================================================================
+      /// default constructor
+      WCovariance () = default ;
+      // ======================================================================
+      /** full constructor (e.g. for serialization)
+       *  @param n    number of entries
+       *  @param w    sum of weights
+       *  @param mu1  mean of the first  variable
+       *  @param mu2  mean of the second variable
+       *  @param c11  co-moment \f$ C_{xx} \f$
+       *  @param c12  co-moment \f$ C_{xy} \f$
+       *  @param c22  co-moment \f$ C_{yy} \f$
+       */
+      WCovariance ( const unsigned long long n   ,
+                    const double             w   ,
+                    const double             mu1 ,
+                    const double             mu2 ,
+                    const double             c11 ,
+                    const double             c12 ,
+                    const double             c22 )
+        : m_n   ( n   )
+        , m_w   ( w   )
+        , m_mu1 ( mu1 )
+        , m_mu2 ( mu2 )
+        , m_c11 ( c11 )
+        , m_c12 ( c12 )
+        , m_c22 ( c22 )
+      {}
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// add the pair of values with the weight
+      inline WCovariance& add ( const double x , const double y , const double w = 1 )
+      {
+        if ( !w ) { return *this ; }                             // RETURN
+        //
+        ++m_n ;
+        const long double wn = m_w + w ;
+        if ( !wn ) { m_w = 0 ; return *this ; }                  // RETURN
+        //
+        const long double d1 = x - m_mu1 ;
+        const long double d2 = y - m_mu2 ;
+        m_w    = wn ;
+        m_mu1 += d1 * w / wn ;
+        m_mu2 += d2 * w / wn ;
+        //
+        m_c11 += w * d1 * ( x - m_mu1 ) ;
+        m_c12 += w * d1 * ( y - m_mu2 ) ;
+        m_c22 += w * d2 * ( y - m_mu2 ) ;
+        //
+        return *this ;
+      }
+      // ======================================================================
+      /// merge with another counter
+      inline WCovariance& add ( const WCovariance& right )
+      {
+        if      ( 0 == right.m_n ) {                    return *this ; }
+        else if ( 0 ==       m_n ) { (*this) = right ;  return *this ; }
+        //
+        m_n += right.m_n ;
+        const long double wn = m_w + right.m_w ;
+        if ( !wn ) { m_w = 0 ; return *this ; }                  // RETURN
+        //
+        const long double d1 = right.m_mu1 - m_mu1 ;
+        const long double d2 = right.m_mu2 - m_mu2 ;
+        const long double f  = m_w * right.m_w / wn ;
+        //
+        m_c11 += right.m_c11 + d1 * d1 * f ;
+        m_c12 += right.m_c12 + d1 * d2 * f ;
+        m_c22 += right.m_c22 + d2 * d2 * f ;
+        //
+        m_mu1 += d1 * right.m_w / wn ;
+        m_mu2 += d2 * right.m_w / wn ;
+        m_w    = wn ;
+        //
+        return *this ;
+      }
+      // ======================================================================
+      /// merge with another counter
+      inline WCovariance& operator+= ( const WCovariance& right ) { return add ( right ) ; }
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// number of entries
+      unsigned long long n   () const { return m_n   ; }
+      /// sum of weights
+      double             w   () const { return m_w   ; }
+      /// mean of the first  variable
+      double             mu1 () const { return m_mu1 ; }
+      /// mean of the second variable
+      double             mu2 () const { return m_mu2 ; }
+      /// co-moment \f$ C_{xx} \f$
+      double             c11 () const { return m_c11 ; }
+      /// co-moment \f$ C_{xy} \f$
+      double             c12 () const { return m_c12 ; }
+      /// co-moment \f$ C_{yy} \f$
+      double             c22 () const { return m_c22 ; }
+      // ======================================================================
+      /// (weighted) variance of the first  variable \f$ C_{xx}/\sum w_i \f$
+      double cov11 () const { return m_w ? double ( m_c11 / m_w ) : 0.0 ; }
+      /// (weighted) covariance                      \f$ C_{xy}/\sum w_i \f$
+      double cov12 () const { return m_w ? double ( m_c12 / m_w ) : 0.0 ; }
+      /// (weighted) variance of the second variable \f$ C_{yy}/\sum w_i \f$
+      double cov22 () const { return m_w ? double ( m_c22 / m_w ) : 0.0 ; }
+      // ======================================================================
+      /// reset the counter
+      void reset () { (*this) = WCovariance () ; }
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// number of entries
+      unsigned long long m_n   { 0 } ;
+      /// sum of weights
+      long double        m_w   { 0 } ;
+      /// mean of the first  variable
+      long double        m_mu1 { 0 } ;
+      /// mean of the second variable
+      long double        m_mu2 { 0 } ;
+      /// co-moments
+      long double        m_c11 { 0 } ;
+      long double        m_c12 { 0 } ;
+      long double        m_c22 { 0 } ;
+      // ======================================================================
+    } ;
+    // ========================================================================
+  } //                                         The end of namespace Ostap::Math
+  // ==========================================================================
+} //                                                 The end of namespace Ostap
+// ============================================================================
+//                                                                      The END
+// ============================================================================
+#endif // OSTAP_COVARIANCE_H
+// ============================================================================
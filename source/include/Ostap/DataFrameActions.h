@@ -0,0 +1,257 @@
+// ============================================================================
+#ifndef OSTAP_DATAFRAMEACTIONS_H
+#define OSTAP_DATAFRAMEACTIONS_H 1
+// ============================================================================
+// Include files
+// ============================================================================
+// STD&STL
+// ============================================================================
+#include <memory>
+#include <string>
+#include <vector>
+#include <algorithm>
+// ============================================================================
+// ROOT
+// ============================================================================
+#include "RVersion.h"
+// ============================================================================
+#if ROOT_VERSION_CODE >= ROOT_VERSION(6,20,0)
+// ============================================================================
+#include "ROOT/RDataFrame.hxx"
+// ============================================================================
+// Ostap
+// ============================================================================
+#include "Ostap/WStatEntity.h"
+#include "Ostap/Covariance.h"
+#include "Ostap/SymmetricMatrixTypes.h"
+// ============================================================================
+/** @file Ostap/DataFrameActions.h
+ *  Collection of the (lazy) actions for RDataFrame
+ *  All actions booked before the first request of the result
+ *  are executed in the same (multithreaded) event loop
+ *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+ *  @date   2021-03-15
+ */
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  namespace Actions
+  {
+    // ========================================================================
+    /** @class WCounter
+     *  The (lazy) action to fill the weighted counter, e.g.
+     *  - Ostap::WStatEntity
+     *  - Ostap::Math::WMoment_
+     *  The counter must provide <code>add ( value , weight )</code>
+     *  and <code>operator+=</code>
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-15
+     */
+    template <class COUNTER>
+    class WCounter : public ROOT::Detail::RDF::RActionImpl<WCounter<COUNTER> >
+    {
+    public:
+      // ======================================================================
+      typedef COUNTER Result_t ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /** constructor 
+       *  @param init   the initial value of the counter
+       *  @param nslots number of slots 
+       */
+      WCounter ( const COUNTER&     init   = COUNTER () , 
+                 const unsigned int nslots = 1          )
+        : m_result ( std::make_shared<Result_t> ( init ) )
+        , m_slots  ( std::max ( nslots , 1u ) )
+      {}
+      /// move constructor
+      WCounter ( WCounter&&      ) = default ;
+      /// no copy constructor
+      WCounter ( const WCounter& ) = delete  ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      std::shared_ptr<Result_t> GetResultPtr  () const { return m_result ; }
+      void                      Initialize    () {}
+      void                      InitTask      ( TTreeReader* , unsigned int ) {}
+      std::string               GetActionName () const { return "WCounter" ; }
+      // ======================================================================
+      /// the actual action
+      void Exec ( unsigned int slot , double value , double weight )
+      { m_slots [ slot ].add ( value , weight ) ; }
+      /// merge the results from the slots
+      void Finalize ()
+      { for ( const auto& c : m_slots ) { (*m_result) += c ; } }
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// the result
+      std::shared_ptr<Result_t> m_result {} ; // the result
+      /// the counters for slots
+      std::vector<Result_t>     m_slots  {} ; // the counters for slots
+      // ======================================================================
+    } ;
+    // ========================================================================
+    /** @class Covariance
+     *  The result of the (lazy) covariance action:
+     *  the statistics for two expressions and their covariance matrix
+     *  - the co-moments are accumulated with the numerically stable 
+     *    one-pass algorithm and normalised by the sum of weights, 
+     *    as for Ostap::StatVar::statCov
+     *  @see Ostap::Math::WCovariance
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-15
+     */
+    class Covariance
+    {
+    public:
+      // ======================================================================
+      /// add the values
+      void add ( const double v1 , const double v2 , const double w )
+      {
+        if ( !w ) { return ; }
+        m_stat1.add ( v1 , w ) ;
+        m_stat2.add ( v2 , w ) ;
+        m_cov  .add ( v1 , v2 , w ) ;
+      }
+      /// merge with another
+      Covariance& operator+= ( const Covariance& right )
+      {
+        m_stat1 += right.m_stat1 ;
+        m_stat2 += right.m_stat2 ;
+        m_cov   += right.m_cov   ;
+        return *this ;
+      }
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// the statistic for the first  expression
+      const Ostap::WStatEntity&  stat1 () const { return m_stat1 ; }
+      /// the statistic for the second expression
+      const Ostap::WStatEntity&  stat2 () const { return m_stat2 ; }
+      /// number of entries
+      unsigned long long         n     () const { return m_stat1.nEntries () ; }
+      /// the covariance matrix (normalised by the sum of weights)
+      Ostap::SymMatrix2x2        cov2  () const
+      {
+        Ostap::SymMatrix2x2 result ;
+        if ( 0 == n () ) { return result ; }
+        //
+        result ( 0 , 0 ) = m_cov.cov11 () ;
+        result ( 0 , 1 ) = m_cov.cov12 () ;
+        result ( 1 , 1 ) = m_cov.cov22 () ;
+        //
+        return result ;
+      }
+      // ======================================================================
+    private:
+      // ======================================================================
+      Ostap::WStatEntity  m_stat1 {} ;
+      Ostap::WStatEntity  m_stat2 {} ;
+      Ostap::Math::WCovariance m_cov {} ;
+      // ======================================================================
+    } ;
+    // ========================================================================
+    /** @class WCovariance
+     *  The (lazy) action to get the covariance for two expressions
+     *  @see Ostap::Actions::Covariance
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-15
+     */
+    class WCovariance : public ROOT::Detail::RDF::RActionImpl<WCovariance>
+    {
+    public:
+      // ======================================================================
+      typedef Covariance Result_t ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// constructor with number of slots 
+      WCovariance ( const unsigned int nslots = 1 )
+        : m_result ( std::make_shared<Result_t> () )
+        , m_slots  ( std::max ( nslots , 1u ) )
+      {}
+      /// move constructor
+      WCovariance ( WCovariance&&      ) = default ;
+      /// no copy constructor
+      WCovariance ( const WCovariance& ) = delete  ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      std::shared_ptr<Result_t> GetResultPtr  () const { return m_result ; }
+      void                      Initialize    () {}
+      void                      InitTask      ( TTreeReader* , unsigned int ) {}
+      std::string               GetActionName () const { return "WCovariance" ; }
+      // ======================================================================
+      /// the actual action
+      void Exec ( unsigned int slot , double v1 , double v2 , double weight )
+      { m_slots [ slot ].add ( v1 , v2 , weight ) ; }
+      /// merge the results from the slots
+      void Finalize ()
+      { for ( const auto& c : m_slots ) { (*m_result) += c ; } }
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// the result
+      std::shared_ptr<Result_t> m_result {} ; // the result
+      /// the counters for slots
+      std::vector<Result_t>     m_slots  {} ; // the counters for slots
+      // ======================================================================
+    } ;
+    // ========================================================================
+    /** book the (lazy) action to fill the weighted counter
+     *  @code
+     *  auto node = frame.Filter ( ... ).Define ( "v" , ... ).Define ( "w" , ... ) ;
+     *  auto stat = Ostap::Actions::book ( node , Ostap::WStatEntity() , "v" , "w" ) ;
+     *  ...
+     *  const Ostap::WStatEntity& s = stat.GetValue () ;
+     *  @endcode
+     *  @param node   (INPUT) the frame node
+     *  @param init   (INPUT) the initial value of the counter
+     *  @param value  (INPUT) the column with value
+     *  @param weight (INPUT) the column with weight
+     *  @return the (lazy) result
+     */
+    template <class NODE, class COUNTER>
+    ROOT::RDF::RResultPtr<COUNTER>
+    book
+    ( NODE               node   ,
+      const COUNTER&     init   ,
+      const std::string& value  ,
+      const std::string& weight )
+    {
+      return node.template Book<double,double>
+        ( WCounter<COUNTER> ( init , node.GetNSlots () ) , { value , weight } ) ;
+    }
+    // ========================================================================
+    /** book the (lazy) action to get the covariance of two expressions
+     *  @param node   (INPUT) the frame node
+     *  @param value1 (INPUT) the column with the first  value
+     *  @param value2 (INPUT) the column with the second value
+     *  @param weight (INPUT) the column with weight
+     *  @return the (lazy) result
+     */
+    template <class NODE>
+    ROOT::RDF::RResultPtr<Covariance>
+    covariance
+    ( NODE               node   ,
+      const std::string& value1 ,
+      const std::string& value2 ,
+      const std::string& weight )
+    {
+      return node.template Book<double,double,double>
+        ( WCovariance ( node.GetNSlots () ) , { value1 , value2 , weight } ) ;
+    }
+    // ========================================================================
+  } //                                      The end of namespace Ostap::Actions
+  // ==========================================================================
+} //                                                 The end of namespace Ostap
+// ============================================================================
+#endif // ROOT_VERSION_CODE >= ROOT_VERSION(6,20,0)
+// ============================================================================
+//                                                                      The END
+// ============================================================================
+#endif // OSTAP_DATAFRAMEACTIONS_H
+// ============================================================================
@@ -0,0 +1,43 @@
+// ============================================================================
+#ifndef OSTAP_DATAHASH_H 
+#define OSTAP_DATAHASH_H 1
+// ============================================================================
+// Include files
+// ============================================================================
+// STD&STL
+// ============================================================================
+#include <cstddef>
+// ============================================================================
+// Forward declarations 
+// ============================================================================
+class RooAbsData ;
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  namespace Utils 
+  {
+    // ========================================================================
+    /** get the hash/checksum of the dataset content:
+     *  the values of all variables (and weights) for all entries
+     *  The direct loop in python is rather slow, thus C++ routine helps
+     *  to speedup procedure drastically 
+     *  @code
+     *  data = ...
+     *  h    = Ostap::Utils::hash_data ( data ) ;
+     *  @endcode 
+     *  @param data (INPUT) dataset
+     *  @return hash/checksum of the dataset content 
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date 2021-03-19
+     */
+    std::size_t hash_data ( const RooAbsData* data ) ;
+    // ========================================================================
+  } //                                        The end of namespace Ostap::Utils
+  // ==========================================================================
+} //                                                 The end of namespace Ostap
+// ============================================================================
+//                                                                      The END 
+// ============================================================================
+#endif // OSTAP_DATAHASH_H
+// ============================================================================
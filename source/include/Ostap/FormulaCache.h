@@ -0,0 +1,128 @@
+// ============================================================================
+#ifndef OSTAP_FORMULACACHE_H 
+#define OSTAP_FORMULACACHE_H 1
+// ============================================================================
+// Include files
+// ============================================================================
+// STD & STL
+// ============================================================================
+#include <map>
+#include <memory>
+#include <string>
+#include <utility>
+// ============================================================================
+// ROOT 
+// ============================================================================
+#include "TObject.h"
+// ============================================================================
+// Forward declarations 
+// ============================================================================
+class TTree ; // ROOT 
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  class Formula ;
+  // ==========================================================================
+  /** @class FormulaCache Ostap/FormulaCache.h
+   *  Cache of compiled formulas, keyed by (tree,expression)
+   *  - the formulas are compiled only once for the given tree  
+   *  - the cached formula is notified (as via Ostap::Utils::Notifier) 
+   *    for each cache hit, to be synchronized with the current tree of TChain 
+   *  - the cached formulas are shared: do not use them for 
+   *    <code>TTree::SetNotify</code>, use Ostap::Utils::Notifier instead 
+   *  - the entries are removed when the tree is deleted 
+   *  @see Ostap::Formula
+   *  @see Ostap::Utils::Notifier
+   *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+   *  @date   2021-03-10
+   */
+  class FormulaCache : public TObject 
+  {
+  public:
+    // ========================================================================
+    ClassDefOverride(Ostap::FormulaCache,1) ;
+    // ========================================================================
+  public:
+    // ========================================================================
+    /** get the (cached) formula for the given expression and tree 
+     *  @param expression (INPUT) the expression 
+     *  @param tree       (INPUT) the tree 
+     *  @return the formula (check <code>ok()</code> for validity)
+     */
+    static std::shared_ptr<Ostap::Formula> formula 
+    ( const std::string& expression , 
+      TTree*             tree       ) ;
+    // ========================================================================
+    /** get the (cached) formula for the given expression and tree 
+     *  @param name       (INPUT) the name (not used for the key) 
+     *  @param expression (INPUT) the expression 
+     *  @param tree       (INPUT) the tree 
+     *  @return the formula (check <code>ok()</code> for validity)
+     */
+    static std::shared_ptr<Ostap::Formula> formula 
+    ( const std::string& name       , 
+      const std::string& expression , 
+      TTree*             tree       ) ;
+    // ========================================================================
+  public:
+    // ========================================================================
+    /// number of cache hits 
+    static unsigned long long hits    () ;
+    /// number of cache misses 
+    static unsigned long long misses  () ;
+    /// number of cached formulas 
+    static unsigned long      size    () ;
+    /// is cache enabled? 
+    static bool               enabled () ;
+    /// enable/disable the cache, return the previous state  
+    static bool               enable  ( const bool value ) ;
+    /// maximal number of cached formulas 
+    static unsigned long      maxSize () ;
+    /// set the maximal number of cached formulas 
+    static void               setMaxSize ( const unsigned long value ) ;
+    /// clear the cache and reset the counters 
+    static void               clear   () ;
+    /// remove all formulas for the given tree 
+    static void               clear   ( const TTree* tree ) ;
+    // ========================================================================
+  public:
+    // ========================================================================
+    /// remove the entries for the deleted trees 
+    void RecursiveRemove ( TObject* obj ) override ;
+    // ========================================================================
+  public:
+    // ========================================================================
+    /// default constructor (needed for dictionary)
+    FormulaCache () = default ;
+    /// virtual destructor 
+    virtual ~FormulaCache () ;
+    // ========================================================================
+  private:
+    // ========================================================================
+    /// the only instance 
+    static FormulaCache& instance () ;
+    // ========================================================================
+  private:
+    // ========================================================================
+    typedef std::pair<const TTree*,std::string>  KEY   ;
+    typedef std::shared_ptr<Ostap::Formula>      ENTRY ;
+    /// the actual cache: ( tree , expression ) -> formula 
+    std::map<KEY,ENTRY> m_cache   {}      ; //!
+    /// number of hits 
+    unsigned long long  m_hits    { 0 }   ; //!
+    /// number of misses 
+    unsigned long long  m_misses  { 0 }   ; //!
+    /// is enabled ?
+    bool                m_enabled { true } ; //!
+    /// maximal size 
+    unsigned long       m_maxsize { 1000 } ; //!
+    // ========================================================================
+  } ;
+  // ==========================================================================
+} //                                                     end of namespace Ostap
+// ============================================================================
+//                                                                      The END 
+// ============================================================================
+#endif // OSTAP_FORMULACACHE_H
+// ============================================================================
@@ -70,6 +70,11 @@ namespace Ostap
       // ======================================================================
       Bool_t Notify   () override ; 
       // ======================================================================
+    public:
+      // ======================================================================
+      /// the expression itself
+      const std::string& expression () const { return m_expression ; }
+      // ======================================================================
     private:
       // ======================================================================
       /// make formula 
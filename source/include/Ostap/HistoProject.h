@@ -7,17 +7,22 @@
 // STD & STL
 // ============================================================================
 #include <limits>
+#include <string>
+#include <vector>
 // ============================================================================
 // Ostap
 // ============================================================================
 #include "Ostap/StatusCode.h"
 #include "Ostap/DataFrame.h"
+#include "Ostap/WStatEntity.h"
+#include "Ostap/Covariance.h"
 // ============================================================================
 // Forward declarations 
 // =============================================================================
 class TH1       ;     // ROOT 
 class TH2       ;     // ROOT 
 class TH3       ;     // ROOT 
+class TTree     ;     // ROOT 
 // =============================================================================
 class RooAbsData ; // RooFit 
 class RooAbsReal ; // RooFit 
@@ -194,6 +199,65 @@ namespace Ostap
       const std::string&  zexpression     ,
       const std::string&  selection  = "" ) ;
     // ========================================================================
+  public:  //   TTree 
+    // ========================================================================
+    /** make a single-pass projection of TTree into many histograms 
+     *  - all expressions and the selection are compiled only once
+     *  - all histograms are filled in one event loop  
+     *  - each histogram consumes <code>histo->GetDimension()</code> 
+     *    expressions (x,y,z) from the list of expressions 
+     *  - the same histogram can be specified several times, 
+     *    that corresponds to the sum of projections 
+     *  @param tree        (INPUT)  input tree 
+     *  @param histos      (UPDATE) histograms 
+     *  @param expressions (INPUT)  expressions for all axes of all histograms 
+     *  @param selection   (INPUT)  selection criteria/weight 
+     *  @param first       (INPUT)  the first entry to process 
+     *  @param last        (INPUT)  the last entry to process (not including!)
+     *  @return number of selected rows summed over all projections 
+     *          (as for the sequence of <code>TTree::Project</code> calls), 
+     *          or -1 for invalid arguments 
+     */
+    static long projectMany
+    ( TTree*                          tree            , 
+      const std::vector<TH1*>&        histos          ,
+      const std::vector<std::string>& expressions     ,
+      const std::string&              selection  = "" ,
+      const unsigned long             first      = 0                                         ,
+      const unsigned long             last       = std::numeric_limits<unsigned long>::max() ) ;
+    // ========================================================================
+    /** make a single-pass projection of TTree into many histograms 
+     *  and collect the statistics and covariances for many expressions in the same loop 
+     *  - all expressions and the selection are compiled only once
+     *  - each histogram consumes <code>histo->GetDimension()</code> 
+     *    expressions (x,y,z) from the list of expressions 
+     *  - each covariance counter consumes two expressions from the list 
+     *    of covariance expressions, for array-like expressions the pairs 
+     *    of values with the same index are used 
+     *  @param tree        (INPUT)  input tree 
+     *  @param histos      (UPDATE) histograms 
+     *  @param expressions (INPUT)  expressions for all axes of all histograms 
+     *  @param stats       (UPDATE) statistics for the statistic expressions 
+     *  @param statexprs   (INPUT)  statistic expressions 
+     *  @param covs        (UPDATE) covariance counters 
+     *  @param covexprs    (INPUT)  pairs of expressions for covariance counters 
+     *  @param selection   (INPUT)  selection criteria/weight 
+     *  @param first       (INPUT)  the first entry to process 
+     *  @param last        (INPUT)  the last entry to process (not including!)
+     *  @return number of selected entries, or -1 for invalid arguments 
+     */
+    static long projectMany
+    ( TTree*                           tree            , 
+      const std::vector<TH1*>&         histos          ,
+      const std::vector<std::string>&  expressions     ,
+      std::vector<Ostap::WStatEntity>& stats           , 
+      const std::vector<std::string>&  statexprs       ,
+      std::vector<Ostap::Math::WCovariance>& covs      , 
+      const std::vector<std::string>&  covexprs        ,
+      const std::string&               selection  = "" ,
+      const unsigned long              first      = 0                                         ,
+      const unsigned long              last       = std::numeric_limits<unsigned long>::max() ) ;
+    // ========================================================================
   } ;
   // ==========================================================================
 } //                                                     end of namespace Ostap
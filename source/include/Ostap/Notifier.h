@@ -77,6 +77,11 @@ namespace  Ostap
       inline bool add  ( std::unique_ptr<TYPE>& o ) 
       { return this -> add ( o.get() ) ; }
       // ======================================================================
+      // add object to the notification list 
+      template <class TYPE>
+      inline bool add  ( std::shared_ptr<TYPE>& o ) 
+      { return this -> add ( o.get() ) ; }
+      // ======================================================================
       /// is this object known for notifier ? 
       bool known ( const TObject* obj ) const ;
       // ======================================================================
@@ -4,6 +4,11 @@
 // ============================================================================
 // Include files
 // ============================================================================
+// STD&STL
+// ============================================================================
+#include <vector>
+#include <memory>
+// ============================================================================
 // RooFit 
 // ============================================================================
 #include "RooAbsPdf.h"
@@ -16,11 +21,118 @@
 #include "Ostap/OstapPyROOT.h"
 #include "Ostap/PyCallable.h"
 // ============================================================================
+// forward declarations 
+// ============================================================================
+class RooAbsData ; // RooFit 
+// ============================================================================
 namespace Ostap 
 {
   // ==========================================================================
   namespace Models 
   {
+    // ========================================================================
+    /** @class PyBatch PyPdf.h Ostap/PyPdf.h
+     *  Helper class for the vectorized evaluation of "pythonic" PDFs:
+     *  - the columns of observables are taken from the attached dataset 
+     *  - python callable is invoked once for all entries with the 
+     *    observables as buffers and the parameters as floats,
+     *    (the variables are in the order of <code>varlist</code>) 
+     *  - the results are cached while the parameters are unchanged 
+     *  - the entry is located by the values of observables, 
+     *    for the unknown entries the scalar evaluation is used 
+     *  @see Ostap::Models::PyPdf
+     *  @see Ostap::Models::PyPdf2
+     *  @see ostap.fitting.pypdf.PyPDF 
+     *  @see ostap.fitting.pypdf.PyPDF2 
+     */
+    class PyBatch
+    {
+    public:
+      // ======================================================================
+      /// default constructor 
+      PyBatch () = default ;
+      /// copy constructor: the callable and the columns are shared, cache is not copied
+      PyBatch ( const PyBatch& right ) ;
+      /// destructor 
+      ~PyBatch () ;
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// no assignement 
+      PyBatch& operator=( const PyBatch& ) = delete ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// set python callable for the vectorized evaluation
+      void      setFunction ( PyObject* function ) ;
+      /// get python callable for the vectorized evaluation
+      PyObject* function    () const { return m_function ; }
+      // ======================================================================
+      /** attach the dataset: get the columns of observables 
+       *  @param data    the dataset 
+       *  @param varlist all variables 
+       *  @return true if the vectorized evaluation is active 
+       */
+      bool attach ( const RooAbsData& data , const RooArgList& varlist ) ;
+      /// detach the dataset and clear the cache 
+      void detach () ;
+      /// is the vectorized evaluation active?
+      bool active () const { return nullptr != m_function && m_columns ; }
+      // ======================================================================
+      /** get the cached value for the current entry 
+       *  @param varlist all variables 
+       *  @param result  (OUTPUT) the cached value 
+       *  @return true if the value is found in the cache 
+       */
+      bool value ( const RooArgList& varlist , double& result ) const ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// number of calls for the python callable (including all copies)
+      unsigned long long calls  () const { return m_columns ? m_columns->calls  : 0 ; }
+      /// number of cache hits (including all copies)
+      unsigned long long hits   () const { return m_columns ? m_columns->hits   : 0 ; }
+      /// number of cache misses (including all copies)
+      unsigned long long misses () const { return m_columns ? m_columns->misses : 0 ; }
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// invoke the python callable for all entries 
+      void fill ( const RooArgList& varlist ) const ;
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// the columns of observables 
+      struct Columns
+      {
+        /// indices of observables in varlist 
+        std::vector<unsigned short>       index {} ;
+        /// the values of observables 
+        std::vector<std::vector<double> > data  {} ;
+        /// number of entries 
+        std::size_t                       size  { 0 } ;
+        /// statistics (shared by all copies) 
+        mutable unsigned long long        calls  { 0 } ;
+        mutable unsigned long long        hits   { 0 } ;
+        mutable unsigned long long        misses { 0 } ;
+      } ;
+      // ======================================================================
+      /// python callable for the vectorized evaluation
+      PyObject*                          m_function { nullptr } ;
+      /// the columns of observables 
+      std::shared_ptr<const Columns>     m_columns  {}          ;
+      /// the values of parameters for the cached results  
+      mutable std::vector<double>        m_params   {}          ;
+      /// the cached results 
+      mutable std::vector<double>        m_results  {}          ;
+      /// the current entry 
+      mutable std::size_t                m_cursor   { 0 }       ;
+      /// are the cached results valid?
+      mutable bool                       m_valid    { false }   ;
+      /// the values of observables for the current entry 
+      mutable std::vector<double>        m_xs       {}          ;
+      // ======================================================================
+    } ;
     // ========================================================================
     /** @class PyPdf PyPdf.h Ostap/PyPdf.h
      *  Helper intermediate base class to implement "purely-python" RooAbsPdf
@@ -154,6 +266,19 @@ namespace Ostap
       // the actual evaluation of function
       Double_t evaluate() const override;
       // ======================================================================
+    public: // vectorized evaluation 
+      // ======================================================================
+      /// set python callable for the vectorized evaluation 
+      void setBatch    ( PyObject* function ) { m_batch.setFunction ( function ) ; }
+      /** attach the dataset for the vectorized evaluation 
+       *  @return true if the vectorized evaluation is active 
+       */
+      bool attachBatch ( const RooAbsData& data ) { return m_batch.attach ( data , m_varlist ) ; }
+      /// detach the dataset and clear the cache 
+      void detachBatch () { m_batch.detach () ; }
+      /// get the helper object for the vectorized evaluation 
+      const PyBatch& batch () const { return m_batch ; }
+      // ======================================================================
     public: // analytical integrals 
       // ======================================================================
       Int_t    getAnalyticalIntegral
@@ -199,6 +324,11 @@ namespace Ostap
       mutable const char*       m_rangeName { nullptr } ;
       mutable Int_t             m_intCode   { 0       } ; 
       // ======================================================================  
+    private: 
+      // ======================================================================  
+      /// helper object for the vectorized evaluation 
+      PyBatch      m_batch   {} ; //! helper object for the vectorized evaluation 
+      // ======================================================================  
     } ;
     // ========================================================================
     /** @class PyPdf2 Ostap/PyPdf.h
@@ -272,6 +402,19 @@ namespace Ostap
       // the actual evaluation of function
       Double_t evaluate() const override;
       // ======================================================================
+    public: // vectorized evaluation 
+      // ======================================================================
+      /// set python callable for the vectorized evaluation 
+      void setBatch    ( PyObject* function ) { m_batch.setFunction ( function ) ; }
+      /** attach the dataset for the vectorized evaluation 
+       *  @return true if the vectorized evaluation is active 
+       */
+      bool attachBatch ( const RooAbsData& data ) { return m_batch.attach ( data , m_varlist ) ; }
+      /// detach the dataset and clear the cache 
+      void detachBatch () { m_batch.detach () ; }
+      /// get the helper object for the vectorized evaluation 
+      const PyBatch& batch () const { return m_batch ; }
+      // ======================================================================
     private:
       // ======================================================================
       // python partner
@@ -279,6 +422,8 @@ namespace Ostap
       PyObject*    m_arguments { nullptr } ; // argument cache
       /// all variables as list of variables 
       RooListProxy m_varlist   {} ; // all variables as list of variables 
+      /// helper object for the vectorized evaluation 
+      PyBatch      m_batch     {} ; //! helper object for the vectorized evaluation 
       // ======================================================================  
     } ;
     // ========================================================================
@@ -0,0 +1,103 @@
+// ============================================================================
+#ifndef OSTAP_ROOFITARRAYS_H
+#define OSTAP_ROOFITARRAYS_H 1
+// ============================================================================
+// Include files
+// ============================================================================
+// Forward declarations
+// ============================================================================
+class RooAbsReal       ; // from RooFit
+class RooAbsRealLValue ; // from RooFit
+class RooArgSet        ; // from RooFit
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  namespace MoreRooFit
+  {
+    // ========================================================================
+    /** @class Arrays Ostap/RooFitArrays.h
+     *  Helper class to evaluate RooFit function/PDF for many points
+     *  in a single C++ loop, e.g. for numpy arrays
+     *  - the points outside the ranges of variables get zero values
+     *  - the values of the variables are restored at the end
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-27
+     */
+    class Arrays
+    {
+    public:
+      // ======================================================================
+      /** evaluate the function for the 1D-array of points
+       *  @param fun     (INPUT)  the function
+       *  @param xvar    (INPUT)  the x-variable
+       *  @param x       (INPUT)  the x-values
+       *  @param result  (UPDATE) the buffer for results
+       *  @param n       (INPUT)  the number of points
+       *  @param normset (INPUT)  the normalization set (if any)
+       *  @return number of points within the ranges of the variables
+       */
+      static unsigned long evaluate
+      ( const RooAbsReal&   fun               ,
+        RooAbsRealLValue&   xvar              ,
+        const double*       x                 ,
+        double*             result            ,
+        const unsigned long n                 ,
+        const RooArgSet*    normset = nullptr ) ;
+      // ======================================================================
+      /** evaluate the function for the 2D-array of points
+       *  @param fun     (INPUT)  the function
+       *  @param xvar    (INPUT)  the x-variable
+       *  @param x       (INPUT)  the x-values
+       *  @param yvar    (INPUT)  the y-variable
+       *  @param y       (INPUT)  the y-values
+       *  @param result  (UPDATE) the buffer for results
+       *  @param n       (INPUT)  the number of points
+       *  @param normset (INPUT)  the normalization set (if any)
+       *  @return number of points within the ranges of the variables
+       */
+      static unsigned long evaluate
+      ( const RooAbsReal&   fun               ,
+        RooAbsRealLValue&   xvar              ,
+        const double*       x                 ,
+        RooAbsRealLValue&   yvar              ,
+        const double*       y                 ,
+        double*             result            ,
+        const unsigned long n                 ,
+        const RooArgSet*    normset = nullptr ) ;
+      // ======================================================================
+      /** evaluate the function for the 3D-array of points
+       *  @param fun     (INPUT)  the function
+       *  @param xvar    (INPUT)  the x-variable
+       *  @param x       (INPUT)  the x-values
+       *  @param yvar    (INPUT)  the y-variable
+       *  @param y       (INPUT)  the y-values
+       *  @param zvar    (INPUT)  the z-variable
+       *  @param z       (INPUT)  the z-values
+       *  @param result  (UPDATE) the buffer for results
+       *  @param n       (INPUT)  the number of points
+       *  @param normset (INPUT)  the normalization set (if any)
+       *  @return number of points within the ranges of the variables
+       */
+      static unsigned long evaluate
+      ( const RooAbsReal&   fun               ,
+        RooAbsRealLValue&   xvar              ,
+        const double*       x                 ,
+        RooAbsRealLValue&   yvar              ,
+        const double*       y                 ,
+        RooAbsRealLValue&   zvar              ,
+        const double*       z                 ,
+        double*             result            ,
+        const unsigned long n                 ,
+        const RooArgSet*    normset = nullptr ) ;
+      // ======================================================================
+    } ;
+    // ========================================================================
+  } //                                    The end of namespace Ostap::MoreRooFit
+  // ==========================================================================
+} //                                                 The end of namespace Ostap
+// ============================================================================
+//                                                                      The END
+// ============================================================================
+#endif // OSTAP_ROOFITARRAYS_H
+// ============================================================================
@@ -21,6 +21,7 @@ class RooAbsData ; // RooFit
 #include "Ostap/ValueWithError.h"
 #include "Ostap/SymmetricMatrixTypes.h"
 #include "Ostap/DataFrame.h"
+#include "Ostap/TDigest.h"
 // ============================================================================
 namespace Ostap
 {
@@ -1021,6 +1022,52 @@ namespace Ostap
       const unsigned long        first      = 0    ,
       const unsigned long        last       = LAST ) ;
     // ========================================================================
+  public:
+    // ========================================================================    
+    /**  fill the mergeable quantile sketch (t-digest) 
+     *   @param tree   (INPUT)  the input tree 
+     *   @param digest (UPDATE) the digest to be filled 
+     *   @param expr   (INPUT)  the expression 
+     *   @param cuts   (INPUT)  selection/weighting criteria 
+     *   @param first  (INPUT)  the first  event to process 
+     *   @param last   (INPUT)  the last event to  process
+     *   @return number of added entries 
+     *   @code
+     *   TTree& tree = ... ;
+     *   Ostap::Math::TDigest digest { 200 } ;
+     *   Ostap::StatVar::digest ( tree , digest , "mass" , "pt>3" ) ;
+     *   const double median = digest.quantile ( 0.5 ) ;
+     *   @endcode 
+     *   @see Ostap::Math::TDigest
+     */
+    static unsigned long digest
+    ( TTree&                     tree             ,
+      Ostap::Math::TDigest&      digest           , 
+      const std::string&         expr             , 
+      const std::string&         cuts      = ""   , 
+      const unsigned long        first     = 0    ,
+      const unsigned long        last      = LAST ) ;
+    // ========================================================================
+    /**  fill the mergeable quantile sketch (t-digest) 
+     *   @param data      (INPUT)  the input data
+     *   @param digest    (UPDATE) the digest to be filled 
+     *   @param expr      (INPUT)  the expression 
+     *   @param cuts      (INPUT)  selection/weighting criteria 
+     *   @param cut_range (INPUT)  cut range 
+     *   @param first     (INPUT)  the first  event to process 
+     *   @param last      (INPUT)  the last event to  process
+     *   @return number of added entries 
+     *   @see Ostap::Math::TDigest
+     */
+    static unsigned long digest
+    ( const RooAbsData&          data              ,
+      Ostap::Math::TDigest&      digest            , 
+      const std::string&         expr              , 
+      const std::string&         cuts       = ""   , 
+      const std::string&         cut_range  = ""   , 
+      const unsigned long        first      = 0    ,
+      const unsigned long        last       = LAST ) ;
+    // ========================================================================
   public:
     // ========================================================================    
     /**  get quantiles of the distribution  
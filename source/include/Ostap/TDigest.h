@@ -0,0 +1,177 @@
+// ============================================================================
+#ifndef OSTAP_TDIGEST_H
+#define OSTAP_TDIGEST_H 1
+// ============================================================================
+// Include files
+// ============================================================================
+// STD&STL
+// ============================================================================
+#include <vector>
+#include <limits>
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  namespace Math
+  {
+    // ========================================================================
+    /** @class TDigest Ostap/TDigest.h
+     *  Mergeable streaming sketch for the (approximate) quantiles:
+     *  the "merging" variant of t-digest with \f$ k_1\f$ scale function
+     *  \f$ k(q) = \frac{\delta}{2\pi} \sin^{-1} \left( 2q-1 \right) \f$
+     *
+     *  - bounded memory: the number of centroids is \f$ \mathcal{O}(\delta) \f$
+     *  - any number of quantiles from the single pass
+     *  - weighted entries (only positive weights are accepted, 
+     *    the number of rejected entries is available via <code>rejected()</code>)
+     *  - two sketches can be merged, e.g. for parallel processing
+     *  - relative accuracy is better for the tails \f$ q\rightarrow 0,1 \f$
+     *
+     *  @code
+     *  TDigest digest { 200 } ;
+     *  for ( ... ) { digest.add ( x , w ) ; }
+     *  const double median = digest.quantile ( 0.5 ) ;
+     *  @endcode
+     *  @see T.Dunning, O.Ertl, "Computing extremely accurate quantiles using t-digests"
+     *  @see https://arxiv.org/abs/1902.04023
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-12
+     */
+    class TDigest
+    {
+    public:
+      // ======================================================================
+      /** constructor
+       *  @param compression the compression parameter \f$ \delta \f$,
+       *         larger values give better accuracy and more centroids
+       */
+      TDigest ( const double compression = 100 ) ;
+      // ======================================================================
+      /** full constructor (e.g. for serialization)
+       *  @param compression the compression parameter
+       *  @param means       the means of centroids
+       *  @param weights     the weights of centroids
+       *  @param xmin        the minimal value
+       *  @param xmax        the maximal value
+       *  @param n           number of added entries
+       *  @param rejected    number of rejected entries
+       */
+      TDigest ( const double               compression ,
+                const std::vector<double>& means       ,
+                const std::vector<double>& weights     ,
+                const double               xmin        ,
+                const double               xmax        ,
+                const unsigned long long   n           ,
+                const unsigned long long   rejected = 0 ) ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /** add the value with the weight
+       *  @param x the value
+       *  @param w the weight (non-positive weights are ignored)
+       *  @return true if the value is accepted
+       *  @see TDigest::rejected 
+       */
+      bool add ( const double x , const double w = 1 ) ;
+      // ======================================================================
+      /// add several values with the same weight
+      template <class ITERATOR>
+      unsigned long add
+      ( ITERATOR     begin ,
+        ITERATOR     end   ,
+        const double w = 1 )
+      {
+        unsigned long n = 0 ;
+        for ( ; begin != end ; ++begin ) { if ( add ( *begin , w ) ) { ++n ; } }
+        return n ;
+      }
+      // ======================================================================
+      /// merge with another digest
+      TDigest& add ( const TDigest& right ) ;
+      // ======================================================================
+      /// merge with another digest
+      TDigest& operator+= ( const TDigest& right ) { return add ( right ) ; }
+      /// add the value
+      TDigest& operator+= ( const double   x     ) {  add ( x ) ; return *this ; }
+      // ======================================================================
+    public:
+      // ======================================================================
+      /** get the (approximate) quantile
+       *  @param q quantile \f$ 0 \le q \le 1 \f$
+       *  @return the quantile (NaN for empty digest)
+       */
+      double quantile ( const double q ) const ;
+      /// get several (approximate) quantiles
+      std::vector<double> quantiles ( const std::vector<double>& qs ) const ;
+      /** get the (approximate) cumulative distribution function
+       *  @param x the value
+       *  @return CDF  (NaN for empty digest)
+       */
+      double cdf      ( const double x ) const ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// compression parameter
+      double             compression () const { return m_compression ; }
+      /// number of added entries
+      unsigned long long n           () const { return m_n           ; }
+      /// number of rejected entries (non-positive weights or non-finite values)
+      unsigned long long rejected    () const { return m_rejected    ; }
+      /// total weight of added entries
+      double             weight      () const ;
+      /// minimal value
+      double             xmin        () const { return m_xmin        ; }
+      /// maximal value
+      double             xmax        () const { return m_xmax        ; }
+      /// empty digest ?
+      bool               empty       () const { return 0 == m_n      ; }
+      /// number of centroids (after compression)
+      unsigned long      size        () const ;
+      /// the means of centroids (after compression)
+      const std::vector<double>& means   () const ;
+      /// the weights of centroids (after compression)
+      const std::vector<double>& weights () const ;
+      // ======================================================================
+    public:
+      // ======================================================================
+      /// compress the buffered values
+      void compress () const ;
+      /// reset the digest
+      void reset    () ;
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// the scale function
+      double k ( const double q ) const ;
+      // ======================================================================
+    private:
+      // ======================================================================
+      /// compression parameter
+      double                      m_compression { 100 } ;
+      /// means of the merged centroids
+      mutable std::vector<double> m_means       {} ;
+      /// weights of the merged centroids
+      mutable std::vector<double> m_weights     {} ;
+      /// buffered values
+      mutable std::vector<double> m_bmeans      {} ;
+      /// weights of buffered values
+      mutable std::vector<double> m_bweights    {} ;
+      /// minimal value
+      double m_xmin {   std::numeric_limits<double>::max () } ;
+      /// maximal value
+      double m_xmax { - std::numeric_limits<double>::max () } ;
+      /// number of added entries
+      unsigned long long          m_n           { 0 } ;
+      /// number of rejected entries
+      unsigned long long          m_rejected    { 0 } ;
+      // ======================================================================
+    } ;
+    // ========================================================================
+  } //                                         The end of namespace Ostap::Math
+  // ==========================================================================
+} //                                                 The end of namespace Ostap
+// ============================================================================
+//                                                                      The END
+// ============================================================================
+#endif // OSTAP_TDIGEST_H
+// ============================================================================
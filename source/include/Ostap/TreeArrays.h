@@ -0,0 +1,67 @@
+// ============================================================================
+#ifndef OSTAP_TREEARRAYS_H 
+#define OSTAP_TREEARRAYS_H 1
+// ============================================================================
+// Include files 
+// ============================================================================
+// STD&STL
+// ============================================================================ 
+#include <limits>
+#include <string>
+#include <vector>
+// ============================================================================
+// Forward declarations 
+// ============================================================================
+class TTree   ; // from ROOT 
+// ============================================================================
+namespace Ostap
+{
+  // ==========================================================================
+  namespace Trees
+  { 
+    // ========================================================================
+    /** @class Arrays Ostap/TreeArrays.h
+     *  Helper class to read the columns (expressions) from TTree/TChain 
+     *  into the contiguous preallocated buffer, e.g. numpy array 
+     *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+     *  @date   2021-03-05
+     */
+    class Arrays 
+    {
+    public:
+      // ======================================================================
+      /** fill the buffer with the values of expressions for selected entries 
+       *  - all expressions and the selection are compiled only once
+       *  - the buffer is column-major: value of the expression <code>i</code>
+       *    for the selected row <code>j</code> is 
+       *    <code>buffer [ i * capacity + j ]</code>
+       *  - for array-like expressions only the first element is used
+       *  - the processing stops when the buffer is full
+       *  @param tree        (INPUT)  input tree 
+       *  @param buffer      (UPDATE) the buffer of size <code>capacity * expressions.size()</code>
+       *  @param capacity    (INPUT)  the maximal number of rows 
+       *  @param expressions (INPUT)  the list of expressions (columns)
+       *  @param selection   (INPUT)  the selection criteria 
+       *  @param first       (INPUT)  the first entry to process 
+       *  @param last        (INPUT)  the last entry to process (not including!)
+       *  @return number of filled rows, or -1 for invalid arguments 
+       */
+      static long fill 
+      ( TTree*                          tree            , 
+        double*                         buffer          , 
+        const unsigned long             capacity        , 
+        const std::vector<std::string>& expressions     ,
+        const std::string&              selection  = "" ,
+        const unsigned long             first      = 0                                         ,
+        const unsigned long             last       = std::numeric_limits<unsigned long>::max() ) ;
+      // ======================================================================
+    } ;
+    // ========================================================================
+  } //                                         The end of namespace Ostap::Trees
+  // ==========================================================================
+} //                                                 The end of namespace Ostap
+// ============================================================================
+//                                                                      The END 
+// ============================================================================
+#endif // OSTAP_TREEARRAYS_H
+// ============================================================================
@@ -0,0 +1,71 @@
+// ============================================================================
+// Include files 
+// ============================================================================
+// ROOT/RooFit
+// ============================================================================
+#include "RVersion.h"
+#include "RooAbsData.h"
+#include "RooAbsReal.h"
+#include "RooAbsCategory.h"
+#include "RooArgSet.h"
+// ============================================================================
+// Ostap
+// ============================================================================
+#include "Ostap/Iterator.h"
+#include "Ostap/DataHash.h"
+// ============================================================================
+// Local
+// ============================================================================
+#include "local_hash.h"
+// ============================================================================
+/** @file 
+ *  implementation file for function Ostap::Utils::hash_data
+ *  @see Ostap::Utils::hash_data
+ *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+ *  @date 2021-03-19
+ */
+// ============================================================================
+/*  get the hash/checksum of the dataset content:
+ *  the values of all variables (and weights) for all entries
+ *  @param data (INPUT) dataset
+ *  @return hash/checksum of the dataset content 
+ */
+// ============================================================================
+std::size_t Ostap::Utils::hash_data ( const RooAbsData* data ) 
+{
+  if ( nullptr == data ) { return 0 ; }                         // RETURN 
+  //
+  const unsigned long nEntries = data->numEntries () ;
+  const bool          weighted = data->isWeighted () ;
+  //
+  std::size_t seed = std::hash_combine ( nEntries , weighted ) ;
+  //
+  for ( unsigned long entry = 0 ; entry < nEntries ; ++entry )   
+  {
+    const RooArgSet* vars = data->get ( entry ) ;
+    if ( nullptr == vars ) { break ; }                          // BREAK 
+    //
+    Ostap::Utils::Iterator iter ( *vars ) ;
+    while ( RooAbsArg* a = iter.static_next<RooAbsArg>() )
+    {
+      const RooAbsReal*     r = dynamic_cast<const RooAbsReal*>     ( a ) ;
+      if      ( r ) { std::_hash_combine ( seed , r->getVal () ) ; }
+      else 
+      {
+        const RooAbsCategory* c = dynamic_cast<const RooAbsCategory*> ( a ) ;
+#if ROOT_VERSION_CODE < ROOT_VERSION(6,22,0)
+        if ( c ) { std::_hash_combine ( seed , c->getIndex        () ) ; }
+#else 
+        if ( c ) { std::_hash_combine ( seed , c->getCurrentIndex () ) ; }
+#endif
+      }
+    }
+    //
+    if ( weighted ) { std::_hash_combine ( seed , data->weight () ) ; }
+  }
+  //
+  return seed ;
+}
+// ============================================================================
+//                                                                      The END 
+// ============================================================================
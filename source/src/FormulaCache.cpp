@@ -0,0 +1,184 @@
+// ============================================================================
+// Include files 
+// ============================================================================
+// ROOT
+// ============================================================================
+#include "TROOT.h"
+#include "TTree.h"
+#include "TCollection.h"
+#include "TSeqCollection.h"
+// ============================================================================
+// Ostap
+// ============================================================================
+#include "Ostap/Formula.h"
+#include "Ostap/FormulaCache.h"
+// ============================================================================
+/** @file
+ *  Implementation file for class Ostap::FormulaCache
+ *  @see Ostap::FormulaCache
+ *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+ *  @date   2021-03-10
+ */
+// ============================================================================
+ClassImp(Ostap::FormulaCache)
+// ============================================================================
+// virtual destructor 
+// ============================================================================
+Ostap::FormulaCache::~FormulaCache () 
+{
+  if ( nullptr != gROOT && nullptr != gROOT->GetListOfCleanups() ) 
+  { gROOT->GetListOfCleanups()->Remove ( this ) ; }
+}
+// ============================================================================
+// the only instance 
+// ============================================================================
+Ostap::FormulaCache& Ostap::FormulaCache::instance () 
+{
+  // ATTENTION: it is never deleted, ROOT keeps the pointer in list of cleanups 
+  static FormulaCache* s_cache = nullptr ;
+  if ( nullptr == s_cache ) 
+  {
+    s_cache = new FormulaCache () ;
+    if ( nullptr != gROOT && nullptr != gROOT->GetListOfCleanups() ) 
+    { gROOT->GetListOfCleanups()->Add ( s_cache ) ; }
+  }
+  return *s_cache ;
+}
+// ============================================================================
+/*  get the (cached) formula for the given expression and tree 
+ *  @param expression (INPUT) the expression 
+ *  @param tree       (INPUT) the tree 
+ *  @return the formula (check <code>ok()</code> for validity)
+ */
+// ============================================================================
+std::shared_ptr<Ostap::Formula> 
+Ostap::FormulaCache::formula
+( const std::string& expression , 
+  TTree*             tree       ) 
+{ return formula ( "" , expression , tree ) ; }
+// ============================================================================
+/*  get the (cached) formula for the given expression and tree 
+ *  @param name       (INPUT) the name (not used for the key) 
+ *  @param expression (INPUT) the expression 
+ *  @param tree       (INPUT) the tree 
+ *  @return the formula (check <code>ok()</code> for validity)
+ */
+// ============================================================================
+std::shared_ptr<Ostap::Formula> 
+Ostap::FormulaCache::formula
+( const std::string& name       , 
+  const std::string& expression , 
+  TTree*             tree       ) 
+{
+  //
+  FormulaCache& cache = instance () ;
+  //
+  if ( !cache.m_enabled || nullptr == tree ) 
+  { return std::make_shared<Ostap::Formula> ( name , expression , tree ) ; }
+  //
+  const KEY key { tree , expression } ;
+  auto it = cache.m_cache.find ( key ) ;
+  if ( cache.m_cache.end() != it ) 
+  {
+    ++cache.m_hits ;
+    // ATTENTION: always notify the formula: the leaves could be updated by 
+    // the previous loop, or the current tree in TChain could be changed 
+    // since the last use (e.g. the loop has ended at the last file and 
+    // the chain has been rewound afterwards) 
+    if ( nullptr != tree->GetTree () ) { it->second -> Notify () ; }
+    return it->second ;
+  }
+  //
+  ++cache.m_misses ;
+  auto result = std::make_shared<Ostap::Formula> ( name , expression , tree ) ;
+  // do not keep invalid formulas 
+  if ( !result || !result->ok() ) { return result ; }
+  //
+  // keep the cache size under control 
+  if ( cache.m_maxsize <= cache.m_cache.size() ) { cache.m_cache.clear() ; }
+  //
+  // get notification when the tree is deleted 
+  tree->SetBit ( kMustCleanup ) ;
+  //
+  cache.m_cache [ key ] = result ;
+  //
+  return result ;
+}
+// ============================================================================
+// number of cache hits 
+// ============================================================================
+unsigned long long Ostap::FormulaCache::hits    () { return instance().m_hits          ; }
+// ============================================================================
+// number of cache misses 
+// ============================================================================
+unsigned long long Ostap::FormulaCache::misses  () { return instance().m_misses        ; }
+// ============================================================================
+// number of cached formulas 
+// ============================================================================
+unsigned long      Ostap::FormulaCache::size    () { return instance().m_cache.size()  ; }
+// ============================================================================
+// is cache enabled? 
+// ============================================================================
+bool               Ostap::FormulaCache::enabled () { return instance().m_enabled       ; }
+// ============================================================================
+// maximal number of cached formulas 
+// ============================================================================
+unsigned long      Ostap::FormulaCache::maxSize () { return instance().m_maxsize       ; }
+// ============================================================================
+// enable/disable the cache, return the previous state  
+// ============================================================================
+bool Ostap::FormulaCache::enable ( const bool value ) 
+{
+  FormulaCache& cache = instance () ;
+  const bool old  = cache.m_enabled ;
+  cache.m_enabled = value ;
+  if ( !value ) { cache.m_cache.clear () ; }
+  return old ;
+}
+// ============================================================================
+// set the maximal number of cached formulas 
+// ============================================================================
+void Ostap::FormulaCache::setMaxSize ( const unsigned long value ) 
+{
+  FormulaCache& cache = instance () ;
+  cache.m_maxsize = value ;
+  if ( value < cache.m_cache.size() ) { cache.m_cache.clear () ; }
+}
+// ============================================================================
+// clear the cache and reset the counters 
+// ============================================================================
+void Ostap::FormulaCache::clear () 
+{
+  FormulaCache& cache = instance () ;
+  cache.m_cache.clear () ;
+  cache.m_hits   = 0 ;
+  cache.m_misses = 0 ;
+}
+// ============================================================================
+// remove all formulas for the given tree 
+// ============================================================================
+void Ostap::FormulaCache::clear ( const TTree* tree ) 
+{
+  FormulaCache& cache = instance () ;
+  for ( auto it = cache.m_cache.begin() ; cache.m_cache.end() != it ; ) 
+  {
+    if ( tree == it->first.first ) { it = cache.m_cache.erase ( it ) ; }
+    else                           { ++it ; }
+  }
+}
+// ============================================================================
+// remove the entries for the deleted trees 
+// ============================================================================
+void Ostap::FormulaCache::RecursiveRemove ( TObject* obj ) 
+{
+  if ( nullptr == obj || m_cache.empty() ) { return ; }
+  for ( auto it = m_cache.begin() ; m_cache.end() != it ; ) 
+  {
+    const TObject* tree = it->first.first ;
+    if ( tree == obj ) { it = m_cache.erase ( it ) ; }
+    else               { ++it ; }
+  }
+}
+// ============================================================================
+//                                                                      The END 
+// ============================================================================
@@ -1,9 +1,15 @@
 // ============================================================================
 // Include files
 // ============================================================================
+// STD & STL
+// ============================================================================
+#include <algorithm>
+#include <memory>
+// ============================================================================
 // ROOT 
 // ============================================================================
 #include "RooDataSet.h"
+#include "TTree.h"
 #include "TH1.h"
 #include "TH2.h"
 #include "TH3.h"
@@ -12,9 +18,11 @@
 // ============================================================================
 #include "Ostap/StatVar.h"
 #include "Ostap/Formula.h"
+#include "Ostap/FormulaCache.h"
 #include "Ostap/FormulaVar.h"
 #include "Ostap/HistoProject.h"
 #include "Ostap/Iterator.h"
+#include "Ostap/Notifier.h"
 // ============================================================================
 #include "OstapDataFrame.h"
 #include "local_math.h"
@@ -594,5 +602,245 @@ Ostap::StatusCode Ostap::HistoProject::project3
   return Ostap::StatusCode::SUCCESS ;
 }
 // ============================================================================
+namespace 
+{
+  // ==========================================================================
+  /** make a single-pass projection of TTree into many histograms 
+   *  and collect the statistics for many expressions in the same loop 
+   *  @see Ostap::HistoProject::projectMany 
+   *  @param rows (UPDATE) number of selected rows summed over all projections
+   *  @return number of selected entries, or -1 for invalid arguments 
+   */
+  long _project_many_ 
+  ( TTree*                           tree        , 
+    const std::vector<TH1*>&         histos      ,
+    const std::vector<std::string>&  expressions ,
+    std::vector<Ostap::WStatEntity>& stats       , 
+    const std::vector<std::string>&  statexprs   ,
+    std::vector<Ostap::Math::WCovariance>& covs  , 
+    const std::vector<std::string>&  covexprs    ,
+    const std::string&               selection   ,
+    const unsigned long              first       ,
+    const unsigned long              last        , 
+    long&                            rows        ) 
+  {
+    //
+    rows = 0 ;
+    //
+    const unsigned int NS = statexprs.size () ;
+    stats.resize ( NS ) ;
+    for ( auto& s : stats ) { s.reset () ; }
+    //
+    const unsigned int NC = covexprs.size () / 2 ;
+    covs.resize ( NC ) ;
+    for ( auto& c : covs  ) { c.reset () ; }
+    //
+    if ( nullptr == tree                    ) { return -1 ; }  // RETURN 
+    if ( histos.empty() && statexprs.empty() && covexprs.empty() ) { return -1 ; }  // RETURN 
+    if ( covexprs.size () != 2 * NC         ) { return -1 ; }  // RETURN 
+    //
+    // check the consistency of histograms and expressions 
+    unsigned int nexpr = 0 ;
+    for ( const TH1* h : histos ) 
+    {
+      if ( nullptr == h ) { return -1 ; }                      // RETURN 
+      const int dim = h -> GetDimension () ;
+      if ( dim < 1 || 3 < dim ) { return -1 ; }                // RETURN 
+      nexpr += dim ;
+    }
+    if ( nexpr != expressions.size() ) { return -1 ; }         // RETURN 
+    //
+    // compile all expressions only once 
+    typedef std::shared_ptr<Ostap::Formula> UOF ;
+    std::vector<UOF> formulas ; formulas.reserve ( nexpr + NS + 2 * NC ) ;
+    for ( const auto& e : expressions ) 
+    {
+      auto p = Ostap::FormulaCache::formula ( e , tree ) ;
+      if ( !p || !p->ok() ) { return -1 ; }                    // RETURN 
+      formulas.push_back ( std::move ( p ) ) ;
+    }
+    for ( const auto& e : statexprs ) 
+    {
+      auto p = Ostap::FormulaCache::formula ( e , tree ) ;
+      if ( !p || !p->ok() ) { return -1 ; }                    // RETURN 
+      formulas.push_back ( std::move ( p ) ) ;
+    }
+    for ( const auto& e : covexprs ) 
+    {
+      auto p = Ostap::FormulaCache::formula ( e , tree ) ;
+      if ( !p || !p->ok() ) { return -1 ; }                    // RETURN 
+      formulas.push_back ( std::move ( p ) ) ;
+    }
+    //
+    // compile the selection 
+    UOF cuts {} ;
+    if ( !trivial ( selection ) ) 
+    {
+      cuts = Ostap::FormulaCache::formula ( selection , tree ) ;
+      if ( !cuts || !cuts->ok() ) { return -1 ; }              // RETURN 
+    }
+    //
+    // reset the histograms 
+    for ( TH1* h : histos ) { h->Reset() ; }
+    //
+    Ostap::Utils::Notifier notify ( formulas.begin() , formulas.end() , cuts.get() , tree ) ;
+    //
+    const unsigned long nEntries = 
+      std::min ( last , (unsigned long) tree->GetEntries() ) ;
+    //
+    std::vector<double> xs {} ;
+    std::vector<double> ys {} ;
+    std::vector<double> zs {} ;
+    //
+    long selected = 0 ;
+    for ( unsigned long entry = first ; entry < nEntries ; ++entry )
+    {
+      //
+      long ievent = tree->GetEntryNumber ( entry ) ;
+      if ( 0 > ievent ) { break ; }                            // BREAK 
+      //
+      ievent      = tree->LoadTree ( ievent ) ;
+      if ( 0 > ievent ) { break ; }                            // BREAK 
+      //
+      // selection weight 
+      const double w = cuts ? cuts->evaluate () : 1.0 ;
+      if ( !w ) { continue ; }
+      //
+      ++selected ;
+      //
+      unsigned int index = 0 ;
+      for ( TH1* h : histos ) 
+      {
+        const int dim = h -> GetDimension () ;
+        if      ( 1 == dim ) 
+        {
+          formulas [ index     ] -> evaluate ( xs ) ;
+          for ( const double x : xs ) { h -> Fill ( x , w ) ; }
+          rows += xs.size () ;
+        }
+        else if ( 2 == dim ) 
+        {
+          formulas [ index     ] -> evaluate ( xs ) ;
+          formulas [ index + 1 ] -> evaluate ( ys ) ;
+          TH2* h2 = static_cast<TH2*> ( h ) ;
+          const std::size_t n = std::min ( xs.size () , ys.size () ) ;
+          for ( std::size_t i = 0 ; i < n ; ++i ) 
+          { h2 -> Fill ( xs [ i ] , ys [ i ] , w ) ; }
+          rows += n ;
+        }
+        else 
+        {
+          formulas [ index     ] -> evaluate ( xs ) ;
+          formulas [ index + 1 ] -> evaluate ( ys ) ;
+          formulas [ index + 2 ] -> evaluate ( zs ) ;
+          TH3* h3 = static_cast<TH3*> ( h ) ;
+          const std::size_t n = std::min ( { xs.size () , ys.size () , zs.size () } ) ;
+          for ( std::size_t i = 0 ; i < n ; ++i ) 
+          { h3 -> Fill ( xs [ i ] , ys [ i ] , zs [ i ] , w ) ; }
+          rows += n ;
+        }
+        index += dim ;
+      }
+      //
+      // statistics 
+      for ( unsigned int i = 0 ; i < NS ; ++i ) 
+      {
+        formulas [ nexpr + i ] -> evaluate ( xs ) ;
+        for ( const double x : xs ) { stats [ i ].add ( x , w ) ; }
+      }
+      //
+      // covariances: the pairs of values with the same index  
+      for ( unsigned int i = 0 ; i < NC ; ++i ) 
+      {
+        formulas [ nexpr + NS + 2 * i     ] -> evaluate ( xs ) ;
+        formulas [ nexpr + NS + 2 * i + 1 ] -> evaluate ( ys ) ;
+        const std::size_t n = std::min ( xs.size () , ys.size () ) ;
+        for ( std::size_t k = 0 ; k < n ; ++k ) { covs [ i ].add ( xs [ k ] , ys [ k ] , w ) ; }
+      }
+    }
+    //
+    return selected ;
+  }
+  // ==========================================================================
+}
+// ============================================================================
+/*  make a single-pass projection of TTree into many histograms 
+ *  - all expressions and the selection are compiled only once
+ *  - all histograms are filled in one event loop  
+ *  - each histogram consumes <code>histo->GetDimension()</code> 
+ *    expressions (x,y,z) from the list of expressions 
+ *  - the same histogram can be specified several times, 
+ *    that corresponds to the sum of projections 
+ *  @param tree        (INPUT)  input tree 
+ *  @param histos      (UPDATE) histograms 
+ *  @param expressions (INPUT)  expressions for all axes of all histograms 
+ *  @param selection   (INPUT)  selection criteria/weight 
+ *  @param first       (INPUT)  the first entry to process 
+ *  @param last        (INPUT)  the last entry to process (not including!)
+ *  @return number of selected rows summed over all projections 
+ *          (as for the sequence of <code>TTree::Project</code> calls), 
+ *          or -1 for invalid arguments 
+ */
+// ============================================================================
+long Ostap::HistoProject::projectMany
+( TTree*                          tree        , 
+  const std::vector<TH1*>&        histos      ,
+  const std::vector<std::string>& expressions ,
+  const std::string&              selection   ,
+  const unsigned long             first       ,
+  const unsigned long             last        ) 
+{
+  //
+  if ( histos.empty() ) { return -1 ; }                      // RETURN 
+  //
+  std::vector<Ostap::WStatEntity>       stats     {} ;
+  std::vector<std::string>              statexprs {} ;
+  std::vector<Ostap::Math::WCovariance> covs      {} ;
+  std::vector<std::string>              covexprs  {} ;
+  long rows = 0 ;
+  const long selected = _project_many_
+    ( tree , histos , expressions , stats , statexprs , covs , covexprs , selection , first , last , rows ) ;
+  //
+  return 0 <= selected ? rows : selected ;
+}
+// ============================================================================
+/*  make a single-pass projection of TTree into many histograms 
+ *  and collect the statistics and covariances for many expressions in the same loop 
+ *  - all expressions and the selection are compiled only once
+ *  - each histogram consumes <code>histo->GetDimension()</code> 
+ *    expressions (x,y,z) from the list of expressions 
+ *  - each covariance counter consumes two expressions from the list 
+ *    of covariance expressions, for array-like expressions the pairs 
+ *    of values with the same index are used 
+ *  @param tree        (INPUT)  input tree 
+ *  @param histos      (UPDATE) histograms 
+ *  @param expressions (INPUT)  expressions for all axes of all histograms 
+ *  @param stats       (UPDATE) statistics for the statistic expressions 
+ *  @param statexprs   (INPUT)  statistic expressions 
+ *  @param covs        (UPDATE) covariance counters 
+ *  @param covexprs    (INPUT)  pairs of expressions for covariance counters 
+ *  @param selection   (INPUT)  selection criteria/weight 
+ *  @param first       (INPUT)  the first entry to process 
+ *  @param last        (INPUT)  the last entry to process (not including!)
+ *  @return number of selected entries, or -1 for invalid arguments 
+ */
+// ============================================================================
+long Ostap::HistoProject::projectMany
+( TTree*                           tree        , 
+  const std::vector<TH1*>&         histos      ,
+  const std::vector<std::string>&  expressions ,
+  std::vector<Ostap::WStatEntity>& stats       , 
+  const std::vector<std::string>&  statexprs   ,
+  std::vector<Ostap::Math::WCovariance>& covs  , 
+  const std::vector<std::string>&  covexprs    ,
+  const std::string&               selection   ,
+  const unsigned long              first       ,
+  const unsigned long              last        ) 
+{
+  long rows = 0 ;
+  return _project_many_
+    ( tree , histos , expressions , stats , statexprs , covs , covexprs , selection , first , last , rows ) ;
+}
+// ============================================================================
 //                                                                      The END 
 // ============================================================================
@@ -8,12 +8,18 @@
 // STD&STL
 // ============================================================================
 #include <cstring>
+#include <algorithm>
 // ============================================================================
 // ROOT 
 // ============================================================================
 #include "RVersion.h"
 #include "TPython.h"
 // ============================================================================
+// RooFit 
+// ============================================================================
+#include "RooAbsData.h"
+#include "RooArgSet.h"
+// ============================================================================
 // Ostap
 // ============================================================================
 #include "Ostap/PyPdf.h"
@@ -28,6 +34,7 @@
  *  Implementation file for class Ostap::Models::PyPdf 
  *  @see  Ostap::Models::PyPdf
  *  @see  Ostap::Models::PyPdf2
+ *  @see  Ostap::Models::PyBatch
  *  @date 2018-06-06 
  *  @author Vanya Belyaev Ivan.Belyaev@itep.ru
  */
@@ -40,6 +47,236 @@ namespace
   static char s_getAI   [] = "get_analytical_integral"  ;
   static char s_AI      [] = "analytical_integral"      ;
   // ==========================================================================
+  /// the window to look for the current entry in the vectorized evaluation
+  const std::size_t s_window = 16 ;
+  // ==========================================================================
+}
+// ============================================================================
+// PyBatch
+// ============================================================================
+// copy constructor: the callable and the columns are shared, cache is not copied
+// ============================================================================
+Ostap::Models::PyBatch::PyBatch
+( const Ostap::Models::PyBatch& right ) 
+  : m_function ( right.m_function ) 
+  , m_columns  ( right.m_columns  )
+{
+  if ( m_function ) { Py_XINCREF ( m_function ) ; }
+}
+// ============================================================================
+// destructor 
+// ============================================================================
+Ostap::Models::PyBatch::~PyBatch() 
+{
+  if ( m_function ) { Py_DECREF ( m_function ) ; m_function = nullptr ; }
+}
+// ============================================================================
+// set python callable for the vectorized evaluation
+// ============================================================================
+void Ostap::Models::PyBatch::setFunction ( PyObject* function ) 
+{
+  if ( Py_None == function ) { function = nullptr ; }
+  //
+  Ostap::Assert ( nullptr == function || PyCallable_Check ( function ) , 
+                  "Function is not callable"   , 
+                  "PyBatch::setFunction"       ,
+                  Ostap::StatusCode(500)       ) ;
+  //
+  if ( function   ) { Py_INCREF ( function   ) ; }
+  if ( m_function ) { Py_DECREF ( m_function ) ; }
+  m_function = function ;
+  m_valid    = false    ;
+}
+// ============================================================================
+/*  attach the dataset: get the columns of observables 
+ *  @param data    the dataset 
+ *  @param varlist all variables 
+ *  @return true if the vectorized evaluation is active 
+ */
+// ============================================================================
+bool Ostap::Models::PyBatch::attach 
+( const RooAbsData& data    , 
+  const RooArgList& varlist ) 
+{
+  detach () ;
+  if ( !m_function ) { return false ; }                             // RETURN
+  //
+  const RooArgSet* vars = data.get () ;
+  if ( !vars       ) { return false ; }                             // RETURN 
+  //
+  auto columns = std::make_shared<Columns> () ;
+  std::vector<const RooAbsReal*> obs ;
+  const unsigned short nv = varlist.getSize () ;
+  for ( unsigned short i = 0 ; i < nv ; ++i ) 
+  {
+    const RooAbsArg*  a = varlist.at ( i ) ;
+    const RooAbsArg*  d = a ? vars->find ( a->GetName () ) : nullptr ;
+    if ( !d ) { continue ; }
+    const RooAbsReal* v = dynamic_cast<const RooAbsReal*> ( d ) ;
+    if ( !v ) { return false ; }                                    // RETURN 
+    columns->index.push_back ( i ) ;
+    obs           .push_back ( v ) ;
+  }
+  if ( obs.empty () ) { return false ; }                            // RETURN 
+  //
+  const std::size_t N = data.numEntries () ;
+  columns->size = N ;
+  columns->data.resize ( obs.size () , std::vector<double> ( N , 0.0 ) ) ;
+  for ( std::size_t k = 0 ; k < N ; ++k ) 
+  {
+    data.get ( k ) ;
+    for ( std::size_t j = 0 ; j < obs.size () ; ++j ) 
+    { columns->data [ j ] [ k ] = obs [ j ]->getVal () ; }
+  }
+  //
+  m_columns = columns ;
+  m_xs.resize ( obs.size () ) ;
+  //
+  return true ;
+}
+// ============================================================================
+// detach the dataset and clear the cache 
+// ============================================================================
+void Ostap::Models::PyBatch::detach () 
+{
+  m_columns.reset () ;
+  m_params .clear () ;
+  m_results.clear () ;
+  m_xs     .clear () ;
+  m_cursor = 0       ;
+  m_valid  = false   ;
+}
+// ============================================================================
+/*  get the cached value for the current entry 
+ *  @param varlist all variables 
+ *  @param result  (OUTPUT) the cached value 
+ *  @return true if the value is found in the cache 
+ */
+// ============================================================================
+bool Ostap::Models::PyBatch::value
+( const RooArgList& varlist , 
+  double&           result  ) const 
+{
+  if ( !active () ) { return false ; }                              // RETURN 
+  //
+  const Columns& cols = *m_columns ;
+  const unsigned short nv = varlist.getSize () ;
+  if ( m_params.size () != nv ) { m_params.assign ( nv , 0.0 ) ; m_valid = false ; }
+  //
+  // (1) get the observables and check the parameters 
+  std::size_t j = 0 ;
+  for ( unsigned short i = 0 ; i < nv ; ++i ) 
+  {
+    const double v = static_cast<const RooAbsReal*> ( varlist.at ( i ) )->getVal () ;
+    if ( j < cols.index.size () && i == cols.index [ j ] ) { m_xs [ j ] = v ; ++j ; }
+    else if ( !m_valid || v != m_params [ i ] ) { m_params [ i ] = v ; m_valid = false ; }
+  }
+  //
+  // (2) (re)fill the cache for the new parameters 
+  if ( !m_valid ) { fill ( varlist ) ; }
+  //
+  // (3) locate the current entry: near the cursor or the first entry 
+  auto match = [&cols,this] ( const std::size_t k ) -> bool
+    {
+      for ( std::size_t i = 0 ; i < cols.data.size () ; ++i ) 
+      { if ( cols.data [ i ] [ k ] != m_xs [ i ] ) { return false ; } }
+      return true ;
+    } ;
+  //
+  const std::size_t last = std::min ( m_cursor + s_window , cols.size ) ;
+  std::size_t       k    = m_cursor ;
+  while ( k < last && !match ( k ) ) { ++k ; }
+  if    ( last <= k ) { k = 0 < cols.size && match ( 0 ) ? 0 : cols.size ; }
+  //
+  if ( cols.size <= k ) { ++cols.misses ; return false ; }          // RETURN
+  //
+  result   = m_results [ k ] ;
+  m_cursor = k + 1 ;
+  ++cols.hits ;
+  //
+  return true ;
+}
+// ============================================================================
+// invoke the python callable for all entries 
+// ============================================================================
+void Ostap::Models::PyBatch::fill ( const RooArgList& varlist ) const 
+{
+  const Columns& cols = *m_columns ;
+  const unsigned short nv = varlist.getSize () ;
+  //
+  PyObject* arguments = PyTuple_New ( nv ) ;
+  std::size_t j = 0 ;
+  for ( unsigned short i = 0 ; i < nv ; ++i ) 
+  {
+    PyObject* item = nullptr ;
+    if ( j < cols.index.size () && i == cols.index [ j ] ) 
+    {
+      // observable: the whole column as a buffer 
+      char*            buffer = reinterpret_cast<char*> ( const_cast<double*> ( cols.data [ j ].data () ) ) ;
+      const Py_ssize_t size   = cols.size * sizeof ( double ) ;
+#if defined (PY_MAJOR_VERSION)  and PY_MAJOR_VERSION < 3
+      item = PyBuffer_FromMemory     ( buffer , size ) ;
+#else 
+      item = PyMemoryView_FromMemory ( buffer , size , PyBUF_READ ) ;
+#endif 
+      ++j ;
+    }
+    else { item = PyFloat_FromDouble ( m_params [ i ] ) ; } // parameter 
+    //
+    if ( !item || 0 != PyTuple_SetItem ( arguments , i , item ) ) 
+    {
+      PyErr_Print () ;
+      Py_DECREF ( arguments ) ;
+      Ostap::throwException ( "Can't fill PyTuple"   ,
+                              "PyBatch::fill"        ,
+                              Ostap::StatusCode(500) ) ;
+    }
+  }
+  //
+  PyObject* result = PyObject_CallObject ( m_function , arguments ) ;
+  Py_DECREF ( arguments ) ;
+  ++cols.calls ;
+  //
+  if ( !result ) 
+  {
+    PyErr_Print () ;
+    Ostap::throwException ( "Invalid ``result''"   ,
+                            "PyBatch::fill"        ,
+                            Ostap::StatusCode(500) ) ;
+  }
+  //
+  // get the results via the buffer protocol 
+  Py_buffer view ;
+  if ( 0 != PyObject_GetBuffer ( result , &view , PyBUF_C_CONTIGUOUS | PyBUF_FORMAT ) ) 
+  {
+    PyErr_Print () ;
+    Py_DECREF ( result ) ;
+    Ostap::throwException ( "``result'' does not support buffer protocol" ,
+                            "PyBatch::fill"        ,
+                            Ostap::StatusCode(500) ) ;
+  }
+  //
+  const bool ok = 
+    sizeof ( double )             == view.itemsize         && 
+    cols.size * sizeof ( double ) == std::size_t ( view.len ) &&
+    nullptr != view.format && 'd' == view.format [ std::strlen ( view.format ) - 1 ] ;
+  //
+  if ( ok ) 
+  {
+    const double* data = static_cast<const double*> ( view.buf ) ;
+    m_results.assign ( data , data + cols.size ) ;
+  }
+  //
+  PyBuffer_Release ( &view   ) ;
+  Py_DECREF        ( result ) ;
+  //
+  Ostap::Assert ( ok                              , 
+                  "Invalid type/size of ``result''" , 
+                  "PyBatch::fill"                 ,
+                  Ostap::StatusCode(500)          ) ;
+  //
+  m_cursor = 0    ;
+  m_valid  = true ;
 }
 // ============================================================================
 #if defined(OSTAP_OLD_PYROOT) && OSTAP_OLD_PYROOT
@@ -126,6 +363,7 @@ Ostap::Models::PyPdf::PyPdf
     //
   , m_self     ( right.m_self ) 
   , m_varlist  ( "!varlist" , this , right.m_varlist ) 
+  , m_batch    ( right.m_batch ) 
 {
   Py_XINCREF ( m_self ) ;
 }
@@ -137,6 +375,7 @@ Ostap::Models::PyPdf::PyPdf
   const char*                 name  ) 
   : RooAbsPdf ( right , name ) 
   , m_varlist  ( "!varlist" , this , right.m_varlist ) 
+  , m_batch    ( right.m_batch ) 
 {}
 // ============================================================================
 #endif 
@@ -441,6 +680,10 @@ Bool_t Ostap::Models::PyPdf::matchArgs ( const RooArgSet& refVars ) const
 Double_t Ostap::Models::PyPdf::evaluate() const 
 { 
   // ==========================================================================
+  // vectorized evaluation: the cached value for the current entry
+  double result = 0 ;
+  if ( m_batch.value ( m_varlist , result ) ) { return result ; }    // RETURN 
+  // ==========================================================================
 #if defined(OSTAP_OLD_PYROOT) && OSTAP_OLD_PYROOT
   // ==========================================================================
   return call_method ( m_self , s_evaluate ) ; 
@@ -538,6 +781,7 @@ Ostap::Models::PyPdf2::PyPdf2
     //
   , m_function ( right.m_function ) 
   , m_varlist  ( "!varlist" , this , right.m_varlist ) 
+  , m_batch    ( right.m_batch    ) 
 {
   if ( m_function ) { Py_XINCREF ( m_function  ) ; }
   m_arguments = PyTuple_New ( m_varlist.getSize() ) ;
@@ -560,6 +804,9 @@ Ostap::Models::PyPdf2::clone ( const char* name ) const
 // ============================================================================
 Double_t Ostap::Models::PyPdf2::evaluate() const 
 {
+  // vectorized evaluation: the cached value for the current entry
+  double value = 0 ;
+  if ( m_batch.value ( m_varlist , value ) ) { return value ; }      // RETURN 
   // 
   if  ( 0 == m_function || !PyCallable_Check( m_function ) ) 
   {
@@ -0,0 +1,160 @@
+// ============================================================================
+// Include files
+// ============================================================================
+// STD & STL
+// ============================================================================
+#include <array>
+// ============================================================================
+// ROOT/RooFit
+// ============================================================================
+#include "RooAbsReal.h"
+#include "RooAbsRealLValue.h"
+#include "RooArgSet.h"
+// ============================================================================
+// Ostap
+// ============================================================================
+#include "Ostap/RooFitArrays.h"
+// ============================================================================
+/** @file
+ *  Implementation file for class Ostap::MoreRooFit::Arrays
+ *  @see Ostap::MoreRooFit::Arrays
+ *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+ *  @date   2021-03-27
+ */
+// ============================================================================
+namespace
+{
+  // ==========================================================================
+  /** evaluate the function for N-dimensional array of points
+   *  @param fun     the function
+   *  @param vars    the variables
+   *  @param values  the values of variables
+   *  @param result  the buffer for results
+   *  @param n       the number of points
+   *  @param normset the normalization set (if any)
+   *  @return number of points within the ranges of the variables
+   */
+  template <std::size_t N>
+  unsigned long _evaluate_
+  ( const RooAbsReal&                        fun     ,
+    const std::array<RooAbsRealLValue*,N>&   vars    ,
+    const std::array<const double*,N>&       values  ,
+    double*                                  result  ,
+    const unsigned long                      n       ,
+    const RooArgSet*                         normset )
+  {
+    if ( nullptr == result || 0 == n ) { return 0 ; }               // RETURN
+    //
+    std::array<double,N> saved ;
+    std::array<double,N> vmin  ;
+    std::array<double,N> vmax  ;
+    for ( std::size_t k = 0 ; k < N ; ++k )
+    {
+      saved [ k ] = vars [ k ]->getVal () ;
+      vmin  [ k ] = vars [ k ]->getMin () ;
+      vmax  [ k ] = vars [ k ]->getMax () ;
+    }
+    //
+    unsigned long good = 0 ;
+    for ( unsigned long i = 0 ; i < n ; ++i )
+    {
+      bool inrange = true ;
+      for ( std::size_t k = 0 ; k < N && inrange ; ++k )
+      {
+        const double v = values [ k ][ i ] ;
+        if ( v < vmin [ k ] || vmax [ k ] < v ) { inrange = false ; }
+        else { vars [ k ]->setVal ( v ) ; }
+      }
+      if ( !inrange ) { result [ i ] = 0 ; continue ; }             // CONTINUE
+      //
+      result [ i ] = nullptr != normset ? fun.getVal ( normset ) : fun.getVal () ;
+      ++good ;
+    }
+    //
+    for ( std::size_t k = 0 ; k < N ; ++k ) { vars [ k ]->setVal ( saved [ k ] ) ; }
+    //
+    return good ;
+  }
+  // ==========================================================================
+}
+// ============================================================================
+/*  evaluate the function for the 1D-array of points
+ *  @param fun     (INPUT)  the function
+ *  @param xvar    (INPUT)  the x-variable
+ *  @param x       (INPUT)  the x-values
+ *  @param result  (UPDATE) the buffer for results
+ *  @param n       (INPUT)  the number of points
+ *  @param normset (INPUT)  the normalization set (if any)
+ *  @return number of points within the ranges of the variables
+ */
+// ============================================================================
+unsigned long Ostap::MoreRooFit::Arrays::evaluate
+( const RooAbsReal&   fun     ,
+  RooAbsRealLValue&   xvar    ,
+  const double*       x       ,
+  double*             result  ,
+  const unsigned long n       ,
+  const RooArgSet*    normset )
+{
+  if ( nullptr == x ) { return 0 ; }                                // RETURN
+  return _evaluate_<1> ( fun , { { &xvar } } , { { x } } , result , n , normset ) ;
+}
+// ============================================================================
+/*  evaluate the function for the 2D-array of points
+ *  @param fun     (INPUT)  the function
+ *  @param xvar    (INPUT)  the x-variable
+ *  @param x       (INPUT)  the x-values
+ *  @param yvar    (INPUT)  the y-variable
+ *  @param y       (INPUT)  the y-values
+ *  @param result  (UPDATE) the buffer for results
+ *  @param n       (INPUT)  the number of points
+ *  @param normset (INPUT)  the normalization set (if any)
+ *  @return number of points within the ranges of the variables
+ */
+// ============================================================================
+unsigned long Ostap::MoreRooFit::Arrays::evaluate
+( const RooAbsReal&   fun     ,
+  RooAbsRealLValue&   xvar    ,
+  const double*       x       ,
+  RooAbsRealLValue&   yvar    ,
+  const double*       y       ,
+  double*             result  ,
+  const unsigned long n       ,
+  const RooArgSet*    normset )
+{
+  if ( nullptr == x || nullptr == y ) { return 0 ; }                // RETURN
+  return _evaluate_<2> ( fun , { { &xvar , &yvar } } , { { x , y } } , result , n , normset ) ;
+}
+// ============================================================================
+/*  evaluate the function for the 3D-array of points
+ *  @param fun     (INPUT)  the function
+ *  @param xvar    (INPUT)  the x-variable
+ *  @param x       (INPUT)  the x-values
+ *  @param yvar    (INPUT)  the y-variable
+ *  @param y       (INPUT)  the y-values
+ *  @param zvar    (INPUT)  the z-variable
+ *  @param z       (INPUT)  the z-values
+ *  @param result  (UPDATE) the buffer for results
+ *  @param n       (INPUT)  the number of points
+ *  @param normset (INPUT)  the normalization set (if any)
+ *  @return number of points within the ranges of the variables
+ */
+// ============================================================================
+unsigned long Ostap::MoreRooFit::Arrays::evaluate
+( const RooAbsReal&   fun     ,
+  RooAbsRealLValue&   xvar    ,
+  const double*       x       ,
+  RooAbsRealLValue&   yvar    ,
+  const double*       y       ,
+  RooAbsRealLValue&   zvar    ,
+  const double*       z       ,
+  double*             result  ,
+  const unsigned long n       ,
+  const RooArgSet*    normset )
+{
+  if ( nullptr == x || nullptr == y || nullptr == z ) { return 0 ; } // RETURN
+  return _evaluate_<3> ( fun , { { &xvar , &yvar , &zvar } } , { { x , y , z } } , result , n , normset ) ;
+}
+// ============================================================================
+//                                                                      The END
+// ============================================================================
@@ -20,6 +20,7 @@
 // Ostap
 // ============================================================================
 #include "Ostap/Formula.h"
+#include "Ostap/FormulaCache.h"
 #include "Ostap/Iterator.h"
 #include "Ostap/Notifier.h"
 #include "Ostap/MatrixUtils.h"
@@ -27,6 +28,7 @@
 #include "Ostap/FormulaVar.h"
 #include "Ostap/P2Quantile.h"
 #include "Ostap/Moments.h"
+#include "Ostap/Covariance.h"
 // ============================================================================
 // Local
 // ============================================================================
@@ -810,6 +812,99 @@ namespace
     return Ostap::StatVar::Quantiles ( std::vector<double>( qs.begin (), qs.end () )  , num ) ;
   }
   // ==========================================================================
+  /*   fill the mergeable quantile sketch (t-digest)
+   *   @param tree   (INPUT)  the input tree 
+   *   @param digest (UPDATE) the digest
+   *   @param var    (INPUT)  the expression 
+   *   @param cuts   (INPUT)  selection/weighting criteria 
+   *   @param  first (INPUT)  the first  event to process 
+   *   @param  last  (INPUT)  the last event to  process
+   *   @return number of added entries 
+   */
+  unsigned long 
+  _digest_
+  ( TTree&                  tree      ,
+    Ostap::Math::TDigest&   digest    , 
+    Ostap::Formula&         var       ,
+    Ostap::Formula*         cuts      , 
+    const unsigned long     first     ,
+    const unsigned long     last      ) 
+  {
+    // the loop 
+    const unsigned long the_last = std::min ( last , (unsigned long) tree.GetEntries() ) ;
+    //
+    Ostap::Utils::Notifier notify ( &tree , &var , cuts ) ;
+    const bool with_cuts = nullptr != cuts ? true : false ;
+    //
+    unsigned long num = 0  ;
+    std::vector<double> results {} ;
+    for ( unsigned long entry = first ; entry < the_last ; ++entry ) 
+    {      
+      long ievent = tree.GetEntryNumber ( entry ) ;
+      if ( 0 > ievent ) { break ; }                        // BREAK
+      //
+      ievent      = tree.LoadTree ( ievent ) ;
+      if ( 0 > ievent ) { break ; }                        // BREAK
+      //
+      const double w = with_cuts ? cuts->evaluate() : 1.0 ;
+      //
+      if ( !w  ) { continue ; }                           // CONTINUE       
+      //
+      var.evaluate  ( results ) ;
+      num += digest.add ( results.begin() , results.end () , w ) ;
+    }
+    //
+    return num ;
+  }
+  // ==========================================================================
+  /*   fill the mergeable quantile sketch (t-digest)
+   *   @param data      (INPUT)  the input data 
+   *   @param digest    (UPDATE) the digest
+   *   @param var       (INPUT)  the expression 
+   *   @param cuts      (INPUT)  selection/weighting criteria 
+   *   @param first     (INPUT)  the first  event to process 
+   *   @param last      (INPUT)  the last event to  process
+   *   @param cut_range (INPUT)  cut range 
+   *   @return number of added entries 
+   */
+  unsigned long 
+  _digest_
+  ( const RooAbsData&       data      ,
+    Ostap::Math::TDigest&   digest    , 
+    const RooAbsReal&       var       ,
+    const RooAbsReal*       cuts      , 
+    const unsigned long     first     ,
+    const unsigned long     last      , 
+    const char*             cut_range ) 
+  {
+    // the loop 
+    const unsigned long the_last = std::min ( last , (unsigned long) data.numEntries() ) ;
+    //
+    const bool  weighted = data.isWeighted () ;
+    //
+    unsigned long num = 0 ;
+    for ( unsigned long entry = first ; entry < the_last ; ++entry )
+    {
+      const RooArgSet* vars = data.get( entry ) ;
+      if ( nullptr == vars )                              { break    ; } // BREAK 
+      //
+      if ( cut_range && !vars->allInRange ( cut_range ) ) { continue ; } // CONTINUE    
+      // apply cuts:
+      const double wc = nullptr != cuts ? cuts -> getVal() : 1.0 ;
+      if ( !wc ) { continue ; }                                          // CONTINUE  
+      // apply weight:
+      const double wd = weighted  ? data.weight()   : 1.0 ;
+      if ( !wd ) { continue ; }                                          // CONTINUE    
+      // cuts & weight:
+      const double w  = wd *  wc ; 
+      if ( !w  ) { continue ; }                                          // CONTINUE        
+      //
+      if ( digest.add ( var.getVal() , w ) ) { ++num ; }
+    }
+    //
+    return num ;
+  }
+  // ==========================================================================
   /** calculate the moment of order "order" relative to the center "center"
    *  @param  tree   (INPUT) input tree 
    *  @param  expr   (INPUT) expression  (must  be valid TFormula!)
@@ -926,7 +1021,8 @@ Ostap::StatVar::statVar
 {
   Statistic result ;
   if ( 0 == tree || last <= first ) { return result ; }  // RETURN
-  Ostap::Formula formula ( expression , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_formula { Ostap::FormulaCache::formula ( expression , tree ) } ;
+  Ostap::Formula& formula = *p_formula ;
   if ( !formula.GetNdim() )         { return result ; }  // RETURN
   //
   Ostap::Utils::Notifier notify ( tree , &formula ) ;
@@ -978,9 +1074,11 @@ Ostap::StatVar::statVar
   //
   Ostap::StatVar::Statistic result ;
   if ( 0 == tree || last <= first ) { return result ; }  // RETURN
-  Ostap::Formula selection ( cuts      , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_selection { Ostap::FormulaCache::formula ( cuts      , tree ) } ;
+  Ostap::Formula& selection = *p_selection ;
   if ( !selection.ok () ) { return result ; }            // RETURN
-  Ostap::Formula formula   ( expression , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_formula { Ostap::FormulaCache::formula ( expression , tree ) } ;
+  Ostap::Formula& formula = *p_formula ;
   if ( !formula  .ok () ) { return result ; }            // RETURN
   //
   Ostap::Utils::Notifier notify ( tree , &selection,  &formula ) ;
@@ -1063,12 +1161,12 @@ unsigned long Ostap::StatVar::statVars
   if ( 0 == tree || last <= first ) { return 0 ; }  // RETURN
   if ( expressions.empty()        ) { return 0 ; }  // RETURN  
   //
-  typedef std::unique_ptr<Ostap::Formula> UOF ;
+  typedef std::shared_ptr<Ostap::Formula> UOF ;
   std::vector<UOF> formulas ; formulas.reserve ( N ) ;
   //
   for ( const auto& e : expressions  ) 
   {
-    auto p = std::make_unique<Ostap::Formula>( e , tree ) ;
+    auto p = Ostap::FormulaCache::formula ( e , tree ) ;
     if ( !p || !p->ok() ) { return 0 ; }
     formulas.push_back ( std::move ( p ) ) ;  
   }
@@ -1133,14 +1231,15 @@ unsigned long Ostap::StatVar::statVars
   if ( 0 == tree || last <= first ) { return 0 ; }  // RETURN
   if ( expressions.empty()        ) { return 0 ; }  // RETURN  
   //
-  Ostap::Formula selection ( cuts , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_selection { Ostap::FormulaCache::formula ( cuts , tree ) } ;
+  Ostap::Formula& selection = *p_selection ;
   if ( !selection .ok ()          ) { return 0 ; }  // RETURN
   //
-  typedef std::unique_ptr<Ostap::Formula> UOF ;
+  typedef std::shared_ptr<Ostap::Formula> UOF ;
   std::vector<UOF> formulas ; formulas.reserve ( N ) ;
   for ( const auto& e : expressions  ) 
   {
-    auto p = std::make_unique<Ostap::Formula>( e , tree ) ;
+    auto p = Ostap::FormulaCache::formula ( e , tree ) ;
     if ( !p || !p->ok() ) { return 0 ; }
     formulas.push_back ( std::move ( p ) ) ;
   }
@@ -1231,9 +1330,11 @@ Ostap::StatVar::statCov
   Ostap::Math::setToScalar ( cov2 , 0.0 ) ;
   //
   if ( 0 == tree || last <= first ) { return 0 ; }         // RETURN
-  Ostap::Formula formula1 ( exp1 , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_formula1 { Ostap::FormulaCache::formula ( exp1 , tree ) } ;
+  Ostap::Formula& formula1 = *p_formula1 ;
   if ( !formula1 .ok () ) { return 0 ; }                   // RETURN
-  Ostap::Formula formula2 ( exp2 , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_formula2 { Ostap::FormulaCache::formula ( exp2 , tree ) } ;
+  Ostap::Formula& formula2 = *p_formula2 ;
   if ( !formula2 .ok () ) { return 0 ; }                   // RETURN
   //
   Ostap::Utils::Notifier notify ( tree , &formula1 , &formula2 ) ;
@@ -1319,11 +1420,14 @@ Ostap::StatVar::statCov
   Ostap::Math::setToScalar ( cov2 , 0.0 ) ;
   //
   if ( 0 == tree || last <= first ) { return 0 ; }              // RETURN
-  Ostap::Formula formula1 ( exp1 , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_formula1 { Ostap::FormulaCache::formula ( exp1 , tree ) } ;
+  Ostap::Formula& formula1 = *p_formula1 ;
   if ( !formula1 .ok () ) { return 0 ; }                        // RETURN
-  Ostap::Formula formula2 ( exp2 , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_formula2 { Ostap::FormulaCache::formula ( exp2 , tree ) } ;
+  Ostap::Formula& formula2 = *p_formula2 ;
   if ( !formula2 .ok () ) { return 0 ; }                        // RETURN
-  Ostap::Formula selection ( cuts      , tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_selection { Ostap::FormulaCache::formula ( cuts      , tree ) } ;
+  Ostap::Formula& selection = *p_selection ;
   if ( !selection.ok () ) { return 0 ; }                        // RETURN
   //
   Ostap::Utils::Notifier notify ( tree , &formula1 , &formula2 ) ;
@@ -1664,10 +1768,10 @@ double Ostap::StatVar::nEff
   const unsigned long  last  ) 
 {
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               , 
                     "Invalid cut:\"" + cuts + '\"' ,
                     "Ostap::StatVar::nEff"         ) ;
@@ -1699,15 +1803,16 @@ double Ostap::StatVar::get_moment
   //
   if ( 0 == order ){ return 1 ; } // RETURN 
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                            , 
                   "Invalid expression:'" + expr + "'" ,
                   "Ostap::StatVar::moment"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               , 
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::moment"       ) ;
@@ -1739,15 +1844,16 @@ Ostap::StatVar::moment
   //
   if ( 0 == order ){ return 1 ; } // RETURN 
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              ,
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::moment"              ) ;  
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               ,   
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::moment"       ) ;
@@ -1780,15 +1886,16 @@ Ostap::StatVar::central_moment
   if      ( 0 == order ){ return 1 ; } // RETURN 
   else if ( 1 == order ){ return 0 ; } // RETURN 
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              , 
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::central_moment"      ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()                 , 
                     "Invalid cut:\"" + cuts + "\""   ,
                     "Ostap::StatVar::central_moment" ) ;
@@ -1815,15 +1922,16 @@ Ostap::StatVar::skewness
   const unsigned long  last  ) 
 {
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              , 
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::skewness"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               , 
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::skewness"     ) ;
@@ -1850,15 +1958,16 @@ Ostap::StatVar::kurtosis
   const unsigned long  last  ) 
 {
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                             , 
                   "Invalid expression:\"" + expr + "\"" , 
                   "Ostap::StatVar::kurtosis"            ) ;  
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( "", cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( "", cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               ,  
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::kurtosis"     ) ;
@@ -1890,15 +1999,16 @@ Ostap::StatVar::quantile
                   "Invalid quantile"         ,
                   "Ostap::StatVar::quantile" ) ;
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              , 
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::quantile"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( "", cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( "", cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               ,
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::quantile"     ) ;
@@ -1937,15 +2047,16 @@ Ostap::StatVar::p2quantile
                   "Invalid quantile"         ,
                   "Ostap::StatVar::quantile" ) ;
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              , 
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::quantile"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( "", cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( "", cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               ,
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::quantile"     ) ;
@@ -1996,15 +2107,16 @@ Ostap::StatVar::quantiles
                   "Invalid quantile"          ,
                   "Ostap::StatVar::quantiles" ) ;
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              ,
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::quantile"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               , 
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::quantile"     ) ;
@@ -2045,15 +2157,16 @@ Ostap::StatVar::p2quantiles
                   "Invalid quantile"          ,
                   "Ostap::StatVar::quantiles" ) ;
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              ,
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::quantile"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               , 
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::quantile"     ) ;
@@ -2062,6 +2175,44 @@ Ostap::StatVar::p2quantiles
   return _p2quantiles_ ( tree , qs , var  ,  cut.get() , first , last ) ; 
 }
 // ============================================================================
+/*   fill the mergeable quantile sketch (t-digest) 
+ *   @param tree   (INPUT)  the input tree 
+ *   @param digest (UPDATE) the digest to be filled 
+ *   @param expr   (INPUT)  the expression 
+ *   @param cuts   (INPUT)  selection/weighting criteria 
+ *   @param first  (INPUT)  the first  event to process 
+ *   @param last   (INPUT)  the last event to  process
+ *   @return number of added entries 
+ */
+// ============================================================================
+unsigned long 
+Ostap::StatVar::digest
+( TTree&                     tree      ,
+  Ostap::Math::TDigest&      digest    , 
+  const std::string&         expr      , 
+  const std::string&         cuts      , 
+  const unsigned long        first     ,
+  const unsigned long        last      ) 
+{
+  //
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
+  Ostap::Assert ( var.ok()                              ,
+                  "Invalid expression:\"" + expr + "\"" ,
+                  "Ostap::StatVar::digest"              ) ;
+  //
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
+  if  ( !cuts.empty() ) 
+  { 
+    cut = Ostap::FormulaCache::formula ( cuts , &tree ) ; 
+    Ostap::Assert ( cut && cut->ok()               , 
+                    "Invalid cut:\"" + cuts + "\"" ,
+                    "Ostap::StatVar::digest"       ) ;
+  }
+  //
+  return _digest_ ( tree , digest , var  ,  cut.get() , first , last ) ; 
+}
+// ============================================================================
 /*  get the interval of the distribution  
  *   @param tree  (INPUT) the input tree 
  *   @param q1    (INPUT) quantile value   0 < q1 < 1  
@@ -2095,15 +2246,16 @@ Ostap::StatVar::interval
                   "Invalid quantile2"        ,
                   "Ostap::StatVar::interval" ) ;
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              , 
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::interval"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( "", cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( "", cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               ,
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::interval"     ) ;
@@ -2152,15 +2304,16 @@ Ostap::StatVar::p2interval
                   "Invalid quantile2"        ,
                   "Ostap::StatVar::interval" ) ;
   //
-  Ostap::Formula var ( expr , &tree ) ;
+  const std::shared_ptr<Ostap::Formula> p_var { Ostap::FormulaCache::formula ( expr , &tree ) } ;
+  Ostap::Formula& var = *p_var ;
   Ostap::Assert ( var.ok()                              , 
                   "Invalid expression:\"" + expr + "\"" ,
                   "Ostap::StatVar::interval"            ) ;
   //
-  std::unique_ptr<Ostap::Formula> cut { nullptr } ;
+  std::shared_ptr<Ostap::Formula> cut { nullptr } ;
   if  ( !cuts.empty() ) 
   { 
-    cut = std::make_unique<Ostap::Formula>( "", cuts , &tree ) ; 
+    cut = Ostap::FormulaCache::formula ( "", cuts , &tree ) ; 
     Ostap::Assert ( cut && cut->ok()               ,
                     "Invalid cut:\"" + cuts + "\"" ,
                     "Ostap::StatVar::interval"     ) ;
@@ -2929,6 +3082,42 @@ Ostap::StatVar::p2quantiles
                          first , the_last , cutrange ) ;
 }
 // ============================================================================
+/*   fill the mergeable quantile sketch (t-digest) 
+ *   @param data      (INPUT)  the input data
+ *   @param digest    (UPDATE) the digest to be filled 
+ *   @param expr      (INPUT)  the expression 
+ *   @param cuts      (INPUT)  selection/weighting criteria 
+ *   @param cut_range (INPUT)  cut range 
+ *   @param first     (INPUT)  the first  event to process 
+ *   @param last      (INPUT)  the last event to  process
+ *   @return number of added entries 
+ */
+// ============================================================================
+unsigned long 
+Ostap::StatVar::digest
+( const RooAbsData&          data      ,
+  Ostap::Math::TDigest&      digest    , 
+  const std::string&         expr      , 
+  const std::string&         cuts      , 
+  const std::string&         cut_range , 
+  const unsigned long        first     ,
+  const unsigned long        last      )
+{
+  //
+  const unsigned long num_entries = data.numEntries() ;
+  const unsigned long the_last    = std::min ( num_entries , last ) ;
+  if ( the_last <= first ) { return 0 ; }                           // RETURN
+  //
+  const char* cutrange  = cut_range.empty() ?  nullptr : cut_range.c_str() ;
+  //
+  const std::unique_ptr<Ostap::FormulaVar> expression { make_formula ( expr , data        ) } ;
+  const std::unique_ptr<Ostap::FormulaVar> cut        { make_formula ( cuts , data , true ) } ;
+  //  
+  return _digest_ ( data  , digest , 
+                    *expression , cut.get() , 
+                    first , the_last , cutrange ) ;
+}
+// ============================================================================
 // Actions with frames 
 // ============================================================================
 /*  get the number of equivalent entries 
@@ -3084,9 +3273,9 @@ unsigned long Ostap::StatVar::statCov
   ROOT::GetImplicitMTPoolSize () ;
 #endif
   //
-  std::vector<Statistic>           _sta1 ( nSlots ? nSlots : 1 ) ;
-  std::vector<Statistic>           _sta2 ( nSlots ? nSlots : 1 ) ;
-  std::vector<Ostap::SymMatrix2x2> _cov2 ( nSlots ? nSlots : 1 ) ;
+  std::vector<Statistic>                _sta1 ( nSlots ? nSlots : 1 ) ;
+  std::vector<Statistic>                _sta2 ( nSlots ? nSlots : 1 ) ;
+  std::vector<Ostap::Math::WCovariance> _cov2 ( nSlots ? nSlots : 1 ) ;
   //
   auto fun = [&_sta1,&_sta2,&_cov2] 
     ( unsigned int slot , double v1 , double v2 , double w )  { 
@@ -3094,27 +3283,22 @@ unsigned long Ostap::StatVar::statCov
     {
       _sta1[slot].add ( v1 , w ) ; 
       _sta2[slot].add ( v2 , w ) ; 
-      _cov2[slot]( 0 , 0 ) += w * v1 * v1 ;
-      _cov2[slot]( 0 , 1 ) += w * v1 * v2 ;
-      _cov2[slot]( 1 , 1 ) += w * v2 * v2 ;        
+      _cov2[slot].add ( v1 , v2 , w ) ;
     }
   } ;
   t.ForeachSlot ( fun , { var1 , var2 , weight } ); 
   // 
+  Ostap::Math::WCovariance cov {} ;
   for ( const auto& s : _sta1 ) { stat1 += s ; }
   for ( const auto& s : _sta2 ) { stat2 += s ; }
-  for ( const auto& s : _cov2 ) { cov2  += s ; }
+  for ( const auto& s : _cov2 ) { cov   += s ; }
   //
   if  ( 0 == stat1.nEntries() ) { return 0 ; }
   //
-  cov2 /= stat1.nEntries() ;
-  //
-  const double v1_mean = stat1.mean() ;
-  const double v2_mean = stat2.mean() ;
-  //
-  cov2 ( 0 , 0 ) -= v1_mean * v1_mean ;
-  cov2 ( 0 , 1 ) -= v1_mean * v2_mean ;
-  cov2 ( 1 , 1 ) -= v2_mean * v2_mean ;
+  // the stable co-moments, normalised by the sum of weights (as for TTree)
+  cov2 ( 0 , 0 ) = cov.cov11 () ;
+  cov2 ( 0 , 1 ) = cov.cov12 () ;
+  cov2 ( 1 , 1 ) = cov.cov22 () ;
   //
   return stat1.nEntries () ;  
 }
@@ -0,0 +1,320 @@
+// ============================================================================
+// Include files
+// ============================================================================
+// STD&STL
+// ============================================================================
+#include <cmath>
+#include <numeric>
+#include <algorithm>
+// ============================================================================
+// Ostap
+// ============================================================================
+#include "Ostap/TDigest.h"
+// ============================================================================
+// Local
+// ============================================================================
+#include "Exception.h"
+// ============================================================================
+/** @file
+ *  Implementation file for class Ostap::Math::TDigest
+ *  @see Ostap::Math::TDigest
+ *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+ *  @date   2021-03-12
+ */
+// ============================================================================
+namespace
+{
+  // ==========================================================================
+  /// the default buffer size (in units of compression)
+  const std::size_t s_BUFFER = 5 ;
+  // ==========================================================================
+  /// interpolate between two points
+  inline double _interpolate_
+  ( const double x  ,
+    const double x0 , const double y0 ,
+    const double x1 , const double y1 )
+  { return x1 <= x0 ? 0.5 * ( y0 + y1 ) : y0 + ( x - x0 ) * ( y1 - y0 ) / ( x1 - x0 ) ; }
+  // ==========================================================================
+}
+// ============================================================================
+// constructor
+// ============================================================================
+Ostap::Math::TDigest::TDigest ( const double compression )
+  : m_compression ( compression )
+{
+  Ostap::Assert ( 10 <= m_compression                ,
+                  "Invalid compression parameter"     ,
+                  "Ostap::Math::TDigest"              ) ;
+}
+// ============================================================================
+// full constructor (e.g. for serialization)
+// ============================================================================
+Ostap::Math::TDigest::TDigest
+( const double               compression ,
+  const std::vector<double>& means       ,
+  const std::vector<double>& weights     ,
+  const double               xmin        ,
+  const double               xmax        ,
+  const unsigned long long   n           ,
+  const unsigned long long   rejected    )
+  : m_compression ( compression )
+  , m_means       ( means       )
+  , m_weights     ( weights     )
+  , m_xmin        ( xmin        )
+  , m_xmax        ( xmax        )
+  , m_n           ( n           )
+  , m_rejected    ( rejected    )
+{
+  Ostap::Assert ( 10 <= m_compression                ,
+                  "Invalid compression parameter"     ,
+                  "Ostap::Math::TDigest"              ) ;
+  Ostap::Assert ( m_means.size() == m_weights.size() ,
+                  "Mismatch in means/weights"         ,
+                  "Ostap::Math::TDigest"              ) ;
+  Ostap::Assert ( std::is_sorted ( m_means.begin() , m_means.end() ) ,
+                  "Centroids are not sorted"          ,
+                  "Ostap::Math::TDigest"              ) ;
+}
+// ============================================================================
+// the scale function
+// ============================================================================
+double Ostap::Math::TDigest::k ( const double q ) const
+{
+  static const double s_2pi = 2 * M_PI ;
+  return m_compression * std::asin ( 2 * std::min ( 1.0 , std::max ( 0.0 , q ) ) - 1 ) / s_2pi ;
+}
+// ============================================================================
+// add the value with the weight
+// ============================================================================
+bool Ostap::Math::TDigest::add ( const double x , const double w )
+{
+  if ( !std::isfinite ( x ) || !std::isfinite ( w ) || w <= 0 ) { ++m_rejected ; return false ; }
+  //
+  m_bmeans  .push_back ( x ) ;
+  m_bweights.push_back ( w ) ;
+  //
+  m_xmin = std::min ( m_xmin , x ) ;
+  m_xmax = std::max ( m_xmax , x ) ;
+  ++m_n ;
+  //
+  if ( s_BUFFER * m_compression <= m_bmeans.size() ) { compress () ; }
+  //
+  return true ;
+}
+// ============================================================================
+// merge with another digest
+// ============================================================================
+Ostap::Math::TDigest&
+Ostap::Math::TDigest::add ( const Ostap::Math::TDigest& right )
+{
+  if ( this == &right ) { return *this ; }
+  //
+  m_rejected += right.m_rejected ;
+  if ( right.empty() ) { return *this ; }
+  //
+  right.compress () ;
+  //
+  m_bmeans  .insert ( m_bmeans  .end () , right.m_means  .begin () , right.m_means  .end () ) ;
+  m_bweights.insert ( m_bweights.end () , right.m_weights.begin () , right.m_weights.end () ) ;
+  //
+  m_xmin = std::min ( m_xmin , right.m_xmin ) ;
+  m_xmax = std::max ( m_xmax , right.m_xmax ) ;
+  m_n   += right.m_n ;
+  //
+  compress () ;
+  //
+  return *this ;
+}
+// ============================================================================
+// compress the buffered values
+// ============================================================================
+void Ostap::Math::TDigest::compress () const
+{
+  if ( m_bmeans.empty() ) { return ; }
+  //
+  // (1) collect all centroids together
+  std::vector<double> means   { m_means   } ;
+  std::vector<double> weights { m_weights } ;
+  means  .insert ( means  .end () , m_bmeans  .begin () , m_bmeans  .end () ) ;
+  weights.insert ( weights.end () , m_bweights.begin () , m_bweights.end () ) ;
+  m_bmeans  .clear () ;
+  m_bweights.clear () ;
+  //
+  // (2) sort them
+  std::vector<std::size_t> index ( means.size() ) ;
+  std::iota ( index.begin () , index.end () , 0 ) ;
+  std::stable_sort ( index.begin () , index.end () ,
+                     [&means] ( const std::size_t i , const std::size_t j )
+                     { return means [ i ] < means [ j ] ; } ) ;
+  //
+  const double total = std::accumulate ( weights.begin () , weights.end () , 0.0 ) ;
+  //
+  // (3) merge the neighbours while the scale function allows
+  m_means  .clear () ;
+  m_weights.clear () ;
+  //
+  double wsum  = 0 ;
+  double klow  = k ( 0 ) ;
+  double mean  = means   [ index.front() ] ;
+  double wcur  = weights [ index.front() ] ;
+  for ( auto it = index.begin() + 1 ; index.end() != it ; ++it )
+  {
+    const double x = means   [ *it ] ;
+    const double w = weights [ *it ] ;
+    if ( k ( ( wsum + wcur + w ) / total ) - klow <= 1 )
+    {
+      wcur += w ;
+      mean += ( x - mean ) * w / wcur ;
+    }
+    else
+    {
+      m_means  .push_back ( mean ) ;
+      m_weights.push_back ( wcur ) ;
+      wsum += wcur ;
+      klow  = k ( wsum / total ) ;
+      mean  = x ;
+      wcur  = w ;
+    }
+  }
+  m_means  .push_back ( mean ) ;
+  m_weights.push_back ( wcur ) ;
+}
+// ============================================================================
+// reset the digest
+// ============================================================================
+void Ostap::Math::TDigest::reset ()
+{
+  m_means   .clear () ;
+  m_weights .clear () ;
+  m_bmeans  .clear () ;
+  m_bweights.clear () ;
+  m_xmin =   std::numeric_limits<double>::max () ;
+  m_xmax = - std::numeric_limits<double>::max () ;
+  m_n        = 0 ;
+  m_rejected = 0 ;
+}
+// ============================================================================
+// total weight of added entries
+// ============================================================================
+double Ostap::Math::TDigest::weight () const
+{
+  compress () ;
+  return std::accumulate ( m_weights.begin () , m_weights.end () , 0.0 ) ;
+}
+// ============================================================================
+// number of centroids (after compression)
+// ============================================================================
+unsigned long Ostap::Math::TDigest::size () const
+{
+  compress () ;
+  return m_means.size () ;
+}
+// ============================================================================
+// the means of centroids (after compression)
+// ============================================================================
+const std::vector<double>& Ostap::Math::TDigest::means   () const
+{
+  compress () ;
+  return m_means ;
+}
+// ============================================================================
+// the weights of centroids (after compression)
+// ============================================================================
+const std::vector<double>& Ostap::Math::TDigest::weights () const
+{
+  compress () ;
+  return m_weights ;
+}
+// ============================================================================
+/*  get the (approximate) quantile
+ *  @param q quantile \f$ 0 \le q \le 1 \f$
+ *  @return the quantile (NaN for empty digest)
+ */
+// ============================================================================
+double Ostap::Math::TDigest::quantile ( const double q ) const
+{
+  Ostap::Assert ( 0 <= q && q <= 1            ,
+                  "Invalid quantile"          ,
+                  "Ostap::Math::TDigest"      ) ;
+  //
+  if ( empty () ) { return std::numeric_limits<double>::quiet_NaN () ; }
+  //
+  compress () ;
+  //
+  const std::size_t N = m_means.size () ;
+  if ( 1 == N || m_xmax <= m_xmin )
+  { return 1 == N ? m_means.front() : m_xmin ; }
+  //
+  const double total = std::accumulate ( m_weights.begin () , m_weights.end () , 0.0 ) ;
+  const double index = q * total ;
+  //
+  // the left tail: between the minimum and the center of the first centroid
+  if ( index <= 0.5 * m_weights.front() )
+  { return _interpolate_ ( index , 0 , m_xmin , 0.5 * m_weights.front() , m_means.front() ) ; }
+  //
+  // the right tail: between the center of the last centroid and the maximum
+  if ( total - index <= 0.5 * m_weights.back() )
+  { return _interpolate_ ( total - index , 0 , m_xmax , 0.5 * m_weights.back() , m_means.back() ) ; }
+  //
+  // interpolate between the centers of neighbouring centroids
+  double wsum = 0.5 * m_weights.front() ;
+  for ( std::size_t i = 0 ; i + 1 < N ; ++i )
+  {
+    const double dw = 0.5 * ( m_weights [ i ] + m_weights [ i + 1 ] ) ;
+    if ( index <= wsum + dw )
+    { return _interpolate_ ( index , wsum , m_means [ i ] , wsum + dw , m_means [ i + 1 ] ) ; }
+    wsum += dw ;
+  }
+  //
+  return m_means.back () ;
+}
+// ============================================================================
+// get several (approximate) quantiles
+// ============================================================================
+std::vector<double>
+Ostap::Math::TDigest::quantiles ( const std::vector<double>& qs ) const
+{
+  std::vector<double> result ; result.reserve ( qs.size () ) ;
+  for ( const double q : qs ) { result.push_back ( quantile ( q ) ) ; }
+  return result ;
+}
+// ============================================================================
+/*  get the (approximate) cumulative distribution function
+ *  @param x the value
+ *  @return CDF  (NaN for empty digest)
+ */
+// ============================================================================
+double Ostap::Math::TDigest::cdf ( const double x ) const
+{
+  if ( empty () ) { return std::numeric_limits<double>::quiet_NaN () ; }
+  //
+  if      ( x <  m_xmin ) { return 0 ; }
+  else if ( x >= m_xmax ) { return 1 ; }
+  //
+  compress () ;
+  //
+  const std::size_t N     = m_means.size () ;
+  const double      total = std::accumulate ( m_weights.begin () , m_weights.end () , 0.0 ) ;
+  //
+  // the left tail
+  if ( x <= m_means.front() )
+  { return _interpolate_ ( x , m_xmin , 0 , m_means.front() , 0.5 * m_weights.front() ) / total ; }
+  //
+  // the right tail
+  if ( m_means.back() <= x )
+  { return 1 - _interpolate_ ( x , m_xmax , 0 , m_means.back() , 0.5 * m_weights.back() ) / total ; }
+  //
+  double wsum = 0.5 * m_weights.front() ;
+  for ( std::size_t i = 0 ; i + 1 < N ; ++i )
+  {
+    const double dw = 0.5 * ( m_weights [ i ] + m_weights [ i + 1 ] ) ;
+    if ( x < m_means [ i + 1 ] )
+    { return _interpolate_ ( x , m_means [ i ] , wsum , m_means [ i + 1 ] , wsum + dw ) / total ; }
+    wsum += dw ;
+  }
+  //
+  return 1 ;
+}
+// ============================================================================
+//                                                                      The END
+// ============================================================================
@@ -0,0 +1,104 @@
+// ============================================================================
+// Include files 
+// ============================================================================
+// STD & STL
+// ============================================================================
+#include <algorithm>
+#include <memory>
+// ============================================================================
+// ROOT
+// ============================================================================
+#include "TTree.h"
+// ============================================================================
+// Ostap
+// ============================================================================
+#include "Ostap/Formula.h"
+#include "Ostap/FormulaCache.h"
+#include "Ostap/Notifier.h"
+#include "Ostap/TreeArrays.h"
+// ============================================================================
+/** @file
+ *  Implementation file for class Ostap::Trees::Arrays
+ *  @see Ostap::Trees::Arrays
+ *  @author Vanya BELYAEV Ivan.Belyaev@itep.ru
+ *  @date   2021-03-05
+ */
+// ============================================================================
+/*  fill the buffer with the values of expressions for selected entries 
+ *  - all expressions and the selection are compiled only once
+ *  - the buffer is column-major: value of the expression <code>i</code>
+ *    for the selected row <code>j</code> is 
+ *    <code>buffer [ i * capacity + j ]</code>
+ *  - for array-like expressions only the first element is used
+ *  - the processing stops when the buffer is full
+ *  @param tree        (INPUT)  input tree 
+ *  @param buffer      (UPDATE) the buffer of size <code>capacity * expressions.size()</code>
+ *  @param capacity    (INPUT)  the maximal number of rows 
+ *  @param expressions (INPUT)  the list of expressions (columns)
+ *  @param selection   (INPUT)  the selection criteria 
+ *  @param first       (INPUT)  the first entry to process 
+ *  @param last        (INPUT)  the last entry to process (not including!)
+ *  @return number of filled rows, or -1 for invalid arguments 
+ */
+// ============================================================================
+long Ostap::Trees::Arrays::fill 
+( TTree*                          tree        , 
+  double*                         buffer      , 
+  const unsigned long             capacity    , 
+  const std::vector<std::string>& expressions ,
+  const std::string&              selection   ,
+  const unsigned long             first       ,
+  const unsigned long             last        ) 
+{
+  //
+  if ( nullptr == tree || nullptr == buffer ) { return -1 ; }  // RETURN 
+  if ( expressions.empty()                  ) { return -1 ; }  // RETURN 
+  if ( 0 == capacity || last <= first       ) { return  0 ; }  // RETURN 
+  //
+  // compile all expressions only once 
+  const unsigned int N = expressions.size() ;
+  typedef std::shared_ptr<Ostap::Formula> UOF ;
+  std::vector<UOF> formulas ; formulas.reserve ( N ) ;
+  for ( const auto& e : expressions ) 
+  {
+    auto p = Ostap::FormulaCache::formula ( e , tree ) ;
+    if ( !p || !p->ok() ) { return -1 ; }                      // RETURN 
+    formulas.push_back ( std::move ( p ) ) ;
+  }
+  //
+  // compile the selection 
+  UOF cuts {} ;
+  if ( !selection.empty() ) 
+  {
+    cuts = Ostap::FormulaCache::formula ( selection , tree ) ;
+    if ( !cuts || !cuts->ok() ) { return -1 ; }                // RETURN 
+  }
+  //
+  Ostap::Utils::Notifier notify ( formulas.begin() , formulas.end() , cuts.get() , tree ) ;
+  //
+  const unsigned long nEntries = 
+    std::min ( last , (unsigned long) tree->GetEntries() ) ;
+  //
+  unsigned long row = 0 ;
+  for ( unsigned long entry = first ; entry < nEntries && row < capacity ; ++entry )
+  {
+    //
+    long ievent = tree->GetEntryNumber ( entry ) ;
+    if ( 0 > ievent ) { break ; }                              // BREAK 
+    //
+    ievent      = tree->LoadTree ( ievent ) ;
+    if ( 0 > ievent ) { break ; }                              // BREAK 
+    //
+    if ( cuts && !cuts->evaluate () ) { continue ; }           // CONTINUE 
+    //
+    for ( unsigned int i = 0 ; i < N ; ++i ) 
+    { buffer [ i * capacity + row ] = formulas [ i ] -> evaluate () ; }
+    //
+    ++row ;
+  }
+  //
+  return row ;
+}
+// ============================================================================
+//                                                                      The END 
+// ============================================================================
@@ -23,13 +23,17 @@
 #include "Ostap/Choose.h"
 #include "Ostap/Clenshaw.h"
 #include "Ostap/Combine.h"
+#include "Ostap/Covariance.h"
 #include "Ostap/Dalitz.h"
 #include "Ostap/DalitzIntegrator.h"
+#include "Ostap/DataFrameActions.h"
 #include "Ostap/DataFrameUtils.h"
+#include "Ostap/DataHash.h"
 #include "Ostap/Digit.h"
 #include "Ostap/EigenSystem.h"
 #include "Ostap/Error2Exception.h"
 #include "Ostap/Formula.h"
+#include "Ostap/FormulaCache.h"
 #include "Ostap/FormulaVar.h"
 #include "Ostap/Fourier.h"
 #include "Ostap/Funcs.h"
@@ -93,6 +97,7 @@
 #include "Ostap/PyVar.h"     
 #include "Ostap/PyBLOB.h"
 #include "Ostap/Polarization.h"
+#include "Ostap/RooFitArrays.h"
 #include "Ostap/RootID.h"
 #include "Ostap/SFactor.h"
 #include "Ostap/StatEntity.h"
@@ -100,12 +105,14 @@
 #include "Ostap/StatusCode.h"
 #include "Ostap/SVectorWithError.h"
 #include "Ostap/SymmetricMatrixTypes.h"
+#include "Ostap/TDigest.h"
 #include "Ostap/Tensors.h"
 #include "Ostap/Tee.h"
 #include "Ostap/ToStream.h"
 #include "Ostap/Topics.h"
 #include "Ostap/TypeWrapper.h"
 #include "Ostap/Tmva.h"
+#include "Ostap/TreeArrays.h"
 #include "Ostap/Valid.h"
 #include "Ostap/ValueWithError.h"
 #include "Ostap/Vector3DTypes.h"
@@ -290,6 +297,7 @@ namespace
     std::vector<Ostap::Math::ValueWithError>               _dver1 ;
     std::vector<std::vector<Ostap::Math::ValueWithError> > _dver2 ;
     std::vector<Ostap::WStatEntity>                        _dver3 ;
+    std::vector<Ostap::Math::WCovariance>                  _dver4 ;
     //
     std::vector<Ostap::Vector2>  _vct_2 ;
     std::vector<Ostap::Vector3>  _vct_3 ;